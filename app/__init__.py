@@ -35,6 +35,27 @@ def create_app(config_class=Config):
             cursor.execute("PRAGMA foreign_keys=ON")
             cursor.close()
     
+    from app.utils import user_cache, query_stats, slow_query_log
+    user_cache.init_app(app)
+    query_stats.init_app(app)
+    slow_query_log.init_app(app)
+    
+    from app.services import (
+        chatbot_contexto, conversaciones, cv_cache, documentos, llm_cliente, planificador_llm, render_jobs,
+        respuestas_chat
+    )
+    cv_cache.init_app(app)
+    documentos.init_app(app)
+    render_jobs.init_app(app)
+    chatbot_contexto.init_app(app)
+    llm_cliente.init_app(app)
+    planificador_llm.init_app(app)
+    conversaciones.init_app(app)
+    respuestas_chat.init_app(app)
+
+    from app.cli import register_commands
+    register_commands(app)
+
     login_manager.login_view = 'auth.login'
     login_manager.login_message = 'Por favor inicia sesión para acceder.'
     
@@ -58,11 +79,15 @@ def create_app(config_class=Config):
     def inject_docente():
         from flask_login import current_user
         if current_user.is_authenticated and not current_user.es_admin():
-            from app.models.docente import Docente
-            docente = Docente.query.filter_by(user_id=current_user.id).first()
-            return {'current_docente': docente}
+            from app.utils.helpers import get_current_docente
+            return {'current_docente': get_current_docente()}
         return {'current_docente': None}
     
+    @app.teardown_request
+    def limpiar_docente_actual(exc):
+        from flask import g
+        g.pop('_current_docente', None)
+    
     # Ruta raíz
     @app.route('/')
     def index():
@@ -78,5 +103,5 @@ def create_app(config_class=Config):
 
 @login_manager.user_loader
 def load_user(user_id):
-    from app.models.user import User
-    return User.query.get(int(user_id))
+    from app.utils.user_cache import cargar_usuario
+    return cargar_usuario(int(user_id))
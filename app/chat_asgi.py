@@ -0,0 +1,204 @@
+"""Streaming del chatbot sobre ASGI: muchas conversaciones abiertas en un solo event loop.
+
+En Flask, ``/chatbot/stream`` itera un stream bloqueante de Groq dentro del
+generador de la respuesta: cada chat abierto ocupa un hilo del worker WSGI
+durante toda la respuesta. Esta sub-app atiende la misma ruta de forma
+asíncrona:
+
+* la preparación (docente, caché, contexto, historial) sigue siendo código
+  síncrono de ``ChatbotService`` y corre en el pool de hilos de anyio, dentro
+  de un contexto de la app de Flask, solo mientras dura;
+* la llamada a la IA usa ``AsyncGroq``: mientras el modelo genera, la
+  conversación no ocupa ningún hilo;
+* cada ``CHAT_STREAM_HEARTBEAT`` segundos sin texto se envía un comentario SSE
+  para que proxies y navegadores no cierren la conexión;
+* los fragmentos pasan por una cola acotada (``CHAT_STREAM_BUFFER``): si el
+  cliente lee lento, se deja de leer de la API en lugar de acumular en memoria;
+* si el cliente se desconecta, se cancela la lectura y se cierra el stream de
+  la API, que deja de generar (y de cobrar) tokens;
+* la llamada espera su turno en el planificador (``app.services.planificador_llm``)
+  sin ocupar un hilo, y el último evento lleva su tiempo en cola y del modelo.
+
+La sesión es la misma cookie firmada de Flask-Login; ``asgi.py`` monta esta
+app junto a la de Flask.
+"""
+import asyncio
+import json
+from contextlib import asynccontextmanager
+import anyio
+from flask.sessions import SecureCookieSessionInterface
+from itsdangerous import BadSignature
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+# Comentario SSE: los clientes lo ignoran, pero mantiene viva la conexión
+LATIDO = ': ping\n\n'
+_FIN = object()
+
+
+def evento(datos):
+    return f"data: {json.dumps(datos)}\n\n"
+
+
+class Retransmision:
+    """Eventos SSE de un stream asíncrono de la API, con latidos y cola acotada"""
+
+    def __init__(self, stream, latido=15.0, buffer=32):
+        self.stream = stream
+        self.latido = latido
+        self.buffer = buffer
+        self.partes = []
+        self.completa = False
+
+    async def _leer(self, cola):
+        try:
+            async for chunk in self.stream:
+                texto = chunk.choices[0].delta.content
+                if texto:
+                    # Con la cola llena esta espera frena la lectura de la API
+                    await cola.put(texto)
+            await cola.put(_FIN)
+        except Exception as e:
+            await cola.put(e)
+
+    async def eventos(self):
+        cola = asyncio.Queue(maxsize=self.buffer)
+        lector = asyncio.create_task(self._leer(cola))
+        siguiente = None
+        try:
+            while True:
+                # La misma espera de ``cola.get`` sobrevive a los latidos: no se pierde texto
+                if siguiente is None:
+                    siguiente = asyncio.ensure_future(cola.get())
+                listos, _ = await asyncio.wait({siguiente}, timeout=self.latido)
+                if not listos:
+                    yield LATIDO
+                    continue
+                item, siguiente = siguiente.result(), None
+                if item is _FIN:
+                    self.completa = True
+                    return
+                if isinstance(item, Exception):
+                    yield evento({'error': str(item)})
+                    return
+                self.partes.append(item)
+                yield evento({'chunk': item})
+        finally:
+            # Fin normal, error o desconexión del cliente (cancelación)
+            for tarea in (lector, siguiente):
+                if tarea is not None:
+                    tarea.cancel()
+            with anyio.CancelScope(shield=True):
+                await self.stream.close()
+
+    @property
+    def texto(self):
+        return ''.join(self.partes)
+
+
+def usuario_de_sesion(flask_app, request):
+    """Id del usuario de la cookie de sesión de Flask-Login, o None"""
+    cookie = request.cookies.get(flask_app.config.get('SESSION_COOKIE_NAME', 'session'))
+    if not cookie:
+        return None
+    serializador = SecureCookieSessionInterface().get_signing_serializer(flask_app)
+    if serializador is None:
+        return None
+    try:
+        sesion = serializador.loads(cookie, max_age=int(flask_app.permanent_session_lifetime.total_seconds()))
+    except BadSignature:
+        return None
+    user_id = sesion.get('_user_id')
+    return int(user_id) if user_id is not None else None
+
+
+def crear_app_chat(flask_app):
+    """Sub-app ASGI con ``POST /chatbot/stream`` para la app de Flask ``flask_app``"""
+    from app.services.chatbot_service import ChatbotService
+    from app.services.llm_cliente import obtener_proveedor_llm
+    from app.services.planificador_llm import ColaLLMLlena, obtener_planificador
+    from app.utils.user_cache import cargar_usuario
+
+    latido = flask_app.config.get('CHAT_STREAM_HEARTBEAT', 15)
+    buffer = flask_app.config.get('CHAT_STREAM_BUFFER', 32)
+    with flask_app.app_context():
+        proveedor = obtener_proveedor_llm()
+        planificador = obtener_planificador()
+
+    def en_contexto(funcion, *args):
+        with flask_app.app_context():
+            return funcion(*args)
+
+    def preparar(user_id, pregunta):
+        if cargar_usuario(user_id) is None:
+            return None, None
+        servicio = ChatbotService()
+        return servicio, servicio.preparar_streaming(pregunta, user_id)
+
+    async def stream_mensaje(request):
+        user_id = usuario_de_sesion(flask_app, request)
+        if user_id is None:
+            return JSONResponse({'error': 'Debes iniciar sesión'}, status_code=401)
+        try:
+            datos = await request.json()
+        except ValueError:
+            datos = {}
+        pregunta = (datos or {}).get('mensaje', '')
+        if not pregunta:
+            return JSONResponse({'error': 'Mensaje vacío'}, status_code=400)
+
+        try:
+            servicio, preparacion = await anyio.to_thread.run_sync(en_contexto, preparar, user_id, pregunta)
+        except Exception as e:
+            print(f"❌ Error en stream_mensaje: {str(e)}")
+            return JSONResponse({'error': str(e)}, status_code=500)
+        if servicio is None:
+            return JSONResponse({'error': 'Debes iniciar sesión'}, status_code=401)
+
+        async def cuerpo():
+            if preparacion.respuesta is not None:
+                yield evento({'chunk': preparacion.respuesta})
+                if preparacion.cache is not None:
+                    yield evento({'metadata': {'cache': preparacion.cache}})
+                return
+            parametros = servicio.parametros_streaming(preparacion)
+            try:
+                async with planificador.turno_async(user_id) as turno:
+                    try:
+                        stream = await turno.llamar_async(
+                            lambda: proveedor.cliente_async().chat.completions.create(**parametros)
+                        )
+                    except Exception as e:
+                        print(f"❌ Error en streaming: {str(e)}")
+                        yield evento({'error': str(e)})
+                        return
+
+                    retransmision = Retransmision(stream, latido, buffer)
+                    async for fragmento in retransmision.eventos():
+                        yield fragmento
+            except ColaLLMLlena as e:
+                yield evento({'error': str(e)})
+                return
+
+            if retransmision.completa:
+                await anyio.to_thread.run_sync(
+                    en_contexto, servicio.completar_streaming, pregunta, user_id, preparacion, retransmision.texto
+                )
+                yield evento({'metadata': {'llm': turno.tiempos()}})
+
+        return StreamingResponse(
+            cuerpo(),
+            media_type='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+
+    @asynccontextmanager
+    async def ciclo_de_vida(_app):
+        yield
+        await proveedor.cerrar_async()
+
+    return Starlette(
+        routes=[Route('/chatbot/stream', stream_mensaje, methods=['POST'])],
+        lifespan=ciclo_de_vida
+    )
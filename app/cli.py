@@ -0,0 +1,132 @@
+import time
+import click
+from flask.cli import with_appcontext
+from app import db
+
+
+@click.command('generar-datos')
+@click.option('--docentes', default=100, show_default=True, type=click.IntRange(1, 10000),
+              help='Número de docentes (con su usuario) a generar')
+@click.option('--escala', default=1.0, show_default=True, type=float,
+              help='Multiplicador del tamaño medio de cada colección')
+@click.option('--articulos', type=int, help='Artículos promedio por docente')
+@click.option('--congresos', type=int, help='Congresos promedio por docente')
+@click.option('--cursos', type=int, help='Cursos promedio por docente')
+@click.option('--proyectos', type=int, help='Proyectos promedio por docente')
+@click.option('--tesis', type=int, help='Tesis dirigidas promedio por docente')
+@click.option('--semilla', default=42, show_default=True, help='Semilla del generador aleatorio')
+@click.option('--lote', default=5000, show_default=True, help='Filas por INSERT en lote')
+@click.option('--crear-tablas/--sin-crear-tablas', default=True, show_default=True,
+              help='Ejecutar db.create_all() antes de insertar')
+@with_appcontext
+def generar_datos(docentes, escala, articulos, congresos, cursos, proyectos, tesis, semilla, lote, crear_tablas):
+    """Poblar la BD con docentes sintéticos y todas sus colecciones (pruebas de escala)"""
+    from app.services.datos_sinteticos import GeneradorDatosSinteticos, TAMANOS_POR_DEFECTO
+
+    tamanos = {nombre: round(media * escala) for nombre, media in TAMANOS_POR_DEFECTO.items()}
+    explicitos = {'articulos': articulos, 'congresos': congresos, 'cursos': cursos,
+                  'proyectos': proyectos, 'tesis': tesis}
+    tamanos.update({nombre: valor for nombre, valor in explicitos.items() if valor is not None})
+
+    if crear_tablas:
+        db.create_all()
+
+    inicio = time.perf_counter()
+    generador = GeneradorDatosSinteticos(semilla=semilla, tamano_lote=lote)
+    conteos = generador.generar(
+        docentes, tamanos,
+        progreso=lambda n, seg: click.echo(f'  {n} docentes ({seg:.1f}s)')
+    )
+    duracion = time.perf_counter() - inicio
+
+    for tabla, filas in sorted(conteos.items()):
+        click.echo(f'{tabla:28} {filas:>10,}')
+    total = sum(conteos.values())
+    click.echo(f'✅ {total:,} filas en {duracion:.1f}s ({total / max(duracion, 1e-9):,.0f} filas/s)')
+
+
+@click.command('limpiar-documentos')
+@with_appcontext
+def limpiar_documentos():
+    """Borrar los documentos generados que superaron DOCUMENTOS_RETENCION_DIAS"""
+    from app.services.documentos import obtener_almacen
+
+    borrados = obtener_almacen().recolectar()
+    click.echo(f'🧹 {borrados} documentos caducados eliminados')
+
+
+@click.command('exportar-cvs')
+@click.argument('salida', type=click.Path(dir_okay=False, writable=True))
+@click.option('--plantilla', default='basico', show_default=True,
+              type=click.Choice(['basico', 'conacyt', 'profesional', 'academico']))
+@click.option('--formato', default='pdf', show_default=True, type=click.Choice(['pdf', 'word']))
+@click.option('--area', default='', help='Área de adscripción del empleo actual')
+@click.option('--nivel', default='', help='Nivel de formación (doctorado, maestria, ...)')
+@with_appcontext
+def exportar_cvs(salida, plantilla, formato, area, nivel):
+    """Guardar en SALIDA un ZIP con los CVs de los docentes que cumplen los filtros"""
+    from flask import current_app
+    from app.services.cv_cache import obtener_cache
+    from app.services.exportacion_cv import ExportacionCV, ids_docentes
+    from app.services.render_jobs import obtener_gestor
+
+    try:
+        exportacion = ExportacionCV(obtener_gestor(), obtener_cache(), plantilla, formato,
+                                    tamano_lote=current_app.config.get('CV_EXPORT_LOTE', 20))
+    except ValueError as e:
+        raise click.UsageError(str(e))
+
+    docente_ids = ids_docentes(area=area, nivel=nivel)
+    inicio = time.perf_counter()
+    with open(salida, 'wb') as archivo:
+        for bloque in exportacion.generar(docente_ids):
+            archivo.write(bloque)
+    click.echo(f'📦 {len(docente_ids)} docentes en {salida} ({time.perf_counter() - inicio:.1f}s)')
+
+
+@click.command('registrar-plantilla')
+@click.argument('nombre')
+@click.argument('archivo', type=click.File('rb'))
+@with_appcontext
+def registrar_plantilla(nombre, archivo):
+    """Registrar un DOCX con campos {{ campo }} como plantilla de combinación"""
+    from app.services import combinacion
+
+    try:
+        plantilla = combinacion.registrar_plantilla(nombre, archivo.read())
+    except combinacion.CampoDesconocido as e:
+        raise click.ClickException(f'{e}. Disponibles: {", ".join(sorted(combinacion.CAMPOS))}')
+    click.echo(f'📝 Plantilla {plantilla.id} ({plantilla.name}): {plantilla.required_fields}')
+
+
+@click.command('combinar-plantilla')
+@click.argument('plantilla_id', type=int)
+@click.option('--area', default='', help='Área de adscripción del empleo actual')
+@click.option('--nivel', default='', help='Nivel de formación (doctorado, maestria, ...)')
+@with_appcontext
+def combinar_plantilla(plantilla_id, area, nivel):
+    """Rellenar la plantilla para los docentes que cumplen los filtros"""
+    from app.models.report_template import ReportTemplate
+    from app.services.combinacion import Combinador
+    from app.services.documentos import obtener_almacen
+    from app.services.exportacion_cv import ids_docentes
+    from app.services.render_jobs import obtener_gestor
+
+    plantilla = db.session.get(ReportTemplate, plantilla_id)
+    if plantilla is None:
+        raise click.ClickException(f'No existe la plantilla {plantilla_id}')
+
+    inicio = time.perf_counter()
+    resultado = Combinador(obtener_gestor(), obtener_almacen()).combinar(plantilla, ids_docentes(area=area, nivel=nivel))
+    for docente_id, error in resultado.errores:
+        click.echo(f'  ⚠️ docente {docente_id}: {error}')
+    click.echo(f'📄 {len(resultado.documentos)} documentos generados en {time.perf_counter() - inicio:.1f}s')
+
+
+def register_commands(app):
+    """Registrar los comandos ``flask`` propios de la aplicación"""
+    app.cli.add_command(generar_datos)
+    app.cli.add_command(limpiar_documentos)
+    app.cli.add_command(exportar_cvs)
+    app.cli.add_command(registrar_plantilla)
+    app.cli.add_command(combinar_plantilla)
@@ -17,6 +17,56 @@ class Config:
     # Session
     PERMANENT_SESSION_LIFETIME = timedelta(hours=24)
     
+    # Caché de usuarios de sesión (evita consultar users en cada petición)
+    USER_CACHE_ENABLED = True
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE', 1024))
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 300))  # segundos
+    
+    # Contexto del CV que usa el chatbot, en caché por docente y versión del perfil
+    CHAT_CONTEXTO_CACHE_ENABLED = True
+    CHAT_CONTEXTO_CACHE_SIZE = int(os.environ.get('CHAT_CONTEXTO_CACHE_SIZE', 512))
+    CHAT_CONTEXTO_TTL = int(os.environ.get('CHAT_CONTEXTO_TTL', 60))  # segundos hasta volver a comparar la versión
+    CHAT_RECUPERACION_LIMITE = int(os.environ.get('CHAT_RECUPERACION_LIMITE', 8))  # registros del CV por pregunta
+    
+    # Instrumentación de consultas SQL por petición
+    QUERY_STATS_HEADERS = None  # None = solo en modo debug
+    QUERY_STATS_STRICT = False  # en pruebas: fallar si se excede el presupuesto
+    QUERY_BUDGET = None  # máximo de consultas por petición
+    QUERY_BUDGETS = {}  # presupuestos por endpoint, p. ej. {'docente.perfil': 15}
+    QUERY_REPEAT_LIMIT = None  # máximo de ejecuciones de una misma forma de consulta
+    
+    # Log de consultas lentas (JSONL rotativo; en SQLite incluye EXPLAIN QUERY PLAN)
+    SLOW_QUERY_THRESHOLD_MS = float(os.environ['SLOW_QUERY_THRESHOLD_MS']) if os.environ.get('SLOW_QUERY_THRESHOLD_MS') else None
+    SLOW_QUERY_LOG_PATH = os.environ.get('SLOW_QUERY_LOG_PATH') or \
+        os.path.join(basedir, '..', 'instance', 'slow_queries.jsonl')
+    SLOW_QUERY_LOG_MAX_BYTES = 5 * 1024 * 1024
+    SLOW_QUERY_LOG_BACKUPS = 3
+    SLOW_QUERY_EXPLAIN = True
+    
+    # Caché en disco de CVs renderizados (llave: docente, versión del perfil y opciones)
+    CV_CACHE_ENABLED = os.environ.get('CV_CACHE_ENABLED', '1') != '0'
+    CV_CACHE_DIR = os.environ.get('CV_CACHE_DIR') or os.path.join(basedir, '..', 'instance', 'cv_cache')
+    CV_CACHE_MAX_BYTES = int(os.environ.get('CV_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+    
+    # Trabajos de render de CV en un pool de procesos (0 = en línea, dentro de la petición)
+    CV_JOBS_WORKERS = int(os.environ.get('CV_JOBS_WORKERS', 2))
+    CV_JOBS_MAX_POR_USUARIO = int(os.environ.get('CV_JOBS_MAX_POR_USUARIO', 2))
+    CV_JOBS_TTL = 600  # segundos que se conserva el estado de un trabajo terminado
+    # Estado de los trabajos, compartido entre workers; por omisión <CV_CACHE_DIR>/trabajos
+    CV_JOBS_DIR = os.environ.get('CV_JOBS_DIR')
+    CV_JOBS_DOWNLOAD_WAIT = 30  # tope de ?esperar= en la descarga; por omisión no se espera
+    CV_JOBS_START_METHOD = 'spawn'
+    CV_EXPORT_LOTE = 20  # docentes que la exportación masiva carga de la BD a la vez
+    
+    # Documentos generados que se conservan (enlaces del chatbot); fuera de static/
+    DOCUMENTOS_DIR = os.environ.get('DOCUMENTOS_DIR') or os.path.join(basedir, '..', 'instance', 'documentos')
+    DOCUMENTOS_RETENCION_DIAS = int(os.environ.get('DOCUMENTOS_RETENCION_DIAS', 30))
+    DOCUMENTOS_MAX_POR_DOCENTE = int(os.environ.get('DOCUMENTOS_MAX_POR_DOCENTE', 20))
+    DOCUMENTOS_MAX_BYTES_POR_DOCENTE = int(os.environ.get('DOCUMENTOS_MAX_BYTES_POR_DOCENTE', 50 * 1024 * 1024))
+    
+    # Plantillas DOCX de combinación de correspondencia (ReportTemplate)
+    PLANTILLAS_DIR = os.environ.get('PLANTILLAS_DIR') or os.path.join(basedir, '..', 'instance', 'plantillas')
+    
     # APIs Externas
     GOOGLE_SCHOLAR_API = os.environ.get('GOOGLE_SCHOLAR_API', '')
     
@@ -32,3 +82,43 @@ class Config:
     
     # GROQ (Chatbot)
     GROQ_API_KEY = os.environ.get('GROQ_API_KEY', '')
+    GROQ_MODEL = os.environ.get('GROQ_MODEL', 'llama-3.3-70b-versatile')
+    
+    # Cliente HTTP del LLM, uno por proceso (conexiones keep-alive entre turnos del chat)
+    LLM_POOL_MAX_CONEXIONES = int(os.environ.get('LLM_POOL_MAX_CONEXIONES', 20))
+    LLM_POOL_MAX_KEEPALIVE = int(os.environ.get('LLM_POOL_MAX_KEEPALIVE', 10))
+    LLM_POOL_KEEPALIVE_EXPIRA = 60  # segundos que una conexión ociosa sigue abierta
+    LLM_TIMEOUT_CONEXION = float(os.environ.get('LLM_TIMEOUT_CONEXION', 5))
+    LLM_TIMEOUT_LECTURA = float(os.environ.get('LLM_TIMEOUT_LECTURA', 60))
+    LLM_MAX_REINTENTOS = int(os.environ.get('LLM_MAX_REINTENTOS', 2))  # 429/5xx/errores de conexión, con backoff
+    
+    # Planificador de llamadas al LLM: tope por proceso, turnos justos entre usuarios y pausa ante 429
+    LLM_MAX_CONCURRENTES = int(os.environ.get('LLM_MAX_CONCURRENTES', 8))
+    LLM_MAX_POR_USUARIO = int(os.environ.get('LLM_MAX_POR_USUARIO', 3))  # consultas en cola o en curso
+    LLM_COLA_ESPERA_MAXIMA = float(os.environ.get('LLM_COLA_ESPERA_MAXIMA', 30))  # segundos antes de rechazar
+    
+    # Backend del LLM: 'groq' (API real o un servidor compatible con OpenAI en LLM_BASE_URL)
+    # o 'simulado' (app/services/llm_simulado.py en el proceso, para pruebas de carga)
+    LLM_BACKEND = os.environ.get('LLM_BACKEND', 'groq')
+    LLM_BASE_URL = os.environ.get('LLM_BASE_URL')
+    LLM_SIMULADO_TOKENS_SEG = float(os.environ.get('LLM_SIMULADO_TOKENS_SEG', 40))
+    LLM_SIMULADO_LATENCIA = os.environ.get('LLM_SIMULADO_LATENCIA', 'lognormal:0.4:0.5')  # hasta el primer token
+    LLM_SIMULADO_TOKENS_RESPUESTA = int(os.environ.get('LLM_SIMULADO_TOKENS_RESPUESTA', 120))
+    LLM_SIMULADO_TASA_429 = float(os.environ.get('LLM_SIMULADO_TASA_429', 0))
+    LLM_SIMULADO_TASA_ERROR = float(os.environ.get('LLM_SIMULADO_TASA_ERROR', 0))
+    LLM_SIMULADO_RETRY_AFTER = 1.0  # segundos en la cabecera Retry-After de los 429 simulados
+    
+    # Conversaciones del chatbot (tabla mensajes_chat + caché en memoria de los turnos recientes)
+    CHAT_PRESUPUESTO_TOKENS = int(os.environ.get('CHAT_PRESUPUESTO_TOKENS', 4000))  # prompt completo por llamada
+    CHAT_HISTORIAL_MAX_MENSAJES = int(os.environ.get('CHAT_HISTORIAL_MAX_MENSAJES', 50))  # por usuario; los más viejos se borran
+    CHAT_HISTORIAL_CACHE_SIZE = int(os.environ.get('CHAT_HISTORIAL_CACHE_SIZE', 1024))
+    CHAT_HISTORIAL_TTL = int(os.environ.get('CHAT_HISTORIAL_TTL', 60))  # segundos
+    
+    # Respuestas del chatbot en caché por docente, versión del perfil y pregunta normalizada
+    CHAT_RESPUESTAS_CACHE_ENABLED = True
+    CHAT_RESPUESTAS_CACHE_SIZE = int(os.environ.get('CHAT_RESPUESTAS_CACHE_SIZE', 2048))
+    CHAT_RESPUESTAS_TTL = int(os.environ.get('CHAT_RESPUESTAS_TTL', 3600))  # segundos
+    
+    # Streaming del chatbot desde asgi.py (app/chat_asgi.py)
+    CHAT_STREAM_HEARTBEAT = float(os.environ.get('CHAT_STREAM_HEARTBEAT', 15))  # segundos sin texto antes de un latido SSE
+    CHAT_STREAM_BUFFER = int(os.environ.get('CHAT_STREAM_BUFFER', 32))  # fragmentos en cola antes de frenar la lectura de la API
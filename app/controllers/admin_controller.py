@@ -1,14 +1,16 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request, send_file
+from flask import Blueprint, render_template, redirect, url_for, flash, request, abort, jsonify, current_app, Response, stream_with_context
 from flask_login import login_required, current_user
 from app import db
 from app.models.user import User
 from app.models.docente import Docente
 from app.models.articulo import Articulo
 from app.models.empleo import Empleo
-from app.models.formacion_academica import FormacionAcademica
 from app.utils.decorators import admin_required
 from app.services.cv_generator_service import CVGeneratorService
-import io
+from app.services.profile_loader import ProfileLoader
+from app.services.cv_cache import obtener_cache
+from app.services.exportacion_cv import PLANTILLAS, ExportacionCV, filtrar_docentes, ids_docentes
+from app.services.render_jobs import LimiteTrabajosExcedido, obtener_gestor, respuesta_encolado, respuesta_limite, trabajo_como_json
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -65,41 +67,13 @@ def dashboard():
 @admin_required
 def docentes():
     """Listar y buscar docentes"""
-    from flask import request
-    from sqlalchemy import or_
-    
     # Obtener parámetros de búsqueda
     query = request.args.get('q', '').strip()
     area_filter = request.args.get('area', '').strip()
     nivel_filter = request.args.get('nivel', '').strip()
     
-    # Consulta base
-    docentes_query = Docente.query
-    
-    # Búsqueda por texto
-    if query:
-        docentes_query = docentes_query.filter(
-            or_(
-                Docente.nombre_completo.ilike(f'%{query}%'),
-                Docente.cvu.ilike(f'%{query}%'),
-                Docente.curp.ilike(f'%{query}%'),
-                Docente.rfc.ilike(f'%{query}%'),
-                Docente.orcid.ilike(f'%{query}%')
-            )
-        )
-    
-    # Filtro por área (basado en empleo actual)
-    if area_filter:
-        docentes_query = docentes_query.join(Empleo).filter(
-            Empleo.actual == True,
-            Empleo.area_adscripcion.ilike(f'%{area_filter}%')
-        )
-    
-    # Filtro por nivel (basado en formación académica)
-    if nivel_filter:
-        docentes_query = docentes_query.join(FormacionAcademica).filter(
-            FormacionAcademica.nivel == nivel_filter
-        )
+    # Consulta base con los mismos filtros que la exportación masiva
+    docentes_query = filtrar_docentes(Docente.query, query, area_filter, nivel_filter)
     
     # Obtener docentes
     docentes_list = docentes_query.distinct().all()
@@ -148,105 +122,48 @@ def docentes():
 @admin_required
 def ver_docente(id):
     """Ver perfil completo de un docente"""
-    docente = Docente.query.get_or_404(id)
-    
-    formaciones = docente.formaciones.all()
-    empleos = docente.empleos.all()
-    articulos = docente.articulos.all()
-    idiomas = docente.idiomas.all()
-    cursos = docente.cursos.all()
-    proyectos = docente.proyectos.all()
-    libros = docente.libros.all()
-    congresos = docente.congresos.all()
-    tesis = docente.tesis.all()
-    desarrollos = docente.desarrollos.all()
-    actividades = docente.actividades.all()
+    perfil = ProfileLoader().cargar(id)
+    if perfil is None:
+        abort(404)
     
     return render_template('admin/ver_docente.html',
-                         docente=docente,
-                         formaciones=formaciones,
-                         empleos=empleos,
-                         articulos=articulos,
-                         idiomas=idiomas,
-                         cursos=cursos,
-                         proyectos=proyectos,
-                         libros=libros,
-                         congresos=congresos,
-                         tesis=tesis,
-                         desarrollos=desarrollos,
-                         actividades=actividades)
+                         docente=perfil.docente,
+                         **perfil.colecciones())
 
 @admin_bp.route('/docentes/<int:id>/cv', methods=['GET', 'POST'])
 @login_required
 @admin_required
 def docente_cv(id):
     """Generar y visualizar el CV de un docente desde el panel admin"""
-    docente = Docente.query.get_or_404(id)
-    
-    formaciones = FormacionAcademica.query.filter_by(docente_id=docente.id).all()
-    empleos = Empleo.query.filter_by(docente_id=docente.id).all()
-    articulos = Articulo.query.filter_by(docente_id=docente.id).all()
-    libros = docente.libros.all()
-    congresos = docente.congresos.all()
-    cursos = docente.cursos.all()
-    proyectos = docente.proyectos.all()
-    tesis = docente.tesis.all()
-    desarrollos = docente.desarrollos.all()
+    perfil = ProfileLoader().cargar(id)
+    if perfil is None:
+        abort(404)
+    
+    docente = perfil.docente
+    formaciones = perfil.formaciones
+    empleos = perfil.empleos
+    articulos = perfil.articulos
+    libros = perfil.libros
+    congresos = perfil.congresos
+    cursos = perfil.cursos
+    proyectos = perfil.proyectos
+    tesis = perfil.tesis
+    desarrollos = perfil.desarrollos
     
     selected_sections = request.form.getlist('sections') or CVGeneratorService.DEFAULT_SECTIONS
     formato = request.form.get('formato', 'pdf')
     tipo_cv = request.form.get('tipo_cv', 'academico')
     
-    if request.method == 'POST':
-        cv_service = CVGeneratorService()
+    if request.method == 'POST' and formato in CVGeneratorService.FORMATOS:
         try:
-            if formato == 'pdf':
-                pdf_data = cv_service.generar_pdf(
-                    docente,
-                    formaciones=formaciones,
-                    empleos=empleos,
-                    articulos=articulos,
-                    libros=libros,
-                    congresos=congresos,
-                    cursos=cursos,
-                    proyectos=proyectos,
-                    tesis=tesis,
-                    desarrollos=desarrollos,
-                    tipo_cv=tipo_cv,
-                    sections=selected_sections
-                )
-                nombre_archivo = docente.nombre_completo.replace(' ', '_') if docente.nombre_completo else 'CV'
-                return send_file(
-                    io.BytesIO(pdf_data),
-                    mimetype='application/pdf',
-                    as_attachment=True,
-                    download_name=f'CV_{nombre_archivo}.pdf'
-                )
-            elif formato == 'word':
-                word_data = cv_service.generar_word(
-                    docente,
-                    formaciones=formaciones,
-                    empleos=empleos,
-                    articulos=articulos,
-                    libros=libros,
-                    congresos=congresos,
-                    cursos=cursos,
-                    proyectos=proyectos,
-                    tesis=tesis,
-                    desarrollos=desarrollos,
-                    tipo_cv=tipo_cv,
-                    sections=selected_sections
-                )
-                nombre_archivo = docente.nombre_completo.replace(' ', '_') if docente.nombre_completo else 'CV'
-                return send_file(
-                    io.BytesIO(word_data),
-                    mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-                    as_attachment=True,
-                    download_name=f'CV_{nombre_archivo}.docx'
-                )
-        except Exception as e:
-            flash(f'Error al generar el CV: {str(e)}', 'danger')
+            trabajo = obtener_gestor().enviar_cv(current_user.id, perfil, formato, tipo_cv, selected_sections)
+        except LimiteTrabajosExcedido as e:
+            if request.accept_mimetypes.best == 'application/json':
+                return respuesta_limite(e)
+            flash(str(e), 'warning')
             return redirect(url_for('admin.docente_cv', id=id))
+        
+        return respuesta_encolado(trabajo, url_for('admin.docente_cv', id=id))
     
     return render_template(
         'admin/docente_cv.html',
@@ -262,5 +179,62 @@ def docente_cv(id):
         desarrollos=desarrollos,
         selected_sections=selected_sections,
         formato=formato,
-        tipo_cv=tipo_cv
+        tipo_cv=tipo_cv,
+        trabajo_id=request.args.get('trabajo')
     )
+
+@admin_bp.route('/docentes/<int:id>/cv/trabajos', methods=['POST'])
+@login_required
+@admin_required
+def docente_cv_trabajo(id):
+    """Encolar el CV de un docente; el estado se consulta en /cv/trabajos/<id>"""
+    perfil = ProfileLoader().cargar(id)
+    if perfil is None:
+        abort(404)
+    
+    formato = request.form.get('formato', 'pdf')
+    if formato not in CVGeneratorService.FORMATOS:
+        return jsonify({'error': f'Formato no soportado: {formato}'}), 400
+    
+    try:
+        trabajo = obtener_gestor().enviar_cv(
+            current_user.id,
+            perfil,
+            formato,
+            request.form.get('tipo_cv', 'academico'),
+            request.form.getlist('sections') or CVGeneratorService.DEFAULT_SECTIONS
+        )
+    except LimiteTrabajosExcedido as e:
+        return respuesta_limite(e)
+    
+    return jsonify(trabajo_como_json(trabajo)), 202
+
+@admin_bp.route('/docentes/cv.zip')
+@login_required
+@admin_required
+def exportar_cvs():
+    """Descargar en un ZIP los CVs de todos los docentes que cumplen los filtros"""
+    plantilla = request.args.get('plantilla', 'basico')
+    formato = request.args.get('formato', 'pdf')
+    if plantilla not in PLANTILLAS or formato not in CVGeneratorService.FORMATOS:
+        abort(400)
+    
+    try:
+        exportacion = ExportacionCV(
+            obtener_gestor(), obtener_cache(), plantilla, formato,
+            tamano_lote=current_app.config.get('CV_EXPORT_LOTE', 20)
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    docente_ids = ids_docentes(
+        request.args.get('q', '').strip(),
+        request.args.get('area', '').strip(),
+        request.args.get('nivel', '').strip()
+    )
+    
+    # El ZIP se envía mientras se genera: sin Content-Length y sin guardarlo completo en memoria
+    respuesta = Response(stream_with_context(exportacion.generar(docente_ids)), mimetype='application/zip')
+    respuesta.headers.set('Content-Disposition', 'attachment', filename=f'CVs_{plantilla}.zip')
+    respuesta.headers['Cache-Control'] = 'no-store'
+    return respuesta
@@ -2,6 +2,7 @@ from flask import Blueprint, render_template, request, jsonify, Response, stream
 from flask_login import login_required, current_user
 from app import csrf
 from app.services.chatbot_service import ChatbotService
+from app.services.conversaciones import obtener_conversaciones
 from app.utils.decorators import docente_required  # ⬅️ CAMBIO: docente_required en vez de profesor_required
 from datetime import datetime
 import json
@@ -54,7 +55,9 @@ def enviar_mensaje():
                 'respuesta': respuesta_texto,
                 'metadata': {
                     'timestamp': datetime.now().isoformat(),
-                    'error': False
+                    'error': False,
+                    'cache': None,
+                    'llm': chatbot_service.tiempos_llm
                 }
             })
         
@@ -92,6 +95,11 @@ def stream_mensaje():
                 chatbot_service = ChatbotService()
                 for chunk in chatbot_service.generar_respuesta_streaming(pregunta, current_user.id):
                     yield f"data: {json.dumps({'chunk': chunk})}\n\n"
+                if chatbot_service.cache_ultima_respuesta is not None:
+                    yield f"data: {json.dumps({'metadata': {'cache': chatbot_service.cache_ultima_respuesta}})}\n\n"
+                if chatbot_service.tiempos_llm is not None:
+                    # Tiempo en cola del planificador y tiempo del modelo, por separado
+                    yield f"data: {json.dumps({'metadata': {'llm': chatbot_service.tiempos_llm}})}\n\n"
             except Exception as e:
                 print(f"❌ Error en streaming: {str(e)}")
                 yield f"data: {json.dumps({'error': str(e)})}\n\n"
@@ -112,6 +120,7 @@ def limpiar():
     """Limpiar el historial del chat"""
     try:
         print("🧹 Limpiando historial del chat")
+        obtener_conversaciones().limpiar(current_user.id)
         return jsonify({
             'mensaje': 'Historial limpiado correctamente',
             'timestamp': datetime.now().isoformat()
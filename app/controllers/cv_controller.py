@@ -1,18 +1,15 @@
-from flask import Blueprint, render_template, request, send_file, flash, redirect, url_for
+from flask import Blueprint, render_template, request, flash, redirect, url_for, jsonify, abort
 from flask_login import login_required, current_user
-from app.models.docente import Docente
-from app.models.formacion_academica import FormacionAcademica
-from app.models.empleo import Empleo
-from app.models.articulo import Articulo
-from app.models.libro import Libro
-from app.models.congreso import Congreso
-from app.models.curso_impartido import CursoImpartido
-from app.models.proyecto_investigacion import ProyectoInvestigacion
-from app.models.tesis_dirigida import TesisDirigida
-from app.models.desarrollo_tecnologico import DesarrolloTecnologico
+from app.services.cv_documento import construir_documento
 from app.services.cv_generator_service import CVGeneratorService
+from app.services.documentos import obtener_almacen, respuesta_archivo
+from app.services.profile_loader import ProfileLoader
+from app.services.render_jobs import (
+    MIMETYPES, LimiteTrabajosExcedido, obtener_gestor, respuesta_descarga, respuesta_encolado, respuesta_limite,
+    segundos_espera_descarga, trabajo_como_json
+)
 from app.utils.decorators import profesor_required
-import io
+from app.utils.helpers import get_current_docente
 
 cv_bp = Blueprint('cv', __name__)
 
@@ -20,77 +17,39 @@ cv_bp = Blueprint('cv', __name__)
 @login_required
 @profesor_required
 def generar():
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     
     if not docente:
         flash('Por favor completa tu perfil primero', 'warning')
         return redirect(url_for('docente.perfil'))
     
-    formaciones = FormacionAcademica.query.filter_by(docente_id=docente.id).all()
-    empleos = Empleo.query.filter_by(docente_id=docente.id).all()
-    articulos = Articulo.query.filter_by(docente_id=docente.id).all()
-    libros = Libro.query.filter_by(docente_id=docente.id).all()
-    congresos = Congreso.query.filter_by(docente_id=docente.id).all()
-    cursos = CursoImpartido.query.filter_by(docente_id=docente.id).all()
-    proyectos = ProyectoInvestigacion.query.filter_by(docente_id=docente.id).all()
-    tesis = TesisDirigida.query.filter_by(docente_id=docente.id).all()
-    desarrollos = DesarrolloTecnologico.query.filter_by(docente_id=docente.id).all()
+    perfil = ProfileLoader().cargar(docente.id)
+    formaciones = perfil.formaciones
+    empleos = perfil.empleos
+    articulos = perfil.articulos
+    libros = perfil.libros
+    congresos = perfil.congresos
+    cursos = perfil.cursos
+    proyectos = perfil.proyectos
+    tesis = perfil.tesis
+    desarrollos = perfil.desarrollos
     
     if request.method == 'POST':
         formato = request.form.get('formato', 'pdf')
         tipo_cv = request.form.get('tipo_cv', 'academico')
         selected_sections = request.form.getlist('sections') or CVGeneratorService.DEFAULT_SECTIONS
         
-        cv_service = CVGeneratorService()
-        
-        try:
-            if formato == 'pdf':
-                pdf_data = cv_service.generar_pdf(
-                    docente,
-                    formaciones,
-                    empleos,
-                    articulos,
-                    libros,
-                    congresos,
-                    cursos,
-                    proyectos,
-                    tesis,
-                    desarrollos,
-                    tipo_cv,
-                    selected_sections
-                )
-                nombre_archivo = docente.nombre_completo.replace(' ', '_') if docente.nombre_completo else 'CV'
-                return send_file(
-                    io.BytesIO(pdf_data),
-                    mimetype='application/pdf',
-                    as_attachment=True,
-                    download_name=f'CV_{nombre_archivo}.pdf'
-                )
-            elif formato == 'word':
-                docx_data = cv_service.generar_word(
-                    docente,
-                    formaciones,
-                    empleos,
-                    articulos,
-                    libros,
-                    congresos,
-                    cursos,
-                    proyectos,
-                    tesis,
-                    desarrollos,
-                    tipo_cv,
-                    selected_sections
-                )
-                nombre_archivo = docente.nombre_completo.replace(' ', '_') if docente.nombre_completo else 'CV'
-                return send_file(
-                    io.BytesIO(docx_data),
-                    mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
-                    as_attachment=True,
-                    download_name=f'CV_{nombre_archivo}.docx'
-                )
-        except Exception as e:
-            flash(f'Error al generar CV: {str(e)}', 'danger')
-            return redirect(url_for('cv.generar'))
+        if formato in CVGeneratorService.FORMATOS:
+            try:
+                trabajo = obtener_gestor().enviar_cv(current_user.id, perfil, formato, tipo_cv, selected_sections)
+            except LimiteTrabajosExcedido as e:
+                if request.accept_mimetypes.best == 'application/json':
+                    return respuesta_limite(e)
+                flash(str(e), 'warning')
+                return redirect(url_for('cv.generar'))
+            
+            # El render sigue en los procesos de fondo; la página consulta el estado
+            return respuesta_encolado(trabajo, url_for('cv.generar'))
     
     return render_template(
         'docente/generar_cv.html',
@@ -103,29 +62,78 @@ def generar():
         cursos=cursos,
         proyectos=proyectos,
         tesis=tesis,
-        desarrollos=desarrollos
+        desarrollos=desarrollos,
+        trabajo_id=request.args.get('trabajo')
     )
 
+@cv_bp.route('/trabajos', methods=['POST'])
+@login_required
+@profesor_required
+def crear_trabajo():
+    """Encolar la generación del CV propio; responde 202 con el id del trabajo"""
+    perfil = ProfileLoader().cargar_por_usuario(current_user.id)
+    if perfil is None:
+        return jsonify({'error': 'Por favor completa tu perfil primero'}), 400
+    
+    formato = request.form.get('formato', 'pdf')
+    if formato not in CVGeneratorService.FORMATOS:
+        return jsonify({'error': f'Formato no soportado: {formato}'}), 400
+    
+    try:
+        trabajo = obtener_gestor().enviar_cv(
+            current_user.id,
+            perfil,
+            formato,
+            request.form.get('tipo_cv', 'academico'),
+            request.form.getlist('sections') or CVGeneratorService.DEFAULT_SECTIONS
+        )
+    except LimiteTrabajosExcedido as e:
+        return respuesta_limite(e)
+    
+    return jsonify(trabajo_como_json(trabajo)), 202
+
+@cv_bp.route('/trabajos/<trabajo_id>')
+@login_required
+def estado_trabajo(trabajo_id):
+    """Estado de un trabajo de render del usuario actual"""
+    trabajo = obtener_gestor().obtener(trabajo_id, current_user.id)
+    if trabajo is None:
+        abort(404)
+    return jsonify(trabajo_como_json(trabajo))
+
+@cv_bp.route('/trabajos/<trabajo_id>/descarga')
+@login_required
+def descargar_trabajo(trabajo_id):
+    """Descargar el resultado; si aún no termina responde 202 (``?esperar=<s>`` bloquea hasta ese tope)"""
+    gestor = obtener_gestor()
+    trabajo = gestor.obtener(trabajo_id, current_user.id)
+    if trabajo is None:
+        # El trabajo ya expiró del registro: buscar la copia persistida del docente
+        docente = get_current_docente()
+        ruta = obtener_almacen().buscar(docente.id, trabajo_id) if docente else None
+        if ruta is None:
+            abort(404)
+        extension = ruta.rsplit('.', 1)[-1]
+        nombre = docente.nombre_completo.replace(' ', '_') if docente.nombre_completo else 'CV'
+        return respuesta_archivo(ruta, MIMETYPES[extension], f'CV_{nombre}.{extension}')
+    espera = segundos_espera_descarga()
+    if espera:
+        trabajo = gestor.esperar(trabajo, espera)
+    return respuesta_descarga(trabajo)
+
 @cv_bp.route('/vista-previa')
 @login_required
 @profesor_required
 def vista_previa():
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     
     if not docente:
         flash('Por favor completa tu perfil primero', 'warning')
         return redirect(url_for('docente.perfil'))
     
-    formaciones = FormacionAcademica.query.filter_by(docente_id=docente.id).all()
-    empleos = Empleo.query.filter_by(docente_id=docente.id).all()
-    articulos = Articulo.query.filter_by(docente_id=docente.id).all()
-    libros = Libro.query.filter_by(docente_id=docente.id).all()
-    congresos = Congreso.query.filter_by(docente_id=docente.id).all()
+    # Misma representación intermedia que el PDF y el Word
+    documento = construir_documento(ProfileLoader().cargar(docente.id))
     
     return render_template('docente/vista_previa_cv.html',
                          docente=docente,
-                         formaciones=formaciones,
-                         empleos=empleos,
-                         articulos=articulos,
-                         libros=libros,
-                         congresos=congresos)
+                         documento=documento)
@@ -24,7 +24,9 @@ from app.forms.libro_forms import LibroForm
 from app.forms.congreso_forms import CongresoForm
 from app.forms.tesis_forms import TesisDirigidaForm
 from app.forms.desarrollo_forms import DesarrolloTecnologicoForm
+from app.services.profile_loader import ProfileLoader
 from app.utils.decorators import docente_required
+from app.utils.helpers import get_current_docente
 
 docente_bp = Blueprint('docente', __name__)
 
@@ -33,7 +35,7 @@ docente_bp = Blueprint('docente', __name__)
 @docente_required
 def dashboard():
     """Dashboard del docente"""
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     
     if not docente:
         flash('Por favor completa tu perfil primero', 'info')
@@ -82,7 +84,7 @@ def dashboard():
 @docente_required
 def perfil():
     """Gestionar perfil del docente"""
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     form = DocenteForm(obj=docente) if docente else DocenteForm()
     
     if form.validate_on_submit():
@@ -95,29 +97,10 @@ def perfil():
         flash('Perfil actualizado exitosamente', 'success')
         return redirect(url_for('docente.perfil'))
     
-    # Obtener datos relacionados para las pestañas
-    formaciones = []
-    empleos = []
-    articulos = []
-    idiomas_list = []
-    cursos_list = []
-    proyectos_list = []
-    libros_list = []
-    congresos_list = []
-    tesis_list = []
-    desarrollos_list = []
-    
+    # Obtener datos relacionados para las pestañas (una consulta por colección)
+    colecciones = {}
     if docente:
-        formaciones = FormacionAcademica.query.filter_by(docente_id=docente.id).order_by(FormacionAcademica.fecha_fin.desc()).all()
-        empleos = Empleo.query.filter_by(docente_id=docente.id).order_by(Empleo.fecha_inicio.desc()).all()
-        articulos = Articulo.query.filter_by(docente_id=docente.id).order_by(Articulo.anio.desc()).all()
-        idiomas_list = Idioma.query.filter_by(docente_id=docente.id).all()
-        cursos_list = CursoImpartido.query.filter_by(docente_id=docente.id).all()
-        proyectos_list = ProyectoInvestigacion.query.filter_by(docente_id=docente.id).all()
-        libros_list = Libro.query.filter_by(docente_id=docente.id).all()
-        congresos_list = Congreso.query.filter_by(docente_id=docente.id).all()
-        tesis_list = TesisDirigida.query.filter_by(docente_id=docente.id).all()
-        desarrollos_list = DesarrolloTecnologico.query.filter_by(docente_id=docente.id).all()
+        colecciones = ProfileLoader().cargar(docente.id).colecciones()
     
     # Formularios para modales
     idioma_form = IdiomaForm()
@@ -131,30 +114,21 @@ def perfil():
     return render_template('docente/perfil.html', 
                           form=form, 
                           docente=docente,
-                          formaciones=formaciones,
-                          empleos=empleos,
-                          articulos=articulos,
-                          idiomas=idiomas_list,
-                          cursos=cursos_list,
-                          proyectos=proyectos_list,
-                          libros=libros_list,
-                          congresos=congresos_list,
-                          tesis=tesis_list,
-                          desarrollos=desarrollos_list,
                           idioma_form=idioma_form,
                           curso_form=curso_form,
                           proyecto_form=proyecto_form,
                           libro_form=libro_form,
                           congreso_form=congreso_form,
                           tesis_form=tesis_form,
-                          desarrollo_form=desarrollo_form)
+                          desarrollo_form=desarrollo_form,
+                          **colecciones)
 
 @docente_bp.route('/formacion', methods=['GET', 'POST'])
 @login_required
 @docente_required
 def formacion():
     """Listar y crear formación académica"""
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     if not docente:
         flash('Por favor completa tu perfil primero', 'warning')
         return redirect(url_for('docente.perfil'))
@@ -167,7 +141,7 @@ def formacion():
 @docente_required
 def nueva_formacion():
     """Crear nueva formación académica"""
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     if not docente:
         flash('Por favor completa tu perfil primero', 'warning')
         return redirect(url_for('docente.perfil'))
@@ -188,7 +162,7 @@ def nueva_formacion():
 @docente_required
 def editar_formacion(id):
     """Editar formación académica"""
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     formacion = FormacionAcademica.query.get_or_404(id)
     
     if formacion.docente_id != docente.id:
@@ -209,7 +183,7 @@ def editar_formacion(id):
 @docente_required
 def eliminar_formacion(id):
     """Eliminar formación académica"""
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     formacion = FormacionAcademica.query.get_or_404(id)
     
     if formacion.docente_id != docente.id:
@@ -226,7 +200,7 @@ def eliminar_formacion(id):
 @docente_required
 def empleos():
     """Listar empleos"""
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     if not docente:
         flash('Por favor completa tu perfil primero', 'warning')
         return redirect(url_for('docente.perfil'))
@@ -239,7 +213,7 @@ def empleos():
 @docente_required
 def nuevo_empleo():
     """Crear nuevo empleo"""
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     if not docente:
         flash('Por favor completa tu perfil primero', 'warning')
         return redirect(url_for('docente.perfil'))
@@ -260,7 +234,7 @@ def nuevo_empleo():
 @docente_required
 def editar_empleo(id):
     """Editar empleo"""
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     empleo = Empleo.query.get_or_404(id)
     
     if empleo.docente_id != docente.id:
@@ -281,7 +255,7 @@ def editar_empleo(id):
 @docente_required
 def eliminar_empleo(id):
     """Eliminar empleo"""
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     empleo = Empleo.query.get_or_404(id)
     
     if empleo.docente_id != docente.id:
@@ -298,7 +272,7 @@ def eliminar_empleo(id):
 @docente_required
 def articulos():
     """Listar artículos"""
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     if not docente:
         flash('Por favor completa tu perfil primero', 'warning')
         return redirect(url_for('docente.perfil'))
@@ -311,7 +285,7 @@ def articulos():
 @docente_required
 def nuevo_articulo():
     """Crear nuevo artículo"""
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     if not docente:
         flash('Por favor completa tu perfil primero', 'warning')
         return redirect(url_for('docente.perfil'))
@@ -332,7 +306,7 @@ def nuevo_articulo():
 @docente_required
 def editar_articulo(id):
     """Editar artículo"""
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     articulo = Articulo.query.get_or_404(id)
     
     if articulo.docente_id != docente.id:
@@ -353,7 +327,7 @@ def editar_articulo(id):
 @docente_required
 def eliminar_articulo(id):
     """Eliminar artículo"""
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     articulo = Articulo.query.get_or_404(id)
     
     if articulo.docente_id != docente.id:
@@ -372,7 +346,7 @@ def eliminar_articulo(id):
 @docente_required
 def idiomas():
     """Listar idiomas"""
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     if not docente:
         flash('Por favor completa tu perfil primero', 'warning')
         return redirect(url_for('docente.perfil'))
@@ -386,7 +360,7 @@ def idiomas():
 @docente_required
 def nuevo_idioma():
     """Crear nuevo idioma"""
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     if not docente:
         flash('Por favor completa tu perfil primero', 'warning')
         return redirect(url_for('docente.perfil'))
@@ -407,7 +381,7 @@ def nuevo_idioma():
 @docente_required
 def editar_idioma(id):
     """Editar idioma"""
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     idioma = Idioma.query.get_or_404(id)
     
     if idioma.docente_id != docente.id:
@@ -428,7 +402,7 @@ def editar_idioma(id):
 @docente_required
 def eliminar_idioma(id):
     """Eliminar idioma"""
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     idioma = Idioma.query.get_or_404(id)
     
     if idioma.docente_id != docente.id:
@@ -447,7 +421,7 @@ def eliminar_idioma(id):
 @docente_required
 def cursos():
     """Listar cursos"""
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     if not docente:
         return redirect(url_for('docente.perfil'))
     cursos_list = CursoImpartido.query.filter_by(docente_id=docente.id).all()
@@ -457,7 +431,7 @@ def cursos():
 @login_required
 @docente_required
 def nuevo_curso():
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     if not docente:
         return redirect(url_for('docente.perfil'))
     form = CursoImpartidoForm()
@@ -474,7 +448,7 @@ def nuevo_curso():
 @login_required
 @docente_required
 def editar_curso(id):
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     curso = CursoImpartido.query.get_or_404(id)
     if curso.docente_id != docente.id:
         return redirect(url_for('docente.cursos'))
@@ -490,7 +464,7 @@ def editar_curso(id):
 @login_required
 @docente_required
 def eliminar_curso(id):
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     curso = CursoImpartido.query.get_or_404(id)
     if curso.docente_id != docente.id:
         return redirect(url_for('docente.cursos'))
@@ -505,7 +479,7 @@ def eliminar_curso(id):
 @login_required
 @docente_required
 def proyectos():
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     if not docente:
         return redirect(url_for('docente.perfil'))
     proyectos_list = ProyectoInvestigacion.query.filter_by(docente_id=docente.id).all()
@@ -515,7 +489,7 @@ def proyectos():
 @login_required
 @docente_required
 def nuevo_proyecto():
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     if not docente:
         return redirect(url_for('docente.perfil'))
     form = ProyectoInvestigacionForm()
@@ -532,7 +506,7 @@ def nuevo_proyecto():
 @login_required
 @docente_required
 def editar_proyecto(id):
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     proyecto = ProyectoInvestigacion.query.get_or_404(id)
     if proyecto.docente_id != docente.id:
         return redirect(url_for('docente.proyectos'))
@@ -548,7 +522,7 @@ def editar_proyecto(id):
 @login_required
 @docente_required
 def eliminar_proyecto(id):
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     proyecto = ProyectoInvestigacion.query.get_or_404(id)
     if proyecto.docente_id != docente.id:
         return redirect(url_for('docente.proyectos'))
@@ -563,7 +537,7 @@ def eliminar_proyecto(id):
 @login_required
 @docente_required
 def libros():
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     if not docente:
         return redirect(url_for('docente.perfil'))
     libros_list = Libro.query.filter_by(docente_id=docente.id).all()
@@ -573,7 +547,7 @@ def libros():
 @login_required
 @docente_required
 def nuevo_libro():
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     if not docente:
         return redirect(url_for('docente.perfil'))
     form = LibroForm()
@@ -590,7 +564,7 @@ def nuevo_libro():
 @login_required
 @docente_required
 def editar_libro(id):
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     libro = Libro.query.get_or_404(id)
     if libro.docente_id != docente.id:
         return redirect(url_for('docente.libros'))
@@ -606,7 +580,7 @@ def editar_libro(id):
 @login_required
 @docente_required
 def eliminar_libro(id):
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     libro = Libro.query.get_or_404(id)
     if libro.docente_id != docente.id:
         return redirect(url_for('docente.libros'))
@@ -621,7 +595,7 @@ def eliminar_libro(id):
 @login_required
 @docente_required
 def congresos():
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     if not docente:
         return redirect(url_for('docente.perfil'))
     congresos_list = Congreso.query.filter_by(docente_id=docente.id).all()
@@ -631,7 +605,7 @@ def congresos():
 @login_required
 @docente_required
 def nuevo_congreso():
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     if not docente:
         return redirect(url_for('docente.perfil'))
     form = CongresoForm()
@@ -648,7 +622,7 @@ def nuevo_congreso():
 @login_required
 @docente_required
 def editar_congreso(id):
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     congreso = Congreso.query.get_or_404(id)
     if congreso.docente_id != docente.id:
         return redirect(url_for('docente.congresos'))
@@ -664,7 +638,7 @@ def editar_congreso(id):
 @login_required
 @docente_required
 def eliminar_congreso(id):
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     congreso = Congreso.query.get_or_404(id)
     if congreso.docente_id != docente.id:
         return redirect(url_for('docente.congresos'))
@@ -679,7 +653,7 @@ def eliminar_congreso(id):
 @login_required
 @docente_required
 def tesis():
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     if not docente:
         return redirect(url_for('docente.perfil'))
     tesis_list = TesisDirigida.query.filter_by(docente_id=docente.id).all()
@@ -689,7 +663,7 @@ def tesis():
 @login_required
 @docente_required
 def nueva_tesis():
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     if not docente:
         return redirect(url_for('docente.perfil'))
     form = TesisDirigidaForm()
@@ -706,7 +680,7 @@ def nueva_tesis():
 @login_required
 @docente_required
 def editar_tesis(id):
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     tesis = TesisDirigida.query.get_or_404(id)
     if tesis.docente_id != docente.id:
         return redirect(url_for('docente.tesis'))
@@ -722,7 +696,7 @@ def editar_tesis(id):
 @login_required
 @docente_required
 def eliminar_tesis(id):
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     tesis = TesisDirigida.query.get_or_404(id)
     if tesis.docente_id != docente.id:
         return redirect(url_for('docente.tesis'))
@@ -737,7 +711,7 @@ def eliminar_tesis(id):
 @login_required
 @docente_required
 def desarrollos():
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     if not docente:
         return redirect(url_for('docente.perfil'))
     desarrollos_list = DesarrolloTecnologico.query.filter_by(docente_id=docente.id).all()
@@ -747,7 +721,7 @@ def desarrollos():
 @login_required
 @docente_required
 def nuevo_desarrollo():
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     if not docente:
         return redirect(url_for('docente.perfil'))
     form = DesarrolloTecnologicoForm()
@@ -764,7 +738,7 @@ def nuevo_desarrollo():
 @login_required
 @docente_required
 def editar_desarrollo(id):
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     desarrollo = DesarrolloTecnologico.query.get_or_404(id)
     if desarrollo.docente_id != docente.id:
         return redirect(url_for('docente.desarrollos'))
@@ -780,7 +754,7 @@ def editar_desarrollo(id):
 @login_required
 @docente_required
 def eliminar_desarrollo(id):
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     desarrollo = DesarrolloTecnologico.query.get_or_404(id)
     if desarrollo.docente_id != docente.id:
         return redirect(url_for('docente.desarrollos'))
@@ -1,10 +1,10 @@
 from flask import Blueprint, render_template, flash, redirect, url_for
-from flask_login import login_required, current_user
+from flask_login import login_required
 from app import db
-from app.models.docente import Docente
 from app.models.articulo import Articulo
 from app.services.api_externa_service import APIExternaService
 from app.utils.decorators import docente_required
+from app.utils.helpers import get_current_docente
 
 sync_bp = Blueprint('sync', __name__)
 
@@ -59,7 +59,7 @@ def _agregar_publicaciones(docente, publicaciones, fuente):
 @docente_required
 def index():
     """Página principal de sincronización"""
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     return render_template('docente/sync.html', docente=docente)
 
 
@@ -68,7 +68,7 @@ def index():
 @docente_required
 def sync_orcid():
     """Sincronizar publicaciones desde ORCID"""
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     
     if not docente:
         flash('Por favor completa tu perfil primero', 'warning')
@@ -105,7 +105,7 @@ def sync_orcid():
 @docente_required
 def sync_scopus():
     """Sincronizar publicaciones desde Scopus"""
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     
     if not docente:
         flash('Por favor completa tu perfil primero', 'warning')
@@ -142,7 +142,7 @@ def sync_scopus():
 @docente_required
 def sync_pubmed():
     """Sincronizar publicaciones desde PubMed"""
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     
     if not docente:
         flash('Por favor completa tu perfil primero', 'warning')
@@ -179,7 +179,7 @@ def sync_pubmed():
 @docente_required
 def sync_todas():
     """Sincronizar publicaciones desde todas las fuentes configuradas"""
-    docente = Docente.query.filter_by(user_id=current_user.id).first()
+    docente = get_current_docente()
     
     if not docente:
         flash('Por favor completa tu perfil primero', 'warning')
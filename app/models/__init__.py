@@ -13,6 +13,8 @@ from app.models.desarrollo_tecnologico import DesarrolloTecnologico
 from app.models.actividad_general import ActividadGeneral
 from app.models.report_template import ReportTemplate
 from app.models.generated_document import GeneratedDocument
+from app.models.perfil_version import PerfilVersion
+from app.models.mensaje_chat import MensajeChat
 
 __all__ = [
     'User',
@@ -29,5 +31,7 @@ __all__ = [
     'DesarrolloTecnologico',
     'ActividadGeneral',
     'ReportTemplate',
-    'GeneratedDocument'
+    'GeneratedDocument',
+    'PerfilVersion',
+    'MensajeChat'
 ]
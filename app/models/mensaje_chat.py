@@ -0,0 +1,16 @@
+from app import db
+from datetime import datetime
+
+class MensajeChat(db.Model):
+    """Turno de la conversación de un usuario con el chatbot"""
+    __tablename__ = 'mensajes_chat'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    rol = db.Column(db.String(20), nullable=False)  # 'user' o 'assistant'
+    contenido = db.Column(db.Text, nullable=False)
+    tokens = db.Column(db.Integer, nullable=False, default=0)  # estimados al guardar
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<MensajeChat {self.user_id} {self.rol}>'
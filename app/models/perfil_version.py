@@ -0,0 +1,123 @@
+from app import db
+from datetime import datetime
+from sqlalchemy import event, inspect, literal, select
+from sqlalchemy.orm import Session, attributes
+
+
+class PerfilVersion(db.Model):
+    """Contador de cambios del perfil de un docente.
+
+    Se incrementa en el mismo flush que modifica al docente o cualquiera de sus
+    tablas hijas, de modo que ``(docente_id, version)`` identifica un estado
+    exacto del perfil (llave de las cachés de CV y del chatbot).
+    """
+    __tablename__ = 'perfil_versiones'
+
+    docente_id = db.Column(db.Integer, db.ForeignKey('docentes.id', ondelete='CASCADE'), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<PerfilVersion {self.docente_id} v{self.version}>'
+
+
+def version_perfil(docente_id):
+    """Versión actual del perfil (0 si nunca se ha modificado)"""
+    version = db.session.execute(
+        select(PerfilVersion.version).where(PerfilVersion.docente_id == docente_id)
+    ).scalar()
+    return version or 0
+
+
+# Columnas de ``User`` que forman parte del perfil (ProfileLoader las copia a la instantánea)
+COLUMNAS_USUARIO = ('id', 'email', 'role', 'created_at')
+
+
+def _docentes_afectados(session):
+    from app.models.docente import Docente
+    from app.models.user import User
+
+    afectados = set()
+    eliminados = set()
+    usuarios = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, PerfilVersion):
+            continue
+        if isinstance(obj, User):
+            # Un usuario nuevo aún no tiene docente; uno borrado se lleva al docente en cascada
+            if obj in session.dirty and any(attributes.get_history(obj, c).has_changes() for c in COLUMNAS_USUARIO):
+                usuarios.add(obj.id)
+            continue
+        if isinstance(obj, Docente):
+            if obj in session.deleted:
+                eliminados.add(obj.id)
+            elif obj not in session.new and session.is_modified(obj, include_collections=False):
+                afectados.add(obj.id)
+            continue
+        if 'docente_id' not in inspect(obj).mapper.columns:
+            continue
+        if obj in session.dirty and not session.is_modified(obj, include_collections=False):
+            continue
+        historial = attributes.get_history(obj, 'docente_id')
+        afectados.update(i for i in (*historial.unchanged, *historial.added, *historial.deleted) if i is not None)
+        if obj.docente_id is not None:
+            afectados.add(obj.docente_id)
+    if usuarios:
+        afectados.update(session.connection().execute(
+            select(Docente.id).where(Docente.user_id.in_(usuarios))
+        ).scalars())
+    return afectados - eliminados
+
+
+# Funciones que reciben los ids de docente cuyo perfil cambió, tras el commit
+_al_confirmar = []
+
+
+def al_confirmar_cambios(funcion):
+    """Registrar ``funcion(docente_ids)`` para cuando se confirme un cambio de perfil
+
+    Sirve a las cachés en memoria del proceso: solo ven los commits hechos
+    en este mismo proceso, así que además deben comparar la versión.
+    """
+    _al_confirmar.append(funcion)
+    return funcion
+
+
+@event.listens_for(Session, 'after_commit')
+def _notificar_cambios(session):
+    afectados = session.info.pop('perfiles_modificados', None)
+    if afectados:
+        for funcion in _al_confirmar:
+            funcion(afectados)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _descartar_cambios(session, transaccion_previa):
+    if transaccion_previa.parent is None:
+        session.info.pop('perfiles_modificados', None)
+
+
+@event.listens_for(Session, 'after_flush')
+def _incrementar_versiones(session, flush_context):
+    afectados = _docentes_afectados(session)
+    if not afectados:
+        return
+    session.info.setdefault('perfiles_modificados', set()).update(afectados)
+
+    from app.models.docente import Docente
+
+    tabla = PerfilVersion.__table__
+    ahora = datetime.utcnow()
+    conexion = session.connection()
+    for docente_id in sorted(afectados):
+        resultado = conexion.execute(
+            tabla.update()
+            .where(tabla.c.docente_id == docente_id)
+            .values(version=tabla.c.version + 1, updated_at=ahora)
+        )
+        if resultado.rowcount == 0:
+            # INSERT ... SELECT: no inserta nada si el docente ya no existe
+            conexion.execute(tabla.insert().from_select(
+                ['docente_id', 'version', 'updated_at'],
+                select(Docente.id, literal(1), literal(ahora)).where(Docente.id == docente_id)
+            ))
@@ -0,0 +1,175 @@
+"""Contexto del CV que el chatbot antepone a cada conversación, en caché por docente.
+
+El contexto tiene una parte fija (datos personales y totales por colección) y
+una que depende de la pregunta: los registros del CV que el índice BM25 del
+docente (``app.services.indice_perfil``) considera relevantes. Armarlo cuesta
+un SELECT por colección; con la caché, una conversación solo toca la BD en el
+primer mensaje. Una entrada es válida para ``(docente_id, version del perfil)``:
+
+* los commits de este proceso que modifican el perfil la borran al instante
+  (``perfil_version.al_confirmar_cambios``);
+* los de otros procesos se detectan al cumplirse ``CHAT_CONTEXTO_TTL``: se
+  compara la versión (una consulta por llave primaria) y solo se reconstruye
+  si cambió.
+
+El índice se guarda aparte y sobrevive a la invalidación: al reconstruir el
+contexto solo se reindexan los registros que cambiaron.
+"""
+import time
+from dataclasses import dataclass, field
+from app.models.perfil_version import al_confirmar_cambios, version_perfil
+from app.services.indice_perfil import IndicePerfil
+from app.services.profile_loader import ProfileLoader
+from app.utils.cache import TTLCache
+
+PROMPT_CONVERSACION = """Eres un asistente virtual especializado en ayudar a docentes con su CV académico.
+Tienes acceso a la siguiente información del docente:
+
+{contexto}
+
+Tu trabajo es:
+1. Responder preguntas sobre el CV del docente
+2. Ayudar a mejorar su perfil académico
+3. Proporcionar información útil sobre sus logros y trayectoria
+
+IMPORTANTE:
+- NO digas que puedes actualizar o modificar datos del perfil directamente.
+- Si el usuario quiere actualizar datos, dile que lo intente con un mensaje claro como: "Actualiza mi nombre a [nuevo nombre]"
+- Las actualizaciones de perfil son manejadas por un sistema separado, no por ti.
+- Nunca finjas que actualizaste algo si no recibiste confirmación del sistema.
+
+Sé amable, profesional y conciso en tus respuestas. Usa emojis ocasionalmente."""
+
+PROMPT_STREAMING = """Eres un asistente académico especializado.
+
+INFORMACIÓN DEL PROFESOR:
+{contexto}
+
+Responde de manera clara y profesional."""
+
+# Colección -> nombre en el resumen de totales
+TOTALES = (
+    ('articulos', 'Artículos científicos'),
+    ('libros', 'Libros y capítulos'),
+    ('congresos', 'Congresos'),
+    ('cursos', 'Cursos impartidos'),
+    ('proyectos', 'Proyectos de investigación'),
+    ('tesis', 'Tesis dirigidas'),
+    ('desarrollos', 'Desarrollos tecnológicos'),
+    ('formaciones', 'Formación académica'),
+    ('empleos', 'Empleos'),
+    ('idiomas', 'Idiomas'),
+    ('actividades', 'Otras actividades'),
+)
+
+
+@dataclass(frozen=True)
+class ContextoChat:
+    """Parte fija del contexto para una versión del perfil, más el índice de sus registros"""
+
+    docente_id: int
+    version: int
+    texto: str
+    indice: IndicePerfil
+    limite: int = 8
+    # colección -> número de registros (orden de ``TOTALES``)
+    totales: dict = field(default_factory=dict)
+
+    @classmethod
+    def desde_perfil(cls, perfil, indice=None, limite=8):
+        indice = indice or IndicePerfil(perfil.id)
+        indice.actualizar(perfil)
+        return cls(
+            docente_id=perfil.id,
+            version=perfil.version,
+            texto=construir_contexto(perfil),
+            indice=indice,
+            limite=limite,
+            totales={coleccion: len(getattr(perfil, coleccion)) for coleccion, _ in TOTALES}
+        )
+
+    def contexto_para(self, consulta):
+        """Texto fijo más los registros relevantes para ``consulta``"""
+        lineas = self.indice.buscar(consulta, self.limite)
+        if not lineas:
+            return self.texto + "\n\n(Ningún registro del CV coincide con la pregunta; los totales de arriba están completos.)"
+        return (
+            self.texto
+            + "\n\nREGISTROS DEL CV RELACIONADOS CON LA PREGUNTA (solo los más relevantes; los totales de arriba incluyen todos):\n"
+            + "\n".join(f"- {linea}" for linea in lineas)
+        )
+
+    def prompt_conversacion(self, consulta):
+        return PROMPT_CONVERSACION.format(contexto=self.contexto_para(consulta))
+
+    def prompt_streaming(self, consulta):
+        return PROMPT_STREAMING.format(contexto=self.contexto_para(consulta))
+
+
+def construir_contexto(perfil):
+    """Parte fija del contexto: datos personales y totales por colección"""
+    docente = perfil.docente
+    contexto_partes = []
+
+    contexto_partes.append("INFORMACIÓN PERSONAL:")
+    contexto_partes.append(f"- Nombre: {docente.nombre_completo or 'No especificado'}")
+    contexto_partes.append(f"- Email: {docente.correo_principal or 'No especificado'}")
+    if docente.cvu:
+        contexto_partes.append(f"- CVU: {docente.cvu}")
+    if docente.orcid:
+        contexto_partes.append(f"- ORCID: {docente.orcid}")
+
+    contexto_partes.append("\nTOTALES DEL CV:")
+    for coleccion, nombre in TOTALES:
+        contexto_partes.append(f"- {nombre}: {len(getattr(perfil, coleccion))}")
+
+    return "\n".join(contexto_partes)
+
+
+# docente_id -> (ContextoChat, momento de la última verificación de versión)
+_contextos = TTLCache(maxsize=512, ttl=None)
+# docente_id -> IndicePerfil (no se invalida: se actualiza por diferencias)
+_indices = TTLCache(maxsize=512, ttl=None)
+_config = {'ttl': 60, 'habilitada': True, 'limite': 8}
+
+
+def init_app(app):
+    """Aplicar ``CHAT_CONTEXTO_*`` de la configuración"""
+    _contextos.clear()
+    _indices.clear()
+    _contextos.configurar(maxsize=app.config.get('CHAT_CONTEXTO_CACHE_SIZE', 512))
+    _indices.configurar(maxsize=app.config.get('CHAT_CONTEXTO_CACHE_SIZE', 512))
+    _config['limite'] = app.config.get('CHAT_RECUPERACION_LIMITE', 8)
+    _config['ttl'] = app.config.get('CHAT_CONTEXTO_TTL', 60)
+    _config['habilitada'] = app.config.get('CHAT_CONTEXTO_CACHE_ENABLED', True)
+
+
+def obtener_contexto(docente_id):
+    """``ContextoChat`` vigente del docente; None si el docente no existe"""
+    ahora = time.monotonic()
+    entrada = _contextos.get(docente_id) if _config['habilitada'] else None
+    if entrada is not None:
+        contexto, verificado = entrada
+        if ahora - verificado < _config['ttl']:
+            return contexto
+        # Pasó el TTL: quizá otro proceso cambió el perfil
+        if version_perfil(docente_id) == contexto.version:
+            _contextos.set(docente_id, (contexto, ahora))
+            return contexto
+
+    perfil = ProfileLoader().cargar(docente_id)
+    if perfil is None:
+        return None
+    indice = _indices.get(docente_id) if _config['habilitada'] else None
+    contexto = ContextoChat.desde_perfil(perfil, indice, _config['limite'])
+    if _config['habilitada']:
+        _contextos.set(docente_id, (contexto, ahora))
+        _indices.set(docente_id, contexto.indice)
+    return contexto
+
+
+@al_confirmar_cambios
+def invalidar_contextos(docente_ids):
+    """Quitar de la caché el contexto de los docentes modificados"""
+    for docente_id in docente_ids:
+        _contextos.pop(docente_id)
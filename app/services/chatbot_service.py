@@ -1,67 +1,52 @@
-import os
 import re
 import json
-from groq import Groq
-from flask import current_app
+from dataclasses import dataclass
+from datetime import datetime
 from app import db
-from app.models.user import User
-from app.models.docente import Docente
-from app.models.articulo import Articulo
-from app.models.congreso import Congreso
-from app.models.curso_impartido import CursoImpartido
-from app.models.proyecto_investigacion import ProyectoInvestigacion
-from app.models.formacion_academica import FormacionAcademica
-from app.models.empleo import Empleo
+from app.services.chatbot_contexto import obtener_contexto
+from app.services.conversaciones import obtener_conversaciones
+from app.services.intenciones import CAMPOS_ACTUALIZABLES, interpretar_actualizacion
+from app.services.llm_cliente import obtener_proveedor_llm
+from app.services.planificador_llm import ColaLLMLlena, obtener_planificador
+from app.services.respuestas_chat import obtener_cache_respuestas, responder_conteo
+from app.utils.helpers import get_docente_for_user
+
+
+@dataclass(frozen=True)
+class PreparacionStream:
+    """Respuesta ya lista (``respuesta``) o los mensajes para pedirla a la IA"""
+
+    respuesta: str = None
+    cache: dict = None
+    mensajes: list = None
+    docente_id: int = None
+    version: int = None
+    primer_turno: bool = False
 
-# Campos del perfil que se pueden actualizar via chatbot
-CAMPOS_ACTUALIZABLES = {
-    'nombre': 'nombre_completo',
-    'nombre_completo': 'nombre_completo',
-    'nombre completo': 'nombre_completo',
-    'email': 'correo_principal',
-    'correo': 'correo_principal',
-    'correo_principal': 'correo_principal',
-    'correo principal': 'correo_principal',
-    'orcid': 'orcid',
-    'cvu': 'cvu',
-    'curp': 'curp',
-    'rfc': 'rfc',
-    'sexo': 'sexo',
-    'género': 'sexo',
-    'genero': 'sexo',
-    'nacionalidad': 'nacionalidad',
-    'pais_nacimiento': 'pais_nacimiento',
-    'país de nacimiento': 'pais_nacimiento',
-    'pais de nacimiento': 'pais_nacimiento',
-    'estado_civil': 'estado_civil',
-    'estado civil': 'estado_civil',
-    'domicilio': 'domicilio',
-    'direccion': 'domicilio',
-    'dirección': 'domicilio',
-    'researcher_id': 'researcher_id',
-    'scopus_author_id': 'scopus_author_id',
-    'scopus': 'scopus_author_id',
-}
 
 class ChatbotService:
     def __init__(self):
-        # Intentar obtener API key de dos formas
-        api_key = os.getenv('GROQ_API_KEY') or current_app.config.get('GROQ_API_KEY')
-        if not api_key:
-            raise ValueError("GROQ_API_KEY no está configurada")
-        
-        self.client = Groq(api_key=api_key)
-        self.model = "llama-3.3-70b-versatile"
+        # Cliente compartido por el proceso: conserva las conexiones keep-alive entre turnos
+        proveedor = obtener_proveedor_llm()
+        self.client = proveedor.cliente()
+        self.model = proveedor.modelo
+        # Turnos de llamada a la IA: tope global y cola justa por usuario
+        self.planificador = obtener_planificador()
+        # Metadata de caché de la última respuesta en streaming (None si llamó a la IA)
+        self.cache_ultima_respuesta = None
+        # Tiempos en cola y del modelo de las llamadas a la IA del último mensaje (None si no llamó)
+        self.tiempos_llm = None
     
     def generar_respuesta(self, mensaje, user_id, historial=None):
-        """Generar respuesta del chatbot"""
+        """Generar respuesta del chatbot
+
+        Sin ``historial`` explícito se usa la conversación guardada del
+        usuario (``app.services.conversaciones``) y el turno se agrega a ella.
+        """
+        self.tiempos_llm = None
         try:
-            # Obtener docente
-            user = User.query.get(user_id)
-            if not user:
-                return "Error: Usuario no encontrado"
-            
-            docente = Docente.query.filter_by(user_id=user.id).first()
+            # Obtener docente (reutiliza el de la petición actual si es el mismo usuario)
+            docente = get_docente_for_user(user_id)
             if not docente:
                 return "Por favor, completa tu perfil primero."
             
@@ -70,13 +55,31 @@ class ChatbotService:
                 return self._procesar_cv_personalizado(mensaje, docente)
             
             # 🔄 DETECTAR SOLICITUD DE ACTUALIZACIÓN DE PERFIL
-            resultado_actualizacion = self._detectar_y_procesar_actualizacion(mensaje, docente)
-            if resultado_actualizacion:
-                return resultado_actualizacion
+            respuesta = self._detectar_y_procesar_actualizacion(mensaje, docente)
+            cache = None
+            if not respuesta:
+                # 📊 Conteos y preguntas repetidas se contestan sin llamar a la IA
+                respuesta, cache = self._respuesta_sin_modelo(mensaje, docente, 'conversacion')
+            if not respuesta:
+                # Respuesta conversacional normal (la versión se toma antes de la llamada)
+                version = obtener_contexto(docente.id).version
+                primer_turno = not (obtener_conversaciones().historial(user_id) if historial is None else historial)
+                respuesta = self._generar_respuesta_conversacional(mensaje, docente, historial)
+                if primer_turno:
+                    obtener_cache_respuestas().guardar(docente.id, version, 'conversacion', mensaje, respuesta)
             
-            # Respuesta conversacional normal
-            return self._generar_respuesta_conversacional(mensaje, docente, historial)
+            if historial is None:
+                obtener_conversaciones().agregar_turno(user_id, mensaje, respuesta)
+            if cache is not None:
+                # Misma forma que una respuesta del modelo, sin tiempos de la IA
+                return {
+                    'respuesta': respuesta,
+                    'metadata': {'timestamp': datetime.now().isoformat(), 'error': False, 'cache': cache, 'llm': None}
+                }
+            return respuesta
             
+        except ColaLLMLlena as e:
+            return f"⏳ {str(e)}"
         except Exception as e:
             print(f"Error en ChatbotService: {str(e)}")
             import traceback
@@ -95,12 +98,17 @@ class ChatbotService:
             print(f"🎨 Generando CV personalizado - Plantilla: {plantilla}")
             print(f"📋 Secciones seleccionadas: {secciones}")
             
-            # Generar PDF
-            from app.services.cv_pdf_generator import CVPDFGenerator
-            generator = CVPDFGenerator()
-            pdf_filename = generator.generar_pdf(docente, secciones, plantilla)
+            # Encolar el PDF en los procesos de render; el chat consulta su estado antes de descargar
+            # y el resultado se conserva en el almacén para que el enlace no caduque con el trabajo
+            from app.services.render_jobs import LimiteTrabajosExcedido, obtener_gestor
+            try:
+                trabajo = obtener_gestor().enviar_cv_plantilla(
+                    docente.user_id, docente, secciones, plantilla, persistir=True
+                )
+            except LimiteTrabajosExcedido as e:
+                return f"⏳ {str(e)}"
             
-            print(f"✅ PDF generado: {pdf_filename}")
+            print(f"✅ Trabajo de render: {trabajo.id} ({trabajo.estado})")
             
             # Construir respuesta
             respuesta = f"""✅ ¡Perfecto! He generado tu CV en formato **{plantilla.upper()}**.
@@ -127,7 +135,7 @@ class ChatbotService:
                     respuesta += f"✓ {secciones_nombres.get(key, key)}\n"
             
             respuesta += f"""
-📥 **[Haz clic aquí para descargar tu CV](/static/pdfs/{pdf_filename})**
+📥 **[Haz clic aquí para descargar tu CV](/cv/trabajos/{trabajo.id}/descarga)**
 
 💡 **Tip:** Puedes generar otro CV con diferentes opciones cuando quieras.
 """
@@ -142,6 +150,13 @@ class ChatbotService:
     
     def _detectar_y_procesar_actualizacion(self, mensaje, docente):
         """Detectar si el mensaje solicita actualizar el perfil y procesarlo"""
+        # Las frases habituales ("mi orcid es X", "actualiza mi correo a Y") se
+        # interpretan localmente, sin llamar a la IA
+        datos_a_actualizar = interpretar_actualizacion(mensaje)
+        if datos_a_actualizar is not None:
+            print(f"⚡ Actualización interpretada localmente: {datos_a_actualizar}")
+            return self._ejecutar_actualizacion(docente, datos_a_actualizar)
+        
         mensaje_lower = mensaje.lower()
         
         # Palabras clave que indican intención de actualizar
@@ -160,7 +175,7 @@ class ChatbotService:
         
         print(f"🔄 Detectada solicitud de actualización: {mensaje}")
         
-        # Usar la IA para extraer los datos a actualizar
+        # Mensaje ambiguo: usar la IA para extraer los datos a actualizar
         datos_a_actualizar = self._extraer_datos_actualizacion(mensaje, docente)
         
         if not datos_a_actualizar:
@@ -213,7 +228,8 @@ O para múltiples campos:
 Responde SOLO con el JSON, sin explicaciones ni texto adicional."""
 
         try:
-            response = self.client.chat.completions.create(
+            response = self._llamar_ia(
+                docente.user_id,
                 messages=[
                     {"role": "system", "content": "Eres un extractor de datos. Solo respondes en JSON válido."},
                     {"role": "user", "content": prompt_extraccion}
@@ -312,36 +328,50 @@ Responde SOLO con el JSON, sin explicaciones ni texto adicional."""
             traceback.print_exc()
             return f"❌ Error al actualizar el perfil: {str(e)}"
     
+    def _respuesta_sin_modelo(self, mensaje, docente, tipo_prompt):
+        """``(respuesta, metadata de caché)`` si no hace falta la IA; ``(None, None)`` si sí"""
+        contexto = obtener_contexto(docente.id)
+        conteo = responder_conteo(mensaje, contexto)
+        if conteo:
+            return conteo, {'tipo': 'calculada'}
+        guardada = obtener_cache_respuestas().buscar(docente.id, contexto.version, tipo_prompt, mensaje)
+        if guardada:
+            return guardada
+        return None, None
+    
+    @staticmethod
+    def _consulta_recuperacion(mensaje, preguntas_anteriores):
+        """Texto con el que se buscan los registros del CV relevantes
+
+        Incluye la pregunta anterior para que un seguimiento como "¿y el más
+        reciente?" recupere lo mismo que la pregunta que continúa.
+        """
+        if preguntas_anteriores:
+            return f"{preguntas_anteriores[-1]} {mensaje}"
+        return mensaje
+    
     def _generar_respuesta_conversacional(self, mensaje, docente, historial=None):
         """Generar respuesta conversacional normal"""
-        contexto = self._construir_contexto_cv(docente)
-        
-        system_message = f"""Eres un asistente virtual especializado en ayudar a docentes con su CV académico.
-Tienes acceso a la siguiente información del docente:
-
-{contexto}
-
-Tu trabajo es:
-1. Responder preguntas sobre el CV del docente
-2. Ayudar a mejorar su perfil académico
-3. Proporcionar información útil sobre sus logros y trayectoria
+        if historial is None:
+            conversaciones = obtener_conversaciones()
+            anteriores = [contenido for rol, contenido, _ in conversaciones.historial(docente.user_id) if rol == 'user']
+        else:
+            anteriores = [m['content'] for m in historial if m.get('role') == 'user']
 
-IMPORTANTE: 
-- NO digas que puedes actualizar o modificar datos del perfil directamente.
-- Si el usuario quiere actualizar datos, dile que lo intente con un mensaje claro como: "Actualiza mi nombre a [nuevo nombre]"
-- Las actualizaciones de perfil son manejadas por un sistema separado, no por ti.
-- Nunca finjas que actualizaste algo si no recibiste confirmación del sistema.
+        # Contexto de la versión actual del perfil (caché por docente) con solo
+        # los registros relevantes para la pregunta
+        consulta = self._consulta_recuperacion(mensaje, anteriores)
+        system_message = obtener_contexto(docente.id).prompt_conversacion(consulta)
 
-Sé amable, profesional y conciso en tus respuestas. Usa emojis ocasionalmente."""
-
-        messages = [{"role": "system", "content": system_message}]
-        
-        if historial:
-            messages.extend(historial)
-        
-        messages.append({"role": "user", "content": mensaje})
+        if historial is None:
+            # Conversación guardada, recortada al presupuesto de tokens
+            messages = conversaciones.mensajes_para_prompt(docente.user_id, system_message, mensaje)
+        else:
+            messages = [{"role": "system", "content": system_message}, *historial,
+                        {"role": "user", "content": mensaje}]
         
-        chat_completion = self.client.chat.completions.create(
+        chat_completion = self._llamar_ia(
+            docente.user_id,
             messages=messages,
             model=self.model,
             temperature=0.7,
@@ -352,98 +382,92 @@ Sé amable, profesional y conciso en tus respuestas. Usa emojis ocasionalmente."
         
         return chat_completion.choices[0].message.content
     
-    def _construir_contexto_cv(self, docente):
-        """Construir contexto con información del CV"""
-        contexto_partes = []
-        
-        contexto_partes.append(f"INFORMACIÓN PERSONAL:")
-        contexto_partes.append(f"- Nombre: {docente.nombre_completo or 'No especificado'}")
-        contexto_partes.append(f"- Email: {docente.correo_principal or 'No especificado'}")
-        if docente.cvu:
-            contexto_partes.append(f"- CVU: {docente.cvu}")
-        if docente.orcid:
-            contexto_partes.append(f"- ORCID: {docente.orcid}")
-        
-        # Artículos
-        articulos = Articulo.query.filter_by(docente_id=docente.id).order_by(Articulo.anio.desc()).limit(10).all()
-        if articulos:
-            contexto_partes.append(f"\nARTÍCULOS CIENTÍFICOS ({len(articulos)} más recientes):")
-            for art in articulos:
-                contexto_partes.append(f"- {art.titulo} ({art.anio})")
-            
-            total_articulos = Articulo.query.filter_by(docente_id=docente.id).count()
-            contexto_partes.append(f"\nTotal de artículos: {total_articulos}")
-        
-        # Formación
-        formaciones = FormacionAcademica.query.filter_by(docente_id=docente.id).all()
-        if formaciones:
-            contexto_partes.append(f"\nFORMACIÓN ACADÉMICA:")
-            for form in formaciones[:3]:
-                contexto_partes.append(f"- {form.nivel or 'N/A'}: {form.grado_obtenido or 'Sin título'}")
-        
-        # Empleos
-        empleos = Empleo.query.filter_by(docente_id=docente.id).order_by(Empleo.fecha_inicio.desc()).limit(3).all()
-        if empleos:
-            contexto_partes.append(f"\nEXPERIENCIA LABORAL:")
-            for emp in empleos:
-                contexto_partes.append(f"- {emp.puesto or 'Sin puesto'} en {emp.institucion or 'Sin institución'}")
-        
-        # Congresos
-        congresos = Congreso.query.filter_by(docente_id=docente.id).order_by(Congreso.fecha.desc()).limit(5).all()
-        if congresos:
-            contexto_partes.append(f"\nCONGRESOS:")
-            for cong in congresos:
-                contexto_partes.append(f"- {cong.nombre_congreso}")
+    def _llamar_ia(self, usuario_id, **parametros):
+        """``chat.completions.create`` en un turno del planificador de ``usuario_id``"""
+        respuesta, turno = self.planificador.llamar(
+            usuario_id, lambda: self.client.chat.completions.create(**parametros)
+        )
+        self._sumar_tiempos(turno)
+        return respuesta
+
+    def _sumar_tiempos(self, turno):
+        tiempos = turno.tiempos()
+        if self.tiempos_llm:
+            tiempos = {clave: round(self.tiempos_llm[clave] + valor, 1) for clave, valor in tiempos.items()}
+        self.tiempos_llm = tiempos
+
+    def preparar_streaming(self, pregunta, usuario_id):
+        """Todo lo que necesita una respuesta en streaming antes de llamar a la IA
+
+        Compartido por ``generar_respuesta_streaming`` y el streaming ASGI
+        (``app.chat_asgi``), que llama a la IA con el cliente asíncrono.
+        """
+        docente = get_docente_for_user(usuario_id)
         
-        # Cursos
-        cursos = CursoImpartido.query.filter_by(docente_id=docente.id).limit(5).all()
-        if cursos:
-            contexto_partes.append(f"\nCURSOS IMPARTIDOS:")
-            for curso in cursos:
-                contexto_partes.append(f"- {curso.nombre_curso}")
+        if not docente:
+            return PreparacionStream(respuesta="Por favor, completa tu perfil primero.")
         
-        # Proyectos
-        proyectos = ProyectoInvestigacion.query.filter_by(docente_id=docente.id).all()
-        if proyectos:
-            contexto_partes.append(f"\nPROYECTOS DE INVESTIGACIÓN:")
-            for proy in proyectos:
-                contexto_partes.append(f"- {proy.nombre_proyecto}")
+        conversaciones = obtener_conversaciones()
+        respuesta, cache = self._respuesta_sin_modelo(pregunta, docente, 'streaming')
+        if respuesta:
+            conversaciones.agregar_turno(usuario_id, pregunta, respuesta)
+            return PreparacionStream(respuesta=respuesta, cache=cache)
         
-        return "\n".join(contexto_partes)
+        contexto = obtener_contexto(docente.id)
+        historial = conversaciones.historial(usuario_id)
+        anteriores = [contenido for rol, contenido, _ in historial if rol == 'user']
+        system_prompt = contexto.prompt_streaming(self._consulta_recuperacion(pregunta, anteriores))
+        return PreparacionStream(
+            mensajes=conversaciones.mensajes_para_prompt(usuario_id, system_prompt, pregunta),
+            docente_id=docente.id,
+            version=contexto.version,
+            primer_turno=not historial
+        )
+    
+    def parametros_streaming(self, preparacion):
+        """Argumentos de ``chat.completions.create`` para una respuesta en streaming"""
+        return {
+            'messages': preparacion.mensajes,
+            'model': self.model,
+            'temperature': 0.7,
+            'max_tokens': 1024,
+            'stream': True
+        }
+    
+    def completar_streaming(self, pregunta, usuario_id, preparacion, respuesta):
+        """Guardar una respuesta en streaming que terminó completa"""
+        # Solo las respuestas completas pasan a la conversación, y a la caché si no hubo historial
+        obtener_conversaciones().agregar_turno(usuario_id, pregunta, respuesta)
+        if preparacion.primer_turno:
+            obtener_cache_respuestas().guardar(
+                preparacion.docente_id, preparacion.version, 'streaming', pregunta, respuesta
+            )
     
     def generar_respuesta_streaming(self, pregunta: str, usuario_id: int):
         """Generar respuesta en modo streaming (para efecto de escritura)"""
-        user = User.query.get(usuario_id)
-        docente = Docente.query.filter_by(user_id=usuario_id).first()
-        
-        if not docente:
-            yield "Por favor, completa tu perfil primero."
+        preparacion = self.preparar_streaming(pregunta, usuario_id)
+        self.cache_ultima_respuesta = preparacion.cache
+        self.tiempos_llm = None
+        if preparacion.respuesta is not None:
+            yield preparacion.respuesta
             return
-        
-        contexto = self._construir_contexto_cv(docente)
-        
-        system_prompt = f"""Eres un asistente académico especializado.
-
-INFORMACIÓN DEL PROFESOR:
-{contexto}
-
-Responde de manera clara y profesional."""
 
         try:
-            stream = self.client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": pregunta}
-                ],
-                model=self.model,
-                temperature=0.7,
-                max_tokens=1024,
-                stream=True
-            )
+            # El turno dura todo el stream: el modelo sigue generando mientras se lee
+            with self.planificador.turno(usuario_id) as turno:
+                parametros = self.parametros_streaming(preparacion)
+                stream = turno.llamar(lambda: self.client.chat.completions.create(**parametros))
+                
+                partes = []
+                for chunk in stream:
+                    if chunk.choices[0].delta.content:
+                        partes.append(chunk.choices[0].delta.content)
+                        yield chunk.choices[0].delta.content
             
-            for chunk in stream:
-                if chunk.choices[0].delta.content:
-                    yield chunk.choices[0].delta.content
+            self._sumar_tiempos(turno)
+            self.completar_streaming(pregunta, usuario_id, preparacion, ''.join(partes))
                     
+        except ColaLLMLlena as e:
+            yield f"⏳ {str(e)}"
         except Exception as e:
-            yield f"Error: {str(e)}"
\ No newline at end of file
+            yield f"Error: {str(e)}"
@@ -0,0 +1,338 @@
+"""Combinación de correspondencia sobre plantillas DOCX (``ReportTemplate``).
+
+Una plantilla es un DOCX con campos ``{{ nombre_campo }}`` en el cuerpo,
+tablas, encabezados o pies (ver ``CAMPOS``). Se analiza una sola vez:
+``compilar`` junta los campos que Word partió entre varios ``<w:r>`` y
+divide cada parte XML en trozos literales y campos. Rellenarla para un
+docente es unir cadenas y escribir el ZIP copiando tal cual imágenes,
+estilos y demás miembros, sin volver a abrir el documento.
+"""
+import io
+import json
+import os
+import re
+import struct
+import uuid
+import zipfile
+import zlib
+from dataclasses import dataclass, field
+from datetime import date
+from functools import lru_cache
+from xml.sax.saxutils import escape
+from docx import Document
+from flask import current_app
+from app import db
+from app.models.generated_document import GeneratedDocument
+from app.models.report_template import ReportTemplate
+from app.services.profile_loader import ProfileLoader
+
+_CAMPO = re.compile(r'\{\{\s*([\w.]+)\s*\}\}')
+
+# Partes del DOCX donde se buscan campos
+_PARTE_CON_CAMPOS = re.compile(r'^word/(document|header\d*|footer\d*)\.xml$')
+
+_PRIORIDAD_NIVEL = {'doctorado': 4, 'maestria': 3, 'especialidad': 2, 'licenciatura': 1}
+
+
+def _texto(valor):
+    if valor is None:
+        return ''
+    if isinstance(valor, date):
+        return valor.strftime('%d/%m/%Y')
+    return str(valor)
+
+
+def _empleo_actual(perfil):
+    return next((e for e in perfil.empleos if e.actual), None)
+
+
+def _grado_maximo(perfil):
+    if not perfil.formaciones:
+        return None
+    return max(perfil.formaciones, key=lambda f: _PRIORIDAD_NIVEL.get(f.nivel, 0))
+
+
+def _de_empleo(columna):
+    return lambda perfil: getattr(_empleo_actual(perfil), columna, None)
+
+
+def _de_grado(columna):
+    return lambda perfil: getattr(_grado_maximo(perfil), columna, None)
+
+
+def _del_docente(columna):
+    return lambda perfil: getattr(perfil.docente, columna)
+
+
+# Campos disponibles en las plantillas: nombre -> función(PerfilDocente)
+CAMPOS = {
+    **{columna: _del_docente(columna) for columna in (
+        'nombre_completo', 'cvu', 'curp', 'rfc', 'sexo', 'fecha_nacimiento', 'pais_nacimiento',
+        'nacionalidad', 'correo_principal', 'orcid', 'researcher_id', 'domicilio',
+    )},
+    'puesto_actual': _de_empleo('puesto'),
+    'institucion_actual': _de_empleo('institucion'),
+    'area_adscripcion': _de_empleo('area_adscripcion'),
+    'grado_maximo': _de_grado('grado_obtenido'),
+    'nivel_maximo': _de_grado('nivel'),
+    'institucion_grado': _de_grado('institucion'),
+    'total_articulos': lambda perfil: len(perfil.articulos),
+    'total_libros': lambda perfil: len(perfil.libros),
+    'total_congresos': lambda perfil: len(perfil.congresos),
+    'total_cursos': lambda perfil: len(perfil.cursos),
+    'total_proyectos': lambda perfil: len(perfil.proyectos),
+    'total_tesis': lambda perfil: len(perfil.tesis),
+    'fecha': lambda perfil: date.today(),
+}
+
+# Colecciones de ``ProfileLoader`` que necesitan los campos
+COLECCIONES = ('empleos', 'formaciones', 'articulos', 'libros', 'congresos', 'cursos', 'proyectos', 'tesis')
+
+
+def valores_campos(perfil, campos):
+    """Texto de cada campo para un docente"""
+    return {campo: _texto(CAMPOS[campo](perfil)) for campo in campos}
+
+
+# ----------------------------------------------------------------------
+# Plantillas compiladas
+# ----------------------------------------------------------------------
+_CABECERA_LOCAL = struct.Struct('<IHHHHHIIIHH')
+_CABECERA_CENTRAL = struct.Struct('<IHHHHHHIIIHHHHHII')
+_FIN_DIRECTORIO = struct.Struct('<IHHHHIIH')
+
+
+def _comprimir(datos):
+    compresor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    return compresor.compress(datos) + compresor.flush()
+
+
+@dataclass(frozen=True)
+class _Miembro:
+    """Miembro del ZIP con sus datos ya comprimidos"""
+
+    nombre: bytes
+    fecha: tuple  # (hora, fecha) en formato MS-DOS
+    crc: int
+    tamano: int
+    comprimido: bytes
+
+    @classmethod
+    def desde(cls, info, datos):
+        anio, mes, dia, hora, minuto, segundo = info.date_time
+        fecha = ((hora << 11) | (minuto << 5) | (segundo // 2), ((anio - 1980) << 9) | (mes << 5) | dia)
+        return cls(info.filename.encode('utf-8'), fecha, zlib.crc32(datos), len(datos), _comprimir(datos))
+
+    def local(self):
+        return _CABECERA_LOCAL.pack(
+            0x04034b50, 20, 0x800, zipfile.ZIP_DEFLATED, *self.fecha,
+            self.crc, len(self.comprimido), self.tamano, len(self.nombre), 0
+        ) + self.nombre + self.comprimido
+
+    def central(self, desplazamiento):
+        return _CABECERA_CENTRAL.pack(
+            0x02014b50, 20, 20, 0x800, zipfile.ZIP_DEFLATED, *self.fecha,
+            self.crc, len(self.comprimido), self.tamano, len(self.nombre), 0, 0, 0, 0, 0, desplazamiento
+        ) + self.nombre
+
+
+@dataclass(frozen=True)
+class PlantillaCompilada:
+    """DOCX analizado: trozos de cada parte con campos y los demás miembros ya comprimidos"""
+
+    campos: frozenset
+    # ``_Miembro`` para los miembros fijos; (ZipInfo, trozos) para las partes con
+    # campos, donde los trozos alternan texto literal (pares) y nombre de campo
+    miembros: tuple = field(repr=False)
+
+    def rellenar(self, valores):
+        """Bytes del DOCX con los campos sustituidos (los que falten quedan vacíos)
+
+        El ZIP se arma a mano: los miembros fijos se copian ya comprimidos y
+        solo se comprimen las partes que cambian. Con ``zipfile`` cada
+        documento volvía a comprimir estilos, tema y fuentes.
+        """
+        escapados = {campo: escape(valores.get(campo, '')) for campo in self.campos}
+        locales = []
+        centrales = []
+        desplazamiento = 0
+        for miembro in self.miembros:
+            if not isinstance(miembro, _Miembro):
+                info, trozos = miembro
+                texto = ''.join(escapados[trozo] if indice % 2 else trozo for indice, trozo in enumerate(trozos))
+                miembro = _Miembro.desde(info, texto.encode('utf-8'))
+            local = miembro.local()
+            locales.append(local)
+            centrales.append(miembro.central(desplazamiento))
+            desplazamiento += len(local)
+
+        directorio = b''.join(centrales)
+        fin = _FIN_DIRECTORIO.pack(0x06054b50, 0, 0, len(centrales), len(centrales),
+                                   len(directorio), desplazamiento, 0)
+        return b''.join(locales) + directorio + fin
+
+
+def _parrafos(documento):
+    """Párrafos del cuerpo, tablas (anidadas), encabezados y pies"""
+    def de_contenedor(contenedor):
+        yield from contenedor.paragraphs
+        for tabla in contenedor.tables:
+            for fila in tabla.rows:
+                for celda in fila.cells:
+                    yield from de_contenedor(celda)
+
+    yield from de_contenedor(documento)
+    for seccion in documento.sections:
+        for parte in (seccion.header, seccion.first_page_header, seccion.even_page_header,
+                      seccion.footer, seccion.first_page_footer, seccion.even_page_footer):
+            if not parte.is_linked_to_previous:
+                yield from de_contenedor(parte)
+
+
+def _unir_campos_partidos(parrafo):
+    """Dejar cada ``{{ campo }}`` dentro de un solo run (Word suele partirlos)"""
+    runs = parrafo.runs
+    textos = [run.text for run in runs]
+    inicios = []
+    posicion = 0
+    for texto in textos:
+        inicios.append(posicion)
+        posicion += len(texto)
+
+    def run_en(caracter):
+        return max(i for i, inicio in enumerate(inicios) if inicio <= caracter and textos[i])
+
+    # De atrás hacia adelante para que las posiciones anteriores sigan valiendo
+    for coincidencia in reversed(list(_CAMPO.finditer(''.join(textos)))):
+        inicio, fin = coincidencia.span()
+        primero, ultimo = run_en(inicio), run_en(fin - 1)
+        if primero == ultimo:
+            continue
+        textos[primero] = textos[primero][:inicio - inicios[primero]] + coincidencia.group(0)
+        for intermedio in range(primero + 1, ultimo):
+            textos[intermedio] = ''
+        textos[ultimo] = textos[ultimo][fin - inicios[ultimo]:]
+        for indice in range(primero, ultimo + 1):
+            runs[indice].text = textos[indice]
+
+
+def compilar(datos):
+    """Analizar los bytes de un DOCX y devolver su ``PlantillaCompilada``"""
+    documento = Document(io.BytesIO(datos))
+    for parrafo in _parrafos(documento):
+        if '{{' in parrafo.text:
+            _unir_campos_partidos(parrafo)
+    normalizado = io.BytesIO()
+    documento.save(normalizado)
+
+    campos = set()
+    miembros = []
+    with zipfile.ZipFile(normalizado) as archivo:
+        for info in archivo.infolist():
+            contenido = archivo.read(info)
+            if _PARTE_CON_CAMPOS.match(info.filename):
+                trozos = tuple(_CAMPO.split(contenido.decode('utf-8')))
+                if len(trozos) > 1:
+                    campos.update(trozos[1::2])
+                    miembros.append((info, trozos))
+                    continue
+            miembros.append(_Miembro.desde(info, contenido))
+    return PlantillaCompilada(frozenset(campos), tuple(miembros))
+
+
+@lru_cache(maxsize=16)
+def _compilada(ruta, firma):
+    with open(ruta, 'rb') as f:
+        return compilar(f.read())
+
+
+def plantilla_compilada(ruta):
+    """Plantilla compilada del archivo, reanalizada solo si el archivo cambia
+
+    La caché es por proceso: en el pool de render cada proceso analiza una
+    plantilla una vez y la reutiliza para todos los docentes que le tocan.
+    """
+    estado = os.stat(ruta)
+    return _compilada(ruta, (estado.st_mtime_ns, estado.st_size))
+
+
+# ----------------------------------------------------------------------
+# Registro y combinación
+# ----------------------------------------------------------------------
+class CampoDesconocido(ValueError):
+    """La plantilla usa campos que no están en ``CAMPOS``"""
+
+
+def registrar_plantilla(nombre, datos, uploaded_by=None):
+    """Guardar un DOCX como ``ReportTemplate`` tras validar sus campos"""
+    compilada = compilar(datos)
+    desconocidos = sorted(compilada.campos - CAMPOS.keys())
+    if desconocidos:
+        raise CampoDesconocido(f'Campos no soportados: {", ".join(desconocidos)}')
+
+    directorio = current_app.config['PLANTILLAS_DIR']
+    os.makedirs(directorio, exist_ok=True)
+    ruta = os.path.join(directorio, f'{uuid.uuid4().hex}.docx')
+    with open(ruta, 'wb') as f:
+        f.write(datos)
+
+    plantilla = ReportTemplate(
+        name=nombre,
+        file_path=ruta,
+        required_fields=json.dumps(sorted(compilada.campos)),
+        uploaded_by=uploaded_by
+    )
+    db.session.add(plantilla)
+    db.session.commit()
+    return plantilla
+
+
+@dataclass
+class ResultadoCombinacion:
+    documentos: list = field(default_factory=list)  # ids de GeneratedDocument
+    errores: list = field(default_factory=list)  # (docente_id, mensaje)
+
+
+class Combinador:
+    """Rellenar una plantilla para muchos docentes en el pool de render.
+
+    Los valores se calculan en el proceso web (lotes de ``ProfileLoader``);
+    a los procesos del pool solo viajan la ruta de la plantilla y un dict de
+    textos por docente. Cada documento se guarda en el almacén de documentos
+    y queda registrado como ``GeneratedDocument``.
+    """
+
+    def __init__(self, gestor, almacen, tamano_lote=50):
+        self.gestor = gestor
+        self.almacen = almacen
+        self.tamano_lote = tamano_lote
+        self.loader = ProfileLoader(COLECCIONES)
+
+    def combinar(self, plantilla, docente_ids):
+        campos = json.loads(plantilla.required_fields or '[]')
+        plantilla_compilada(plantilla.file_path)  # falla aquí, y no N veces, si el archivo no existe
+        resultado = ResultadoCombinacion()
+        docente_ids = list(docente_ids)
+
+        for inicio in range(0, len(docente_ids), self.tamano_lote):
+            perfiles = self.loader.cargar_varios(docente_ids[inicio:inicio + self.tamano_lote])
+            tareas = [
+                ((perfil.id, perfil.docente.user_id),
+                 {'tipo': 'combinacion', 'ruta': plantilla.file_path, 'valores': valores_campos(perfil, campos)})
+                for perfil in perfiles.values()
+            ]
+            nuevos = []
+            for (docente_id, user_id), datos, error in self.gestor.mapear(tareas):
+                if error is not None:
+                    resultado.errores.append((docente_id, error))
+                    continue
+                ruta = self.almacen.guardar(docente_id, uuid.uuid4().hex, 'docx', datos)
+                nuevos.append(GeneratedDocument(
+                    template_id=plantilla.id,
+                    target_user_id=user_id,
+                    generated_file_path=ruta
+                ))
+            db.session.add_all(nuevos)
+            db.session.commit()
+            resultado.documentos.extend(documento.id for documento in nuevos)
+        return resultado
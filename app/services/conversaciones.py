@@ -0,0 +1,135 @@
+"""Memoria de las conversaciones del chatbot, guardada en el servidor.
+
+Cada turno se guarda en ``mensajes_chat``, que conserva solo los últimos
+``max_mensajes`` de cada usuario (lo único que el historial llega a leer);
+esos mismos se guardan además en una ``TTLCache`` del proceso, de modo
+que un turno normalmente no lee la conversación de la BD. Antes de llamar
+al modelo, ``mensajes_para_prompt`` recorta el historial (de lo más nuevo a
+lo más viejo) para que el prompt completo quepa en ``CHAT_PRESUPUESTO_TOKENS``:
+el tamaño y el costo de cada llamada no crecen con la conversación.
+"""
+import math
+from flask import current_app
+from sqlalchemy import delete, select
+from app import db
+from app.models.mensaje_chat import MensajeChat
+from app.utils.cache import TTLCache
+
+# Tokens que agrega la API por mensaje (rol y separadores)
+TOKENS_POR_MENSAJE = 4
+
+
+def estimar_tokens(texto):
+    """Tokens aproximados de un texto
+
+    No hay tokenizador del modelo en el servidor; con 3.5 caracteres por
+    token la estimación queda un poco por encima de lo real en español, así
+    que el presupuesto no se excede.
+    """
+    return math.ceil(len(texto or '') / 3.5) + TOKENS_POR_MENSAJE
+
+
+class AlmacenConversaciones:
+    """Turnos de cada usuario en SQLite, con los recientes en memoria.
+
+    La caché en memoria es por proceso; su ``ttl`` acota cuánto tarda un
+    proceso en ver los turnos que otro proceso guardó para el mismo usuario.
+    """
+
+    def __init__(self, max_mensajes=50, presupuesto_tokens=4000, cache_size=1024, ttl=60):
+        self.max_mensajes = max_mensajes
+        self.presupuesto_tokens = presupuesto_tokens
+        self._recientes = TTLCache(maxsize=cache_size, ttl=ttl)
+
+    def historial(self, user_id):
+        """Últimos ``max_mensajes`` turnos del usuario como tupla de ``(rol, contenido, tokens)``"""
+        turnos = self._recientes.get(user_id)
+        if turnos is None:
+            filas = db.session.execute(
+                select(MensajeChat.rol, MensajeChat.contenido, MensajeChat.tokens)
+                .where(MensajeChat.user_id == user_id)
+                .order_by(MensajeChat.id.desc())
+                .limit(self.max_mensajes)
+            ).all()
+            turnos = tuple((fila.rol, fila.contenido, fila.tokens) for fila in reversed(filas))
+            self._recientes.set(user_id, turnos)
+        return turnos
+
+    def agregar_turno(self, user_id, pregunta, respuesta):
+        """Guardar la pregunta del usuario y la respuesta del asistente
+
+        En la misma transacción borra los mensajes del usuario anteriores a
+        los últimos ``max_mensajes``, así la tabla no crece con la conversación.
+        """
+        nuevos = [('user', pregunta, estimar_tokens(pregunta)),
+                  ('assistant', respuesta, estimar_tokens(respuesta))]
+        turnos = self.historial(user_id)
+        db.session.add_all([
+            MensajeChat(user_id=user_id, rol=rol, contenido=contenido, tokens=tokens)
+            for rol, contenido, tokens in nuevos
+        ])
+        db.session.flush()
+        # Id del mensaje más viejo que se conserva; lo anterior ya no se lee
+        corte = db.session.execute(
+            select(MensajeChat.id)
+            .where(MensajeChat.user_id == user_id)
+            .order_by(MensajeChat.id.desc())
+            .offset(self.max_mensajes - 1)
+            .limit(1)
+        ).scalar()
+        if corte is not None:
+            db.session.execute(
+                delete(MensajeChat).where(MensajeChat.user_id == user_id, MensajeChat.id < corte)
+            )
+        db.session.commit()
+        self._recientes.set(user_id, (turnos + tuple(nuevos))[-self.max_mensajes:])
+
+    def limpiar(self, user_id):
+        """Borrar la conversación del usuario"""
+        db.session.execute(delete(MensajeChat).where(MensajeChat.user_id == user_id))
+        db.session.commit()
+        self._recientes.pop(user_id)
+
+    def mensajes_para_prompt(self, user_id, system_prompt, pregunta):
+        """Mensajes para la API: sistema, el historial que cabe en el presupuesto y la pregunta
+
+        Los turnos se toman del más nuevo al más viejo y se detiene en el
+        primero que no cabe, para no dejar huecos en la conversación. Si se
+        omitió algo, el prompt de sistema lo indica.
+        """
+        disponible = self.presupuesto_tokens - estimar_tokens(system_prompt) - estimar_tokens(pregunta)
+        turnos = self.historial(user_id)
+        incluidos = []
+        for rol, contenido, tokens in reversed(turnos):
+            if tokens > disponible:
+                break
+            disponible -= tokens
+            incluidos.append({'role': rol, 'content': contenido})
+        incluidos.reverse()
+        # La conversación debe empezar con un turno del usuario
+        if incluidos and incluidos[0]['role'] == 'assistant':
+            incluidos.pop(0)
+
+        if len(incluidos) < len(turnos):
+            system_prompt += (
+                "\n\n(Se omitieron los mensajes más antiguos de esta conversación; "
+                "si el usuario se refiere a ellos, pídele que repita los detalles.)"
+            )
+        return [{'role': 'system', 'content': system_prompt}, *incluidos, {'role': 'user', 'content': pregunta}]
+
+
+def init_app(app):
+    """Crear el almacén de conversaciones según ``CHAT_*``"""
+    almacen = AlmacenConversaciones(
+        max_mensajes=app.config.get('CHAT_HISTORIAL_MAX_MENSAJES', 50),
+        presupuesto_tokens=app.config.get('CHAT_PRESUPUESTO_TOKENS', 4000),
+        cache_size=app.config.get('CHAT_HISTORIAL_CACHE_SIZE', 1024),
+        ttl=app.config.get('CHAT_HISTORIAL_TTL', 60)
+    )
+    app.extensions['conversaciones'] = almacen
+    return almacen
+
+
+def obtener_conversaciones():
+    """Almacén de conversaciones de la app actual"""
+    return current_app.extensions['conversaciones']
@@ -0,0 +1,201 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from flask import current_app
+
+# Subir al cambiar la forma en que se dibujan los CV para invalidar todo lo guardado
+VERSION_RENDER = 2
+
+
+class CVRenderCache:
+    """Caché en disco de CVs ya renderizados, direccionada por contenido.
+
+    La llave es el SHA-256 de ``(docente_id, version del perfil, formato,
+    parámetros)``; como la versión sube con cualquier escritura al docente o
+    a sus tablas hijas, una entrada nunca queda obsoleta: simplemente deja de
+    pedirse. Los archivos viven en ``<directorio>/<docente_id>/v<version>_<llave>.<ext>``;
+    al guardar una versión nueva se borran las anteriores del mismo docente, y
+    si el total supera ``max_bytes`` se desalojan los menos usados (por mtime).
+    """
+
+    def __init__(self, directorio, max_bytes=256 * 1024 * 1024, habilitada=True):
+        self.directorio = directorio
+        self.max_bytes = max_bytes
+        self.habilitada = habilitada
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._tamano_estimado = None
+
+    @staticmethod
+    def clave(docente_id, version, formato, parametros):
+        contenido = json.dumps(
+            {
+                'render': VERSION_RENDER,
+                'docente_id': docente_id,
+                'version': version,
+                'formato': formato,
+                'parametros': parametros,
+            },
+            sort_keys=True, default=str
+        )
+        return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+    def obtener_o_generar(self, docente_id, version, formato, parametros, generar):
+        """Devolver los bytes guardados o llamar a ``generar()`` y guardar el resultado"""
+        if not self.habilitada:
+            return generar()
+
+        datos = self.buscar(docente_id, version, formato, parametros)
+        if datos is None:
+            datos = generar()
+            self.guardar(docente_id, version, formato, parametros, datos)
+        return datos
+
+    def buscar(self, docente_id, version, formato, parametros):
+        """Bytes guardados para esa llave, o None"""
+        if not self.habilitada:
+            return None
+        clave = self.clave(docente_id, version, formato, parametros)
+        datos = self._leer(self._ruta(docente_id, version, clave, formato))
+        if datos is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return datos
+
+    def buscar_ruta(self, docente_id, version, formato, parametros):
+        """Ruta del archivo guardado para esa llave, sin leerlo; None si no está"""
+        if not self.habilitada:
+            return None
+        clave = self.clave(docente_id, version, formato, parametros)
+        ruta = self._ruta(docente_id, version, clave, formato)
+        try:
+            os.utime(ruta)  # marca de uso reciente para el desalojo LRU
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return ruta
+
+    def guardar(self, docente_id, version, formato, parametros, datos):
+        """Guardar un render (p. ej. al terminar un trabajo en segundo plano); devuelve la ruta"""
+        if not self.habilitada:
+            return None
+        clave = self.clave(docente_id, version, formato, parametros)
+        ruta = self._ruta(docente_id, version, clave, formato)
+        self._escribir(ruta, datos)
+        self._purgar_versiones(docente_id, version)
+        self._aplicar_limite()
+        return ruta
+
+    def invalidar_docente(self, docente_id):
+        """Borrar todo lo guardado de un docente"""
+        self._purgar_versiones(docente_id, None)
+
+    def tamano_total(self):
+        return sum(os.path.getsize(ruta) for ruta in self._archivos())
+
+    # ------------------------------------------------------------------
+    # Archivos
+    # ------------------------------------------------------------------
+    def _ruta(self, docente_id, version, clave, formato):
+        return os.path.join(self.directorio, str(docente_id), f'v{version}_{clave}.{formato}')
+
+    def _leer(self, ruta):
+        try:
+            with open(ruta, 'rb') as f:
+                datos = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(ruta)  # marca de uso reciente para el desalojo LRU
+        except OSError:
+            pass
+        return datos
+
+    def _escribir(self, ruta, datos):
+        carpeta = os.path.dirname(ruta)
+        os.makedirs(carpeta, exist_ok=True)
+        # Escritura atómica: otro proceso nunca ve un archivo a medias
+        fd, temporal = tempfile.mkstemp(dir=carpeta, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(datos)
+            os.replace(temporal, ruta)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+        with self._lock:
+            if self._tamano_estimado is not None:
+                self._tamano_estimado += len(datos)
+
+    def _purgar_versiones(self, docente_id, version_actual):
+        carpeta = os.path.join(self.directorio, str(docente_id))
+        try:
+            nombres = os.listdir(carpeta)
+        except FileNotFoundError:
+            return
+        prefijo = f'v{version_actual}_' if version_actual is not None else None
+        for nombre in nombres:
+            if nombre.endswith('.tmp') or (prefijo and nombre.startswith(prefijo)):
+                continue
+            self._borrar(os.path.join(carpeta, nombre))
+
+    def _aplicar_limite(self):
+        with self._lock:
+            # El tamaño se estima en memoria y solo se recorre el disco al rebasar
+            # el límite, para no listar el directorio completo en cada escritura
+            if self._tamano_estimado is not None and self._tamano_estimado <= self.max_bytes:
+                return
+            archivos = []
+            for ruta in self._archivos():
+                try:
+                    estado = os.stat(ruta)
+                except FileNotFoundError:
+                    continue
+                archivos.append((estado.st_mtime, estado.st_size, ruta))
+            total = sum(tamano for _, tamano, _ in archivos)
+            for _, tamano, ruta in sorted(archivos):
+                if total <= self.max_bytes:
+                    break
+                if self._borrar(ruta):
+                    total -= tamano
+            self._tamano_estimado = total
+
+    def _archivos(self):
+        if not os.path.isdir(self.directorio):
+            return
+        for carpeta in os.scandir(self.directorio):
+            if not carpeta.is_dir():
+                continue
+            for archivo in os.scandir(carpeta.path):
+                if archivo.is_file() and not archivo.name.endswith('.tmp'):
+                    yield archivo.path
+
+    @staticmethod
+    def _borrar(ruta):
+        try:
+            os.remove(ruta)
+            return True
+        except FileNotFoundError:
+            return False
+
+
+def init_app(app):
+    """Crear la caché de CVs según ``CV_CACHE_*`` y guardarla en ``app.extensions``"""
+    cache = CVRenderCache(
+        app.config['CV_CACHE_DIR'],
+        max_bytes=app.config.get('CV_CACHE_MAX_BYTES', 256 * 1024 * 1024),
+        habilitada=app.config.get('CV_CACHE_ENABLED', True)
+    )
+    app.extensions['cv_cache'] = cache
+    return cache
+
+
+def obtener_cache():
+    """Caché de CVs de la app actual"""
+    return current_app.extensions['cv_cache']
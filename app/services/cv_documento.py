@@ -0,0 +1,299 @@
+"""Representación intermedia del CV, independiente del formato de salida.
+
+``construir_documento`` recorre una sola vez un ``PerfilDocente`` y produce
+un ``DocumentoCV``: secciones ordenadas de entradas ya formateadas (títulos,
+periodos, citas). Los renderizadores de PDF, Word y la vista previa HTML solo
+deciden la presentación, de modo que generar los tres formatos de un docente
+cuesta una carga de datos y un solo paso de formateo.
+"""
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class EntradaCV:
+    """Un elemento de una sección (un artículo, un empleo, un grado…)"""
+
+    titulo: str
+    subtitulo: str = ''
+    periodo: str = ''
+    detalles: tuple = ()  # líneas "Etiqueta: valor", en orden de presentación
+    cita: str = ''  # referencia bibliográfica completa (publicaciones)
+    enlace: str = ''
+    categoria: str = ''  # clasificación corta, p. ej. el nivel de un grado
+
+
+@dataclass(frozen=True)
+class SeccionCV:
+    clave: str
+    titulo: str
+    entradas: tuple = ()
+    numerada: bool = False
+
+
+@dataclass(frozen=True)
+class DocumentoCV:
+    docente_id: int
+    version: int
+    nombre: str
+    contacto: tuple = ()  # líneas bajo el nombre
+    puesto: str = ''  # empleo más reciente
+    adscripcion: str = ''
+    cvu: str = ''
+    identificadores: tuple = ()  # pares (etiqueta, valor), solo los registrados
+    datos_generales: tuple = ()  # pares (etiqueta, valor); vacío si no se pidió la sección
+    datos_personales: tuple = ()  # igual que ``datos_generales``
+    secciones: tuple = ()
+
+    def seccion(self, clave):
+        return next((s for s in self.secciones if s.clave == clave), None)
+
+
+# ----------------------------------------------------------------------
+# Formato de valores
+# ----------------------------------------------------------------------
+SIN_CAPTURAR = 'Sin capturar'
+
+
+def formatear_fecha(valor):
+    return valor.strftime('%Y-%m-%d') if valor else 'Sin fecha'
+
+
+def formatear_periodo(inicio, fin, actual=False):
+    final = 'Actualidad' if actual or not fin else fin.strftime('%Y-%m-%d')
+    return f"{formatear_fecha(inicio)} - {final}"
+
+
+def _detalles(*pares):
+    """Líneas "Etiqueta: valor" omitiendo los valores vacíos"""
+    return tuple(f"{etiqueta}: {valor}" for etiqueta, valor in pares if valor)
+
+
+def _unir(*partes, separador=', '):
+    return separador.join(str(p) for p in partes if p)
+
+
+def cita_articulo(articulo):
+    """Referencia estilo APA: Autores (Año). Título. Revista, Vol(Núm), págs. DOI"""
+    volumen = _unir(articulo.volumen, f"({articulo.numero})" if articulo.numero else '', separador='')
+    fuente = _unir(articulo.revista, volumen, articulo.paginas)
+    partes = [
+        _unir(articulo.autores, f"({articulo.anio})" if articulo.anio else '', separador=' '),
+        articulo.titulo,
+        fuente,
+    ]
+    cita = '. '.join(p for p in partes if p) + '.'
+    if articulo.doi:
+        cita += f" https://doi.org/{articulo.doi}"
+    return cita
+
+
+def cita_libro(libro):
+    """Referencia estilo APA para libros y capítulos"""
+    titulo = libro.titulo
+    if libro.titulo_capitulo:
+        titulo = f"{libro.titulo_capitulo}. En {libro.titulo}"
+    partes = [
+        _unir(libro.autores, f"({libro.anio})" if libro.anio else '', separador=' '),
+        titulo,
+        libro.editorial,
+    ]
+    cita = '. '.join(p for p in partes if p) + '.'
+    if libro.isbn:
+        cita += f" ISBN {libro.isbn}"
+    return cita
+
+
+# ----------------------------------------------------------------------
+# Secciones
+# ----------------------------------------------------------------------
+def _formaciones(perfil):
+    return tuple(
+        EntradaCV(
+            titulo=grado.grado_obtenido or grado.nivel or 'Grado no registrado',
+            subtitulo=_unir(grado.institucion or 'Institución no registrada',
+                            f"({grado.pais})" if grado.pais else '', separador=' '),
+            periodo=formatear_periodo(grado.fecha_inicio, grado.fecha_fin),
+            detalles=_detalles(('Área', grado.area_conocimiento), ('Trabajo', grado.titulo_trabajo)),
+            categoria=grado.nivel or '',
+        )
+        for grado in perfil.formaciones
+    )
+
+
+def _empleos(perfil):
+    return tuple(
+        EntradaCV(
+            titulo=empleo.puesto or 'Sin puesto',
+            subtitulo=empleo.institucion or '',
+            periodo=formatear_periodo(empleo.fecha_inicio, empleo.fecha_fin, empleo.actual),
+            detalles=_detalles(('Logros', empleo.logros)),
+        )
+        for empleo in perfil.empleos
+    )
+
+
+def _articulos(perfil):
+    return tuple(
+        EntradaCV(
+            titulo=articulo.titulo or 'Sin título',
+            subtitulo=_unir(articulo.revista, articulo.anio),
+            detalles=_detalles(('DOI', articulo.doi), ('Autores', articulo.autores)),
+            cita=cita_articulo(articulo),
+            enlace=f"https://doi.org/{articulo.doi}" if articulo.doi else '',
+        )
+        for articulo in perfil.articulos
+    )
+
+
+def _libros(perfil):
+    return tuple(
+        EntradaCV(
+            titulo=libro.titulo or 'Sin título',
+            subtitulo=_unir(libro.editorial or 'Editorial no registrada', libro.anio),
+            detalles=_detalles(('Capítulo', libro.titulo_capitulo), ('ISBN', libro.isbn)),
+            cita=cita_libro(libro),
+        )
+        for libro in perfil.libros
+    )
+
+
+def _congresos(perfil):
+    return tuple(
+        EntradaCV(
+            titulo=congreso.nombre_congreso or 'Sin nombre',
+            subtitulo=_unir(congreso.ciudad, congreso.pais),
+            periodo=formatear_fecha(congreso.fecha) if congreso.fecha else '',
+            detalles=_detalles(('Ponencia', congreso.titulo_ponencia)),
+        )
+        for congreso in perfil.congresos
+    )
+
+
+def _cursos(perfil):
+    return tuple(
+        EntradaCV(
+            titulo=curso.nombre_curso or 'Sin nombre',
+            subtitulo=curso.programa_educativo or '',
+            periodo=formatear_periodo(curso.fecha_inicio, curso.fecha_fin),
+        )
+        for curso in perfil.cursos
+    )
+
+
+def _proyectos(perfil):
+    return tuple(
+        EntradaCV(
+            titulo=proyecto.nombre_proyecto or 'Sin nombre',
+            subtitulo=f"Línea: {proyecto.linea_investigacion}" if proyecto.linea_investigacion else '',
+            periodo=formatear_periodo(proyecto.fecha_inicio, proyecto.fecha_fin),
+            detalles=_detalles(('Estado', proyecto.estado), ('Objetivo', proyecto.objetivo_general),
+                               ('Financiamiento', proyecto.financiamiento)),
+        )
+        for proyecto in perfil.proyectos
+    )
+
+
+def _tesis(perfil):
+    return tuple(
+        EntradaCV(
+            titulo=trabajo.titulo or 'Sin título',
+            subtitulo=trabajo.institucion or 'Institución no registrada',
+            periodo=formatear_periodo(trabajo.fecha_inicio, trabajo.fecha_fin),
+            detalles=_detalles(('Estudiante', trabajo.estudiante_nombre), ('Nivel', trabajo.nivel),
+                               ('Estado', trabajo.estado)),
+        )
+        for trabajo in perfil.tesis
+    )
+
+
+def _desarrollos(perfil):
+    return tuple(
+        EntradaCV(
+            titulo=desarrollo.nombre or 'Sin nombre',
+            subtitulo=desarrollo.tipo or '',
+            detalles=_detalles(('Nivel de madurez', desarrollo.nivel_madurez), ('Descripción', desarrollo.descripcion)),
+        )
+        for desarrollo in perfil.desarrollos
+    )
+
+
+# (clave, título, constructor, numerada) en el orden en que aparecen en el CV
+SECCIONES = (
+    ('formacion_academica', 'Formación Académica', _formaciones, False),
+    ('experiencia_laboral', 'Experiencia Laboral', _empleos, False),
+    ('articulos', 'Artículos Científicos', _articulos, True),
+    ('libros', 'Libros y Capítulos', _libros, True),
+    ('congresos', 'Congresos y Ponencias', _congresos, False),
+    ('cursos', 'Cursos Impartidos', _cursos, False),
+    ('proyectos', 'Proyectos de Investigación', _proyectos, True),
+    ('tesis', 'Tesis Dirigidas', _tesis, False),
+    ('desarrollos', 'Desarrollos Tecnológicos', _desarrollos, False),
+)
+
+CLAVES_SECCIONES = ('datos_generales',) + tuple(clave for clave, *_ in SECCIONES)
+
+
+def construir_documento(perfil, secciones=None):
+    """Formatear un ``PerfilDocente`` en un ``DocumentoCV``
+
+    Args:
+        perfil: Instantánea del docente (``ProfileLoader``)
+        secciones: Claves a incluir (ver ``CLAVES_SECCIONES``); por defecto todas.
+            Las secciones sin elementos se omiten.
+    """
+    incluidas = set(CLAVES_SECCIONES if secciones is None else secciones)
+    docente = perfil.docente
+
+    contacto = [docente.correo_principal or 'Correo no registrado']
+    if docente.orcid:
+        contacto.append(f"ORCID: {docente.orcid}")
+    contacto.append(f"Nacionalidad: {docente.nacionalidad or 'Nacionalidad no registrada'}")
+
+    identificadores = tuple(
+        (etiqueta, valor)
+        for etiqueta, valor in (('ORCID', docente.orcid), ('Researcher ID', docente.researcher_id),
+                                ('Scopus Author ID', docente.scopus_author_id))
+        if valor
+    )
+
+    datos_generales = datos_personales = ()
+    if 'datos_generales' in incluidas:
+        datos_generales = (
+            ('CVU', docente.cvu or SIN_CAPTURAR),
+            ('RFC', docente.rfc or SIN_CAPTURAR),
+            ('CURP', docente.curp or SIN_CAPTURAR),
+            ('Researcher ID', docente.researcher_id or SIN_CAPTURAR),
+        )
+        datos_personales = (
+            ('Nacionalidad', docente.nacionalidad or SIN_CAPTURAR),
+            ('Fecha de nacimiento', formatear_fecha(docente.fecha_nacimiento) if docente.fecha_nacimiento else SIN_CAPTURAR),
+            ('Estado civil', docente.estado_civil or SIN_CAPTURAR),
+            ('Sexo', docente.sexo or SIN_CAPTURAR),
+            ('País de nacimiento', docente.pais_nacimiento or SIN_CAPTURAR),
+            ('Domicilio', docente.domicilio or SIN_CAPTURAR),
+        )
+
+    # Los empleos llegan ordenados por fecha de inicio descendente
+    actual = perfil.empleos[0] if perfil.empleos else None
+
+    cuerpo = []
+    for clave, titulo, construir, numerada in SECCIONES:
+        if clave not in incluidas:
+            continue
+        entradas = construir(perfil)
+        if entradas:
+            cuerpo.append(SeccionCV(clave, titulo, entradas, numerada))
+
+    return DocumentoCV(
+        docente_id=perfil.id,
+        version=perfil.version,
+        nombre=docente.nombre_completo or 'Docente',
+        contacto=tuple(contacto),
+        puesto=(actual.puesto or '') if actual else '',
+        adscripcion=(actual.institucion or '') if actual else '',
+        cvu=docente.cvu or '',
+        identificadores=identificadores,
+        datos_generales=datos_generales,
+        datos_personales=datos_personales,
+        secciones=tuple(cuerpo),
+    )
@@ -0,0 +1,200 @@
+"""Registro de recursos de las plantillas de CV (colores, estilos y estilos de tabla).
+
+Construir una hoja de ReportLab cuesta: ``getSampleStyleSheet()`` crea unas
+veinte ``ParagraphStyle`` y cada plantilla añade las suyas. Aquí se construyen
+una sola vez por proceso y se comparten entre todos los renders; las hojas
+quedan congeladas para que ningún generador las modifique por accidente.
+"""
+from functools import lru_cache
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT
+from reportlab.lib.styles import ParagraphStyle, StyleSheet1, getSampleStyleSheet
+from reportlab.platypus import TableStyle
+
+# Colores institucionales CONAHCYT
+CONAHCYT_AZUL = colors.HexColor('#1a365d')  # Azul oscuro institucional
+CONAHCYT_GRIS = colors.HexColor('#4a5568')  # Gris para texto secundario
+CONAHCYT_LINEA = colors.HexColor('#2d3748')  # Color para líneas
+CONAHCYT_FONDO = colors.HexColor('#f7fafc')  # Fondo claro para tablas
+
+# Colores PROFESIONAL (elegante, moderno)
+PROF_NEGRO = colors.HexColor('#1a1a2e')      # Negro azulado
+PROF_DORADO = colors.HexColor('#d4af37')     # Dorado elegante
+PROF_GRIS = colors.HexColor('#6c757d')       # Gris neutro
+PROF_FONDO = colors.HexColor('#f8f9fa')      # Fondo muy claro
+PROF_ACENTO = colors.HexColor('#16213e')     # Azul muy oscuro
+
+# Colores ACADÉMICO (verde limón + azul marino)
+ACAD_VERDE = colors.HexColor('#84cc16')      # Verde limón
+ACAD_VERDE_OSCURO = colors.HexColor('#65a30d')  # Verde limón oscuro
+ACAD_AZUL = colors.HexColor('#1e3a5f')       # Azul marino
+ACAD_AZUL_CLARO = colors.HexColor('#3b82f6') # Azul claro
+ACAD_FONDO = colors.HexColor('#f0fdf4')      # Fondo verde muy claro
+
+# Colores del CV básico (CVGeneratorService)
+BASICO_TITULO = colors.HexColor('#0f172a')
+BASICO_SECCION = colors.HexColor('#2563eb')
+
+
+# ----------------------------------------------------------------------
+# Estilos de tabla (TableStyle no se modifica al aplicarlo a una tabla)
+# ----------------------------------------------------------------------
+TABLA_CAMPOS = TableStyle([
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+    ('TOPPADDING', (0, 0), (-1, -1), 4),
+])
+
+TABLA_ETIQUETA_VALOR = TableStyle([
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 3),
+])
+
+TABLA_PROF_DATOS = TableStyle([
+    ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('TEXTCOLOR', (0, 0), (0, -1), PROF_DORADO),
+    ('TEXTCOLOR', (1, 0), (1, -1), PROF_NEGRO),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+])
+
+TABLA_ACAD_SECCION = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), ACAD_AZUL),
+    ('TOPPADDING', (0, 0), (-1, -1), 8),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ('LEFTPADDING', (0, 0), (-1, -1), 10),
+    ('RIGHTPADDING', (0, 0), (-1, -1), 10),
+])
+
+TABLA_ACAD_DATOS = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), ACAD_FONDO),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ('TOPPADDING', (0, 0), (-1, -1), 8),
+    ('LEFTPADDING', (0, 0), (-1, -1), 8),
+    ('GRID', (0, 0), (-1, -1), 0.5, ACAD_VERDE),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+])
+
+
+# ----------------------------------------------------------------------
+# Hojas de estilo de párrafo
+# ----------------------------------------------------------------------
+class HojaEstilos(StyleSheet1):
+    """``StyleSheet1`` que deja de aceptar estilos nuevos una vez construida"""
+
+    def __init__(self, base=None):
+        super().__init__()
+        self._congelada = False
+        if base is not None:
+            self.byName.update(base.byName)
+            self.byAlias.update(base.byAlias)
+
+    def add(self, style, alias=None):
+        if self._congelada:
+            raise TypeError('La hoja de estilos es compartida; crea una copia con HojaEstilos(hoja)')
+        super().add(style, alias)
+
+    def congelar(self):
+        self._congelada = True
+        return self
+
+
+def _agregar(hoja, nombre, padre, **atributos):
+    hoja.add(ParagraphStyle(name=nombre, parent=hoja[padre], **atributos))
+
+
+def _estilos_conacyt(hoja):
+    """Estilos personalizados estilo CONAHCYT/CVU"""
+    # Encabezado institucional
+    _agregar(hoja, 'ConahcytHeader', 'Normal', fontSize=14, textColor=CONAHCYT_AZUL,
+             fontName='Helvetica-Bold', spaceAfter=6)
+    # Nombre del investigador (grande y prominente)
+    _agregar(hoja, 'CVTitle', 'Heading1', fontSize=16, textColor=CONAHCYT_AZUL, spaceAfter=2,
+             spaceBefore=10, alignment=TA_LEFT, fontName='Helvetica-Bold')
+    # Puesto/cargo actual
+    _agregar(hoja, 'CVPuesto', 'Normal', fontSize=11, textColor=CONAHCYT_GRIS, spaceAfter=2,
+             fontName='Helvetica-Bold')
+    # Número de CVU
+    _agregar(hoja, 'CVCVU', 'Normal', fontSize=10, textColor=CONAHCYT_GRIS, spaceAfter=12,
+             fontName='Helvetica')
+    # Subtítulo/contacto
+    _agregar(hoja, 'CVSubtitle', 'Normal', fontSize=10, textColor=CONAHCYT_GRIS, spaceAfter=8,
+             alignment=TA_LEFT)
+    # Sección principal CONAHCYT (títulos de sección)
+    _agregar(hoja, 'ConacytSection', 'Heading2', fontSize=11, textColor=CONAHCYT_AZUL, spaceAfter=8,
+             spaceBefore=16, fontName='Helvetica-Bold', borderPadding=0, leftIndent=0)
+    # Texto de perfil (justificado)
+    _agregar(hoja, 'PerfilText', 'Normal', fontSize=9, textColor=colors.black, spaceAfter=12,
+             alignment=TA_JUSTIFY, leading=12)
+    # Etiqueta de campo (negrita)
+    _agregar(hoja, 'FieldLabel', 'Normal', fontSize=8, textColor=CONAHCYT_GRIS,
+             fontName='Helvetica-Bold')
+    # Valor de campo
+    _agregar(hoja, 'FieldValue', 'Normal', fontSize=9, textColor=colors.black)
+    # Item de lista (artículos, etc.)
+    _agregar(hoja, 'ListItem', 'Normal', fontSize=9, textColor=colors.black, spaceAfter=8,
+             leftIndent=0, leading=11)
+    # Título de item (negrita)
+    _agregar(hoja, 'ItemTitle', 'Normal', fontSize=9, textColor=colors.black,
+             fontName='Helvetica-Bold', spaceAfter=2)
+    # Detalles de item
+    _agregar(hoja, 'ItemDetails', 'Normal', fontSize=8, textColor=CONAHCYT_GRIS, spaceAfter=6,
+             leading=10)
+    # Sección normal (compatibilidad)
+    _agregar(hoja, 'SectionTitle', 'Heading2', fontSize=12, textColor=CONAHCYT_AZUL, spaceAfter=6,
+             spaceBefore=12, fontName='Helvetica-Bold')
+
+
+def _estilos_profesional(hoja):
+    """Estilos de la plantilla PROFESIONAL (dorado/negro)"""
+    _agregar(hoja, 'ProfTitle', 'Heading1', fontSize=22, textColor=PROF_NEGRO, alignment=TA_CENTER,
+             fontName='Helvetica-Bold', spaceAfter=4, spaceBefore=8)
+    _agregar(hoja, 'ProfSubtitle', 'Normal', fontSize=11, textColor=PROF_GRIS, alignment=TA_CENTER,
+             spaceAfter=15)
+    _agregar(hoja, 'ProfSection', 'Heading2', fontSize=12, textColor=PROF_NEGRO,
+             fontName='Helvetica-Bold', spaceBefore=18, spaceAfter=10, borderPadding=(5, 0, 5, 0))
+    _agregar(hoja, 'ProfItem', 'Normal', fontSize=10, textColor=PROF_NEGRO,
+             fontName='Helvetica-Bold', spaceAfter=2)
+    _agregar(hoja, 'ProfDetail', 'Normal', fontSize=9, textColor=PROF_GRIS, spaceAfter=8, leading=11)
+
+
+def _estilos_academico(hoja):
+    """Estilos de la plantilla ACADÉMICA (verde limón/azul marino)"""
+    _agregar(hoja, 'AcadTitle', 'Heading1', fontSize=20, textColor=ACAD_AZUL, alignment=TA_CENTER,
+             fontName='Helvetica-Bold', spaceAfter=6, spaceBefore=10)
+    _agregar(hoja, 'AcadSubtitle', 'Normal', fontSize=10, textColor=ACAD_VERDE_OSCURO,
+             alignment=TA_CENTER, spaceAfter=12)
+    # Texto dentro de sección (blanco sobre fondo azul)
+    _agregar(hoja, 'AcadSectionText', 'Normal', fontSize=12, textColor=colors.white,
+             fontName='Helvetica-Bold', alignment=TA_LEFT)
+    _agregar(hoja, 'AcadSubsection', 'Normal', fontSize=10, textColor=ACAD_AZUL,
+             fontName='Helvetica-Bold', spaceBefore=10, spaceAfter=4)
+    _agregar(hoja, 'AcadItem', 'Normal', fontSize=10, textColor=ACAD_AZUL,
+             fontName='Helvetica-Bold', spaceAfter=2)
+    _agregar(hoja, 'AcadDetail', 'Normal', fontSize=9, textColor=colors.black, spaceAfter=8, leading=11)
+    _agregar(hoja, 'AcadHighlight', 'Normal', fontSize=9, textColor=ACAD_VERDE_OSCURO,
+             fontName='Helvetica-Oblique', spaceAfter=6)
+
+
+def _estilos_basico(hoja):
+    """Estilos del CV básico de ``CVGeneratorService``"""
+    _agregar(hoja, 'CustomTitle', 'Heading1', fontSize=20, textColor=BASICO_TITULO, spaceAfter=12,
+             alignment=TA_CENTER)
+    _agregar(hoja, 'CustomHeading', 'Heading2', fontSize=14, textColor=BASICO_SECCION, spaceAfter=6,
+             spaceBefore=12)
+
+
+def construir_hoja_estilos():
+    """Construir (sin caché) la hoja con los estilos de todas las plantillas"""
+    hoja = HojaEstilos(getSampleStyleSheet())
+    for agregar in (_estilos_conacyt, _estilos_profesional, _estilos_academico, _estilos_basico):
+        agregar(hoja)
+    return hoja.congelar()
+
+
+@lru_cache(maxsize=None)
+def hoja_estilos():
+    """Hoja de estilos compartida del proceso (solo lectura)"""
+    return construir_hoja_estilos()
@@ -0,0 +1,320 @@
+import random
+import time
+from datetime import date, timedelta
+from sqlalchemy import func, select
+from werkzeug.security import generate_password_hash
+from app import db
+from app.models.user import User
+from app.models.docente import Docente
+from app.models.formacion_academica import FormacionAcademica
+from app.models.empleo import Empleo
+from app.models.idioma import Idioma
+from app.models.curso_impartido import CursoImpartido
+from app.models.proyecto_investigacion import ProyectoInvestigacion
+from app.models.articulo import Articulo
+from app.models.libro import Libro
+from app.models.congreso import Congreso
+from app.models.tesis_dirigida import TesisDirigida
+from app.models.desarrollo_tecnologico import DesarrolloTecnologico
+from app.models.actividad_general import ActividadGeneral
+
+NOMBRES = ['María', 'José', 'Guadalupe', 'Juan', 'Ana', 'Luis', 'Carmen', 'Carlos', 'Laura', 'Jorge',
+           'Patricia', 'Miguel', 'Verónica', 'Francisco', 'Alejandra', 'Ricardo', 'Fernanda', 'Sergio']
+APELLIDOS = ['Hernández', 'García', 'Martínez', 'López', 'González', 'Pérez', 'Rodríguez', 'Sánchez',
+             'Ramírez', 'Cruz', 'Flores', 'Gómez', 'Morales', 'Vázquez', 'Reyes', 'Jiménez', 'Torres']
+INSTITUCIONES = ['Universidad Tecnológica de Tulancingo', 'UNAM', 'Instituto Politécnico Nacional',
+                 'Universidad Autónoma del Estado de Hidalgo', 'CINVESTAV', 'Tecnológico de Monterrey',
+                 'Universidad de Guadalajara', 'BUAP', 'Universidad Veracruzana']
+AREAS = ['Ingeniería', 'Tecnologías de la Información', 'Ciencias Básicas', 'Administración',
+         'Mecatrónica', 'Energías Renovables', 'Biotecnología']
+REVISTAS = ['Revista Mexicana de Ingeniería Química', 'Computación y Sistemas', 'IEEE Latin America Transactions',
+            'Ingeniería, Investigación y Tecnología', 'Nature Communications', 'Journal of Cleaner Production',
+            'Sensors', 'Applied Sciences', 'Energies']
+EDITORIALES = ['Pearson', 'Springer', 'McGraw-Hill', 'Alfaomega', 'Editorial UAEH', 'Elsevier']
+PAISES_CIUDADES = [('México', 'Ciudad de México'), ('México', 'Guadalajara'), ('México', 'Monterrey'),
+                   ('España', 'Madrid'), ('Colombia', 'Bogotá'), ('Estados Unidos', 'San Diego'),
+                   ('Chile', 'Santiago'), ('Argentina', 'Buenos Aires')]
+TEMAS = ['redes neuronales', 'energía solar', 'control difuso', 'minería de datos', 'biopolímeros',
+         'internet de las cosas', 'visión por computadora', 'manufactura aditiva', 'ciberseguridad',
+         'tratamiento de aguas', 'robótica móvil', 'cadena de suministro', 'aprendizaje profundo']
+NIVELES_FORMACION = ['licenciatura', 'maestria', 'doctorado', 'especialidad']
+PUESTOS = ['Profesor de Tiempo Completo', 'Profesor de Asignatura', 'Investigador Titular',
+           'Coordinador Académico', 'Director de Carrera', 'Técnico Académico']
+IDIOMAS = [('Inglés', 'B2'), ('Francés', 'A2'), ('Alemán', 'B1'), ('Portugués', 'B1'), ('Inglés', 'C1')]
+
+# Tamaño medio de cada colección por docente; cada docente recibe entre 0 y el doble
+TAMANOS_POR_DEFECTO = {
+    'formaciones': 3,
+    'empleos': 3,
+    'idiomas': 2,
+    'cursos': 8,
+    'proyectos': 3,
+    'articulos': 15,
+    'libros': 2,
+    'congresos': 6,
+    'tesis': 4,
+    'desarrollos': 1,
+    'actividades': 3,
+}
+
+
+class GeneradorDatosSinteticos:
+    """Genera usuarios/docentes con todas sus colecciones mediante inserts Core por lotes"""
+
+    def __init__(self, semilla=42, tamano_lote=5000, password='docente123'):
+        self.rng = random.Random(semilla)
+        self.tamano_lote = tamano_lote
+        # El hash es costoso: se calcula una sola vez para todos los usuarios
+        self.password_hash = generate_password_hash(password)
+        self.conteos = {}
+
+    def generar(self, num_docentes, tamanos=None, progreso=None):
+        """Insertar ``num_docentes`` docentes; devuelve {tabla: filas insertadas}"""
+        tamanos = {**TAMANOS_POR_DEFECTO, **(tamanos or {})}
+        self.conteos = {}
+        inicio = time.perf_counter()
+
+        siguiente_user = self._siguiente_id(User)
+        siguiente_docente = self._siguiente_id(Docente)
+        generadores = {
+            'formaciones': (FormacionAcademica, self._formacion),
+            'empleos': (Empleo, self._empleo),
+            'idiomas': (Idioma, self._idioma),
+            'cursos': (CursoImpartido, self._curso),
+            'proyectos': (ProyectoInvestigacion, self._proyecto),
+            'articulos': (Articulo, self._articulo),
+            'libros': (Libro, self._libro),
+            'congresos': (Congreso, self._congreso),
+            'tesis': (TesisDirigida, self._tesis),
+            'desarrollos': (DesarrolloTecnologico, self._desarrollo),
+            'actividades': (ActividadGeneral, self._actividad),
+        }
+        pendientes = {modelo: [] for modelo, _ in generadores.values()}
+        pendientes[User] = []
+        pendientes[Docente] = []
+
+        for n in range(num_docentes):
+            user_id = siguiente_user + n
+            docente_id = siguiente_docente + n
+            pendientes[User].append(self._usuario(user_id))
+            pendientes[Docente].append(self._docente(docente_id, user_id))
+
+            for nombre, (modelo, fabrica) in generadores.items():
+                media = tamanos.get(nombre, 0)
+                cantidad = self.rng.randint(0, 2 * media) if media else 0
+                for k in range(cantidad):
+                    pendientes[modelo].append(fabrica(docente_id, k))
+
+            # Docentes y usuarios primero para respetar las llaves foráneas
+            if len(pendientes[Docente]) >= self.tamano_lote or n == num_docentes - 1:
+                self._volcar(User, pendientes)
+                self._volcar(Docente, pendientes)
+            for modelo in pendientes:
+                if modelo not in (User, Docente) and len(pendientes[modelo]) >= self.tamano_lote:
+                    self._volcar(User, pendientes)
+                    self._volcar(Docente, pendientes)
+                    self._volcar(modelo, pendientes)
+            if progreso and (n + 1) % 1000 == 0:
+                progreso(n + 1, time.perf_counter() - inicio)
+
+        for modelo in list(pendientes):
+            self._volcar(modelo, pendientes)
+        db.session.commit()
+        return dict(self.conteos)
+
+    # ------------------------------------------------------------------
+    # Inserción
+    # ------------------------------------------------------------------
+    def _volcar(self, modelo, pendientes):
+        filas = pendientes[modelo]
+        if not filas:
+            return
+        db.session.execute(modelo.__table__.insert(), filas)
+        tabla = modelo.__tablename__
+        self.conteos[tabla] = self.conteos.get(tabla, 0) + len(filas)
+        pendientes[modelo] = []
+
+    @staticmethod
+    def _siguiente_id(modelo):
+        return (db.session.execute(select(func.max(modelo.id))).scalar() or 0) + 1
+
+    # ------------------------------------------------------------------
+    # Fábricas de filas
+    # ------------------------------------------------------------------
+    def _fecha(self, desde=1995, hasta=2025):
+        return date(desde, 1, 1) + timedelta(days=self.rng.randint(0, (hasta - desde) * 365))
+
+    def _periodo(self, max_anios=6):
+        inicio = self._fecha()
+        fin = inicio + timedelta(days=self.rng.randint(90, max_anios * 365))
+        return inicio, (fin if fin < date(2026, 1, 1) else None)
+
+    def _nombre(self):
+        return f'{self.rng.choice(NOMBRES)} {self.rng.choice(APELLIDOS)} {self.rng.choice(APELLIDOS)}'
+
+    def _usuario(self, user_id):
+        return {
+            'id': user_id,
+            'email': f'docente{user_id}@sintetico.utte.edu.mx',
+            'password_hash': self.password_hash,
+            'role': 'docente',
+        }
+
+    def _docente(self, docente_id, user_id):
+        return {
+            'id': docente_id,
+            'user_id': user_id,
+            'cvu': f'S{docente_id:09d}',
+            'nombre_completo': self._nombre(),
+            'curp': f'SINT{docente_id:014d}',
+            'rfc': f'SINT{docente_id:09d}'[:13],
+            'sexo': self.rng.choice(['Masculino', 'Femenino']),
+            'fecha_nacimiento': self._fecha(1955, 1995),
+            'pais_nacimiento': 'México',
+            'nacionalidad': 'Mexicana',
+            'estado_civil': self.rng.choice(['Soltero(a)', 'Casado(a)', 'Divorciado(a)']),
+            'domicilio': f'Calle {self.rng.randint(1, 300)}, Tulancingo, Hidalgo',
+            'correo_principal': f'docente{user_id}@sintetico.utte.edu.mx',
+            'orcid': f'0000-000{docente_id % 10}-{docente_id % 10000:04d}-{self.rng.randint(1000, 9999)}',
+        }
+
+    def _formacion(self, docente_id, k):
+        inicio, fin = self._periodo(5)
+        nivel = NIVELES_FORMACION[k % len(NIVELES_FORMACION)]
+        tema = self.rng.choice(TEMAS)
+        return {
+            'docente_id': docente_id,
+            'nivel': nivel,
+            'grado_obtenido': f'{nivel.capitalize()} en {self.rng.choice(AREAS)}',
+            'institucion': self.rng.choice(INSTITUCIONES),
+            'pais': 'México',
+            'fecha_inicio': inicio,
+            'fecha_fin': fin,
+            'titulo_trabajo': f'Estudio sobre {tema}',
+            'area_conocimiento': self.rng.choice(AREAS),
+        }
+
+    def _empleo(self, docente_id, k):
+        inicio, fin = self._periodo(10)
+        return {
+            'docente_id': docente_id,
+            'institucion': self.rng.choice(INSTITUCIONES),
+            'puesto': self.rng.choice(PUESTOS),
+            'tipo_contrato': self.rng.choice(['Base', 'Temporal', 'Honorarios']),
+            'fecha_inicio': inicio,
+            'fecha_fin': None if k == 0 else fin,
+            'actual': k == 0,
+            'logros': f'Coordinación de proyectos de {self.rng.choice(TEMAS)}',
+            'area_adscripcion': self.rng.choice(AREAS),
+        }
+
+    def _idioma(self, docente_id, k):
+        idioma, nivel = self.rng.choice(IDIOMAS)
+        return {
+            'docente_id': docente_id,
+            'idioma': idioma,
+            'nivel': nivel,
+            'certificado': self.rng.random() < 0.5,
+        }
+
+    def _curso(self, docente_id, k):
+        inicio = self._fecha(2005, 2025)
+        return {
+            'docente_id': docente_id,
+            'nombre_curso': f'{self.rng.choice(TEMAS).capitalize()} {k + 1}',
+            'programa_educativo': f'Ingeniería en {self.rng.choice(AREAS)}',
+            'nivel': self.rng.choice(['licenciatura', 'maestria']),
+            'fecha_inicio': inicio,
+            'fecha_fin': inicio + timedelta(days=120),
+            'horas_semanales': float(self.rng.choice([3, 4, 5, 6])),
+        }
+
+    def _proyecto(self, docente_id, k):
+        inicio, fin = self._periodo(4)
+        tema = self.rng.choice(TEMAS)
+        return {
+            'docente_id': docente_id,
+            'nombre_proyecto': f'Desarrollo de soluciones de {tema}',
+            'objetivo_general': f'Investigar y aplicar técnicas de {tema} en la región',
+            'linea_investigacion': self.rng.choice(AREAS),
+            'fecha_inicio': inicio,
+            'fecha_fin': fin,
+            'estado': 'Concluido' if fin else 'En curso',
+            'financiamiento': self.rng.choice(['CONAHCYT', 'PRODEP', 'Institucional', None]),
+            'monto': float(self.rng.randint(50, 2000) * 1000),
+        }
+
+    def _articulo(self, docente_id, k):
+        tema = self.rng.choice(TEMAS)
+        return {
+            'docente_id': docente_id,
+            'titulo': f'Análisis de {tema} aplicado a casos de estudio ({docente_id}-{k})',
+            'revista': self.rng.choice(REVISTAS),
+            'anio': self.rng.randint(1998, 2025),
+            'volumen': str(self.rng.randint(1, 60)),
+            'numero': str(self.rng.randint(1, 12)),
+            'paginas': f'{self.rng.randint(1, 200)}-{self.rng.randint(201, 400)}',
+            'estado': 'Publicado',
+            'doi': f'10.5555/sint.{docente_id}.{k}' if self.rng.random() < 0.7 else None,
+            'indexacion': self.rng.choice(['Scopus', 'ORCID', 'PubMed', 'JCR']),
+            'autores': f'{self._nombre()}, {self._nombre()}',
+        }
+
+    def _libro(self, docente_id, k):
+        return {
+            'docente_id': docente_id,
+            'titulo': f'Fundamentos de {self.rng.choice(TEMAS)}',
+            'editorial': self.rng.choice(EDITORIALES),
+            'anio': self.rng.randint(2000, 2025),
+            'pais': 'México',
+            'idioma': 'Español',
+            'isbn': f'978-{self.rng.randint(0, 9)}-{docente_id:06d}-{k:02d}',
+            'tipo': self.rng.choice(['libro', 'capitulo']),
+            'autores': self._nombre(),
+        }
+
+    def _congreso(self, docente_id, k):
+        pais, ciudad = self.rng.choice(PAISES_CIUDADES)
+        return {
+            'docente_id': docente_id,
+            'nombre_congreso': f'Congreso Internacional de {self.rng.choice(AREAS)}',
+            'titulo_ponencia': f'Avances en {self.rng.choice(TEMAS)}',
+            'tipo': self.rng.choice(['Internacional', 'Nacional']),
+            'fecha': self._fecha(2005, 2025),
+            'pais': pais,
+            'ciudad': ciudad,
+            'modalidad': self.rng.choice(['Presencial', 'Virtual']),
+            'tipo_participacion': self.rng.choice(['Ponente', 'Asistente', 'Organizador']),
+        }
+
+    def _tesis(self, docente_id, k):
+        inicio, fin = self._periodo(3)
+        return {
+            'docente_id': docente_id,
+            'titulo': f'Implementación de {self.rng.choice(TEMAS)} en la industria',
+            'nivel': self.rng.choice(['licenciatura', 'maestria', 'doctorado']),
+            'institucion': self.rng.choice(INSTITUCIONES),
+            'fecha_inicio': inicio,
+            'fecha_fin': fin,
+            'estado': 'Concluida' if fin else 'En proceso',
+            'estudiante_nombre': self._nombre(),
+            'pais': 'México',
+        }
+
+    def _desarrollo(self, docente_id, k):
+        tema = self.rng.choice(TEMAS)
+        return {
+            'docente_id': docente_id,
+            'nombre': f'Prototipo de {tema}',
+            'tipo': self.rng.choice(['Software', 'Prototipo', 'Patente']),
+            'nivel_madurez': f'TRL {self.rng.randint(1, 9)}',
+            'descripcion': f'Sistema basado en {tema}',
+        }
+
+    def _actividad(self, docente_id, k):
+        return {
+            'docente_id': docente_id,
+            'categoria': self.rng.choice(['premio', 'evaluacion', 'divulgacion', 'institucional']),
+            'titulo': f'Participación en {self.rng.choice(TEMAS)}',
+            'fecha': self._fecha(2010, 2025),
+        }
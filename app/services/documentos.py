@@ -0,0 +1,158 @@
+import os
+import re
+import tempfile
+import threading
+import time
+from flask import current_app, send_file
+
+# Los ids de documento son uuid4().hex; cualquier otra cosa no llega al disco
+_ID_VALIDO = re.compile(r'^[0-9a-f]{32}$')
+
+
+class AlmacenDocumentos:
+    """Almacén de CVs que deben sobrevivir a la petición (p. ej. enlaces del chatbot).
+
+    Sustituye a ``app/static/pdfs``: los archivos viven fuera de ``static`` en
+    ``<directorio>/<docente_id>/<documento_id>.<ext>``, solo se sirven por una
+    ruta autenticada, caducan a los ``retencion_dias`` y cada docente conserva
+    como máximo ``max_por_docente`` archivos y ``max_bytes_por_docente`` bytes
+    (se borran primero los más antiguos).
+    """
+
+    def __init__(self, directorio, retencion_dias=30, max_por_docente=20,
+                 max_bytes_por_docente=50 * 1024 * 1024, intervalo_limpieza=3600):
+        self.directorio = directorio
+        self.retencion = retencion_dias * 86400
+        self.max_por_docente = max_por_docente
+        self.max_bytes_por_docente = max_bytes_por_docente
+        self.intervalo_limpieza = intervalo_limpieza
+        self._lock = threading.Lock()
+        self._ultima_limpieza = 0.0
+
+    def guardar(self, docente_id, documento_id, extension, datos):
+        """Guardar un documento y aplicar la cuota del docente; devuelve la ruta"""
+        if not _ID_VALIDO.match(documento_id):
+            raise ValueError(f'Id de documento no válido: {documento_id!r}')
+        carpeta = os.path.join(self.directorio, str(int(docente_id)))
+        os.makedirs(carpeta, exist_ok=True)
+        ruta = os.path.join(carpeta, f'{documento_id}.{extension}')
+
+        # Escritura atómica: una descarga concurrente nunca ve un archivo a medias
+        fd, temporal = tempfile.mkstemp(dir=carpeta, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(datos)
+            os.replace(temporal, ruta)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+
+        self._aplicar_cuota(carpeta, conservar=ruta)
+        self._limpiar_si_toca()
+        return ruta
+
+    def buscar(self, docente_id, documento_id):
+        """Ruta del documento del docente, o None si no existe o ya caducó"""
+        if not _ID_VALIDO.match(documento_id or ''):
+            return None
+        carpeta = os.path.join(self.directorio, str(int(docente_id)))
+        try:
+            nombres = os.listdir(carpeta)
+        except FileNotFoundError:
+            return None
+        limite = time.time() - self.retencion
+        for nombre in nombres:
+            if nombre.startswith(documento_id + '.') and not nombre.endswith('.tmp'):
+                ruta = os.path.join(carpeta, nombre)
+                try:
+                    if os.path.getmtime(ruta) >= limite:
+                        return ruta
+                except FileNotFoundError:
+                    pass
+        return None
+
+    def recolectar(self, ahora=None):
+        """Borrar los documentos caducados y las carpetas vacías; devuelve cuántos borró"""
+        limite = (ahora or time.time()) - self.retencion
+        borrados = 0
+        if not os.path.isdir(self.directorio):
+            return 0
+        for carpeta in os.scandir(self.directorio):
+            if not carpeta.is_dir():
+                continue
+            for archivo in os.scandir(carpeta.path):
+                try:
+                    if archivo.is_file() and archivo.stat().st_mtime < limite:
+                        os.remove(archivo.path)
+                        borrados += 1
+                except FileNotFoundError:
+                    pass
+            try:
+                os.rmdir(carpeta.path)
+            except OSError:
+                pass  # no está vacía
+        with self._lock:
+            self._ultima_limpieza = time.time()
+        return borrados
+
+    def _aplicar_cuota(self, carpeta, conservar):
+        archivos = []
+        for archivo in os.scandir(carpeta):
+            if archivo.is_file() and not archivo.name.endswith('.tmp'):
+                try:
+                    estado = archivo.stat()
+                except FileNotFoundError:
+                    continue
+                archivos.append((estado.st_mtime, estado.st_size, archivo.path))
+
+        # Del más nuevo al más antiguo: lo que no cabe en la cuota se borra
+        archivos.sort(reverse=True)
+        total = 0
+        for indice, (_, tamano, ruta) in enumerate(archivos):
+            total += tamano
+            excede = indice >= self.max_por_docente or total > self.max_bytes_por_docente
+            if excede and ruta != conservar:
+                try:
+                    os.remove(ruta)
+                except FileNotFoundError:
+                    pass
+                total -= tamano
+
+    def _limpiar_si_toca(self):
+        with self._lock:
+            if time.time() - self._ultima_limpieza < self.intervalo_limpieza:
+                return
+            self._ultima_limpieza = time.time()
+        self.recolectar()
+
+
+def respuesta_archivo(ruta, mimetype, nombre_archivo):
+    """Enviar un documento del almacén por bloques, con ``Content-Length``/``ETag``"""
+    respuesta = send_file(
+        ruta,
+        mimetype=mimetype,
+        as_attachment=True,
+        download_name=nombre_archivo,
+        conditional=True,
+        etag=True
+    )
+    respuesta.headers['Cache-Control'] = 'private, no-cache'
+    return respuesta
+
+
+def init_app(app):
+    """Crear el almacén de documentos según ``DOCUMENTOS_*``"""
+    almacen = AlmacenDocumentos(
+        app.config['DOCUMENTOS_DIR'],
+        retencion_dias=app.config.get('DOCUMENTOS_RETENCION_DIAS', 30),
+        max_por_docente=app.config.get('DOCUMENTOS_MAX_POR_DOCENTE', 20),
+        max_bytes_por_docente=app.config.get('DOCUMENTOS_MAX_BYTES_POR_DOCENTE', 50 * 1024 * 1024)
+    )
+    app.extensions['documentos'] = almacen
+    return almacen
+
+
+def obtener_almacen():
+    """Almacén de documentos de la app actual"""
+    return current_app.extensions['documentos']
@@ -0,0 +1,159 @@
+"""Exportación masiva de CVs: un ZIP que se escribe mientras se renderiza.
+
+Los docentes se cargan en lotes (``ProfileLoader``, un SELECT por tabla y
+lote), los CVs se renderizan en el pool de ``render_jobs`` con un número
+acotado de tareas en vuelo y cada archivo se agrega al ZIP en cuanto termina.
+Los bytes del ZIP salen por bloques, así que la memoria depende del tamaño
+del lote y de los procesos, no de cuántos docentes se exporten; lo único que
+crece es la lista de ids y el directorio central del ZIP (unos cien bytes
+por archivo).
+"""
+import re
+import zipfile
+from sqlalchemy import or_, select
+from app import db
+from app.models.docente import Docente
+from app.models.empleo import Empleo
+from app.models.formacion_academica import FormacionAcademica
+from app.services.cv_generator_service import CVGeneratorService
+from app.services.cv_pdf_generator import ContextoCV, CVPDFGenerator
+from app.services.profile_loader import ProfileLoader
+
+# 'basico' es el CV de CVGeneratorService (PDF o Word); el resto, las plantillas de CVPDFGenerator (PDF)
+PLANTILLAS = ('basico',) + CVPDFGenerator.PLANTILLAS
+
+
+def filtrar_docentes(consulta, texto='', area='', nivel=''):
+    """Aplicar los filtros del buscador de docentes del panel admin"""
+    if texto:
+        consulta = consulta.where(
+            or_(
+                Docente.nombre_completo.ilike(f'%{texto}%'),
+                Docente.cvu.ilike(f'%{texto}%'),
+                Docente.curp.ilike(f'%{texto}%'),
+                Docente.rfc.ilike(f'%{texto}%'),
+                Docente.orcid.ilike(f'%{texto}%')
+            )
+        )
+    # Área: la del empleo actual
+    if area:
+        consulta = consulta.join(Empleo, Empleo.docente_id == Docente.id).where(
+            Empleo.actual == True,
+            Empleo.area_adscripcion.ilike(f'%{area}%')
+        )
+    # Nivel: cualquier grado registrado con ese nivel
+    if nivel:
+        consulta = consulta.join(FormacionAcademica, FormacionAcademica.docente_id == Docente.id).where(
+            FormacionAcademica.nivel == nivel
+        )
+    return consulta
+
+
+def ids_docentes(texto='', area='', nivel=''):
+    """Ids (ordenados) de los docentes que cumplen los filtros"""
+    consulta = filtrar_docentes(select(Docente.id), texto, area, nivel)
+    return db.session.execute(consulta.distinct().order_by(Docente.id)).scalars().all()
+
+
+class _Sumidero:
+    """Destino sin ``seek`` para ``ZipFile``: acumula lo escrito hasta que se vacía"""
+
+    def __init__(self):
+        self._partes = []
+
+    def write(self, datos):
+        self._partes.append(bytes(datos))
+        return len(datos)
+
+    def flush(self):
+        pass
+
+    def vaciar(self):
+        datos = b''.join(self._partes)
+        self._partes.clear()
+        return datos
+
+
+class ExportacionCV:
+    """Renderizar los CVs de varios docentes y empaquetarlos en un ZIP por bloques"""
+
+    def __init__(self, gestor, cache, plantilla='basico', formato='pdf', tamano_lote=20):
+        """
+        Args:
+            gestor: ``GestorTrabajos`` cuyo pool renderiza los CVs
+            cache: Caché de CVs; los CVs ya generados no se vuelven a renderizar
+            plantilla: Una de ``PLANTILLAS``
+            formato: 'pdf' o 'word' (Word solo con la plantilla 'basico')
+            tamano_lote: Docentes que se cargan de la BD a la vez
+        """
+        if plantilla not in PLANTILLAS:
+            raise ValueError(f'Plantilla no soportada: {plantilla}')
+        if plantilla != 'basico' and formato != 'pdf':
+            raise ValueError(f'La plantilla {plantilla} solo se genera en PDF')
+        self.gestor = gestor
+        self.cache = cache
+        self.plantilla = plantilla
+        self.formato = formato
+        self.extension = CVGeneratorService.extension(formato)
+        self.tamano_lote = tamano_lote
+        self.loader = ProfileLoader(ContextoCV.COLECCIONES)
+
+        if plantilla == 'basico':
+            self.parametros = CVGeneratorService.parametros_cache('academico', None)
+        else:
+            self.secciones = {clave: True for clave in CVPDFGenerator.SECCIONES}
+            self.parametros = CVPDFGenerator.parametros_cache(self.secciones, plantilla)
+
+    def _tarea(self, perfil):
+        if self.plantilla == 'basico':
+            return {'tipo': 'cv_service', 'perfil': perfil, 'formato': self.formato,
+                    'tipo_cv': 'academico', 'sections': None}
+        return {'tipo': 'cv_pdf', 'contexto': ContextoCV.desde_perfil(perfil),
+                'secciones': self.secciones, 'plantilla': self.plantilla}
+
+    def _nombre_entrada(self, docente):
+        nombre = re.sub(r'[^\w.-]+', '_', docente.nombre_completo or '').strip('_') or 'Docente'
+        return f'CV_{nombre}_{docente.id}.{self.extension}'
+
+    def _resultados(self, docente_ids):
+        """``(nombre, datos, error)`` de cada docente, lote por lote
+
+        Dentro de un lote los CVs en caché salen primero y los demás en el
+        orden en que el pool los termina.
+        """
+        for inicio in range(0, len(docente_ids), self.tamano_lote):
+            perfiles = self.loader.cargar_varios(docente_ids[inicio:inicio + self.tamano_lote])
+            tareas = []
+            for perfil in perfiles.values():
+                nombre = self._nombre_entrada(perfil.docente)
+                guardado = self.cache.buscar(perfil.id, perfil.version, self.extension, self.parametros)
+                if guardado is not None:
+                    yield nombre, guardado, None
+                else:
+                    tareas.append(((perfil.id, perfil.version, nombre), self._tarea(perfil)))
+
+            for (docente_id, version, nombre), datos, error in self.gestor.mapear(tareas):
+                if datos is not None:
+                    self.cache.guardar(docente_id, version, self.extension, self.parametros, datos)
+                yield nombre, datos, error
+
+    def generar(self, docente_ids):
+        """Producir los bytes del ZIP por bloques, uno por CV terminado
+
+        Los CVs que fallan no interrumpen la exportación: se listan en
+        ``errores.txt`` dentro del mismo ZIP.
+        """
+        docente_ids = list(docente_ids)
+        sumidero = _Sumidero()
+        errores = []
+        # Los PDF y DOCX ya vienen comprimidos: se guardan sin volver a comprimir
+        with zipfile.ZipFile(sumidero, 'w', compression=zipfile.ZIP_STORED) as archivo:
+            for nombre, datos, error in self._resultados(docente_ids):
+                if error is not None:
+                    errores.append(f'{nombre}: {error}')
+                    continue
+                archivo.writestr(nombre, datos)
+                yield sumidero.vaciar()
+            if errores:
+                archivo.writestr('errores.txt', '\n'.join(errores) + '\n')
+        yield sumidero.vaciar()
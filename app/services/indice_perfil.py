@@ -0,0 +1,249 @@
+"""Índice de recuperación (BM25) sobre todos los registros del CV de un docente.
+
+El chatbot antes mandaba al modelo un recorte fijo del CV (10 artículos, 3
+formaciones, 5 congresos...) sin importar la pregunta: el prompt pesaba lo
+mismo para un saludo y las preguntas sobre registros viejos no tenían
+respuesta. Con el índice, el prompt lleva solo los registros que se parecen a
+la pregunta (BM25 sobre las palabras de cada registro). Las palabras que
+nombran una colección ("congresos", "tesis", "artículos") no se puntúan:
+restringen la búsqueda a esa colección, y si la pregunta no dice nada más
+("¿qué congresos tengo?") se devuelven sus registros más recientes.
+
+El índice de un docente se conserva entre versiones del perfil: al cambiar la
+versión, ``IndicePerfil.actualizar`` compara los registros nuevos con los
+indexados y solo vuelve a tokenizar los que cambiaron.
+"""
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter, namedtuple
+from app.services.profile_loader import orden_desc
+
+# Palabras que no ayudan a distinguir registros
+PALABRAS_VACIAS = frozenset('''
+a al algo algun alguna algunas alguno algunos ante asi aun cada como con cual cuales cuando
+cuanta cuantas cuanto cuantos de del desde donde dos el ella ellas ellos en entre era es esa
+esas ese eso esos esta estan estas este esto estos fue fueron ha han hay hasta he la las le
+les lo los mas me mi mis mucho muy nada ni no nos o otra otras otro otros para pero poco por
+porque que quien se ser si sin sobre son su sus tambien te tengo tiene tienen todo todos tu
+tus un una unas uno unos y ya yo dime dame muestrame mio mia mios mias
+'''.split())
+
+K1 = 1.5
+B = 0.75
+
+
+def normalizar(texto):
+    """Minúsculas y sin acentos"""
+    texto = unicodedata.normalize('NFKD', texto.lower())
+    return ''.join(c for c in texto if not unicodedata.combining(c))
+
+
+def _raiz(palabra):
+    # Plurales regulares: "artículos" -> "articulo", "universidades" -> "universidad"
+    if len(palabra) > 5 and palabra.endswith('es') and palabra[-3] in 'dlnrz':
+        return palabra[:-2]
+    if len(palabra) > 3 and palabra.endswith('s') and not palabra.endswith('is'):
+        return palabra[:-1]
+    return palabra
+
+
+def tokenizar(texto):
+    """Términos de un texto: minúsculas, sin acentos, sin palabras vacías ni plurales"""
+    return [
+        _raiz(palabra)
+        for palabra in re.findall(r'\w+', normalizar(texto or ''))
+        if len(palabra) > 1 and palabra not in PALABRAS_VACIAS
+    ]
+
+
+class IndiceBM25:
+    """Índice invertido con puntuación BM25; admite agregar y quitar documentos"""
+
+    def __init__(self, k1=K1, b=B):
+        self.k1 = k1
+        self.b = b
+        self._postings = {}   # término -> {clave: frecuencia}
+        self._longitudes = {}  # clave -> número de términos
+        self._vocabulario = {}  # clave -> términos distintos del documento
+        self._longitud_total = 0
+
+    def __len__(self):
+        return len(self._longitudes)
+
+    def agregar(self, clave, terminos):
+        if clave in self._longitudes:
+            self.quitar(clave)
+        frecuencias = Counter(terminos)
+        for termino, frecuencia in frecuencias.items():
+            self._postings.setdefault(termino, {})[clave] = frecuencia
+        self._vocabulario[clave] = tuple(frecuencias)
+        self._longitudes[clave] = len(terminos)
+        self._longitud_total += len(terminos)
+
+    def quitar(self, clave):
+        longitud = self._longitudes.pop(clave, None)
+        if longitud is None:
+            return
+        self._longitud_total -= longitud
+        for termino in self._vocabulario.pop(clave):
+            del self._postings[termino][clave]
+            if not self._postings[termino]:
+                del self._postings[termino]
+
+    def puntuar(self, terminos):
+        """``{clave: puntuación}`` de los documentos que contienen algún término"""
+        total = len(self._longitudes)
+        if not total:
+            return {}
+        promedio = self._longitud_total / total or 1
+        puntuaciones = {}
+        for termino in set(terminos):
+            documentos = self._postings.get(termino)
+            if not documentos:
+                continue
+            idf = math.log(1 + (total - len(documentos) + 0.5) / (len(documentos) + 0.5))
+            for clave, frecuencia in documentos.items():
+                norma = self.k1 * (1 - self.b + self.b * self._longitudes[clave] / promedio)
+                puntuaciones[clave] = puntuaciones.get(clave, 0.0) + idf * frecuencia * (self.k1 + 1) / (frecuencia + norma)
+        return puntuaciones
+
+
+def _anio(valor):
+    return getattr(valor, 'year', valor)
+
+
+def _unir(*partes):
+    return ', '.join(str(p) for p in partes if p not in (None, ''))
+
+
+# coleccion: de PerfilDocente; etiqueta: palabras con que la pregunta nombra la colección;
+# columnas: las que se indexan; reciente: columna para desempatar (None: por id);
+# linea: texto del registro en el prompt
+Fuente = namedtuple('Fuente', 'coleccion etiqueta columnas reciente linea')
+
+FUENTES = (
+    Fuente('articulos', 'artículo científico publicación revista',
+           ('titulo', 'revista', 'anio', 'autores', 'indexacion', 'doi', 'estado'), 'anio',
+           lambda r: f"Artículo: {r.titulo} ({r.anio or 's/f'})" + (f", {r.revista}" if r.revista else '')),
+    Fuente('libros', 'libro capítulo publicación',
+           ('titulo', 'titulo_capitulo', 'editorial', 'anio', 'autores', 'isbn', 'tipo'), 'anio',
+           lambda r: f"Libro: {_unir(r.titulo, r.titulo_capitulo, r.editorial)} ({r.anio or 's/f'})"),
+    Fuente('congresos', 'congreso ponencia evento',
+           ('nombre_congreso', 'titulo_ponencia', 'tipo', 'fecha', 'pais', 'ciudad', 'tipo_participacion'), 'fecha',
+           lambda r: f"Congreso: {_unir(r.nombre_congreso, r.titulo_ponencia, r.ciudad, _anio(r.fecha))}"),
+    Fuente('cursos', 'curso impartido docencia materia',
+           ('nombre_curso', 'programa_educativo', 'nivel', 'fecha_inicio'), 'fecha_inicio',
+           lambda r: f"Curso impartido: {_unir(r.nombre_curso, r.programa_educativo, _anio(r.fecha_inicio))}"),
+    Fuente('proyectos', 'proyecto',
+           ('nombre_proyecto', 'linea_investigacion', 'objetivo_general', 'financiamiento', 'estado',
+            'instituciones_colaboradoras', 'fecha_inicio'), 'fecha_inicio',
+           lambda r: f"Proyecto: {_unir(r.nombre_proyecto, r.linea_investigacion, r.estado)}"),
+    Fuente('tesis', 'tesis dirigida estudiante',
+           ('titulo', 'nivel', 'institucion', 'estudiante_nombre', 'estado', 'fecha_fin'), 'fecha_fin',
+           lambda r: f"Tesis dirigida: {_unir(r.titulo, r.nivel, r.estudiante_nombre, _anio(r.fecha_fin))}"),
+    Fuente('desarrollos', 'desarrollo tecnológico',
+           ('nombre', 'tipo', 'nivel_madurez', 'descripcion', 'aplicacion_practica'), None,
+           lambda r: f"Desarrollo tecnológico: {_unir(r.nombre, r.tipo)}"),
+    Fuente('formaciones', 'formación académica grado',
+           ('nivel', 'grado_obtenido', 'institucion', 'pais', 'fecha_fin', 'titulo_trabajo',
+            'area_conocimiento', 'disciplina'), 'fecha_fin',
+           lambda r: f"Formación: {_unir(r.nivel, r.grado_obtenido, r.institucion, _anio(r.fecha_fin))}"),
+    Fuente('empleos', 'empleo experiencia laboral trabajo puesto',
+           ('puesto', 'institucion', 'area_adscripcion', 'tipo_contrato', 'fecha_inicio', 'logros'), 'fecha_inicio',
+           lambda r: f"Empleo: {_unir(r.puesto, r.institucion, 'actual' if r.actual else _anio(r.fecha_fin))}"),
+    Fuente('idiomas', 'idioma lengua', ('idioma', 'nivel', 'certificacion'), None,
+           lambda r: f"Idioma: {_unir(r.idioma, r.nivel, r.certificacion)}"),
+    Fuente('actividades', 'actividad', ('categoria', 'titulo', 'descripcion', 'fecha'), 'fecha',
+           lambda r: f"Actividad ({r.categoria}): {_unir(r.titulo, _anio(r.fecha))}"),
+)
+
+
+# término de una etiqueta -> colecciones que nombra
+ETIQUETAS = {}
+for _fuente in FUENTES:
+    for _termino in tokenizar(f'{_fuente.coleccion} {_fuente.etiqueta}'):
+        ETIQUETAS.setdefault(_termino, set()).add(_fuente.coleccion)
+
+
+def _terminos(fuente, registro):
+    partes = []
+    for columna in fuente.columnas:
+        valor = getattr(registro, columna)
+        if valor is not None:
+            partes.append(str(_anio(valor)))
+    return tokenizar(' '.join(partes))
+
+
+class IndicePerfil:
+    """Índice BM25 de los registros de un docente, actualizado por diferencias"""
+
+    def __init__(self, docente_id):
+        self.docente_id = docente_id
+        self.version = None
+        self._indice = IndiceBM25()
+        self._registros = {}  # (colección, id) -> Registro indexado
+        self._orden = {}      # (colección, id) -> posición por recencia (desempate)
+        self._lineas = {}     # (colección, id) -> línea para el prompt
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._indice)
+
+    def actualizar(self, perfil):
+        """Sincronizar el índice con ``perfil``; devuelve ``(agregados, quitados)``
+
+        Los registros sin cambios no se vuelven a tokenizar. Una instantánea más
+        vieja que la indexada se ignora.
+        """
+        with self._lock:
+            if self.version is not None and perfil.version < self.version:
+                return 0, 0
+            vigentes = {}
+            orden = {}
+            for fuente in FUENTES:
+                registros = getattr(perfil, fuente.coleccion)
+                if fuente.reciente:
+                    registros = orden_desc(registros, fuente.reciente)
+                for registro in registros:
+                    clave = (fuente.coleccion, registro.id)
+                    vigentes[clave] = (fuente, registro)
+                    orden[clave] = len(orden)
+
+            quitados = [clave for clave in self._registros if clave not in vigentes]
+            for clave in quitados:
+                self._indice.quitar(clave)
+                del self._registros[clave], self._lineas[clave]
+
+            agregados = 0
+            for clave, (fuente, registro) in vigentes.items():
+                if self._registros.get(clave) == registro:
+                    continue
+                self._indice.agregar(clave, _terminos(fuente, registro))
+                self._registros[clave] = registro
+                self._lineas[clave] = fuente.linea(registro)
+                agregados += 1
+
+            self._orden = orden
+            self.version = perfil.version
+            return agregados, len(quitados)
+
+    def buscar(self, consulta, limite=8):
+        """Líneas de los ``limite`` registros más relevantes para ``consulta``
+
+        Los empates (p. ej. "¿qué artículos tengo?", que nombra la colección y
+        nada más) se resuelven por recencia: lo más reciente primero.
+        """
+        terminos = tokenizar(consulta)
+        colecciones = set().union(*(ETIQUETAS.get(t, ()) for t in terminos))
+        contenido = [t for t in terminos if t not in ETIQUETAS]
+        with self._lock:
+            puntuaciones = self._indice.puntuar(contenido) if contenido else {}
+            if colecciones:
+                puntuaciones = {c: p for c, p in puntuaciones.items() if c[0] in colecciones}
+                if not puntuaciones:
+                    # Solo se nombró la colección: sus registros, por recencia
+                    puntuaciones = {c: 0.0 for c in self._orden if c[0] in colecciones}
+            mejores = sorted(puntuaciones, key=lambda clave: (-puntuaciones[clave], self._orden[clave]))
+            return [self._lineas[clave] for clave in mejores[:limite]]
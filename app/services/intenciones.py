@@ -0,0 +1,227 @@
+"""Interpretación local de las solicitudes de actualización del perfil.
+
+Antes, cada mensaje con palabras como "pon" o "cambia" costaba una llamada al
+modelo solo para sacar un campo y un valor. Las frases habituales ("mi orcid
+es X", "actualiza mi correo a Y") se reconocen aquí con expresiones regulares
+armadas desde ``CAMPOS_ACTUALIZABLES`` y el valor se valida según el campo.
+Cuando el mensaje es ambiguo (negación, pregunta, más de un campo, un valor
+que no pasa la validación) ``interpretar_actualizacion`` devuelve None y el
+chatbot recurre al modelo como antes.
+
+El valor se guarda sin confirmación, así que la validación es estricta: se
+quitan las fórmulas de cortesía del final ("por favor", "gracias"), un valor
+que sigue con otra oración ("Ana y necesito ayuda…") se rechaza, los nombres
+tienen un máximo de palabras, nacionalidad y estado civil se comparan contra
+listas cerradas y el domicilio, texto libre, solo se acepta entre comillas o
+tras dos puntos.
+"""
+import re
+import unicodedata
+from app.models.docente import Docente
+
+# Campos del perfil que se pueden actualizar via chatbot
+CAMPOS_ACTUALIZABLES = {
+    'nombre': 'nombre_completo',
+    'nombre_completo': 'nombre_completo',
+    'nombre completo': 'nombre_completo',
+    'email': 'correo_principal',
+    'correo': 'correo_principal',
+    'correo_principal': 'correo_principal',
+    'correo principal': 'correo_principal',
+    'correo electrónico': 'correo_principal',
+    'correo electronico': 'correo_principal',
+    'orcid': 'orcid',
+    'cvu': 'cvu',
+    'curp': 'curp',
+    'rfc': 'rfc',
+    'sexo': 'sexo',
+    'género': 'sexo',
+    'genero': 'sexo',
+    'nacionalidad': 'nacionalidad',
+    'pais_nacimiento': 'pais_nacimiento',
+    'país de nacimiento': 'pais_nacimiento',
+    'pais de nacimiento': 'pais_nacimiento',
+    'estado_civil': 'estado_civil',
+    'estado civil': 'estado_civil',
+    'domicilio': 'domicilio',
+    'direccion': 'domicilio',
+    'dirección': 'domicilio',
+    'researcher_id': 'researcher_id',
+    'scopus_author_id': 'scopus_author_id',
+    'scopus': 'scopus_author_id',
+}
+
+
+def _alternativas(alias):
+    # Los más largos primero: "nombre completo" antes que "nombre"
+    partes = (r'[\s_]+'.join(map(re.escape, re.split(r'[\s_]+', a)))
+              for a in sorted(alias, key=len, reverse=True))
+    return '|'.join(partes)
+
+
+# Alias normalizado ("pais nacimiento", "researcher id") -> campo del modelo
+_ALIAS = {re.sub(r'[\s_]+', ' ', alias): campo for alias, campo in CAMPOS_ACTUALIZABLES.items()}
+_CAMPO = rf'(?P<campo>{_alternativas(CAMPOS_ACTUALIZABLES)})'
+_VERBO = (r'(?:actualiz|actualic|cambi|modific|edit|registr|guard|establec|configur)(?:a|ar|e)'
+          r'|pon(?:er|gas?)?')
+
+# "actualiza mi correo a X", "quiero cambiar el orcid por X", "pon mi cvu: X"
+_PATRON_VERBO = re.compile(
+    rf'\b(?:{_VERBO})\s+(?:mi|el|la)\s+(?:nuev[oa]\s+)?{_CAMPO}'
+    r'(?:\s+(?:a|por|en|como|con)\s+|\s*(?P<delimitador>[:=])\s*)(?P<valor>.+)$',
+    re.IGNORECASE
+)
+# "mi orcid es X", "mi nuevo correo es: X", "quiero que mi domicilio sea X"
+_PATRON_ES = re.compile(
+    rf'\bmi\s+(?:nuev[oa]\s+)?{_CAMPO}\s+(?:ahora\s+)?(?:es|sea|será|sera)\s*(?P<delimitador>:)?\s+(?P<valor>.+)$',
+    re.IGNORECASE
+)
+_MENCION_CAMPO = re.compile(rf'\b{_CAMPO}\b', re.IGNORECASE)
+_NEGACION = re.compile(r'\b(?:no|nunca|jamás|jamas)\b', re.IGNORECASE)
+_PREGUNTA = re.compile(r'^\W*(?:cuál|cual|qué|que|cómo|como|dónde|donde|por\s+qué|cuándo|cuando)\b', re.IGNORECASE)
+
+_EMAIL = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_ORCID = re.compile(r'^(?:https?://(?:www\.)?orcid\.org/)?(\d{4}-\d{4}-\d{4}-\d{3}[\dX])$', re.IGNORECASE)
+_CURP = re.compile(r'^[A-Z]{4}\d{6}[HMX][A-Z]{5}[A-Z\d]\d$')
+_RFC = re.compile(r'^[A-ZÑ&]{3,4}\d{6}(?:[A-Z\d]{3})?$')
+_NOMBRE = re.compile(r"^[^\W\d_]+\.?(?:[\s'-]+[^\W\d_]+\.?)*$")
+_MAX_PALABRAS_NOMBRE = 6
+# Fórmulas de cortesía al final del mensaje, fuera del valor
+_CORTESIA = re.compile(r'[\s,;]*\b(?:por\s+favor|porfa(?:vor)?|gracias|please)\W*$', re.IGNORECASE)
+# Conectores que indican que el mensaje sigue después del valor
+_CONECTORES = re.compile(r'(?:^|\s)(?:y|e|que|para|con|porque|pero|pues)(?=\s|,|$)', re.IGNORECASE)
+_NACIONALIDADES = {
+    f'{raiz}{final}'
+    for raiz in ('mexican', 'guatemaltec', 'hondureñ', 'salvadoreñ', 'panameñ', 'cuban', 'dominican',
+                 'puertorriqueñ', 'colombian', 'venezolan', 'ecuatorian', 'peruan', 'bolivian', 'chilen',
+                 'argentin', 'uruguay', 'paraguay', 'brasileñ', 'español', 'italian', 'britanic', 'chin',
+                 'corean', 'rus', 'ucranian', 'suec')
+    for final in ('o', 'a')
+} | {
+    'estadounidense', 'canadiense', 'nicaragüense', 'costarricense', 'beliceña', 'beliceño',
+    'francés', 'francesa', 'alemán', 'alemana', 'portugués', 'portuguesa', 'inglés', 'inglesa',
+    'japonés', 'japonesa', 'hindú', 'india', 'indio', 'polaco', 'polaca', 'holandés', 'holandesa',
+    'suizo', 'suiza', 'austriaco', 'austriaca', 'belga', 'irlandés', 'irlandesa',
+}
+_ESTADOS_CIVILES = {
+    'soltero', 'soltera', 'casado', 'casada', 'divorciado', 'divorciada', 'viudo', 'viuda',
+    'separado', 'separada', 'unión libre', 'concubinato',
+}
+# Texto libre: solo se acepta entre comillas o tras dos puntos
+_CAMPOS_LIBRES = {'domicilio'}
+_SEXOS = {
+    'masculino': 'Masculino', 'hombre': 'Masculino',
+    'femenino': 'Femenino', 'mujer': 'Femenino',
+    'otro': 'Otro', 'no binario': 'Otro',
+}
+
+
+def _validar_texto(patron=None, mayusculas=False):
+    def validar(valor):
+        if mayusculas:
+            valor = valor.upper()
+        if patron is not None and not patron.match(valor):
+            return None
+        return valor
+    return validar
+
+
+def _sin_acentos(texto):
+    # "ü" y "ñ" se conservan: distinguen palabras en español
+    descompuesto = unicodedata.normalize('NFD', texto.lower())
+    return unicodedata.normalize('NFC', re.sub(r'[\u0301\u0300]', '', descompuesto))
+
+
+def _validar_lista(permitidos):
+    normalizados = {_sin_acentos(valor) for valor in permitidos}
+
+    def validar(valor):
+        return valor if _sin_acentos(re.sub(r'\s+', ' ', valor)) in normalizados else None
+    return validar
+
+
+def _validar_nombre(valor):
+    if len(valor.split()) > _MAX_PALABRAS_NOMBRE:
+        return None
+    return valor if _NOMBRE.match(valor) else None
+
+
+def _validar_orcid(valor):
+    coincidencia = _ORCID.match(valor)
+    return coincidencia.group(1).upper() if coincidencia else None
+
+
+# campo del modelo -> función que devuelve el valor normalizado o None si no es válido
+VALIDADORES = {
+    'nombre_completo': _validar_nombre,
+    'correo_principal': _validar_texto(_EMAIL),
+    'orcid': _validar_orcid,
+    'cvu': _validar_texto(re.compile(r'^\d+$')),
+    'curp': _validar_texto(_CURP, mayusculas=True),
+    'rfc': _validar_texto(_RFC, mayusculas=True),
+    'sexo': lambda valor: _SEXOS.get(valor.lower()),
+    'nacionalidad': _validar_lista(_NACIONALIDADES),
+    'pais_nacimiento': _validar_nombre,
+    'estado_civil': _validar_lista(_ESTADOS_CIVILES),
+    'domicilio': _validar_texto(),
+    'researcher_id': _validar_texto(re.compile(r'^[A-Z]{1,3}-\d{4}-\d{4}$'), mayusculas=True),
+    'scopus_author_id': _validar_texto(re.compile(r'^\d{10,11}$')),
+}
+
+
+def _campo_real(alias):
+    return _ALIAS[re.sub(r'[\s_]+', ' ', alias.lower())]
+
+
+def _limpiar_valor(valor):
+    """``(valor, entre_comillas)`` sin puntuación final ni fórmulas de cortesía"""
+    valor = _CORTESIA.sub('', valor.strip()).rstrip('.!?¡¿ ').strip()
+    # Comillas alrededor del valor
+    if len(valor) >= 2 and valor[0] + valor[-1] in ('""', "''", '«»', '“”'):
+        return valor[1:-1].strip(), True
+    return valor, False
+
+
+def validar_valor(campo, valor, delimitado=False):
+    """Valor normalizado para ``campo`` (columna de ``Docente``) o None si no es válido
+
+    ``delimitado`` indica que el valor venía tras dos puntos; igual que un
+    valor entre comillas, se toma completo aunque contenga conectores.
+    """
+    valor, entre_comillas = _limpiar_valor(valor)
+    delimitado = delimitado or entre_comillas
+    if not valor:
+        return None
+    if not delimitado and (campo in _CAMPOS_LIBRES or _CONECTORES.search(valor)):
+        return None
+    longitud = getattr(Docente.__table__.columns[campo].type, 'length', None)
+    if longitud and len(valor) > longitud:
+        return None
+    return VALIDADORES[campo](valor)
+
+
+def interpretar_actualizacion(mensaje):
+    """``{"campo": ..., "valor": ...}`` si el mensaje pide sin ambigüedad actualizar un campo
+
+    Devuelve None cuando el mensaje no sigue una de las frases conocidas o
+    cuando no es seguro interpretarlo sin el modelo.
+    """
+    mensaje = mensaje.strip()
+    if _PREGUNTA.match(mensaje):
+        return None
+
+    coincidencia = _PATRON_VERBO.search(mensaje) or _PATRON_ES.search(mensaje)
+    if coincidencia is None or _NEGACION.search(mensaje, 0, coincidencia.start('valor')):
+        return None
+
+    # Si se menciona otro campo (p. ej. "... y mi cvu a Y") lo resuelve el modelo
+    mencionados = {_campo_real(m.group('campo')) for m in _MENCION_CAMPO.finditer(mensaje)}
+    campo = _campo_real(coincidencia.group('campo'))
+    if mencionados != {campo}:
+        return None
+
+    valor = validar_valor(campo, coincidencia.group('valor'), delimitado=bool(coincidencia.group('delimitador')))
+    if valor is None:
+        return None
+    return {'campo': campo, 'valor': valor}
+
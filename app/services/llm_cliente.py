@@ -0,0 +1,147 @@
+"""Cliente de Groq compartido por todo el proceso.
+
+``ChatbotService`` se crea en cada petición; antes cada instancia armaba su
+propio ``Groq`` con un pool HTTP nuevo, así que cada turno del chat pagaba
+TCP + TLS hasta la API. Aquí el cliente se crea una sola vez por proceso
+(de forma perezosa, después del fork de gunicorn) y sus conexiones
+keep-alive se reutilizan entre turnos y entre hilos: ``httpx.Client`` es
+seguro entre hilos.
+
+El streaming ASGI (``app.chat_asgi``) usa además un ``AsyncGroq`` con los
+mismos límites, uno por event loop.
+
+El backend es intercambiable (``LLM_BACKEND``): quien use el proveedor solo
+cuenta con la interfaz del SDK compatible con OpenAI (``chat.completions.create``,
+sus tipos de respuesta y sus excepciones).
+
+* ``'groq'``: la API de Groq, o cualquier servidor compatible en ``LLM_BASE_URL``;
+* ``'simulado'``: ``app.services.llm_simulado`` en el mismo proceso, sin red ni
+  cuota (pruebas de carga y desarrollo).
+"""
+import asyncio
+import atexit
+import os
+import threading
+import httpx
+from flask import current_app
+from groq import AsyncGroq, DefaultAsyncHttpxClient, DefaultHttpxClient, Groq
+from app.services.llm_simulado import ClienteSimulado, ClienteSimuladoAsync, ModeloSimulado
+
+BACKENDS = ('groq', 'simulado')
+
+
+class ProveedorLLM:
+    """Crea y conserva el cliente LLM del proceso según ``LLM_*``"""
+
+    def __init__(self, api_key, modelo='llama-3.3-70b-versatile', max_conexiones=20,
+                 max_keepalive=10, keepalive_expira=60, timeout_conexion=5, timeout_lectura=60,
+                 max_reintentos=2, backend='groq', base_url=None, simulado=None):
+        if backend not in BACKENDS:
+            raise ValueError(f"LLM_BACKEND desconocido: {backend!r} (opciones: {', '.join(BACKENDS)})")
+        self.api_key = api_key
+        self.modelo = modelo
+        self.backend = backend
+        self.base_url = base_url
+        self.simulado = simulado or (ModeloSimulado() if backend == 'simulado' else None)
+        self.max_reintentos = max_reintentos
+        self.limites = httpx.Limits(
+            max_connections=max_conexiones,
+            max_keepalive_connections=max_keepalive,
+            keepalive_expiry=keepalive_expira
+        )
+        self.timeout = httpx.Timeout(timeout_lectura, connect=timeout_conexion)
+        self._cliente = None
+        self._pid = None
+        self._cliente_async = None
+        self._loop_async = None
+        self._lock = threading.Lock()
+
+    def _validar(self):
+        if self.backend == 'groq' and not self.api_key:
+            raise ValueError("GROQ_API_KEY no está configurada")
+
+    def _crear_cliente(self):
+        if self.backend == 'simulado':
+            return ClienteSimulado(self.simulado)
+        return Groq(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            max_retries=self.max_reintentos,
+            timeout=self.timeout,
+            http_client=DefaultHttpxClient(limits=self.limites, timeout=self.timeout)
+        )
+
+    def _crear_cliente_async(self):
+        if self.backend == 'simulado':
+            return ClienteSimuladoAsync(self.simulado)
+        return AsyncGroq(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            max_retries=self.max_reintentos,
+            timeout=self.timeout,
+            http_client=DefaultAsyncHttpxClient(limits=self.limites, timeout=self.timeout)
+        )
+
+    def cliente(self):
+        """Cliente del backend para el proceso actual (se crea en el primer uso)"""
+        # Un hijo creado con fork no debe reutilizar los sockets del padre
+        if self._cliente is not None and self._pid == os.getpid():
+            return self._cliente
+        self._validar()
+        with self._lock:
+            if self._cliente is None or self._pid != os.getpid():
+                self._cliente = self._crear_cliente()
+                self._pid = os.getpid()
+            return self._cliente
+
+    def cliente_async(self):
+        """Cliente asíncrono del event loop actual (sus conexiones pertenecen a ese loop)"""
+        loop = asyncio.get_running_loop()
+        if self._cliente_async is not None and self._loop_async is loop:
+            return self._cliente_async
+        self._validar()
+        with self._lock:
+            if self._cliente_async is None or self._loop_async is not loop:
+                self._cliente_async = self._crear_cliente_async()
+                self._loop_async = loop
+            return self._cliente_async
+
+    async def cerrar_async(self):
+        with self._lock:
+            cliente, self._cliente_async = self._cliente_async, None
+            self._loop_async = None
+        if cliente is not None:
+            await cliente.close()
+
+    def cerrar(self):
+        with self._lock:
+            cliente, self._cliente = self._cliente, None
+        if cliente is not None and self._pid == os.getpid():
+            cliente.close()
+
+
+def init_app(app):
+    """Crear el proveedor del cliente LLM según ``GROQ_*``/``LLM_*``"""
+    backend = app.config.get('LLM_BACKEND', 'groq')
+    proveedor = ProveedorLLM(
+        os.getenv('GROQ_API_KEY') or app.config.get('GROQ_API_KEY'),
+        modelo=app.config.get('GROQ_MODEL', 'llama-3.3-70b-versatile'),
+        max_conexiones=app.config.get('LLM_POOL_MAX_CONEXIONES', 20),
+        max_keepalive=app.config.get('LLM_POOL_MAX_KEEPALIVE', 10),
+        keepalive_expira=app.config.get('LLM_POOL_KEEPALIVE_EXPIRA', 60),
+        timeout_conexion=app.config.get('LLM_TIMEOUT_CONEXION', 5),
+        timeout_lectura=app.config.get('LLM_TIMEOUT_LECTURA', 60),
+        # Los reintentos (LLM_MAX_REINTENTOS) los hace el planificador: así los 429 frenan a todo el proceso
+        max_reintentos=0,
+        backend=backend,
+        base_url=app.config.get('LLM_BASE_URL'),
+        simulado=ModeloSimulado.desde_config(app.config) if backend == 'simulado' else None
+    )
+    atexit.register(proveedor.cerrar)
+    app.extensions['llm'] = proveedor
+    return proveedor
+
+
+def obtener_proveedor_llm():
+    """Proveedor del cliente LLM de la app actual"""
+    return current_app.extensions['llm']
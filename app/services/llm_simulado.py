@@ -0,0 +1,311 @@
+"""Backend LLM local que imita a la API compatible con OpenAI de Groq, sin gastar cuota.
+
+Sirve para medir latencia y concurrencia del chatbot (``benchmarks/chatbot_bench.py``)
+y para desarrollar sin ``GROQ_API_KEY``. ``ModeloSimulado`` decide cada
+respuesta según la configuración:
+
+* ``latencia``: tiempo hasta el primer token, con una distribución
+  (``'fija:0.3'``, ``'uniforme:0.1:0.6'`` o ``'lognormal:0.4:0.5'``, mediana y sigma);
+* ``tokens_por_segundo``: ritmo de los tokens siguientes (0: sin espera);
+* ``tasa_429`` y ``tasa_error``: fracción de llamadas que fallan con 429
+  (con ``Retry-After``) o con 500.
+
+Se usa de dos formas:
+
+* en el mismo proceso, con ``LLM_BACKEND = 'simulado'``: ``ProveedorLLM``
+  entrega ``ClienteSimulado``/``ClienteSimuladoAsync``, que responden con los
+  mismos tipos y excepciones que el SDK de Groq;
+* como servidor HTTP, para medir también la red y el SDK real::
+
+      python -m app.services.llm_simulado --puerto 8100 --tokens-seg 40 --tasa-429 0.05
+
+  y en la app ``LLM_BASE_URL=http://127.0.0.1:8100`` (con cualquier ``GROQ_API_KEY``).
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+import groq
+import httpx
+from groq.types.chat import ChatCompletion, ChatCompletionChunk
+
+# Texto de relleno para las respuestas conversacionales
+_PALABRAS = (
+    'Según tu CV registrado, tu trayectoria incluye artículos científicos, proyectos de '
+    'investigación, cursos impartidos y dirección de tesis en tu área de conocimiento. '
+    'Te sugiero destacar las publicaciones más recientes y los proyectos con financiamiento.'
+).split()
+# Respuesta del extractor de actualizaciones del chatbot (prompts que piden JSON)
+_RESPUESTA_JSON = '{"error": "no_identificado"}'
+
+
+def distribucion_latencia(especificacion):
+    """Función ``rng -> segundos`` para ``'fija:s'``, ``'uniforme:min:max'`` o ``'lognormal:mediana:sigma'``"""
+    nombre, *parametros = str(especificacion).split(':')
+    try:
+        valores = [float(p) for p in parametros]
+        if nombre == 'fija' and len(valores) == 1:
+            return lambda rng: valores[0]
+        if nombre == 'uniforme' and len(valores) == 2:
+            return lambda rng: rng.uniform(*valores)
+        if nombre == 'lognormal' and len(valores) == 2:
+            mediana, sigma = valores
+            return lambda rng: rng.lognormvariate(0, sigma) * mediana
+    except ValueError:
+        pass
+    raise ValueError(f"Latencia simulada no válida: {especificacion!r}")
+
+
+@dataclass
+class Plan:
+    """Lo que hará una llamada: fallar con ``error`` o esperar ``latencia`` y emitir ``tokens``"""
+    latencia: float
+    tokens: list = field(default_factory=list)
+    error: int = None
+
+
+class ModeloSimulado:
+    """Decide latencia, texto y errores de cada llamada (seguro entre hilos)"""
+
+    def __init__(self, tokens_por_segundo=40.0, latencia='lognormal:0.4:0.5', tasa_error=0.0,
+                 tasa_429=0.0, retry_after=1.0, tokens_respuesta=120, semilla=None):
+        self.tokens_por_segundo = tokens_por_segundo
+        self.latencia = latencia
+        self.tasa_error = tasa_error
+        self.tasa_429 = tasa_429
+        self.retry_after = retry_after
+        self.tokens_respuesta = tokens_respuesta
+        self._latencia = distribucion_latencia(latencia)
+        self._rng = random.Random(semilla)
+        self._lock = threading.Lock()
+        self.llamadas = 0
+        self.errores = {429: 0, 500: 0}
+
+    @classmethod
+    def desde_config(cls, config):
+        return cls(
+            tokens_por_segundo=config.get('LLM_SIMULADO_TOKENS_SEG', 40.0),
+            latencia=config.get('LLM_SIMULADO_LATENCIA', 'lognormal:0.4:0.5'),
+            tasa_error=config.get('LLM_SIMULADO_TASA_ERROR', 0.0),
+            tasa_429=config.get('LLM_SIMULADO_TASA_429', 0.0),
+            retry_after=config.get('LLM_SIMULADO_RETRY_AFTER', 1.0),
+            tokens_respuesta=config.get('LLM_SIMULADO_TOKENS_RESPUESTA', 120),
+            semilla=config.get('LLM_SIMULADO_SEMILLA')
+        )
+
+    @property
+    def intervalo(self):
+        """Segundos entre un token y el siguiente"""
+        return 1 / self.tokens_por_segundo if self.tokens_por_segundo else 0.0
+
+    def planear(self, mensajes, max_tokens=None):
+        with self._lock:
+            self.llamadas += 1
+            sorteo = self._rng.random()
+            if sorteo < self.tasa_429:
+                self.errores[429] += 1
+                return Plan(0.0, error=429)
+            if sorteo < self.tasa_429 + self.tasa_error:
+                self.errores[500] += 1
+                return Plan(0.0, error=500)
+            latencia = max(0.0, self._latencia(self._rng))
+            cantidad = self._rng.randint(max(1, self.tokens_respuesta // 2), max(1, self.tokens_respuesta))
+
+        if any(m.get('role') == 'system' and 'JSON' in (m.get('content') or '') for m in mensajes):
+            return Plan(latencia, [_RESPUESTA_JSON])
+        cantidad = min(cantidad, max_tokens or cantidad)
+        return Plan(latencia, [_PALABRAS[i % len(_PALABRAS)] + ' ' for i in range(cantidad)])
+
+    def estadisticas(self):
+        with self._lock:
+            return {'llamadas': self.llamadas, 'errores_429': self.errores[429], 'errores_500': self.errores[500]}
+
+
+def cuerpo_error(plan, retry_after):
+    """``(estado, cabeceras, cuerpo JSON)`` de la respuesta de error de ``plan``"""
+    if plan.error == 429:
+        return 429, {'retry-after': f'{retry_after:g}'}, {
+            'error': {'message': 'Rate limit reached (simulado)', 'type': 'tokens', 'code': 'rate_limit_exceeded'}
+        }
+    return 500, {}, {'error': {'message': 'Internal server error (simulado)', 'type': 'internal_server_error'}}
+
+
+def completion(plan, modelo):
+    """Cuerpo JSON de una respuesta completa (``stream=False``)"""
+    return {
+        'id': f'chatcmpl-{uuid.uuid4().hex}', 'object': 'chat.completion', 'created': int(time.time()),
+        'model': modelo,
+        'choices': [{'index': 0, 'finish_reason': 'stop',
+                     'message': {'role': 'assistant', 'content': ''.join(plan.tokens)}}],
+        'usage': {'prompt_tokens': 0, 'completion_tokens': len(plan.tokens), 'total_tokens': len(plan.tokens)},
+    }
+
+
+def chunks(plan, modelo):
+    """Cuerpos JSON de los fragmentos de una respuesta en streaming (uno por token)"""
+    identificador, creado = f'chatcmpl-{uuid.uuid4().hex}', int(time.time())
+    ultimo = len(plan.tokens) - 1
+    for i, token in enumerate(plan.tokens):
+        yield {
+            'id': identificador, 'object': 'chat.completion.chunk', 'created': creado, 'model': modelo,
+            'choices': [{'index': 0, 'finish_reason': 'stop' if i == ultimo else None,
+                         'delta': {'role': 'assistant', 'content': token} if i == 0 else {'content': token}}],
+            'x_groq': None,
+        }
+
+
+def _excepcion(plan, retry_after):
+    # La misma excepción que levantaría el SDK con la respuesta HTTP equivalente
+    estado, cabeceras, cuerpo = cuerpo_error(plan, retry_after)
+    solicitud = httpx.Request('POST', 'http://llm-simulado/openai/v1/chat/completions')
+    respuesta = httpx.Response(estado, headers=cabeceras, json=cuerpo, request=solicitud)
+    clase = groq.RateLimitError if estado == 429 else groq.InternalServerError
+    return clase(cuerpo['error']['message'], response=respuesta, body=cuerpo)
+
+
+class StreamSimulado:
+    def __init__(self, plan, modelo, intervalo):
+        self._fragmentos = chunks(plan, modelo)
+        self._intervalo = intervalo
+        self._primero = True
+        self.cerrado = False
+
+    def __iter__(self):
+        for fragmento in self._fragmentos:
+            if self.cerrado:
+                return
+            if not self._primero:
+                time.sleep(self._intervalo)
+            self._primero = False
+            yield ChatCompletionChunk.model_validate(fragmento)
+
+    def close(self):
+        self.cerrado = True
+
+
+class StreamSimuladoAsync(StreamSimulado):
+    async def __aiter__(self):
+        for fragmento in self._fragmentos:
+            if self.cerrado:
+                return
+            if not self._primero:
+                await asyncio.sleep(self._intervalo)
+            self._primero = False
+            yield ChatCompletionChunk.model_validate(fragmento)
+
+    async def close(self):
+        self.cerrado = True
+
+
+class _Completions:
+    def __init__(self, modelo):
+        self.modelo = modelo
+
+    def create(self, messages, model, stream=False, max_tokens=None, **_):
+        plan = self.modelo.planear(messages, max_tokens)
+        if plan.error:
+            raise _excepcion(plan, self.modelo.retry_after)
+        time.sleep(plan.latencia)
+        if stream:
+            return StreamSimulado(plan, model, self.modelo.intervalo)
+        time.sleep(self.modelo.intervalo * (len(plan.tokens) - 1))
+        return ChatCompletion.model_validate(completion(plan, model))
+
+
+class _CompletionsAsync(_Completions):
+    async def create(self, messages, model, stream=False, max_tokens=None, **_):
+        plan = self.modelo.planear(messages, max_tokens)
+        if plan.error:
+            raise _excepcion(plan, self.modelo.retry_after)
+        await asyncio.sleep(plan.latencia)
+        if stream:
+            return StreamSimuladoAsync(plan, model, self.modelo.intervalo)
+        await asyncio.sleep(self.modelo.intervalo * (len(plan.tokens) - 1))
+        return ChatCompletion.model_validate(completion(plan, model))
+
+
+class ClienteSimulado:
+    """Sustituto en proceso de ``groq.Groq`` (solo ``chat.completions.create``)"""
+
+    def __init__(self, modelo):
+        self.modelo = modelo
+        self.chat = SimpleNamespace(completions=_Completions(modelo))
+
+    def close(self):
+        pass
+
+
+class ClienteSimuladoAsync:
+    """Sustituto en proceso de ``groq.AsyncGroq``"""
+
+    def __init__(self, modelo):
+        self.modelo = modelo
+        self.chat = SimpleNamespace(completions=_CompletionsAsync(modelo))
+
+    async def close(self):
+        pass
+
+
+def crear_servidor(modelo):
+    """App ASGI con ``POST /openai/v1/chat/completions`` (ruta del SDK de Groq) y ``/v1/chat/completions``"""
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse, StreamingResponse
+    from starlette.routing import Route
+
+    async def chat_completions(request):
+        datos = await request.json()
+        plan = modelo.planear(datos.get('messages', []), datos.get('max_tokens'))
+        if plan.error:
+            estado, cabeceras, cuerpo = cuerpo_error(plan, modelo.retry_after)
+            return JSONResponse(cuerpo, status_code=estado, headers=cabeceras)
+        await asyncio.sleep(plan.latencia)
+        nombre = datos.get('model', 'simulado')
+        if not datos.get('stream'):
+            await asyncio.sleep(modelo.intervalo * (len(plan.tokens) - 1))
+            return JSONResponse(completion(plan, nombre))
+
+        async def eventos():
+            for i, fragmento in enumerate(chunks(plan, nombre)):
+                if i:
+                    await asyncio.sleep(modelo.intervalo)
+                yield f'data: {json.dumps(fragmento)}\n\n'
+            yield 'data: [DONE]\n\n'
+
+        return StreamingResponse(eventos(), media_type='text/event-stream')
+
+    async def estadisticas(request):
+        return JSONResponse(modelo.estadisticas())
+
+    return Starlette(routes=[
+        Route('/openai/v1/chat/completions', chat_completions, methods=['POST']),
+        Route('/v1/chat/completions', chat_completions, methods=['POST']),
+        Route('/estadisticas', estadisticas),
+    ])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8100)
+    parser.add_argument('--tokens-seg', type=float, default=40.0)
+    parser.add_argument('--latencia', default='lognormal:0.4:0.5', help="fija:s, uniforme:min:max o lognormal:mediana:sigma")
+    parser.add_argument('--tokens-respuesta', type=int, default=120)
+    parser.add_argument('--tasa-429', type=float, default=0.0)
+    parser.add_argument('--tasa-error', type=float, default=0.0)
+    parser.add_argument('--retry-after', type=float, default=1.0)
+    parser.add_argument('--semilla', type=int)
+    args = parser.parse_args(argv)
+
+    import uvicorn
+    modelo = ModeloSimulado(args.tokens_seg, args.latencia, args.tasa_error, args.tasa_429,
+                            args.retry_after, args.tokens_respuesta, args.semilla)
+    uvicorn.run(crear_servidor(modelo), host=args.host, port=args.puerto, log_level='warning')
+
+
+if __name__ == '__main__':
+    main()
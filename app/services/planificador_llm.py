@@ -0,0 +1,344 @@
+"""Planificador de las llamadas al LLM: tope global, cola justa por usuario y freno ante 429.
+
+Sin planificador, una ráfaga de mensajes llegaba toda a la vez a Groq: la API
+respondía 429, el SDK reintentaba cada llamada por su cuenta y los reintentos
+se sumaban a la ráfaga. Además, un usuario que reenvía su pregunta una y otra
+vez ocupaba los turnos de los demás. Aquí cada llamada pide un turno:
+
+* como mucho ``limite`` llamadas en curso en el proceso (``LLM_MAX_CONCURRENTES``);
+* las que esperan se atienden por turnos entre usuarios (round-robin), no por
+  orden de llegada, y cada usuario tiene un máximo de consultas pendientes
+  (``LLM_MAX_POR_USUARIO``); pasarse, o esperar más de ``LLM_COLA_ESPERA_MAXIMA``
+  segundos, levanta ``ColaLLMLlena``;
+* un 429 detiene la entrega de turnos durante su ``Retry-After`` y reduce el
+  límite a la mitad; cada ``limite`` llamadas exitosas lo suben en uno, hasta
+  el máximo configurado;
+* los reintentos (429, 5xx, errores de conexión) los hace el turno, no el SDK
+  (``ProveedorLLM`` crea los clientes con ``max_retries=0``).
+
+Cada ``Turno`` separa el tiempo en cola (incluidas las pausas por 429) del
+tiempo del modelo; ``ChatbotService`` los devuelve en la metadata de la respuesta.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+import groq
+from flask import current_app
+
+# Errores que se reintentan (el resto son del prompt o de la cuenta)
+REINTENTABLES = (groq.RateLimitError, groq.InternalServerError, groq.APIConnectionError)
+ESPERA_REINTENTO_MAXIMA = 30.0
+
+
+class ColaLLMLlena(Exception):
+    """El usuario tiene demasiadas consultas pendientes o la espera fue demasiado larga"""
+
+
+def segundos_retry_after(error):
+    """Segundos de ``Retry-After``/``retry-after-ms`` de un error de la API, o None"""
+    respuesta = getattr(error, 'response', None)
+    if respuesta is None:
+        return None
+    for cabecera, escala in (('retry-after-ms', 1000), ('retry-after', 1)):
+        try:
+            return float(respuesta.headers[cabecera]) / escala
+        except (KeyError, ValueError):
+            continue
+    return None
+
+
+class _Espera:
+    """Un pedido de turno en la cola; despierta a un hilo o a una corrutina"""
+
+    def __init__(self, usuario_id, loop=None):
+        self.usuario_id = usuario_id
+        self.concedida = False
+        self._loop = loop
+        self._evento = threading.Event() if loop is None else None
+        self._futuro = loop.create_future() if loop is not None else None
+
+    def despertar(self):
+        if self._loop is None:
+            self._evento.set()
+        else:
+            self._loop.call_soon_threadsafe(self._resolver)
+
+    def _resolver(self):
+        if not self._futuro.done():
+            self._futuro.set_result(None)
+
+    def esperar(self, timeout):
+        return self._evento.wait(timeout)
+
+    async def esperar_async(self, timeout):
+        try:
+            await asyncio.wait_for(asyncio.shield(self._futuro), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+class Turno:
+    """Permiso para una llamada al modelo, con sus tiempos"""
+
+    def __init__(self, planificador, usuario_id, cola_s):
+        self.planificador = planificador
+        self.usuario_id = usuario_id
+        self.cola_s = cola_s
+        self.modelo_s = 0.0
+        self.reintentos = 0
+        self.exito = False
+        self._concedido = time.monotonic()
+        self._pausas = 0.0
+
+    def _pausa(self, error, intento):
+        """Segundos antes de reintentar tras ``error``, o None si no se reintenta"""
+        if not isinstance(error, REINTENTABLES) or intento >= self.planificador.max_reintentos:
+            return None
+        pausa = segundos_retry_after(error)
+        if isinstance(error, groq.RateLimitError):
+            pausa = self.planificador.registrar_429(pausa)
+        elif pausa is None:
+            pausa = self.planificador.reintento_base * 2 ** intento
+        pausa = min(pausa, ESPERA_REINTENTO_MAXIMA)
+        self.reintentos += 1
+        self._pausas += pausa
+        return pausa
+
+    def llamar(self, funcion):
+        """``funcion()`` con reintentos; las pausas cuentan como tiempo en cola"""
+        intento = 0
+        while True:
+            try:
+                resultado = funcion()
+                self.exito = True
+                return resultado
+            except Exception as e:
+                pausa = self._pausa(e, intento)
+                if pausa is None:
+                    raise
+            time.sleep(pausa)
+            intento += 1
+
+    async def llamar_async(self, funcion):
+        """Como ``llamar``, para una ``funcion`` que devuelve un awaitable"""
+        intento = 0
+        while True:
+            try:
+                resultado = await funcion()
+                self.exito = True
+                return resultado
+            except Exception as e:
+                pausa = self._pausa(e, intento)
+                if pausa is None:
+                    raise
+            await asyncio.sleep(pausa)
+            intento += 1
+
+    def _terminar(self):
+        total = time.monotonic() - self._concedido
+        self.cola_s += self._pausas
+        self.modelo_s = max(0.0, total - self._pausas)
+
+    def tiempos(self):
+        return {'cola_ms': round(self.cola_s * 1000, 1), 'modelo_ms': round(self.modelo_s * 1000, 1),
+                'reintentos': self.reintentos}
+
+
+class PlanificadorLLM:
+    """Reparte los turnos de llamada al modelo entre los usuarios del proceso (seguro entre hilos)"""
+
+    def __init__(self, max_concurrentes=8, max_por_usuario=3, espera_maxima=30.0,
+                 max_reintentos=2, reintento_base=0.5):
+        self.max_concurrentes = max(1, max_concurrentes)
+        self.limite = self.max_concurrentes
+        self.max_por_usuario = max_por_usuario
+        self.espera_maxima = espera_maxima
+        self.max_reintentos = max_reintentos
+        self.reintento_base = reintento_base
+        self._lock = threading.Lock()
+        self._colas = OrderedDict()  # usuario -> deque de _Espera; el primero es el siguiente turno
+        self._pendientes = {}        # usuario -> consultas en cola o en curso
+        self._en_curso = 0
+        self._exitos = 0
+        self._pausa_hasta = 0.0
+        self._temporizador = None
+        self._totales = {'llamadas': 0, 'rechazadas': 0, 'respuestas_429': 0, 'cola_s': 0.0,
+                         'modelo_s': 0.0, 'cola_max_s': 0.0}
+
+    # -- cola -----------------------------------------------------------------
+
+    def _encolar(self, espera):
+        """Registrar el pedido; True si el turno se concede sin esperar"""
+        with self._lock:
+            pendientes = self._pendientes.get(espera.usuario_id, 0)
+            if pendientes >= self.max_por_usuario:
+                self._totales['rechazadas'] += 1
+                raise ColaLLMLlena(
+                    f'Ya tienes {pendientes} consultas al asistente en curso; espera a que termine alguna'
+                )
+            self._pendientes[espera.usuario_id] = pendientes + 1
+            if not self._colas and self._en_curso < self.limite and time.monotonic() >= self._pausa_hasta:
+                self._en_curso += 1
+                espera.concedida = True
+                return True
+            self._colas.setdefault(espera.usuario_id, deque()).append(espera)
+            # Sin llamadas en curso nadie más despacharía (p. ej. durante una pausa por 429)
+            self._despachar()
+            return espera.concedida
+
+    def _despachar(self):
+        # Con el lock tomado: conceder turnos a los siguientes usuarios de la rotación
+        pausa = self._pausa_hasta - time.monotonic()
+        if pausa > 0:
+            if self._colas and self._temporizador is None:
+                self._temporizador = threading.Timer(pausa, self._fin_de_pausa)
+                self._temporizador.daemon = True
+                self._temporizador.start()
+            return
+        while self._colas and self._en_curso < self.limite:
+            usuario_id, cola = next(iter(self._colas.items()))
+            espera = cola.popleft()
+            if cola:
+                self._colas.move_to_end(usuario_id)
+            else:
+                del self._colas[usuario_id]
+            self._en_curso += 1
+            espera.concedida = True
+            espera.despertar()
+
+    def _fin_de_pausa(self):
+        with self._lock:
+            self._temporizador = None
+            self._despachar()
+
+    def _retirar(self, espera):
+        """Sacar un pedido que dejó de esperar; False si el turno ya se le había concedido"""
+        with self._lock:
+            if espera.concedida:
+                return False
+            cola = self._colas.get(espera.usuario_id)
+            if cola is not None:
+                cola.remove(espera)
+                if not cola:
+                    del self._colas[espera.usuario_id]
+            self._descontar(espera.usuario_id)
+            return True
+
+    def _descontar(self, usuario_id):
+        if self._pendientes[usuario_id] > 1:
+            self._pendientes[usuario_id] -= 1
+        else:
+            del self._pendientes[usuario_id]
+
+    def _liberar(self, turno):
+        with self._lock:
+            self._en_curso -= 1
+            self._descontar(turno.usuario_id)
+            if turno.exito:
+                # Aumento aditivo: uno más por cada ``limite`` llamadas exitosas
+                self._exitos += 1
+                if self._exitos >= self.limite and self.limite < self.max_concurrentes:
+                    self.limite += 1
+                    self._exitos = 0
+            totales = self._totales
+            totales['llamadas'] += 1
+            totales['cola_s'] += turno.cola_s
+            totales['modelo_s'] += turno.modelo_s
+            totales['cola_max_s'] = max(totales['cola_max_s'], turno.cola_s)
+            self._despachar()
+
+    def registrar_429(self, retry_after=None):
+        """Pausar la entrega de turnos y reducir el límite; devuelve los segundos de pausa"""
+        pausa = retry_after if retry_after is not None else self.reintento_base
+        with self._lock:
+            ahora = time.monotonic()
+            # Los 429 de una misma ráfaga reducen el límite una sola vez
+            if ahora >= self._pausa_hasta:
+                self.limite = max(1, self.limite // 2)
+                self._exitos = 0
+            self._pausa_hasta = max(self._pausa_hasta, ahora + pausa)
+            self._totales['respuestas_429'] += 1
+            return self._pausa_hasta - ahora
+
+    # -- turnos ---------------------------------------------------------------
+
+    def _espera_excedida(self):
+        self._totales['rechazadas'] += 1
+        return ColaLLMLlena('El asistente está atendiendo muchas consultas; intenta de nuevo en unos segundos')
+
+    @contextmanager
+    def turno(self, usuario_id):
+        """Esperar un turno (bloquea el hilo) y liberarlo al salir del bloque"""
+        inicio = time.monotonic()
+        espera = _Espera(usuario_id)
+        if not self._encolar(espera) and not espera.esperar(self.espera_maxima) and self._retirar(espera):
+            raise self._espera_excedida()
+        turno = Turno(self, usuario_id, time.monotonic() - inicio)
+        try:
+            yield turno
+        finally:
+            turno._terminar()
+            self._liberar(turno)
+
+    @asynccontextmanager
+    async def turno_async(self, usuario_id):
+        """Como ``turno``, esperando en el event loop sin ocupar un hilo"""
+        inicio = time.monotonic()
+        espera = _Espera(usuario_id, asyncio.get_running_loop())
+        if not self._encolar(espera):
+            try:
+                concedido = await espera.esperar_async(self.espera_maxima)
+            except asyncio.CancelledError:
+                # El cliente se fue mientras esperaba: devolver el turno si ya se le había dado
+                if not self._retirar(espera):
+                    self._liberar(Turno(self, usuario_id, time.monotonic() - inicio))
+                raise
+            if not concedido and self._retirar(espera):
+                raise self._espera_excedida()
+        turno = Turno(self, usuario_id, time.monotonic() - inicio)
+        try:
+            yield turno
+        finally:
+            turno._terminar()
+            self._liberar(turno)
+
+    def llamar(self, usuario_id, funcion):
+        """``(resultado, turno)`` de ``funcion()`` en un turno de ``usuario_id``"""
+        with self.turno(usuario_id) as turno:
+            return turno.llamar(funcion), turno
+
+    def estadisticas(self):
+        with self._lock:
+            totales = dict(self._totales)
+            llamadas = totales.pop('llamadas')
+            return {
+                'limite': self.limite,
+                'en_curso': self._en_curso,
+                'en_cola': sum(len(cola) for cola in self._colas.values()),
+                'llamadas': llamadas,
+                'rechazadas': totales['rechazadas'],
+                'respuestas_429': totales['respuestas_429'],
+                'cola_media_ms': round(totales['cola_s'] * 1000 / llamadas, 1) if llamadas else None,
+                'modelo_media_ms': round(totales['modelo_s'] * 1000 / llamadas, 1) if llamadas else None,
+                'cola_max_ms': round(totales['cola_max_s'] * 1000, 1),
+            }
+
+
+def init_app(app):
+    """Crear el planificador según ``LLM_MAX_CONCURRENTES``/``LLM_MAX_POR_USUARIO``/``LLM_COLA_*``"""
+    planificador = PlanificadorLLM(
+        max_concurrentes=app.config.get('LLM_MAX_CONCURRENTES', 8),
+        max_por_usuario=app.config.get('LLM_MAX_POR_USUARIO', 3),
+        espera_maxima=app.config.get('LLM_COLA_ESPERA_MAXIMA', 30.0),
+        max_reintentos=app.config.get('LLM_MAX_REINTENTOS', 2)
+    )
+    app.extensions['planificador_llm'] = planificador
+    return planificador
+
+
+def obtener_planificador():
+    """Planificador de llamadas al LLM de la app actual"""
+    return current_app.extensions['planificador_llm']
@@ -0,0 +1,201 @@
+from dataclasses import dataclass, fields
+from sqlalchemy import func, select
+from app import db
+from app.models.user import User
+from app.models.docente import Docente
+from app.models.formacion_academica import FormacionAcademica
+from app.models.empleo import Empleo
+from app.models.idioma import Idioma
+from app.models.curso_impartido import CursoImpartido
+from app.models.proyecto_investigacion import ProyectoInvestigacion
+from app.models.articulo import Articulo
+from app.models.libro import Libro
+from app.models.congreso import Congreso
+from app.models.tesis_dirigida import TesisDirigida
+from app.models.desarrollo_tecnologico import DesarrolloTecnologico
+from app.models.actividad_general import ActividadGeneral
+from app.models.perfil_version import COLUMNAS_USUARIO, PerfilVersion
+
+
+class Registro:
+    """Copia de solo lectura de una fila; expone las columnas como atributos"""
+
+    __slots__ = ('_datos',)
+
+    def __init__(self, datos):
+        object.__setattr__(self, '_datos', dict(datos))
+
+    def __getattr__(self, nombre):
+        try:
+            return self._datos[nombre]
+        except KeyError:
+            raise AttributeError(nombre) from None
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError(f'Registro de solo lectura: no se puede asignar {nombre}')
+
+    def __reduce__(self):
+        return (Registro, (self._datos,))
+
+    def __eq__(self, otro):
+        return isinstance(otro, Registro) and self._datos == otro._datos
+
+    def __hash__(self):
+        return hash(tuple(sorted(self._datos.items(), key=lambda item: item[0])))
+
+    def __repr__(self):
+        return f'<Registro {self._datos.get("id")}>'
+
+
+def orden_desc(registros, campo):
+    """Orden descendente con los NULL al final, igual que ``ORDER BY campo DESC`` en SQLite"""
+    con_valor = [r for r in registros if getattr(r, campo) is not None]
+    sin_valor = [r for r in registros if getattr(r, campo) is None]
+    return tuple(sorted(con_valor, key=lambda r: getattr(r, campo), reverse=True)) + tuple(sin_valor)
+
+
+@dataclass(frozen=True)
+class PerfilDocente:
+    """Instantánea inmutable de un docente con todas sus colecciones"""
+
+    docente: Registro
+    version: int = 0
+    formaciones: tuple = ()
+    empleos: tuple = ()
+    idiomas: tuple = ()
+    cursos: tuple = ()
+    proyectos: tuple = ()
+    articulos: tuple = ()
+    libros: tuple = ()
+    congresos: tuple = ()
+    tesis: tuple = ()
+    desarrollos: tuple = ()
+    actividades: tuple = ()
+
+    @property
+    def id(self):
+        return self.docente.id
+
+    def colecciones(self):
+        """Colecciones como dict, útil para pasarlas a ``render_template``"""
+        return {
+            campo.name: getattr(self, campo.name)
+            for campo in fields(self)
+            if campo.name not in ('docente', 'version')
+        }
+
+
+class ProfileLoader:
+    """Carga docentes con todas sus colecciones en un número fijo de consultas.
+
+    Las relaciones de ``Docente`` son ``lazy='dynamic'`` y no admiten
+    ``selectinload``; el cargador emite el mismo patrón que usaría
+    ``selectinload``: un SELECT por tabla hija con ``docente_id IN (...)``,
+    sin importar cuántos docentes se pidan.
+    """
+
+    # (nombre de la colección, modelo, orden)
+    COLECCIONES = (
+        ('formaciones', FormacionAcademica, (FormacionAcademica.fecha_fin.desc(),)),
+        ('empleos', Empleo, (Empleo.fecha_inicio.desc(),)),
+        ('idiomas', Idioma, ()),
+        ('cursos', CursoImpartido, ()),
+        ('proyectos', ProyectoInvestigacion, ()),
+        ('articulos', Articulo, (Articulo.anio.desc(),)),
+        ('libros', Libro, ()),
+        ('congresos', Congreso, ()),
+        ('tesis', TesisDirigida, ()),
+        ('desarrollos', DesarrolloTecnologico, ()),
+        ('actividades', ActividadGeneral, ()),
+    )
+
+    # Límite de parámetros por cláusula IN (SQLite admite pocos en versiones antiguas)
+    TAMANO_LOTE = 500
+
+    # Columnas del usuario que se copian a la instantánea (cambiarlas sube la versión del perfil)
+    COLUMNAS_USUARIO = COLUMNAS_USUARIO
+
+    def __init__(self, colecciones=None):
+        """
+        Args:
+            colecciones: Nombres de las colecciones a cargar; por defecto todas
+        """
+        if colecciones is None:
+            self.colecciones = self.COLECCIONES
+        else:
+            self.colecciones = tuple(c for c in self.COLECCIONES if c[0] in colecciones)
+
+    def cargar(self, docente_id):
+        """Cargar un docente por id; devuelve None si no existe"""
+        return self.cargar_varios([docente_id]).get(docente_id)
+
+    def cargar_por_usuario(self, user_id):
+        """Cargar el docente asociado a un usuario"""
+        docente_id = db.session.execute(
+            select(Docente.id).where(Docente.user_id == user_id)
+        ).scalar()
+        if docente_id is None:
+            return None
+        return self.cargar(docente_id)
+
+    def cargar_varios(self, docente_ids):
+        """Cargar varios docentes; devuelve un dict {docente_id: PerfilDocente}"""
+        ids = list(dict.fromkeys(docente_ids))
+        if not ids:
+            return {}
+
+        docentes = {}
+        versiones = {}
+        for lote in self._lotes(ids):
+            # La versión se lee junto con el docente y antes que las colecciones:
+            # si hay una escritura intermedia, la instantánea es más nueva que su
+            # versión, nunca más vieja (lo que importa a las cachés por versión)
+            consulta = (
+                select(
+                    Docente.__table__,
+                    *[User.__table__.c[c].label(f'usuario__{c}') for c in self.COLUMNAS_USUARIO],
+                    func.coalesce(PerfilVersion.version, 0).label('perfil__version')
+                )
+                .outerjoin(User.__table__, Docente.user_id == User.id)
+                .outerjoin(PerfilVersion.__table__, PerfilVersion.docente_id == Docente.id)
+                .where(Docente.id.in_(lote))
+            )
+            for fila in db.session.execute(consulta).mappings():
+                docentes[fila['id']] = self._registro_docente(fila)
+                versiones[fila['id']] = fila['perfil__version']
+
+        colecciones = {docente_id: {} for docente_id in docentes}
+        for nombre, modelo, orden in self.colecciones:
+            for docente_id in docentes:
+                colecciones[docente_id][nombre] = []
+            tabla = modelo.__table__
+            for lote in self._lotes(list(docentes)):
+                consulta = (
+                    select(tabla)
+                    .where(tabla.c.docente_id.in_(lote))
+                    .order_by(*orden, tabla.c.id)
+                )
+                for fila in db.session.execute(consulta).mappings():
+                    colecciones[fila['docente_id']][nombre].append(Registro(fila))
+
+        return {
+            docente_id: PerfilDocente(
+                docente=docentes[docente_id],
+                version=versiones[docente_id],
+                **{nombre: tuple(filas) for nombre, filas in colecciones[docente_id].items()}
+            )
+            for docente_id in ids
+            if docente_id in docentes
+        }
+
+    def _registro_docente(self, fila):
+        datos = {k: v for k, v in fila.items() if not k.startswith(('usuario__', 'perfil__'))}
+        usuario = None
+        if fila['user_id'] is not None:
+            usuario = Registro({c: fila[f'usuario__{c}'] for c in self.COLUMNAS_USUARIO})
+        datos['user'] = usuario
+        return Registro(datos)
+
+    def _lotes(self, ids):
+        for inicio in range(0, len(ids), self.TAMANO_LOTE):
+            yield ids[inicio:inicio + self.TAMANO_LOTE]
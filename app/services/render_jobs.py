@@ -0,0 +1,555 @@
+import atexit
+import json
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, TimeoutError as FuturesTimeout, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from flask import abort, current_app, jsonify, redirect, request, url_for
+from app.services.documentos import respuesta_archivo
+
+MIMETYPES = {
+    'pdf': 'application/pdf',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+}
+
+
+class LimiteTrabajosExcedido(Exception):
+    """El usuario ya tiene el máximo de renders en curso"""
+
+
+# ----------------------------------------------------------------------
+# Lado del proceso de render
+# ----------------------------------------------------------------------
+_trabajador = {}
+
+
+def _iniciar_trabajador():
+    """Inicializador del pool: precarga reportlab/docx y la hoja de estilos
+
+    Las tareas llegan con los datos ya cargados (``PerfilDocente`` o
+    ``ContextoCV``), así que los procesos de render no abren app ni BD.
+    """
+    import reportlab.platypus  # noqa: F401
+    import docx  # noqa: F401
+    from app.services.cv_estilos import hoja_estilos
+    from app.services.cv_generator_service import CVGeneratorService
+    from app.services.cv_pdf_generator import CVPDFGenerator
+
+    hoja_estilos()
+    _trabajador['cv_service'] = CVGeneratorService()
+    _trabajador['cv_pdf'] = CVPDFGenerator()
+
+
+def ejecutar_tarea(tarea):
+    """Renderizar una tarea y devolver los bytes (corre en el pool o en línea)"""
+    from app.services.cv_generator_service import CVGeneratorService
+    from app.services.cv_pdf_generator import CVPDFGenerator
+
+    if tarea['tipo'] == 'cv_service':
+        servicio = _trabajador.get('cv_service') or CVGeneratorService()
+        return servicio.renderizar_perfil(tarea['perfil'], tarea['formato'], tarea['tipo_cv'], tarea['sections'])
+
+    if tarea['tipo'] == 'cv_pdf':
+        generador = _trabajador.get('cv_pdf') or CVPDFGenerator()
+        return generador.generar_pdf_bytes(tarea['contexto'], tarea['secciones'], tarea['plantilla'])
+
+    if tarea['tipo'] == 'combinacion':
+        from app.services.combinacion import plantilla_compilada
+        return plantilla_compilada(tarea['ruta']).rellenar(tarea['valores'])
+
+    raise ValueError(f'Tipo de tarea desconocido: {tarea["tipo"]}')
+
+
+# ----------------------------------------------------------------------
+# Lado de la aplicación web
+# ----------------------------------------------------------------------
+@dataclass
+class Trabajo:
+    id: str
+    user_id: int
+    docente_id: int
+    formato: str
+    nombre_archivo: str
+    creado: float = field(default_factory=time.time)
+    terminado: float = None
+    ruta: str = None
+    error: str = None
+    future: object = None
+    persistir: bool = False
+
+    @property
+    def estado(self):
+        if self.ruta is not None:
+            return 'terminado'
+        if self.error is not None:
+            return 'error'
+        if self.future is not None and self.future.running():
+            return 'en_proceso'
+        return 'pendiente'
+
+    @property
+    def activo(self):
+        return self.estado in ('pendiente', 'en_proceso')
+
+    @property
+    def mimetype(self):
+        return MIMETYPES[self.formato]
+
+    def como_dict(self):
+        return {
+            'id': self.id,
+            'estado': self.estado,
+            'formato': self.formato,
+            'nombre_archivo': self.nombre_archivo,
+            'creado': self.creado,
+            'terminado': self.terminado,
+            'error': self.error,
+        }
+
+
+# Los ids de trabajo son uuid4().hex; cualquier otra cosa no llega al disco
+_ID_VALIDO = re.compile(r'^[0-9a-f]{32}$')
+_CAMPOS_REGISTRO = ('id', 'user_id', 'docente_id', 'formato', 'nombre_archivo',
+                    'creado', 'terminado', 'ruta', 'error', 'persistir')
+
+
+class RegistroTrabajos:
+    """Estado de los trabajos en disco, visible desde todos los procesos web.
+
+    Cada trabajo es ``<directorio>/<user_id>/<trabajo_id>.json`` (escritura
+    atómica); el archivo resultante no se copia aquí, el registro apunta a la
+    caché de CVs o al almacén de documentos. Solo cuando la caché está
+    deshabilitada el resultado se guarda junto al estado. Un trabajo terminado
+    se borra a los ``ttl`` segundos, y uno que sigue pendiente pasado ese
+    tiempo (el proceso que lo atendía murió) se reporta como error.
+    """
+
+    def __init__(self, directorio, ttl=600, intervalo_limpieza=60):
+        self.directorio = directorio
+        self.ttl = ttl
+        self.intervalo_limpieza = intervalo_limpieza
+        self._lock = threading.Lock()
+        self._ultima_limpieza = 0.0
+
+    def guardar(self, trabajo):
+        self._escribir(self._ruta(trabajo.user_id, trabajo.id, 'json'),
+                       json.dumps({campo: getattr(trabajo, campo) for campo in _CAMPOS_REGISTRO}).encode('utf-8'))
+
+    def guardar_resultado(self, trabajo, datos):
+        """Guardar el archivo junto al estado (caché deshabilitada); devuelve la ruta"""
+        ruta = self._ruta(trabajo.user_id, trabajo.id, trabajo.formato)
+        self._escribir(ruta, datos)
+        return ruta
+
+    def cargar(self, trabajo_id, user_id):
+        """Trabajo del usuario por id, o None si no existe o ya expiró"""
+        if not _ID_VALIDO.match(trabajo_id or ''):
+            return None
+        return self._leer(self._ruta(user_id, trabajo_id, 'json'))
+
+    def del_usuario(self, user_id):
+        """Trabajos vigentes del usuario (los expirados se borran al pasar)"""
+        carpeta = os.path.join(self.directorio, str(int(user_id)))
+        try:
+            nombres = os.listdir(carpeta)
+        except FileNotFoundError:
+            return []
+        return [trabajo for trabajo in (self._leer(os.path.join(carpeta, nombre))
+                                        for nombre in nombres if nombre.endswith('.json'))
+                if trabajo is not None]
+
+    def recolectar(self):
+        """Borrar los trabajos expirados de todos los usuarios; devuelve cuántos borró"""
+        borrados = 0
+        if not os.path.isdir(self.directorio):
+            return 0
+        for carpeta in os.scandir(self.directorio):
+            if not carpeta.is_dir():
+                continue
+            for archivo in os.scandir(carpeta.path):
+                if archivo.name.endswith('.json') and self._leer(archivo.path) is None:
+                    borrados += 1
+        with self._lock:
+            self._ultima_limpieza = time.time()
+        return borrados
+
+    def limpiar_si_toca(self):
+        with self._lock:
+            if time.time() - self._ultima_limpieza < self.intervalo_limpieza:
+                return
+            self._ultima_limpieza = time.time()
+        self.recolectar()
+
+    def _leer(self, ruta):
+        try:
+            with open(ruta, 'rb') as f:
+                trabajo = Trabajo(**json.loads(f.read()))
+        except (FileNotFoundError, ValueError, TypeError):
+            return None
+        limite = time.time() - self.ttl
+        if (trabajo.terminado or trabajo.creado) < limite:
+            if trabajo.terminado is None:
+                # Nadie lo terminó a tiempo: se informa una vez y se borra en la siguiente limpieza
+                trabajo.error = 'El trabajo se interrumpió; genera el CV de nuevo'
+                trabajo.terminado = time.time()
+                self._escribir(ruta, json.dumps(
+                    {campo: getattr(trabajo, campo) for campo in _CAMPOS_REGISTRO}).encode('utf-8'))
+                return trabajo
+            self._borrar(ruta)
+            if trabajo.ruta and os.path.dirname(trabajo.ruta) == os.path.dirname(ruta):
+                self._borrar(trabajo.ruta)
+            return None
+        return trabajo
+
+    def _ruta(self, user_id, trabajo_id, extension):
+        return os.path.join(self.directorio, str(int(user_id)), f'{trabajo_id}.{extension}')
+
+    @staticmethod
+    def _escribir(ruta, datos):
+        carpeta = os.path.dirname(ruta)
+        os.makedirs(carpeta, exist_ok=True)
+        # Escritura atómica: otro proceso nunca lee un estado a medias
+        fd, temporal = tempfile.mkstemp(dir=carpeta, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(datos)
+            os.replace(temporal, ruta)
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+
+    @staticmethod
+    def _borrar(ruta):
+        try:
+            os.remove(ruta)
+        except FileNotFoundError:
+            pass
+
+
+class GestorTrabajos:
+    """Registro de trabajos de render y pool de procesos que los ejecuta.
+
+    Con ``workers=0`` las tareas se ejecutan en línea dentro de la petición
+    (desarrollo y pruebas). El estado de cada trabajo se escribe en
+    ``registro`` (disco compartido), así que con varios workers de uvicorn
+    cualquiera responde el estado y la descarga; en memoria solo quedan los
+    futures de los trabajos que este proceso tiene en curso. El resultado se
+    sirve desde la caché en disco, nunca desde memoria.
+    """
+
+    def __init__(self, cache, registro, workers=2, max_por_usuario=2,
+                 metodo_inicio='spawn', almacen=None):
+        self.cache = cache
+        self.registro = registro
+        self.almacen = almacen
+        self.workers = workers
+        self.max_por_usuario = max_por_usuario
+        self.metodo_inicio = metodo_inicio
+        self._trabajos = {}
+        self._lock = threading.Lock()
+        self._pool = None
+
+    # -- envío ---------------------------------------------------------
+    def enviar_cv(self, user_id, perfil, formato='pdf', tipo_cv='academico', sections=None, nombre_archivo=None):
+        """Encolar un CV de ``CVGeneratorService`` a partir de un ``PerfilDocente``"""
+        from app.services.cv_generator_service import CVGeneratorService
+
+        extension = CVGeneratorService.extension(formato)
+        tarea = {
+            'tipo': 'cv_service', 'perfil': perfil, 'formato': formato,
+            'tipo_cv': tipo_cv, 'sections': sections,
+        }
+        return self._enviar(
+            user_id, perfil.id, perfil.version, extension,
+            CVGeneratorService.parametros_cache(tipo_cv, sections), tarea,
+            nombre_archivo or _nombre_archivo(perfil.docente, extension)
+        )
+
+    def enviar_cv_plantilla(self, user_id, docente, secciones, plantilla='conacyt', persistir=False):
+        """Encolar un CV de ``CVPDFGenerator`` (plantillas del chatbot)
+
+        Con ``persistir`` el resultado se copia al almacén de documentos, de
+        modo que el enlace sigue funcionando cuando el trabajo ya expiró.
+        """
+        from app.services.cv_pdf_generator import ContextoCV, CVPDFGenerator
+
+        # Los datos se cargan aquí, en lote; el proceso de render no toca la BD
+        contexto = ContextoCV.cargar(docente.id)
+        if contexto is None:
+            raise LookupError(f'El docente {docente.id} ya no existe')
+        tarea = {'tipo': 'cv_pdf', 'contexto': contexto, 'secciones': secciones, 'plantilla': plantilla}
+        return self._enviar(
+            user_id, contexto.id, contexto.version, 'pdf',
+            CVPDFGenerator.parametros_cache(secciones, plantilla), tarea,
+            _nombre_archivo(docente, 'pdf'), persistir=persistir
+        )
+
+    def _enviar(self, user_id, docente_id, version, formato, parametros, tarea, nombre_archivo, persistir=False):
+        self.registro.limpiar_si_toca()
+        trabajo = Trabajo(uuid.uuid4().hex, user_id, docente_id, formato, nombre_archivo,
+                          persistir=persistir and self.almacen is not None)
+
+        with self._lock:
+            # Los de este proceso y los que otros workers registraron en disco
+            activos = {t.id for t in self._trabajos.values() if t.user_id == user_id and t.activo}
+            activos.update(t.id for t in self.registro.del_usuario(user_id) if t.activo)
+            if len(activos) >= self.max_por_usuario:
+                raise LimiteTrabajosExcedido(
+                    f'Ya tienes {len(activos)} CV en proceso; espera a que termine alguno'
+                )
+            self.registro.guardar(trabajo)
+
+        guardado = self.cache.buscar_ruta(docente_id, version, formato, parametros)
+        if guardado is not None:
+            self._terminar(trabajo, ruta=guardado)
+            return trabajo
+
+        if not self.workers:
+            try:
+                datos = ejecutar_tarea(tarea)
+            except Exception as e:
+                self._terminar(trabajo, error=str(e))
+            else:
+                self._terminar(trabajo, datos=datos,
+                               ruta=self.cache.guardar(docente_id, version, formato, parametros, datos))
+            return trabajo
+
+        with self._lock:
+            self._trabajos[trabajo.id] = trabajo
+        try:
+            trabajo.future = self._obtener_pool().submit(ejecutar_tarea, tarea)
+        except BrokenProcessPool as e:
+            self.cerrar()
+            self._terminar(trabajo, error=f'El pool de render se detuvo: {e}')
+            return trabajo
+        trabajo.future.add_done_callback(
+            lambda future: self._al_completar(trabajo, future, docente_id, version, formato, parametros)
+        )
+        return trabajo
+
+    def _al_completar(self, trabajo, future, docente_id, version, formato, parametros):
+        try:
+            datos = future.result()
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                # Un proceso murió (p. ej. sin memoria): el siguiente envío abre un pool nuevo
+                self.cerrar()
+            self._terminar(trabajo, error=str(e) or type(e).__name__)
+            return
+        self._terminar(trabajo, datos=datos,
+                       ruta=self.cache.guardar(docente_id, version, formato, parametros, datos))
+
+    def _terminar(self, trabajo, datos=None, ruta=None, error=None):
+        """Registrar el resultado en disco; ``ruta`` es el archivo en la caché, si lo hay"""
+        try:
+            if datos is not None and ruta is None:
+                ruta = self.registro.guardar_resultado(trabajo, datos)
+            if ruta is not None and trabajo.persistir:
+                # La copia del almacén dura más que la caché: el enlace apunta a ella
+                if datos is None:
+                    with open(ruta, 'rb') as f:
+                        datos = f.read()
+                try:
+                    ruta = self.almacen.guardar(trabajo.docente_id, trabajo.id, trabajo.formato, datos)
+                except OSError as e:
+                    print(f"⚠️ No se pudo guardar el documento {trabajo.id}: {e}")
+        except OSError as e:
+            ruta, error = None, f'No se pudo guardar el CV: {e}'
+        trabajo.ruta = ruta
+        trabajo.error = error
+        trabajo.terminado = time.time()
+        try:
+            self.registro.guardar(trabajo)
+        except OSError as e:
+            print(f"⚠️ No se pudo registrar el trabajo {trabajo.id}: {e}")
+        with self._lock:
+            self._trabajos.pop(trabajo.id, None)
+
+    # -- lotes ---------------------------------------------------------
+    def mapear(self, tareas, en_vuelo=None):
+        """Renderizar ``(clave, tarea)`` en el pool y producir ``(clave, datos, error)``
+
+        Los resultados salen en orden de llegada, no de envío. Como mucho hay
+        ``en_vuelo`` tareas enviadas sin recoger (por defecto dos por proceso),
+        así que ``tareas`` puede ser un generador perezoso de cualquier tamaño
+        sin que la memoria crezca con él. No registra ``Trabajo`` ni aplica el
+        límite por usuario: es para exportaciones masivas.
+        """
+        if not self.workers:
+            for clave, tarea in tareas:
+                try:
+                    yield clave, ejecutar_tarea(tarea), None
+                except Exception as e:
+                    yield clave, None, str(e) or type(e).__name__
+            return
+
+        en_vuelo = en_vuelo or self.workers * 2
+        pendientes = {}
+        tareas = iter(tareas)
+        agotadas = False
+        try:
+            while pendientes or not agotadas:
+                while not agotadas and len(pendientes) < en_vuelo:
+                    try:
+                        clave, tarea = next(tareas)
+                    except StopIteration:
+                        agotadas = True
+                        break
+                    try:
+                        pendientes[self._obtener_pool().submit(ejecutar_tarea, tarea)] = clave
+                    except BrokenProcessPool as e:
+                        self.cerrar()
+                        yield clave, None, f'El pool de render se detuvo: {e}'
+                if not pendientes:
+                    continue
+                listos, _ = wait(pendientes, return_when=FIRST_COMPLETED)
+                for future in listos:
+                    clave = pendientes.pop(future)
+                    try:
+                        yield clave, future.result(), None
+                    except Exception as e:
+                        if isinstance(e, BrokenProcessPool):
+                            self.cerrar()
+                        yield clave, None, str(e) or type(e).__name__
+        finally:
+            # Si el consumidor abandona (p. ej. el cliente cortó la descarga), no seguir renderizando
+            for future in pendientes:
+                future.cancel()
+
+    # -- consulta ------------------------------------------------------
+    def obtener(self, trabajo_id, user_id):
+        """Trabajo del usuario por id; None si no existe, expiró o pertenece a otro usuario"""
+        trabajo = self._trabajos.get(trabajo_id)
+        if trabajo is not None:
+            return trabajo if trabajo.user_id == user_id else None
+        # Terminado, o en curso en otro worker: el estado está en disco
+        return self.registro.cargar(trabajo_id, user_id)
+
+    def esperar(self, trabajo, timeout):
+        """Bloquear hasta ``timeout`` segundos a que el trabajo termine"""
+        if trabajo.future is None:
+            # Lo atiende otro worker: consultar el registro hasta el tope
+            limite = time.monotonic() + timeout
+            while trabajo.activo and time.monotonic() < limite:
+                time.sleep(min(0.2, max(0.0, limite - time.monotonic())))
+                trabajo = self.registro.cargar(trabajo.id, trabajo.user_id) or trabajo
+            return trabajo
+        if trabajo.activo:
+            try:
+                trabajo.future.result(timeout=timeout)
+            except FuturesTimeout:
+                pass
+            except Exception:
+                pass  # el error queda registrado por _al_completar
+            # add_done_callback puede correr un instante después de result()
+            limite = time.monotonic() + 1
+            while trabajo.activo and trabajo.future.done() and time.monotonic() < limite:
+                time.sleep(0.005)
+        return trabajo
+
+    # -- mantenimiento -------------------------------------------------
+    def _obtener_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self.metodo_inicio),
+                    initializer=_iniciar_trabajador
+                )
+                atexit.register(self.cerrar)
+            return self._pool
+
+    def cerrar(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _nombre_archivo(docente, extension):
+    nombre = docente.nombre_completo.replace(' ', '_') if docente.nombre_completo else 'CV'
+    return f'CV_{nombre}.{extension}'
+
+
+def respuesta_descarga(trabajo):
+    """Archivo del trabajo si ya terminó; si no, 202 con su estado y ``Retry-After``"""
+    if trabajo.estado == 'terminado':
+        if not os.path.isfile(trabajo.ruta):
+            abort(404)  # la caché lo desalojó
+        return respuesta_archivo(trabajo.ruta, trabajo.mimetype, trabajo.nombre_archivo)
+    codigo = 500 if trabajo.estado == 'error' else 202
+    respuesta = jsonify(trabajo_como_json(trabajo))
+    respuesta.status_code = codigo
+    if codigo == 202:
+        respuesta.headers['Retry-After'] = '2'
+    return respuesta
+
+
+def respuesta_encolado(trabajo, url_pagina):
+    """Respuesta inmediata a un formulario que encoló un CV, sin esperar el render.
+
+    ``fetch`` recibe 202 con el estado del trabajo; un envío normal del
+    formulario vuelve a ``url_pagina`` con ``?trabajo=<id>`` y la página
+    consulta el estado hasta poder descargar.
+    """
+    if request.accept_mimetypes.best == 'application/json':
+        return jsonify(trabajo_como_json(trabajo)), 202
+    return redirect(f'{url_pagina}?trabajo={trabajo.id}')
+
+
+def respuesta_limite(error):
+    """429 con ``Retry-After`` cuando el usuario ya tiene demasiados trabajos en curso"""
+    respuesta = jsonify({'error': str(error)})
+    respuesta.status_code = 429
+    respuesta.headers['Retry-After'] = '5'
+    return respuesta
+
+
+def segundos_espera_descarga():
+    """Espera opcional de una descarga: ``?esperar=<s>``, acotada por ``CV_JOBS_DOWNLOAD_WAIT``"""
+    esperar = request.args.get('esperar', 0, type=float)
+    return max(0.0, min(esperar, current_app.config.get('CV_JOBS_DOWNLOAD_WAIT', 30)))
+
+
+def trabajo_como_json(trabajo):
+    """Estado del trabajo para las respuestas JSON, con las URLs de consulta"""
+    datos = trabajo.como_dict()
+    datos['url_estado'] = url_for('cv.estado_trabajo', trabajo_id=trabajo.id)
+    datos['url_descarga'] = url_for('cv.descargar_trabajo', trabajo_id=trabajo.id)
+    return datos
+
+
+def init_app(app):
+    """Crear el gestor de trabajos según ``CV_JOBS_*``"""
+    from app.services.cv_cache import obtener_cache
+    from app.services.documentos import obtener_almacen
+
+    with app.app_context():
+        cache = obtener_cache()
+        almacen = obtener_almacen()
+    registro = RegistroTrabajos(
+        app.config.get('CV_JOBS_DIR') or os.path.join(app.config['CV_CACHE_DIR'], 'trabajos'),
+        ttl=app.config.get('CV_JOBS_TTL', 600)
+    )
+    gestor = GestorTrabajos(
+        cache,
+        registro,
+        workers=app.config.get('CV_JOBS_WORKERS', 2),
+        max_por_usuario=app.config.get('CV_JOBS_MAX_POR_USUARIO', 2),
+        metodo_inicio=app.config.get('CV_JOBS_START_METHOD', 'spawn'),
+        almacen=almacen
+    )
+    app.extensions['render_jobs'] = gestor
+    return gestor
+
+
+def obtener_gestor():
+    """Gestor de trabajos de render de la app actual"""
+    return current_app.extensions['render_jobs']
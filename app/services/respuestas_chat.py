@@ -0,0 +1,129 @@
+"""Respuestas del chatbot que no necesitan una llamada al modelo.
+
+Los docentes repiten las mismas preguntas ("¿cuántos artículos tengo?") y cada
+una era una llamada pagada a la API. Aquí hay dos atajos, que
+``ChatbotService`` prueba antes de llamar al modelo:
+
+* las preguntas de conteo sobre colecciones del CV se contestan con los
+  totales que ``ContextoChat`` ya tiene calculados (``responder_conteo``);
+* las demás respuestas se guardan en una ``TTLCache`` (LRU con expiración)
+  con llave ``(docente_id, versión del perfil, tipo de prompt, pregunta
+  normalizada)``. Un cambio en el perfil cambia la versión, así que nunca se
+  sirve una respuesta armada con datos viejos; el tipo de prompt separa las
+  respuestas del chat normal ('conversacion') de las del streaming
+  ('streaming'), que usan instrucciones distintas.
+
+Solo se usan para preguntas autónomas: un seguimiento como "¿y el más
+reciente?" depende de la conversación y siempre va al modelo. Por lo mismo
+solo se guardan respuestas del primer turno: una generada con historial en el
+prompt puede depender de esa conversación y no se comparte con otra.
+"""
+import re
+import time
+from dataclasses import dataclass
+from flask import current_app
+from app.services.chatbot_contexto import TOTALES
+from app.services.indice_perfil import ETIQUETAS, normalizar, tokenizar
+from app.utils.cache import TTLCache
+
+# Palabras de cortesía que no cambian la pregunta
+_CORTESIA = re.compile(r'\b(?:hola|oye|por favor|porfa|gracias|buenos dias|buenas tardes|buenas noches)\b')
+# Referencias a turnos anteriores: la respuesta depende de la conversación
+_SEGUIMIENTO = re.compile(
+    r'^(?:y|e|entonces|pero)\b'
+    r'|\b(?:eso|esa|ese|esos|esas|esto|aquel|aquella|anterior|anteriores|lo mismo|tambien|otra vez|de nuevo)\b'
+)
+_CONTEO = re.compile(r'\bcuant[oa]s\b')
+# Términos que pueden acompañar a una pregunta de conteo sin cambiar su respuesta
+_NEUTRAS = frozenset(tokenizar(
+    'registrados registradas publicados publicadas publique impartidos imparti dirigidas dirigi '
+    'llevo cv curriculum perfil total actualmente ahora momento'
+))
+
+
+def normalizar_pregunta(texto):
+    """Minúsculas, sin acentos, signos ni cortesías y con espacios simples"""
+    texto = normalizar(texto or '')
+    texto = re.sub(r'[^\w\s]', ' ', texto)
+    texto = _CORTESIA.sub(' ', texto)
+    return ' '.join(texto.split())
+
+
+def es_autonoma(normalizada):
+    """Si la pregunta se entiende sin la conversación (se puede reutilizar la respuesta)"""
+    return len(normalizada.split()) >= 2 and not _SEGUIMIENTO.search(normalizada)
+
+
+def responder_conteo(pregunta, contexto):
+    """Respuesta a "¿cuántos X tengo?" con los totales del contexto; None si no aplica"""
+    normalizada = normalizar_pregunta(pregunta)
+    if not _CONTEO.search(normalizada) or not es_autonoma(normalizada):
+        return None
+    terminos = [t for t in tokenizar(normalizada) if t not in _NEUTRAS]
+    # Cualquier otro término ("en 2020", "indexados") pide un filtro que los totales no tienen
+    if not terminos or any(t not in ETIQUETAS for t in terminos):
+        return None
+
+    colecciones = set().union(*(ETIQUETAS[t] for t in terminos))
+    filas = [f"- **{nombre}:** {contexto.totales[coleccion]}"
+             for coleccion, nombre in TOTALES if coleccion in colecciones]
+    return "📊 Según tu CV registrado:\n" + "\n".join(filas)
+
+
+@dataclass(frozen=True)
+class RespuestaGuardada:
+    pregunta: str
+    respuesta: str
+    guardada: float
+
+
+class CacheRespuestas:
+    """Respuestas del modelo por ``(docente_id, versión, tipo de prompt, pregunta normalizada)``"""
+
+    def __init__(self, maxsize=2048, ttl=3600, habilitada=True):
+        self.habilitada = habilitada
+        self._respuestas = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def buscar(self, docente_id, version, tipo_prompt, pregunta):
+        """``(respuesta, metadata)`` guardada para la pregunta, o None
+
+        ``metadata['tipo']`` es 'exacta' si el texto coincide tal cual y
+        'normalizada' si solo coincide tras normalizarlo.
+        """
+        normalizada = normalizar_pregunta(pregunta)
+        if not self.habilitada or not es_autonoma(normalizada):
+            return None
+        guardada = self._respuestas.get((docente_id, version, tipo_prompt, normalizada))
+        if guardada is None:
+            return None
+        tipo = 'exacta' if guardada.pregunta == pregunta.strip() else 'normalizada'
+        return guardada.respuesta, {'tipo': tipo, 'edad_s': round(time.monotonic() - guardada.guardada, 1)}
+
+    def guardar(self, docente_id, version, tipo_prompt, pregunta, respuesta):
+        """Guardar una respuesta generada en el primer turno (sin historial en el prompt)"""
+        normalizada = normalizar_pregunta(pregunta)
+        if self.habilitada and es_autonoma(normalizada):
+            self._respuestas.set(
+                (docente_id, version, tipo_prompt, normalizada),
+                RespuestaGuardada(pregunta.strip(), respuesta, time.monotonic())
+            )
+
+    def estadisticas(self):
+        return {'entradas': len(self._respuestas), 'hits': self._respuestas.hits,
+                'misses': self._respuestas.misses}
+
+
+def init_app(app):
+    """Crear la caché de respuestas según ``CHAT_RESPUESTAS_*``"""
+    cache = CacheRespuestas(
+        maxsize=app.config.get('CHAT_RESPUESTAS_CACHE_SIZE', 2048),
+        ttl=app.config.get('CHAT_RESPUESTAS_TTL', 3600),
+        habilitada=app.config.get('CHAT_RESPUESTAS_CACHE_ENABLED', True)
+    )
+    app.extensions['respuestas_chat'] = cache
+    return cache
+
+
+def obtener_cache_respuestas():
+    """Caché de respuestas del chatbot de la app actual"""
+    return current_app.extensions['respuestas_chat']
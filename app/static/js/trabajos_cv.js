@@ -0,0 +1,96 @@
+// Descarga de CVs generados en segundo plano: el servidor encola el render y
+// responde de inmediato; aquí se consulta el estado del trabajo hasta que
+// termina y entonces se pide el archivo.
+
+function esperarTrabajoCV(urlEstado, intervalo = 1000) {
+    return fetch(urlEstado, { headers: { 'Accept': 'application/json' } })
+        .then((respuesta) => {
+            if (!respuesta.ok) {
+                const error = new Error('El trabajo ya no está disponible, genera el CV de nuevo');
+                error.status = respuesta.status;
+                throw error;
+            }
+            return respuesta.json();
+        })
+        .then((trabajo) => {
+            if (trabajo.estado === 'terminado') {
+                return trabajo;
+            }
+            if (trabajo.estado === 'error') {
+                throw new Error(`Error al generar el CV: ${trabajo.error}`);
+            }
+            return new Promise((resolver) => setTimeout(resolver, intervalo))
+                .then(() => esperarTrabajoCV(urlEstado, intervalo));
+        });
+}
+
+function descargarTrabajoCV(urlEstado, boton, urlRespaldo) {
+    const etiqueta = boton ? boton.innerHTML : null;
+    if (boton) {
+        boton.classList.add('disabled');
+        boton.setAttribute('aria-disabled', 'true');
+        boton.innerHTML = '<span class="spinner-border spinner-border-sm"></span> Generando CV...';
+    }
+    return esperarTrabajoCV(urlEstado)
+        .then((trabajo) => { window.location.href = trabajo.url_descarga; })
+        .catch((error) => {
+            // Un trabajo que ya expiró del registro puede tener copia persistida
+            if (error.status === 404 && urlRespaldo) {
+                window.location.href = urlRespaldo;
+            } else {
+                alert(error.message);
+            }
+        })
+        .finally(() => {
+            if (boton) {
+                boton.classList.remove('disabled');
+                boton.removeAttribute('aria-disabled');
+                boton.innerHTML = etiqueta;
+            }
+        });
+}
+
+function enviarFormularioCV(formulario, boton) {
+    return fetch(formulario.action, {
+        method: 'POST',
+        body: new FormData(formulario),
+        headers: { 'Accept': 'application/json' }
+    })
+        .then((respuesta) => respuesta.json().then((datos) => {
+            if (!respuesta.ok) {
+                throw new Error(datos.error || 'No se pudo generar el CV');
+            }
+            return datos;
+        }))
+        .then((trabajo) => descargarTrabajoCV(trabajo.url_estado, boton))
+        .catch((error) => alert(error.message));
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    // Formularios que encolan un CV: enviar con fetch y descargar al terminar
+    document.querySelectorAll('form[data-trabajo-cv]').forEach((formulario) => {
+        formulario.addEventListener('submit', (event) => {
+            event.preventDefault();
+            const boton = formulario.querySelector('[type="submit"]');
+            if (!boton.classList.contains('disabled')) {
+                enviarFormularioCV(formulario, boton);
+            }
+        });
+        // Envío normal del formulario: el servidor redirige con ?trabajo=<id> y aquí se retoma
+        if (formulario.dataset.urlEstado) {
+            descargarTrabajoCV(formulario.dataset.urlEstado, formulario.querySelector('[type="submit"]'));
+        }
+    });
+});
+
+// Enlaces a un trabajo (p. ej. los del chatbot), incluidos los que se agregan después
+document.addEventListener('click', (event) => {
+    const enlace = event.target.closest('a[data-url-estado]');
+    if (!enlace) {
+        return;
+    }
+    event.preventDefault();
+    if (!enlace.classList.contains('disabled')) {
+        descargarTrabajoCV(enlace.dataset.urlEstado, enlace, enlace.href);
+    }
+});
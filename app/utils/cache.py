@@ -0,0 +1,77 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """Caché LRU en memoria con expiración por tiempo, segura entre hilos"""
+
+    _VACIO = object()
+
+    def __init__(self, maxsize=1024, ttl=300, timer=time.monotonic):
+        """
+        Args:
+            maxsize: Número máximo de entradas antes de desalojar la menos usada
+            ttl: Segundos de vida de cada entrada (None para no expirar)
+            timer: Reloj monotónico (inyectable en pruebas)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def configurar(self, maxsize=None, ttl=_VACIO):
+        """Ajustar límites en caliente (p. ej. desde la configuración de la app)"""
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if ttl is not self._VACIO:
+                self.ttl = ttl
+            self._recortar()
+
+    def get(self, clave, default=None):
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada is None:
+                self.misses += 1
+                return default
+            valor, expira = entrada
+            if expira is not None and expira <= self._timer():
+                del self._datos[clave]
+                self.misses += 1
+                return default
+            self._datos.move_to_end(clave)
+            self.hits += 1
+            return valor
+
+    def set(self, clave, valor):
+        with self._lock:
+            expira = self._timer() + self.ttl if self.ttl is not None else None
+            self._datos[clave] = (valor, expira)
+            self._datos.move_to_end(clave)
+            self._recortar()
+
+    def pop(self, clave, default=None):
+        with self._lock:
+            entrada = self._datos.pop(clave, None)
+            return entrada[0] if entrada is not None else default
+
+    def clear(self):
+        with self._lock:
+            self._datos.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __contains__(self, clave):
+        return self.get(clave, self._VACIO) is not self._VACIO
+
+    def __len__(self):
+        with self._lock:
+            return len(self._datos)
+
+    def _recortar(self):
+        while len(self._datos) > self.maxsize:
+            self._datos.popitem(last=False)
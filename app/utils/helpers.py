@@ -1,6 +1,7 @@
 import os
 from werkzeug.utils import secure_filename
-from flask import current_app
+from flask import current_app, g, has_request_context
+from flask_login import current_user
 
 def allowed_file(filename):
     """Verifica si el archivo tiene una extensión permitida"""
@@ -40,3 +41,19 @@ def get_file_size(filepath):
     except:
         return 0
 
+def get_current_docente():
+    """Obtiene el docente del usuario autenticado (una sola consulta por petición)"""
+    if not current_user.is_authenticated:
+        return None
+    if '_current_docente' not in g:
+        from app.models.docente import Docente
+        g._current_docente = Docente.query.filter_by(user_id=current_user.id).first()
+    return g._current_docente
+
+def get_docente_for_user(user_id):
+    """Obtiene el docente de un usuario, reutilizando el de la petición si coincide"""
+    # Fuera de una petición de Flask (p. ej. el streaming ASGI) no hay current_user
+    if has_request_context() and current_user.is_authenticated and current_user.id == user_id:
+        return get_current_docente()
+    from app.models.docente import Docente
+    return Docente.query.filter_by(user_id=user_id).first()
@@ -0,0 +1,143 @@
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from flask import g, has_request_context, current_app, request
+from sqlalchemy import event
+from app import db
+
+_PARAM = r'(?:\?|%s|:\w+|%\(\w+\)s)'
+_RE_LISTA_IN = re.compile(r'\(\s*' + _PARAM + r'(?:\s*,\s*' + _PARAM + r')+\s*\)')
+_RE_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+# Estadísticas abiertas con contar_consultas() fuera del ciclo de petición
+_estadisticas_manuales = ContextVar('estadisticas_consultas', default=())
+
+
+class PresupuestoConsultasExcedido(AssertionError):
+    """Una petición superó el presupuesto de consultas o repitió la misma consulta"""
+
+
+def huella_sql(statement):
+    """Forma normalizada de una sentencia: sin literales y con listas IN colapsadas"""
+    sql = ' '.join(statement.split())
+    sql = _RE_LITERAL.sub('?', sql)
+    return _RE_LISTA_IN.sub('(?)', sql)
+
+
+class EstadisticasConsultas:
+    """Conteo, tiempo total y huellas repetidas de las consultas de un bloque"""
+
+    def __init__(self):
+        self.total = 0
+        self.tiempo = 0.0
+        self.huellas = Counter()
+
+    def registrar(self, statement, duracion):
+        self.total += 1
+        self.tiempo += duracion
+        self.huellas[huella_sql(statement)] += 1
+
+    @property
+    def tiempo_ms(self):
+        return self.tiempo * 1000
+
+    @property
+    def max_repeticiones(self):
+        return max(self.huellas.values(), default=0)
+
+    def repetidas(self, minimo=2):
+        """Huellas ejecutadas al menos ``minimo`` veces (candidatas a N+1)"""
+        return {huella: n for huella, n in self.huellas.most_common() if n >= minimo}
+
+    def verificar(self, max_consultas=None, max_repeticiones=None, contexto=''):
+        """Lanzar PresupuestoConsultasExcedido si se supera algún límite"""
+        if max_consultas is not None and self.total > max_consultas:
+            raise PresupuestoConsultasExcedido(
+                f'{contexto}{self.total} consultas (presupuesto: {max_consultas})'
+            )
+        if max_repeticiones is not None:
+            repetidas = self.repetidas(max_repeticiones + 1)
+            if repetidas:
+                huella, veces = next(iter(repetidas.items()))
+                raise PresupuestoConsultasExcedido(
+                    f'{contexto}consulta repetida {veces} veces (máximo: {max_repeticiones}): {huella}'
+                )
+
+
+@contextmanager
+def contar_consultas():
+    """Medir las consultas ejecutadas dentro del bloque (pruebas y benchmarks)"""
+    estadisticas = EstadisticasConsultas()
+    token = _estadisticas_manuales.set(_estadisticas_manuales.get() + (estadisticas,))
+    try:
+        yield estadisticas
+    finally:
+        _estadisticas_manuales.reset(token)
+
+
+@contextmanager
+def presupuesto_consultas(max_consultas=None, max_repeticiones=None):
+    """Fallar si el bloque supera ``max_consultas`` o repite una consulta más de ``max_repeticiones`` veces"""
+    with contar_consultas() as estadisticas:
+        yield estadisticas
+    estadisticas.verificar(max_consultas, max_repeticiones)
+
+
+def _antes_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_stats_inicio', []).append(time.perf_counter())
+
+
+def _despues_de_ejecutar(conn, cursor, statement, parameters, context, executemany):
+    pila = conn.info.get('query_stats_inicio')
+    if not pila:
+        return
+    duracion = time.perf_counter() - pila.pop()
+
+    for estadisticas in _estadisticas_manuales.get():
+        estadisticas.registrar(statement, duracion)
+    if has_request_context():
+        estadisticas = g.get('_query_stats')
+        if estadisticas is not None:
+            estadisticas.registrar(statement, duracion)
+
+
+def _iniciar_peticion():
+    g._query_stats = EstadisticasConsultas()
+
+
+def _finalizar_peticion(response):
+    estadisticas = g.pop('_query_stats', None)
+    if estadisticas is None:
+        return response
+
+    config = current_app.config
+    mostrar = config.get('QUERY_STATS_HEADERS')
+    if mostrar is None:
+        mostrar = current_app.debug
+    if mostrar:
+        response.headers['X-Query-Count'] = str(estadisticas.total)
+        response.headers['X-Query-Time-Ms'] = f'{estadisticas.tiempo_ms:.2f}'
+        response.headers['X-Query-Max-Repeats'] = str(estadisticas.max_repeticiones)
+
+    if config.get('QUERY_STATS_STRICT'):
+        presupuestos = config.get('QUERY_BUDGETS') or {}
+        estadisticas.verificar(
+            max_consultas=presupuestos.get(request.endpoint, config.get('QUERY_BUDGET')),
+            max_repeticiones=config.get('QUERY_REPEAT_LIMIT'),
+            contexto=f'{request.endpoint}: '
+        )
+    return response
+
+
+def init_app(app):
+    """Instrumentar los engines de la app y registrar los hooks de petición"""
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        if not event.contains(engine, 'before_cursor_execute', _antes_de_ejecutar):
+            event.listen(engine, 'before_cursor_execute', _antes_de_ejecutar)
+            event.listen(engine, 'after_cursor_execute', _despues_de_ejecutar)
+    app.before_request(_iniciar_peticion)
+    app.after_request(_finalizar_peticion)
@@ -0,0 +1,109 @@
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from flask import has_request_context, request
+from sqlalchemy import event
+from app import db
+
+logger = logging.getLogger('app.slow_queries')
+
+
+def _forma_parametros(parameters, executemany):
+    """Tipos de los parámetros, sin sus valores (no se registran datos personales)"""
+    if executemany:
+        filas = list(parameters or [])
+        return {'filas': len(filas), 'forma': _forma_parametros(filas[0], False) if filas else []}
+    if isinstance(parameters, dict):
+        return {clave: type(valor).__name__ for clave, valor in parameters.items()}
+    return [type(valor).__name__ for valor in (parameters or ())]
+
+
+def _plan_sqlite(cursor, statement, parameters):
+    """Ejecutar EXPLAIN QUERY PLAN sobre la misma conexión DBAPI"""
+    plan_cursor = cursor.connection.cursor()
+    try:
+        plan_cursor.execute('EXPLAIN QUERY PLAN ' + statement, parameters or ())
+        return [
+            {'id': fila[0], 'parent': fila[1], 'detail': fila[3]}
+            for fila in plan_cursor.fetchall()
+        ]
+    finally:
+        plan_cursor.close()
+
+
+def _vista_actual():
+    if not has_request_context():
+        return None
+    return {'endpoint': request.endpoint, 'method': request.method, 'path': request.path}
+
+
+class SlowQueryLog:
+    """Registra en JSONL rotativo las consultas más lentas que un umbral.
+
+    En SQLite adjunta el ``EXPLAIN QUERY PLAN`` de los SELECT lentos, de modo
+    que los ``SCAN`` sin índice se vean directamente en el log.
+    """
+
+    def __init__(self, ruta, umbral_ms, max_bytes=5 * 1024 * 1024, respaldos=3, explain=True):
+        self.umbral = umbral_ms / 1000.0
+        self.explain = explain
+        os.makedirs(os.path.dirname(os.path.abspath(ruta)), exist_ok=True)
+        self.handler = RotatingFileHandler(ruta, maxBytes=max_bytes, backupCount=respaldos, encoding='utf-8')
+        self.handler.setFormatter(logging.Formatter('%(message)s'))
+
+    def escuchar(self, engine):
+        self._es_sqlite = engine.dialect.name == 'sqlite'
+        event.listen(engine, 'before_cursor_execute', self._antes)
+        event.listen(engine, 'after_cursor_execute', self._despues)
+
+    def _antes(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('slow_query_inicio', []).append(time.perf_counter())
+
+    def _despues(self, conn, cursor, statement, parameters, context, executemany):
+        pila = conn.info.get('slow_query_inicio')
+        if not pila:
+            return
+        duracion = time.perf_counter() - pila.pop()
+        if duracion < self.umbral:
+            return
+
+        entrada = {
+            'timestamp': datetime.utcnow().isoformat(),
+            'duration_ms': round(duracion * 1000, 3),
+            'statement': ' '.join(statement.split()),
+            'parameters': _forma_parametros(parameters, executemany),
+            'view': _vista_actual(),
+        }
+        es_select = statement.lstrip().upper().startswith(('SELECT', 'WITH'))
+        if self.explain and self._es_sqlite and es_select and not executemany:
+            try:
+                entrada['query_plan'] = _plan_sqlite(cursor, statement, parameters)
+            except Exception as e:
+                entrada['query_plan_error'] = str(e)
+
+        self.handler.handle(logger.makeRecord(
+            logger.name, logging.WARNING, __file__, 0, json.dumps(entrada, default=str, ensure_ascii=False), None, None
+        ))
+
+
+def init_app(app):
+    """Activar el log si ``SLOW_QUERY_THRESHOLD_MS`` está configurado"""
+    umbral = app.config.get('SLOW_QUERY_THRESHOLD_MS')
+    if umbral is None:
+        return None
+
+    slow_log = SlowQueryLog(
+        app.config['SLOW_QUERY_LOG_PATH'],
+        float(umbral),
+        max_bytes=app.config.get('SLOW_QUERY_LOG_MAX_BYTES', 5 * 1024 * 1024),
+        respaldos=app.config.get('SLOW_QUERY_LOG_BACKUPS', 3),
+        explain=app.config.get('SLOW_QUERY_EXPLAIN', True)
+    )
+    with app.app_context():
+        engine = db.engine
+    slow_log.escuchar(engine)
+    app.extensions['slow_query_log'] = slow_log
+    return slow_log
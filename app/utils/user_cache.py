@@ -0,0 +1,67 @@
+from flask_login import UserMixin
+from sqlalchemy import event, select
+from app import db
+from app.models.user import User
+from app.utils.cache import TTLCache
+
+
+class UsuarioSesion(UserMixin):
+    """Copia ligera y desacoplada de la sesión de BD de un ``User``.
+
+    Es lo que ``current_user`` devuelve en cada petición autenticada; solo
+    lleva los campos que usan las vistas y plantillas.
+    """
+
+    def __init__(self, id, email, role, created_at=None):
+        self.id = id
+        self.email = email
+        self.role = role
+        self.created_at = created_at
+
+    def es_admin(self):
+        return self.role == 'admin'
+
+    def __repr__(self):
+        return f'<UsuarioSesion {self.email}>'
+
+
+_usuarios = TTLCache(maxsize=1024, ttl=300)
+
+
+def init_app(app):
+    """Aplicar ``USER_CACHE_SIZE``/``USER_CACHE_TTL`` de la configuración"""
+    _usuarios.clear()
+    _usuarios.configurar(
+        maxsize=app.config.get('USER_CACHE_SIZE', 1024),
+        ttl=app.config.get('USER_CACHE_TTL', 300)
+    )
+    if not app.config.get('USER_CACHE_ENABLED', True):
+        _usuarios.configurar(maxsize=0)
+
+
+def cargar_usuario(user_id):
+    """Obtener el usuario de sesión, consultando la BD solo si no está en caché"""
+    usuario = _usuarios.get(user_id)
+    if usuario is not None:
+        return usuario
+
+    fila = db.session.execute(
+        select(User.id, User.email, User.role, User.created_at).where(User.id == user_id)
+    ).first()
+    if fila is None:
+        return None
+
+    usuario = UsuarioSesion(fila.id, fila.email, fila.role, fila.created_at)
+    _usuarios.set(user_id, usuario)
+    return usuario
+
+
+def invalidar_usuario(user_id):
+    """Quitar un usuario de la caché (se llama al modificarlo o eliminarlo)"""
+    _usuarios.pop(user_id)
+
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _invalidar_al_modificar(mapper, connection, target):
+    invalidar_usuario(target.id)
@@ -0,0 +1,21 @@
+"""Punto de entrada ASGI: el streaming del chatbot en el event loop y el resto en Flask.
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000 --workers 4
+
+``POST /chatbot/stream`` lo atiende ``app.chat_asgi`` (asíncrono, sin ocupar un
+hilo por conversación abierta); cualquier otra ruta pasa a la app de Flask a
+través del adaptador WSGI de Starlette, que la ejecuta en su pool de hilos.
+``run.py`` sigue sirviendo todo con Flask, incluido el ``/chatbot/stream`` síncrono.
+"""
+import warnings
+from app import create_app
+from app.chat_asgi import crear_app_chat
+
+with warnings.catch_warnings():
+    # Starlette marca el adaptador como deprecado en favor de a2wsgi; la interfaz es la misma
+    warnings.simplefilter('ignore', DeprecationWarning)
+    from starlette.middleware.wsgi import WSGIMiddleware
+
+flask_app = create_app()
+app = crear_app_chat(flask_app)
+app.mount('/', WSGIMiddleware(flask_app))
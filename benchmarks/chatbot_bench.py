@@ -0,0 +1,242 @@
+"""Tiempo al primer token y throughput del chatbot con N usuarios concurrentes.
+
+Uso:
+    python -m benchmarks.chatbot_bench --usuarios 16 --mensajes 5
+    python -m benchmarks.chatbot_bench --usuarios 32 --tokens-seg 80 --latencia lognormal:0.6:0.4 --tasa-429 0.05
+    python -m benchmarks.chatbot_bench --base-url http://127.0.0.1:8100 --guardar benchmarks/resultados/chatbot.json
+
+El modelo es el backend simulado (``app.services.llm_simulado``), así que no
+se gasta cuota de Groq: por defecto en el mismo proceso, o con ``--base-url``
+un servidor compatible con OpenAI (p. ej. ``python -m app.services.llm_simulado``)
+al que se llega con el SDK real de Groq.
+
+Cada usuario es un hilo con su propio ``test_client`` y sesión de docente que
+envía ``--mensajes`` preguntas a ``/chatbot/mensaje`` y luego a
+``/chatbot/stream``. Por ruta se reporta:
+
+* TTFT (tiempo al primer token): en ``/chatbot/stream``, hasta el primer
+  fragmento; en ``/chatbot/mensaje`` coincide con la respuesta completa;
+* latencia total, peticiones/s y tokens/s (tokens estimados de las respuestas);
+* tiempo en la cola del planificador de llamadas (``app.services.planificador_llm``,
+  incluidas las pausas por 429) separado del tiempo del modelo, según la
+  metadata ``llm`` de cada respuesta;
+* errores: respuestas de error del chatbot (p. ej. un 429 sin reintentos restantes).
+
+La caché de respuestas se desactiva salvo con ``--cache``: cada pregunta llega al modelo.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+
+from benchmarks.estadisticas import (
+    resumen_latencias, guardar_baseline, cargar_baseline, comparar, imprimir_comparacion
+)
+from benchmarks.http_bench import PASSWORD_DOCENTE, iniciar_sesion, sembrar
+
+RUTAS = ('chatbot.mensaje', 'chatbot.stream')
+TEMAS = ('aprendizaje automático', 'energías renovables', 'educación a distancia', 'bioinformática',
+         'redes de sensores', 'manufactura', 'gestión ambiental', 'ciencia de datos')
+PREGUNTAS = (
+    'Resume mi experiencia en {tema}',
+    '¿Qué publicaciones tengo relacionadas con {tema}?',
+    '¿Qué proyectos he dirigido sobre {tema}?',
+    'Sugiere cómo presentar mi trabajo en {tema} para una convocatoria',
+)
+# Inicio de las respuestas de error de ChatbotService (conversación y streaming)
+PREFIJOS_ERROR = ('Lo siento, ocurrió un error', 'Error:')
+
+
+def crear_app(ruta_bd, simulado, base_url=None, cache=False, max_concurrentes=8):
+    from app import create_app
+    from app.config import Config
+
+    class BenchConfig(Config):
+        TESTING = True
+        WTF_CSRF_ENABLED = False
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{ruta_bd}'
+        SQLALCHEMY_ENGINE_OPTIONS = {'connect_args': {'check_same_thread': False, 'timeout': 30}}
+        SLOW_QUERY_THRESHOLD_MS = None
+        CHAT_RESPUESTAS_CACHE_ENABLED = cache
+        LLM_BACKEND = 'groq' if base_url else 'simulado'
+        LLM_BASE_URL = base_url
+        GROQ_API_KEY = 'simulado'
+        LLM_SIMULADO_TOKENS_SEG = simulado['tokens_por_segundo']
+        LLM_SIMULADO_LATENCIA = simulado['latencia']
+        LLM_SIMULADO_TOKENS_RESPUESTA = simulado['tokens_respuesta']
+        LLM_SIMULADO_TASA_429 = simulado['tasa_429']
+        LLM_SIMULADO_TASA_ERROR = simulado['tasa_error']
+        LLM_SIMULADO_SEMILLA = simulado['semilla']
+        LLM_MAX_CONCURRENTES = max_concurrentes
+
+    return create_app(BenchConfig)
+
+
+def _es_error(texto):
+    return texto.startswith(PREFIJOS_ERROR)
+
+
+def pedir_mensaje(cliente, pregunta):
+    """``(ttft_ms, total_ms, texto, error, tiempos_llm)`` de una petición a ``/chatbot/mensaje``"""
+    inicio = time.perf_counter()
+    respuesta = cliente.post('/chatbot/mensaje', json={'mensaje': pregunta})
+    total_ms = (time.perf_counter() - inicio) * 1000
+    datos = respuesta.get_json() or {}
+    texto = datos.get('respuesta') or ''
+    tiempos = (datos.get('metadata') or {}).get('llm')
+    return total_ms, total_ms, texto, respuesta.status_code != 200 or _es_error(texto), tiempos
+
+
+def pedir_stream(cliente, pregunta):
+    """``(ttft_ms, total_ms, texto, error, tiempos_llm)`` leyendo los eventos SSE de ``/chatbot/stream`` a medida que llegan"""
+    inicio = time.perf_counter()
+    respuesta = cliente.post('/chatbot/stream', json={'mensaje': pregunta}, buffered=False)
+    ttft_ms, partes, error, tiempos = None, [], respuesta.status_code != 200, None
+    pendiente = b''
+    for bloque in respuesta.response:
+        pendiente += bloque
+        *eventos, pendiente = pendiente.split(b'\n\n')
+        for evento in eventos:
+            if not evento.startswith(b'data: '):
+                continue
+            datos = json.loads(evento[6:])
+            if 'chunk' in datos:
+                if ttft_ms is None:
+                    ttft_ms = (time.perf_counter() - inicio) * 1000
+                partes.append(datos['chunk'])
+            tiempos = (datos.get('metadata') or {}).get('llm', tiempos)
+            error = error or 'error' in datos
+    respuesta.close()
+    total_ms = (time.perf_counter() - inicio) * 1000
+    texto = ''.join(partes)
+    return ttft_ms if ttft_ms is not None else total_ms, total_ms, texto, error or _es_error(texto), tiempos
+
+
+PETICIONES = {'chatbot.mensaje': pedir_mensaje, 'chatbot.stream': pedir_stream}
+
+
+def medir_ruta(ruta, clientes, mensajes, semilla):
+    """Cada cliente envía ``mensajes`` preguntas en su propio hilo; devuelve el resumen de la ruta"""
+    from app.services.conversaciones import estimar_tokens
+
+    pedir = PETICIONES[ruta]
+
+    def trabajador(i):
+        rng = random.Random(f'{semilla}:{ruta}:{i}')
+        return [pedir(clientes[i], rng.choice(PREGUNTAS).format(tema=rng.choice(TEMAS))) for _ in range(mensajes)]
+
+    with ThreadPoolExecutor(max_workers=len(clientes)) as pool:
+        inicio = time.perf_counter()
+        muestras = [m for lote in pool.map(trabajador, range(len(clientes))) for m in lote]
+        duracion = time.perf_counter() - inicio
+
+    resultado = resumen_latencias([m[0] for m in muestras], duracion)
+    totales = resumen_latencias([m[1] for m in muestras])
+    resultado['total_p50_ms'] = totales['p50_ms']
+    resultado['total_p95_ms'] = totales['p95_ms']
+    resultado['tokens_por_s'] = sum(estimar_tokens(m[2]) for m in muestras if not m[3]) / duracion
+    tiempos = [m[4] for m in muestras if m[4]]
+    cola = resumen_latencias([t['cola_ms'] for t in tiempos])
+    resultado['cola_p50_ms'], resultado['cola_p95_ms'] = cola['p50_ms'], cola['p95_ms']
+    resultado['modelo_p50_ms'] = resumen_latencias([t['modelo_ms'] for t in tiempos])['p50_ms']
+    resultado['reintentos'] = sum(t['reintentos'] for t in tiempos)
+    resultado['errores'] = sum(1 for m in muestras if m[3])
+    return resultado
+
+
+def correr(usuarios=8, mensajes=3, tokens_por_segundo=40.0, latencia='lognormal:0.4:0.5', tokens_respuesta=120,
+           tasa_429=0.0, tasa_error=0.0, base_url=None, cache=False, semilla=42, rutas=None,
+           max_concurrentes=8):
+    """Sembrar una BD temporal con ``usuarios`` docentes y medir las rutas; devuelve (resultados, configuración)"""
+    simulado = {
+        'tokens_por_segundo': tokens_por_segundo, 'latencia': latencia, 'tokens_respuesta': tokens_respuesta,
+        'tasa_429': tasa_429, 'tasa_error': tasa_error, 'semilla': semilla,
+    }
+    configuracion = {'usuarios': usuarios, 'mensajes': mensajes, 'base_url': base_url, 'cache': cache,
+                     'max_concurrentes': max_concurrentes, **simulado}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = crear_app(os.path.join(tmp, 'bench.db'), simulado, base_url, cache, max_concurrentes)
+        contexto = sembrar(app, usuarios, 0.5, semilla)
+        clientes = [iniciar_sesion(app, email, PASSWORD_DOCENTE) for email in contexto['docente_emails']]
+        imprimir_encabezado()
+
+        resultados = {}
+        for ruta in rutas or RUTAS:
+            # El chatbot imprime diagnósticos y trazas de error; se descartan mientras se mide
+            with open(os.devnull, 'w') as nulo, redirect_stdout(nulo), redirect_stderr(nulo):
+                resultados[ruta] = medir_ruta(ruta, clientes, mensajes, semilla)
+            imprimir_fila(ruta, resultados[ruta])
+
+        proveedor = app.extensions['llm']
+        if proveedor.simulado is not None:
+            print(f'\nmodelo simulado: {proveedor.simulado.estadisticas()}')
+        print(f'planificador: {app.extensions["planificador_llm"].estadisticas()}')
+
+    return resultados, configuracion
+
+
+def imprimir_encabezado():
+    print(f'\n{"ruta":16} {"n":>5} {"err":>4} {"ttft p50":>9} {"ttft p95":>9} {"ttft p99":>9} '
+          f'{"total p50":>10} {"total p95":>10} {"cola p50":>9} {"cola p95":>9} {"modelo p50":>10} '
+          f'{"req/s":>7} {"tokens/s":>9}')
+
+
+def imprimir_fila(nombre, r):
+    print(f'{nombre:16} {r["n"]:>5} {r["errores"]:>4} {r["p50_ms"]:>9.1f} {r["p95_ms"]:>9.1f} {r["p99_ms"]:>9.1f} '
+          f'{r["total_p50_ms"]:>10.1f} {r["total_p95_ms"]:>10.1f} {_ms(r["cola_p50_ms"]):>9} {_ms(r["cola_p95_ms"]):>9} '
+          f'{_ms(r["modelo_p50_ms"]):>10} {r["throughput_rps"]:>7.1f} {r["tokens_por_s"]:>9.1f}')
+
+
+def _ms(valor):
+    return '-' if valor is None else f'{valor:.1f}'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--usuarios', type=int, default=8, help='Usuarios concurrentes (un docente cada uno)')
+    parser.add_argument('--mensajes', type=int, default=3, help='Preguntas por usuario y ruta')
+    parser.add_argument('--tokens-seg', type=float, default=40.0)
+    parser.add_argument('--latencia', default='lognormal:0.4:0.5',
+                        help='Hasta el primer token: fija:s, uniforme:min:max o lognormal:mediana:sigma')
+    parser.add_argument('--tokens-respuesta', type=int, default=120)
+    parser.add_argument('--tasa-429', type=float, default=0.0)
+    parser.add_argument('--tasa-error', type=float, default=0.0)
+    parser.add_argument('--base-url', help='Servidor compatible con OpenAI (en lugar del simulado en proceso)')
+    parser.add_argument('--cache', action='store_true', help='Mantener la caché de respuestas del chatbot')
+    parser.add_argument('--max-concurrentes', type=int, default=8, help='Tope de llamadas al modelo en curso')
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--rutas', nargs='*', choices=RUTAS)
+    parser.add_argument('--guardar', metavar='JSON', help='Guardar los resultados como baseline')
+    parser.add_argument('--comparar', metavar='JSON', help='Comparar contra un baseline guardado')
+    parser.add_argument('--tolerancia', type=float, default=0.20, help='Empeoramiento permitido (fracción)')
+    args = parser.parse_args(argv)
+
+    resultados, configuracion = correr(
+        args.usuarios, args.mensajes, args.tokens_seg, args.latencia, args.tokens_respuesta,
+        args.tasa_429, args.tasa_error, args.base_url, args.cache, args.semilla, args.rutas,
+        args.max_concurrentes
+    )
+
+    if args.guardar:
+        guardar_baseline(args.guardar, resultados, configuracion)
+        print(f'\nBaseline guardado en {args.guardar}')
+
+    if args.comparar:
+        baseline = cargar_baseline(args.comparar)
+        if baseline.get('configuracion') != configuracion:
+            print('\n⚠️ La configuración difiere del baseline; la comparación es orientativa')
+        filas = comparar(resultados, baseline, ('p50_ms', 'p95_ms', 'throughput_rps'), args.tolerancia)
+        imprimir_comparacion(filas)
+        if any(fila[-1] for fila in filas):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
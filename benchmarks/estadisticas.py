@@ -0,0 +1,80 @@
+import json
+import math
+import os
+import platform
+from datetime import datetime
+
+
+def percentil(valores, p):
+    """Percentil ``p`` (0-100) con interpolación lineal; None si no hay valores"""
+    if not valores:
+        return None
+    ordenados = sorted(valores)
+    posicion = (len(ordenados) - 1) * p / 100.0
+    bajo, alto = math.floor(posicion), math.ceil(posicion)
+    if bajo == alto:
+        return ordenados[bajo]
+    return ordenados[bajo] + (ordenados[alto] - ordenados[bajo]) * (posicion - bajo)
+
+
+def resumen_latencias(latencias_ms, duracion_s=None):
+    """p50/p95/p99, media, máximo y (si se da la duración) throughput en req/s"""
+    resumen = {
+        'n': len(latencias_ms),
+        'p50_ms': percentil(latencias_ms, 50),
+        'p95_ms': percentil(latencias_ms, 95),
+        'p99_ms': percentil(latencias_ms, 99),
+        'media_ms': sum(latencias_ms) / len(latencias_ms) if latencias_ms else None,
+        'max_ms': max(latencias_ms, default=None),
+    }
+    if duracion_s:
+        resumen['throughput_rps'] = len(latencias_ms) / duracion_s
+    return resumen
+
+
+def guardar_baseline(ruta, resultados, configuracion):
+    """Guardar resultados y configuración como JSON para comparar corridas futuras"""
+    os.makedirs(os.path.dirname(os.path.abspath(ruta)), exist_ok=True)
+    datos = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'maquina': platform.machine(),
+        'configuracion': configuracion,
+        'resultados': resultados,
+    }
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(datos, f, ensure_ascii=False, indent=2)
+
+
+def cargar_baseline(ruta):
+    with open(ruta, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def comparar(resultados, baseline, metricas=('p50_ms', 'p95_ms', 'consultas_por_peticion'), tolerancia=0.20):
+    """Comparar contra un baseline; devuelve [(nombre, métrica, antes, ahora, cambio, regresión)].
+
+    Una métrica es regresión cuando empeora más de ``tolerancia`` (fracción).
+    Para ``throughput_rps`` mayor es mejor; para el resto, menor es mejor.
+    """
+    filas = []
+    anteriores = baseline.get('resultados', {})
+    for nombre, actual in resultados.items():
+        anterior = anteriores.get(nombre)
+        if not anterior:
+            continue
+        for metrica in metricas:
+            antes, ahora = anterior.get(metrica), actual.get(metrica)
+            if antes is None or ahora is None:
+                continue
+            cambio = (ahora - antes) / antes if antes else (0.0 if ahora == antes else math.inf)
+            empeora = -cambio if metrica == 'throughput_rps' else cambio
+            filas.append((nombre, metrica, antes, ahora, cambio, empeora > tolerancia))
+    return filas
+
+
+def imprimir_comparacion(filas):
+    print(f'\n{"ruta":24} {"métrica":24} {"baseline":>10} {"actual":>10} {"cambio":>9}')
+    for nombre, metrica, antes, ahora, cambio, regresion in filas:
+        marca = '  ⚠️ regresión' if regresion else ''
+        print(f'{nombre:24} {metrica:24} {antes:>10.2f} {ahora:>10.2f} {cambio:>+8.1%}{marca}')
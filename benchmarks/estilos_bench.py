@@ -0,0 +1,60 @@
+"""Micro-benchmark del costo de preparar los estilos de ReportLab por render.
+
+Uso:
+    python -m benchmarks.estilos_bench --repeticiones 2000
+
+Compara construir la hoja completa en cada render (lo que hacían
+``CVPDFGenerator()`` y ``CVGeneratorService.generar_pdf`` antes del registro
+``app.services.cv_estilos``) contra tomarla del registro compartido.
+"""
+import argparse
+import sys
+import time
+
+from benchmarks.estadisticas import resumen_latencias
+
+
+def _casos():
+    from app.services.cv_estilos import construir_hoja_estilos, hoja_estilos
+    from app.services.cv_pdf_generator import CVPDFGenerator
+
+    hoja_estilos()  # el registro se llena una vez, fuera de la medición
+    return {
+        'hoja_sin_registro': construir_hoja_estilos,
+        'hoja_del_registro': hoja_estilos,
+        'CVPDFGenerator()': CVPDFGenerator,
+    }
+
+
+def medir(repeticiones=1000, casos=None):
+    """Latencias por caso en milisegundos (resumen de ``estadisticas``)"""
+    resultados = {}
+    for nombre, funcion in (casos or _casos()).items():
+        latencias = []
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            t0 = time.perf_counter()
+            funcion()
+            latencias.append((time.perf_counter() - t0) * 1000)
+        resultados[nombre] = resumen_latencias(latencias, time.perf_counter() - inicio)
+    return resultados
+
+
+def imprimir(resultados):
+    print(f'{"caso":22} {"n":>6} {"p50 µs":>10} {"p95 µs":>10} {"ops/s":>12}')
+    for nombre, r in resultados.items():
+        print(f'{nombre:22} {r["n"]:>6} {r["p50_ms"] * 1000:>10.1f} {r["p95_ms"] * 1000:>10.1f} '
+              f'{r["throughput_rps"]:>12,.0f}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeticiones', type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    imprimir(medir(args.repeticiones))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""Benchmark HTTP de las rutas principales sobre una BD sintética escalada.
+
+Uso:
+    python -m benchmarks.http_bench --docentes 500 --peticiones 200 --concurrencia 8
+    python -m benchmarks.http_bench --guardar benchmarks/resultados/baseline.json
+    python -m benchmarks.http_bench --comparar benchmarks/resultados/baseline.json
+
+Cada hilo usa su propio ``test_client`` con sesión iniciada (docente o admin).
+``/sync/todas`` se ejecuta contra publicaciones grabadas en
+``benchmarks/fixtures/sync_todas.json``: no sale ninguna petición a ORCID,
+Scopus o PubMed, de modo que los tiempos solo reflejan a la aplicación.
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from dataclasses import dataclass
+from unittest import mock
+
+from benchmarks.estadisticas import (
+    resumen_latencias, guardar_baseline, cargar_baseline, comparar, imprimir_comparacion
+)
+
+DIR_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+PASSWORD_ADMIN = 'admin123'
+PASSWORD_DOCENTE = 'docente123'
+
+
+@dataclass(frozen=True)
+class Ruta:
+    nombre: str
+    rol: str
+    metodo: str
+    url: object  # str o callable(rng, contexto) -> str
+    datos: dict = None
+    estado_esperado: tuple = (200,)
+
+
+RUTAS = (
+    Ruta('docente.dashboard', 'docente', 'GET', '/docente/dashboard'),
+    Ruta('docente.perfil', 'docente', 'GET', '/docente/perfil'),
+    Ruta('admin.docentes', 'admin', 'GET', '/admin/docentes'),
+    Ruta('admin.ver_docente', 'admin', 'GET',
+         lambda rng, contexto: f'/admin/docentes/{rng.choice(contexto["docente_ids"])}'),
+    # Solo encola el render y redirige: mide el tiempo que la petición ocupa al hilo WSGI
+    Ruta('cv.generar', 'docente', 'POST', '/cv/generar', {'formato': 'pdf', 'tipo_cv': 'academico'},
+         estado_esperado=(302,)),
+    Ruta('sync.todas', 'docente', 'POST', '/sync/todas', estado_esperado=(302,)),
+)
+
+
+def crear_app(ruta_bd, cache_cv=True):
+    from app import create_app
+    from app.config import Config
+
+    class BenchConfig(Config):
+        TESTING = True
+        WTF_CSRF_ENABLED = False
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{ruta_bd}'
+        SQLALCHEMY_ENGINE_OPTIONS = {'connect_args': {'check_same_thread': False, 'timeout': 30}}
+        QUERY_STATS_HEADERS = True
+        SLOW_QUERY_THRESHOLD_MS = None
+        CV_CACHE_ENABLED = cache_cv
+        CV_CACHE_DIR = os.path.join(os.path.dirname(ruta_bd), 'cv_cache')
+
+    return create_app(BenchConfig)
+
+
+def sembrar(app, docentes, escala, semilla):
+    """Crear el esquema, poblarlo con datos sintéticos y un admin; devuelve el contexto del benchmark"""
+    from app import db
+    from app.models.user import User
+    from app.models.docente import Docente
+    from app.services.datos_sinteticos import GeneradorDatosSinteticos, TAMANOS_POR_DEFECTO
+
+    with app.app_context():
+        db.create_all()
+        tamanos = {nombre: round(media * escala) for nombre, media in TAMANOS_POR_DEFECTO.items()}
+        conteos = GeneradorDatosSinteticos(semilla=semilla, password=PASSWORD_DOCENTE).generar(docentes, tamanos)
+
+        admin = User(email='admin@bench.utte.edu.mx', role='admin')
+        admin.set_password(PASSWORD_ADMIN)
+        db.session.add(admin)
+        db.session.commit()
+
+        filas = db.session.execute(db.select(Docente.id, User.email).join(User, Docente.user_id == User.id)).all()
+        return {
+            'conteos': conteos,
+            'docente_ids': [fila.id for fila in filas],
+            'docente_emails': [fila.email for fila in filas],
+            'admin_email': admin.email,
+        }
+
+
+def iniciar_sesion(app, email, password):
+    cliente = app.test_client()
+    respuesta = cliente.post('/auth/login', data={'email': email, 'password': password})
+    if respuesta.status_code != 302:
+        raise RuntimeError(f'No se pudo iniciar sesión como {email} ({respuesta.status_code})')
+    return cliente
+
+
+def _ejecutar(cliente, ruta, rng, contexto):
+    url = ruta.url(rng, contexto) if callable(ruta.url) else ruta.url
+    inicio = time.perf_counter()
+    respuesta = cliente.open(url, method=ruta.metodo, data=ruta.datos)
+    latencia_ms = (time.perf_counter() - inicio) * 1000
+    consultas = int(respuesta.headers.get('X-Query-Count', 0))
+    ok = respuesta.status_code in ruta.estado_esperado
+    respuesta.close()
+    return latencia_ms, consultas, ok
+
+
+def medir_ruta(ruta, clientes, peticiones, calentamiento, semilla, contexto):
+    """Lanzar ``peticiones`` repartidas entre los clientes en paralelo (un hilo por cliente)"""
+    concurrencia = len(clientes)
+    por_hilo = [peticiones // concurrencia + (1 if i < peticiones % concurrencia else 0) for i in range(concurrencia)]
+
+    rngs = [random.Random(f'{semilla}:{ruta.nombre}:{i}') for i in range(concurrencia)]
+
+    def calentar(i):
+        for _ in range(calentamiento):
+            _ejecutar(clientes[i], ruta, rngs[i], contexto)
+
+    def trabajador(i):
+        return [_ejecutar(clientes[i], ruta, rngs[i], contexto) for _ in range(por_hilo[i])]
+
+    with ThreadPoolExecutor(max_workers=concurrencia) as pool:
+        list(pool.map(calentar, range(concurrencia)))
+        inicio = time.perf_counter()
+        muestras = [m for lote in pool.map(trabajador, range(concurrencia)) for m in lote]
+        duracion = time.perf_counter() - inicio
+
+    resultado = resumen_latencias([m[0] for m in muestras], duracion)
+    resultado['errores'] = sum(1 for m in muestras if not m[2])
+    resultado['consultas_por_peticion'] = sum(m[1] for m in muestras) / len(muestras) if muestras else None
+    return resultado
+
+
+def correr(docentes=200, escala=1.0, peticiones=100, concurrencia=4, calentamiento=2, semilla=42, rutas=None):
+    """Sembrar una BD temporal y medir las rutas; devuelve (resultados, configuración)"""
+    from app.services.api_externa_service import APIExternaService
+
+    configuracion = {
+        'docentes': docentes, 'escala': escala, 'peticiones': peticiones,
+        'concurrencia': concurrencia, 'calentamiento': calentamiento, 'semilla': semilla,
+    }
+    seleccion = [r for r in RUTAS if not rutas or r.nombre in rutas]
+    with open(os.path.join(DIR_FIXTURES, 'sync_todas.json'), encoding='utf-8') as f:
+        fixture_sync = json.load(f)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app = crear_app(os.path.join(tmp, 'bench.db'))
+        inicio = time.perf_counter()
+        contexto = sembrar(app, docentes, escala, semilla)
+        print(f'BD sembrada: {sum(contexto["conteos"].values()):,} filas en {time.perf_counter() - inicio:.1f}s')
+        imprimir_encabezado()
+
+        clientes = {
+            'docente': [iniciar_sesion(app, contexto['docente_emails'][i % docentes], PASSWORD_DOCENTE)
+                        for i in range(concurrencia)],
+            'admin': [iniciar_sesion(app, contexto['admin_email'], PASSWORD_ADMIN) for _ in range(concurrencia)],
+        }
+
+        resultados = {}
+        reemplazo = lambda self: copy.deepcopy(fixture_sync)
+        with mock.patch.object(APIExternaService, 'obtener_todas_publicaciones', reemplazo):
+            for ruta in seleccion:
+                # Las vistas imprimen diagnósticos en stdout; se descartan mientras se mide
+                with open(os.devnull, 'w') as nulo, redirect_stdout(nulo):
+                    resultados[ruta.nombre] = medir_ruta(
+                        ruta, clientes[ruta.rol], peticiones, calentamiento, semilla, contexto
+                    )
+                imprimir_fila(ruta.nombre, resultados[ruta.nombre])
+
+    return resultados, configuracion
+
+
+def imprimir_encabezado():
+    print(f'\n{"ruta":20} {"n":>5} {"err":>4} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"req/s":>8} {"consultas":>9}')
+
+
+def imprimir_fila(nombre, r):
+    print(f'{nombre:20} {r["n"]:>5} {r["errores"]:>4} {r["p50_ms"]:>9.2f} {r["p95_ms"]:>9.2f} '
+          f'{r["p99_ms"]:>9.2f} {r["throughput_rps"]:>8.1f} {r["consultas_por_peticion"]:>9.1f}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--docentes', type=int, default=200)
+    parser.add_argument('--escala', type=float, default=1.0, help='Multiplicador del tamaño de las colecciones')
+    parser.add_argument('--peticiones', type=int, default=100, help='Peticiones medidas por ruta')
+    parser.add_argument('--concurrencia', type=int, default=4)
+    parser.add_argument('--calentamiento', type=int, default=2, help='Peticiones no medidas por hilo y ruta')
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--rutas', nargs='*', choices=[r.nombre for r in RUTAS])
+    parser.add_argument('--guardar', metavar='JSON', help='Guardar los resultados como baseline')
+    parser.add_argument('--comparar', metavar='JSON', help='Comparar contra un baseline guardado')
+    parser.add_argument('--tolerancia', type=float, default=0.20, help='Empeoramiento permitido (fracción)')
+    args = parser.parse_args(argv)
+
+    resultados, configuracion = correr(
+        args.docentes, args.escala, args.peticiones, args.concurrencia,
+        args.calentamiento, args.semilla, args.rutas
+    )
+
+    if args.guardar:
+        guardar_baseline(args.guardar, resultados, configuracion)
+        print(f'\nBaseline guardado en {args.guardar}')
+
+    if args.comparar:
+        baseline = cargar_baseline(args.comparar)
+        if baseline.get('configuracion') != configuracion:
+            print('\n⚠️ La configuración difiere del baseline; la comparación es orientativa')
+        filas = comparar(resultados, baseline, tolerancia=args.tolerancia)
+        imprimir_comparacion(filas)
+        if any(fila[-1] for fila in filas):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Precisión y latencia del intérprete local de actualizaciones del chatbot.
+
+Uso:
+    python -m benchmarks.intenciones_bench --repeticiones 200
+
+Recorre el corpus etiquetado ``benchmarks/fixtures/intenciones_actualizacion.json``
+con ``app.services.intenciones.interpretar_actualizacion`` y reporta:
+
+* resueltas: frases que se atienden sin llamar al modelo;
+* erróneas: frases resueltas con un campo o valor distinto a la etiqueta
+  (deben ser cero: una actualización mal interpretada se guarda en la BD);
+* al modelo: frases que se delegan al modelo, como antes de este intérprete.
+
+La latencia es la de interpretar cada frase; el camino anterior pagaba una
+llamada completa a la API por cada una.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from benchmarks.estadisticas import resumen_latencias
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'intenciones_actualizacion.json')
+
+
+def cargar_corpus(ruta=CORPUS):
+    with open(ruta, encoding='utf-8') as archivo:
+        return json.load(archivo)['casos']
+
+
+def evaluar(casos):
+    """Conteos de aciertos por tipo y las frases que no coinciden con su etiqueta"""
+    from app.services.intenciones import interpretar_actualizacion
+
+    conteos = {'resueltas': 0, 'erroneas': 0, 'al_modelo': 0, 'omitidas': 0}
+    discrepancias = []
+    for caso in casos:
+        obtenido = interpretar_actualizacion(caso['mensaje'])
+        esperado = caso['esperado']
+        if obtenido is None:
+            conteos['al_modelo'] += 1
+            # Resoluble localmente según la etiqueta, pero se delegó al modelo
+            if esperado is not None:
+                conteos['omitidas'] += 1
+                discrepancias.append((caso['mensaje'], esperado, obtenido))
+        elif obtenido == esperado:
+            conteos['resueltas'] += 1
+        else:
+            conteos['erroneas'] += 1
+            discrepancias.append((caso['mensaje'], esperado, obtenido))
+    return conteos, discrepancias
+
+
+def medir(repeticiones=100, casos=None):
+    """Latencia por frase en milisegundos (resumen de ``estadisticas``)"""
+    from app.services.intenciones import interpretar_actualizacion
+
+    casos = casos or cargar_corpus()
+    latencias = []
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        for caso in casos:
+            t0 = time.perf_counter()
+            interpretar_actualizacion(caso['mensaje'])
+            latencias.append((time.perf_counter() - t0) * 1000)
+    return resumen_latencias(latencias, time.perf_counter() - inicio)
+
+
+def imprimir(conteos, discrepancias, latencia):
+    total = conteos['resueltas'] + conteos['erroneas'] + conteos['al_modelo']
+    print(f'{total} frases: {conteos["resueltas"]} resueltas localmente, '
+          f'{conteos["erroneas"]} erróneas, {conteos["al_modelo"]} al modelo '
+          f'({conteos["omitidas"]} resolubles)')
+    for mensaje, esperado, obtenido in discrepancias:
+        print(f'  ✗ {mensaje!r}: esperado {esperado}, obtenido {obtenido}')
+    print(f'latencia: p50 {latencia["p50_ms"] * 1000:.1f} µs, p95 {latencia["p95_ms"] * 1000:.1f} µs, '
+          f'{latencia["throughput_rps"]:,.0f} frases/s')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeticiones', type=int, default=100)
+    parser.add_argument('--corpus', default=CORPUS)
+    args = parser.parse_args(argv)
+
+    casos = cargar_corpus(args.corpus)
+    conteos, discrepancias = evaluar(casos)
+    imprimir(conteos, discrepancias, medir(args.repeticiones, casos))
+    # Una actualización mal interpretada es peor que una llamada de más al modelo
+    return 1 if conteos['erroneas'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
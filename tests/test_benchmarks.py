@@ -0,0 +1,86 @@
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from benchmarks.estadisticas import percentil, comparar, guardar_baseline, cargar_baseline
+from benchmarks import chatbot_bench, estilos_bench, http_bench, intenciones_bench
+
+
+class EstadisticasTestCase(unittest.TestCase):
+    def test_percentil_interpolado(self):
+        valores = [10, 20, 30, 40, 50]
+
+        self.assertEqual(percentil(valores, 50), 30)
+        self.assertEqual(percentil(valores, 0), 10)
+        self.assertEqual(percentil(valores, 100), 50)
+        self.assertAlmostEqual(percentil(valores, 95), 48)
+        self.assertIsNone(percentil([], 50))
+
+    def test_comparar_detecta_regresiones(self):
+        baseline = {'resultados': {'r': {'p95_ms': 100.0, 'throughput_rps': 50.0}}}
+        actuales = {'r': {'p95_ms': 130.0, 'throughput_rps': 48.0}}
+
+        filas = {fila[1]: fila for fila in comparar(actuales, baseline, ('p95_ms', 'throughput_rps'), 0.2)}
+
+        self.assertTrue(filas['p95_ms'][-1])
+        self.assertFalse(filas['throughput_rps'][-1])
+
+
+class HttpBenchTestCase(unittest.TestCase):
+    def test_corrida_minima_y_baseline(self):
+        with redirect_stdout(io.StringIO()):
+            resultados, configuracion = http_bench.correr(
+                docentes=3, escala=0.5, peticiones=2, concurrencia=2, calentamiento=0
+            )
+
+        self.assertEqual(set(resultados), {ruta.nombre for ruta in http_bench.RUTAS})
+        for nombre, resultado in resultados.items():
+            self.assertEqual(resultado['errores'], 0, nombre)
+            self.assertGreater(resultado['consultas_por_peticion'], 0, nombre)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            ruta = os.path.join(tmp, 'baseline.json')
+            guardar_baseline(ruta, resultados, configuracion)
+            self.assertEqual(cargar_baseline(ruta)['configuracion'], configuracion)
+
+
+class EstilosBenchTestCase(unittest.TestCase):
+    def test_registro_es_mas_barato_que_reconstruir(self):
+        resultados = estilos_bench.medir(repeticiones=20)
+
+        self.assertEqual(resultados['hoja_sin_registro']['n'], 20)
+        self.assertLess(resultados['hoja_del_registro']['p50_ms'], resultados['hoja_sin_registro']['p50_ms'])
+
+
+class IntencionesBenchTestCase(unittest.TestCase):
+    def test_corpus_sin_actualizaciones_erroneas(self):
+        casos = intenciones_bench.cargar_corpus()
+
+        conteos, discrepancias = intenciones_bench.evaluar(casos)
+
+        self.assertEqual(discrepancias, [])
+        self.assertEqual(conteos['erroneas'], 0)
+        self.assertGreater(conteos['resueltas'], 0)
+        self.assertEqual(intenciones_bench.medir(repeticiones=2, casos=casos)['n'], 2 * len(casos))
+
+
+class ChatbotBenchTestCase(unittest.TestCase):
+    def test_corrida_minima_con_el_modelo_simulado(self):
+        with redirect_stdout(io.StringIO()):
+            resultados, configuracion = chatbot_bench.correr(
+                usuarios=2, mensajes=2, tokens_por_segundo=500, latencia='fija:0.02', tokens_respuesta=10
+            )
+
+        self.assertEqual(set(resultados), set(chatbot_bench.RUTAS))
+        for nombre, resultado in resultados.items():
+            self.assertEqual((resultado['n'], resultado['errores']), (4, 0), nombre)
+            self.assertGreater(resultado['tokens_por_s'], 0, nombre)
+        # En streaming el primer token llega antes que la respuesta completa
+        stream = resultados['chatbot.stream']
+        self.assertLess(stream['p50_ms'], stream['total_p50_ms'])
+        self.assertEqual(configuracion['usuarios'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,164 @@
+import asyncio
+import json
+import unittest
+from unittest import mock
+from starlette.testclient import TestClient
+from app import create_app, db
+from app.chat_asgi import LATIDO, Retransmision, crear_app_chat
+from app.config import Config
+from app.models.user import User
+from app.models.docente import Docente
+from app.models.mensaje_chat import MensajeChat
+from app.services.llm_cliente import ProveedorLLM
+from tests.test_conversaciones import fragmento_llm
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    WTF_CSRF_ENABLED = False
+    CV_JOBS_WORKERS = 0
+    GROQ_API_KEY = 'clave-de-prueba'
+
+
+class StreamFalso:
+    """Stream asíncrono de la API: ``textos`` con ``pausa`` segundos entre cada uno"""
+
+    def __init__(self, textos, pausa=0.0, error=None):
+        self.textos = textos
+        self.pausa = pausa
+        self.error = error
+        self.leidos = 0
+        self.cerrado = False
+
+    def __aiter__(self):
+        return self._generar()
+
+    async def _generar(self):
+        for texto in self.textos:
+            await asyncio.sleep(self.pausa)
+            self.leidos += 1
+            yield fragmento_llm(texto)
+        if self.error:
+            raise self.error
+
+    async def close(self):
+        self.cerrado = True
+
+
+def recolectar(retransmision, limite=None):
+    async def leer():
+        eventos = []
+        generador = retransmision.eventos()
+        async for evento in generador:
+            eventos.append(evento)
+            if limite and len(eventos) >= limite:
+                await generador.aclose()
+                break
+        return eventos
+    return asyncio.run(leer())
+
+
+class RetransmisionTestCase(unittest.TestCase):
+    def test_retransmite_los_fragmentos_y_cierra_el_stream(self):
+        stream = StreamFalso(['Ho', '', 'la'])
+        retransmision = Retransmision(stream, latido=5)
+
+        eventos = recolectar(retransmision)
+
+        self.assertEqual(eventos, ['data: {"chunk": "Ho"}\n\n', 'data: {"chunk": "la"}\n\n'])
+        self.assertTrue(retransmision.completa)
+        self.assertEqual(retransmision.texto, 'Hola')
+        self.assertTrue(stream.cerrado)
+
+    def test_latido_mientras_el_modelo_no_responde(self):
+        retransmision = Retransmision(StreamFalso(['Hola'], pausa=0.05), latido=0.01)
+
+        eventos = recolectar(retransmision)
+
+        self.assertIn(LATIDO, eventos)
+        self.assertEqual(eventos[-1], 'data: {"chunk": "Hola"}\n\n')
+        self.assertEqual(retransmision.texto, 'Hola')
+
+    def test_desconexion_deja_de_leer_la_api(self):
+        stream = StreamFalso(['x'] * 1000)
+        retransmision = Retransmision(stream, latido=5, buffer=4)
+
+        eventos = recolectar(retransmision, limite=2)
+
+        self.assertEqual(len(eventos), 2)
+        self.assertFalse(retransmision.completa)
+        self.assertTrue(stream.cerrado)
+        # Con la cola llena la lectura se detiene: nunca más de lo que cabe en ella
+        self.assertLessEqual(stream.leidos, 2 + 4 + 1)
+
+    def test_error_de_la_api_a_mitad_del_stream(self):
+        stream = StreamFalso(['Ho'], error=RuntimeError('conexión perdida'))
+        retransmision = Retransmision(stream, latido=5)
+
+        eventos = recolectar(retransmision)
+
+        self.assertEqual(eventos[-1], 'data: {"error": "conexi\\u00f3n perdida"}\n\n')
+        self.assertFalse(retransmision.completa)
+        self.assertTrue(stream.cerrado)
+
+
+class ChatAsgiTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        with self.app.app_context():
+            db.create_all()
+            user = User(email='docente@example.com', role='docente')
+            user.set_password('password123')
+            db.session.add(Docente(user=user, nombre_completo='Ana Ruiz'))
+            db.session.commit()
+        parche = mock.patch.object(ProveedorLLM, 'cliente', return_value=mock.Mock())
+        parche.start()
+        self.addCleanup(parche.stop)
+
+        self.stream = StreamFalso(['Ho', 'la'])
+        self.llm = mock.Mock()
+        self.llm.chat.completions.create = mock.AsyncMock(return_value=self.stream)
+        parche = mock.patch.object(ProveedorLLM, 'cliente_async', return_value=self.llm)
+        parche.start()
+        self.addCleanup(parche.stop)
+
+        flask_client = self.app.test_client()
+        flask_client.post('/auth/login', data={'email': 'docente@example.com', 'password': 'password123'})
+        self.client = TestClient(crear_app_chat(self.app))
+        self.client.cookies.set('session', flask_client.get_cookie('session').value)
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_stream_con_la_sesion_de_flask_guarda_el_turno(self):
+        respuesta = self.client.post('/chatbot/stream', json={'mensaje': 'Hola'})
+
+        eventos = [json.loads(linea[6:]) for linea in respuesta.text.split('\n\n') if linea.startswith('data: ')]
+        self.assertEqual(respuesta.headers['content-type'], 'text/event-stream; charset=utf-8')
+        self.assertEqual(eventos[:2], [{'chunk': 'Ho'}, {'chunk': 'la'}])
+        self.assertEqual(set(eventos[2]['metadata']['llm']), {'cola_ms', 'modelo_ms', 'reintentos'})
+        self.assertTrue(self.llm.chat.completions.create.call_args.kwargs['stream'])
+        self.assertTrue(self.stream.cerrado)
+        with self.app.app_context():
+            self.assertEqual([m.contenido for m in MensajeChat.query.order_by(MensajeChat.id)], ['Hola', 'Hola'])
+
+    def test_sin_sesion_valida(self):
+        for cookie in (None, 'cookie-falsificada'):
+            self.client.cookies.clear()
+            if cookie:
+                self.client.cookies.set('session', cookie)
+            respuesta = self.client.post('/chatbot/stream', json={'mensaje': 'Hola'})
+            self.assertEqual(respuesta.status_code, 401)
+        self.llm.chat.completions.create.assert_not_called()
+
+    def test_mensaje_vacio(self):
+        respuesta = self.client.post('/chatbot/stream', json={'mensaje': ''})
+
+        self.assertEqual(respuesta.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from sqlalchemy import update
+from app import create_app, db
+from app.config import Config
+from app.models.user import User
+from app.models.docente import Docente
+from app.models.articulo import Articulo
+from app.models.perfil_version import PerfilVersion
+from app.services import chatbot_contexto
+from app.services.chatbot_contexto import obtener_contexto
+from app.services.chatbot_service import ChatbotService
+from app.utils.query_stats import contar_consultas
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    CV_JOBS_WORKERS = 0
+    GROQ_API_KEY = 'clave-de-prueba'
+    CHAT_CONTEXTO_TTL = 60
+
+
+class ContextoChatTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.contexto = self.app.app_context()
+        self.contexto.push()
+        db.create_all()
+        user = User(email='docente@example.com', role='docente')
+        user.set_password('password123')
+        docente = Docente(user=user, nombre_completo='Ana Ruiz', cvu='123')
+        db.session.add(docente)
+        db.session.flush()
+        db.session.add_all([
+            Articulo(docente_id=docente.id, titulo='Artículo viejo', anio=2019),
+            Articulo(docente_id=docente.id, titulo='Artículo nuevo', anio=2024),
+        ])
+        db.session.commit()
+        self.docente_id = docente.id
+        self.ahora = 1000.0
+        parche = mock.patch.object(chatbot_contexto.time, 'monotonic', lambda: self.ahora)
+        parche.start()
+        self.addCleanup(parche.stop)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.contexto.pop()
+
+    def test_segundo_mensaje_no_consulta_la_bd(self):
+        with contar_consultas() as primero:
+            contexto = obtener_contexto(self.docente_id)
+        with contar_consultas() as segundo:
+            repetido = obtener_contexto(self.docente_id)
+
+        self.assertGreater(primero.total, 0)
+        self.assertEqual(segundo.total, 0)
+        self.assertIs(repetido, contexto)
+        self.assertIn('- Artículos científicos: 2', contexto.texto)
+        prompt = contexto.prompt_conversacion('¿Qué artículos tengo?')
+        self.assertIn(contexto.texto, prompt)
+        self.assertIn('- Artículo: Artículo nuevo (2024)\n- Artículo: Artículo viejo (2019)', prompt)
+        self.assertIn(contexto.texto, contexto.prompt_streaming('Hola'))
+
+    def test_commit_del_perfil_invalida_el_contexto(self):
+        anterior = obtener_contexto(self.docente_id)
+
+        db.session.add(Articulo(docente_id=self.docente_id, titulo='Artículo recién agregado', anio=2025))
+        db.session.commit()
+        actual = obtener_contexto(self.docente_id)
+
+        self.assertEqual(actual.version, anterior.version + 1)
+        self.assertIn('- Artículos científicos: 3', actual.texto)
+        self.assertIn('Artículo recién agregado', actual.contexto_para('artículo recién agregado'))
+
+    def test_rollback_no_invalida(self):
+        anterior = obtener_contexto(self.docente_id)
+
+        db.session.add(Articulo(docente_id=self.docente_id, titulo='Descartado', anio=2025))
+        db.session.flush()
+        db.session.rollback()
+
+        self.assertIs(obtener_contexto(self.docente_id), anterior)
+
+    def test_tras_el_ttl_compara_la_version(self):
+        anterior = obtener_contexto(self.docente_id)
+        self.ahora += 61
+
+        with contar_consultas() as verificacion:
+            self.assertIs(obtener_contexto(self.docente_id), anterior)
+        self.assertEqual(verificacion.total, 1)
+
+        # Otro proceso modificó el perfil: aquí no hubo flush que invalidara la caché
+        db.session.execute(
+            update(PerfilVersion).where(PerfilVersion.docente_id == self.docente_id)
+            .values(version=PerfilVersion.version + 5)
+        )
+        db.session.commit()
+        self.assertIs(obtener_contexto(self.docente_id), anterior)
+        self.ahora += 61
+        self.assertEqual(obtener_contexto(self.docente_id).version, anterior.version + 5)
+
+    def test_chatbot_usa_el_prompt_en_cache(self):
+        servicio = ChatbotService()
+        respuesta = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content='Hola'))])
+        servicio.client = mock.Mock()
+        servicio.client.chat.completions.create.return_value = respuesta
+        docente = db.session.get(Docente, self.docente_id)
+
+        servicio._generar_respuesta_conversacional('¿Cuántos artículos tengo?', docente)
+        historial = [{'role': 'user', 'content': '¿Cuántos artículos tengo?'}, {'role': 'assistant', 'content': 'Tienes 2.'}]
+        with contar_consultas() as estadisticas:
+            servicio._generar_respuesta_conversacional('¿Y el más reciente?', docente, historial)
+
+        self.assertEqual(estadisticas.total, 0)
+        mensajes = servicio.client.chat.completions.create.call_args.kwargs['messages']
+        self.assertIn('- Artículos científicos: 2', mensajes[0]['content'])
+        # El seguimiento busca con la pregunta anterior: recupera los artículos
+        self.assertIn('- Artículo: Artículo nuevo (2024)', mensajes[0]['content'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from docx import Document
+from app import create_app, db
+from app.config import Config
+from app.models.user import User
+from app.models.docente import Docente
+from app.models.articulo import Articulo
+from app.models.empleo import Empleo
+from app.models.formacion_academica import FormacionAcademica
+from app.models.generated_document import GeneratedDocument
+from app.services import combinacion
+from app.services.combinacion import CampoDesconocido, Combinador, compilar, registrar_plantilla
+from app.services.documentos import obtener_almacen
+from app.services.render_jobs import obtener_gestor
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    CV_JOBS_WORKERS = 0
+
+
+def docx_plantilla():
+    documento = Document()
+    documento.sections[0].header.paragraphs[0].text = 'CVU {{cvu}}'
+    parrafo = documento.add_paragraph('Se hace constar que ')
+    # Word parte los campos entre runs al editar: {{nombre_completo}} en tres pedazos
+    parrafo.add_run('{{nombre_')
+    parrafo.add_run('comp').bold = True
+    parrafo.add_run('leto}}, ')
+    parrafo.add_run('{{ puesto_actual }}.')
+    tabla = documento.add_table(rows=1, cols=2)
+    tabla.cell(0, 0).text = 'Artículos'
+    tabla.cell(0, 1).text = '{{total_articulos}}'
+    documento.add_paragraph('Grado: {{grado_maximo}}')
+    salida = io.BytesIO()
+    documento.save(salida)
+    return salida.getvalue()
+
+
+def textos(datos):
+    documento = Document(io.BytesIO(datos))
+    cuerpo = [p.text for p in documento.paragraphs]
+    celdas = [c.text for fila in documento.tables[0].rows for c in fila.cells]
+    encabezado = documento.sections[0].header.paragraphs[0].text
+    return cuerpo, celdas, encabezado
+
+
+class CompilarTestCase(unittest.TestCase):
+    def test_campos_partidos_entre_runs_se_reconocen(self):
+        compilada = compilar(docx_plantilla())
+
+        self.assertEqual(compilada.campos, {'cvu', 'nombre_completo', 'puesto_actual', 'total_articulos', 'grado_maximo'})
+
+    def test_rellenar_sustituye_y_escapa(self):
+        compilada = compilar(docx_plantilla())
+
+        datos = compilada.rellenar({'nombre_completo': 'Ana <Ruiz> & Co', 'cvu': '123',
+                                    'puesto_actual': 'Profesora', 'total_articulos': '4'})
+
+        cuerpo, celdas, encabezado = textos(datos)
+        self.assertEqual(cuerpo[0], 'Se hace constar que Ana <Ruiz> & Co, Profesora.')
+        self.assertEqual(cuerpo[1], 'Grado: ')
+        self.assertEqual(celdas, ['Artículos', '4'])
+        self.assertEqual(encabezado, 'CVU 123')
+
+
+class CombinadorTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        TestConfig.CV_CACHE_DIR = os.path.join(self.directorio, 'cache')
+        TestConfig.DOCUMENTOS_DIR = os.path.join(self.directorio, 'documentos')
+        TestConfig.PLANTILLAS_DIR = os.path.join(self.directorio, 'plantillas')
+        self.app = create_app(TestConfig)
+        self.contexto = self.app.app_context()
+        self.contexto.push()
+        db.create_all()
+        self.docente_ids = []
+        for indice in range(3):
+            user = User(email=f'docente{indice}@example.com', role='docente')
+            user.set_password('password123')
+            docente = Docente(user=user, nombre_completo=f'Docente {indice}', cvu=f'CVU{indice}')
+            db.session.add(docente)
+            db.session.flush()
+            db.session.add_all([
+                Empleo(docente_id=docente.id, puesto='Investigador', institucion='UTTEC', actual=True),
+                FormacionAcademica(docente_id=docente.id, nivel='maestria', grado_obtenido='Maestría'),
+                FormacionAcademica(docente_id=docente.id, nivel='doctorado', grado_obtenido='Doctorado en IA'),
+                *[Articulo(docente_id=docente.id, titulo=f'A{n}') for n in range(indice)],
+            ])
+            self.docente_ids.append(docente.id)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.contexto.pop()
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def test_registrar_valida_campos(self):
+        plantilla = registrar_plantilla('Constancia', docx_plantilla())
+
+        self.assertTrue(os.path.exists(plantilla.file_path))
+        self.assertIn('nombre_completo', json.loads(plantilla.required_fields))
+
+        documento = Document()
+        documento.add_paragraph('{{campo_inventado}}')
+        salida = io.BytesIO()
+        documento.save(salida)
+        with self.assertRaises(CampoDesconocido):
+            registrar_plantilla('Mala', salida.getvalue())
+
+    def test_combinar_registra_un_documento_por_docente_con_un_solo_analisis(self):
+        plantilla = registrar_plantilla('Constancia', docx_plantilla())
+        combinacion._compilada.cache_clear()
+
+        resultado = Combinador(obtener_gestor(), obtener_almacen(), tamano_lote=2).combinar(plantilla, self.docente_ids)
+
+        self.assertEqual(resultado.errores, [])
+        self.assertEqual(combinacion._compilada.cache_info().misses, 1)
+        documentos = GeneratedDocument.query.order_by(GeneratedDocument.id).all()
+        self.assertEqual([d.id for d in documentos], resultado.documentos)
+        self.assertEqual(len(documentos), 3)
+        with open(documentos[2].generated_file_path, 'rb') as f:
+            cuerpo, celdas, encabezado = textos(f.read())
+        self.assertEqual(cuerpo[0], 'Se hace constar que Docente 2, Investigador.')
+        self.assertEqual(cuerpo[1], 'Grado: Doctorado en IA')
+        self.assertEqual(celdas[1], '2')
+        self.assertEqual(encabezado, 'CVU CVU2')
+        self.assertEqual(documentos[2].template_id, plantilla.id)
+
+    def test_comandos_registrar_y_combinar(self):
+        ruta = os.path.join(self.directorio, 'constancia.docx')
+        with open(ruta, 'wb') as f:
+            f.write(docx_plantilla())
+        runner = self.app.test_cli_runner()
+
+        registro = runner.invoke(args=['registrar-plantilla', 'Constancia', ruta])
+        combinacion_cli = runner.invoke(args=['combinar-plantilla', '1'])
+
+        self.assertEqual(registro.exit_code, 0, registro.output)
+        self.assertEqual(combinacion_cli.exit_code, 0, combinacion_cli.output)
+        self.assertIn('3 documentos generados', combinacion_cli.output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,155 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from app import create_app, db
+from app.config import Config
+from app.models.user import User
+from app.models.docente import Docente
+from app.models.mensaje_chat import MensajeChat
+from app.services.conversaciones import AlmacenConversaciones, estimar_tokens
+from app.services.llm_cliente import ProveedorLLM
+from app.utils.query_stats import contar_consultas
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    WTF_CSRF_ENABLED = False
+    CV_JOBS_WORKERS = 0
+    GROQ_API_KEY = 'clave-de-prueba'
+
+
+def respuesta_llm(texto):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=texto))])
+
+
+def fragmento_llm(texto):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=texto))])
+
+
+class AlmacenConversacionesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.contexto = self.app.app_context()
+        self.contexto.push()
+        db.create_all()
+        user = User(email='docente@example.com', role='docente')
+        user.set_password('password123')
+        db.session.add(user)
+        db.session.commit()
+        self.user_id = user.id
+        self.almacen = AlmacenConversaciones(max_mensajes=6, presupuesto_tokens=300)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.contexto.pop()
+
+    def test_turnos_en_bd_y_en_memoria(self):
+        self.almacen.agregar_turno(self.user_id, 'Hola', '¡Hola! ¿En qué te ayudo?')
+
+        with contar_consultas() as estadisticas:
+            turnos = self.almacen.historial(self.user_id)
+
+        self.assertEqual(estadisticas.total, 0)
+        self.assertEqual([rol for rol, _, _ in turnos], ['user', 'assistant'])
+        self.assertEqual(MensajeChat.query.filter_by(user_id=self.user_id).count(), 2)
+        # Otro proceso (caché vacía) lee lo mismo de la BD
+        self.assertEqual(AlmacenConversaciones().historial(self.user_id), turnos)
+
+    def test_conserva_solo_los_ultimos_mensajes_en_memoria(self):
+        for numero in range(5):
+            self.almacen.agregar_turno(self.user_id, f'pregunta {numero}', f'respuesta {numero}')
+
+        turnos = self.almacen.historial(self.user_id)
+
+        self.assertEqual(len(turnos), 6)
+        self.assertEqual(turnos[0][1], 'pregunta 2')
+        self.assertEqual(AlmacenConversaciones(max_mensajes=6).historial(self.user_id), turnos)
+
+    def test_la_tabla_conserva_solo_los_ultimos_mensajes(self):
+        for numero in range(5):
+            self.almacen.agregar_turno(self.user_id, f'pregunta {numero}', f'respuesta {numero}')
+
+        filas = MensajeChat.query.filter_by(user_id=self.user_id).order_by(MensajeChat.id).all()
+
+        self.assertEqual([fila.contenido for fila in filas],
+                         ['pregunta 2', 'respuesta 2', 'pregunta 3', 'respuesta 3', 'pregunta 4', 'respuesta 4'])
+
+    def test_prompt_recortado_al_presupuesto(self):
+        for numero in range(3):
+            self.almacen.agregar_turno(self.user_id, f'pregunta {numero} ' + 'x' * 300, f'respuesta {numero} ' + 'y' * 300)
+
+        mensajes = self.almacen.mensajes_para_prompt(self.user_id, 'Eres un asistente.', '¿Y ahora?')
+
+        self.assertEqual([m['role'] for m in mensajes], ['system', 'user', 'assistant', 'user'])
+        self.assertTrue(mensajes[1]['content'].startswith('pregunta 2'))
+        self.assertIn('Se omitieron', mensajes[0]['content'])
+        historial = sum(estimar_tokens(m['content']) for m in mensajes[1:-1])
+        self.assertLessEqual(historial + estimar_tokens('Eres un asistente.') + estimar_tokens('¿Y ahora?'), 300)
+
+    def test_sin_recorte_no_agrega_aviso(self):
+        self.almacen.agregar_turno(self.user_id, 'Hola', 'Hola')
+
+        mensajes = self.almacen.mensajes_para_prompt(self.user_id, 'Eres un asistente.', '¿Y ahora?')
+
+        self.assertEqual(mensajes[0]['content'], 'Eres un asistente.')
+        self.assertEqual(len(mensajes), 4)
+
+    def test_limpiar(self):
+        self.almacen.agregar_turno(self.user_id, 'Hola', 'Hola')
+
+        self.almacen.limpiar(self.user_id)
+
+        self.assertEqual(self.almacen.historial(self.user_id), ())
+        self.assertEqual(MensajeChat.query.count(), 0)
+
+
+class ChatbotConversacionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            user = User(email='docente@example.com', role='docente')
+            user.set_password('password123')
+            db.session.add(Docente(user=user, nombre_completo='Ana Ruiz'))
+            db.session.commit()
+        self.llm = mock.Mock()
+        parche = mock.patch.object(ProveedorLLM, 'cliente', return_value=self.llm)
+        parche.start()
+        self.addCleanup(parche.stop)
+        self.client.post('/auth/login', data={'email': 'docente@example.com', 'password': 'password123'})
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_el_segundo_mensaje_lleva_el_primer_turno(self):
+        self.llm.chat.completions.create.side_effect = [respuesta_llm('Aún no tienes artículos.'), respuesta_llm('De nada.')]
+
+        self.client.post('/chatbot/mensaje', json={'mensaje': '¿Qué artículos tengo?'})
+        self.client.post('/chatbot/mensaje', json={'mensaje': 'Gracias'})
+
+        mensajes = self.llm.chat.completions.create.call_args.kwargs['messages']
+        self.assertEqual(
+            [(m['role'], m['content']) for m in mensajes[1:]],
+            [('user', '¿Qué artículos tengo?'), ('assistant', 'Aún no tienes artículos.'), ('user', 'Gracias')]
+        )
+
+    def test_streaming_guarda_la_respuesta_completa_y_limpiar_la_borra(self):
+        self.llm.chat.completions.create.return_value = iter([fragmento_llm('Ho'), fragmento_llm('la')])
+
+        respuesta = self.client.post('/chatbot/stream', json={'mensaje': 'Hola'})
+        respuesta.get_data()
+
+        with self.app.app_context():
+            self.assertEqual([m.contenido for m in MensajeChat.query.order_by(MensajeChat.id)], ['Hola', 'Hola'])
+        self.client.post('/chatbot/limpiar')
+        with self.app.app_context():
+            self.assertEqual(MensajeChat.query.count(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
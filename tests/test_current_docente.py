@@ -0,0 +1,62 @@
+import unittest
+from sqlalchemy import event
+from app import create_app, db
+from app.config import Config
+from app.models.user import User
+from app.models.docente import Docente
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    WTF_CSRF_ENABLED = False
+
+
+class CurrentDocenteTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        user = User(email='docente@example.com', role='docente')
+        user.set_password('password123')
+        db.session.add(Docente(user=user, nombre_completo='Docente de Prueba'))
+        db.session.commit()
+
+        self.client.post('/auth/login', data={
+            'email': 'docente@example.com',
+            'password': 'password123'
+        })
+
+        self.consultas = []
+        event.listen(db.engine, 'before_cursor_execute', self._registrar)
+
+    def tearDown(self):
+        event.remove(db.engine, 'before_cursor_execute', self._registrar)
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _registrar(self, conn, cursor, statement, parameters, context, executemany):
+        self.consultas.append(' '.join(statement.split()))
+
+    def _busquedas_de_docente(self):
+        return [
+            sql for sql in self.consultas
+            if 'FROM docentes' in sql and 'WHERE docentes.user_id = ?' in sql
+        ]
+
+    def test_una_busqueda_de_docente_por_peticion(self):
+        for ruta in ('/docente/dashboard', '/docente/perfil', '/docente/articulos',
+                     '/cv/generar', '/cv/vista-previa', '/sync/'):
+            with self.subTest(ruta=ruta):
+                self.consultas.clear()
+                response = self.client.get(ruta)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(self._busquedas_de_docente()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,197 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from app import create_app, db
+from app.config import Config
+from app.models.user import User
+from app.models.docente import Docente
+from app.models.articulo import Articulo
+from app.models.perfil_version import version_perfil
+from app.services.cv_cache import CVRenderCache
+from app.services.cv_generator_service import CVGeneratorService
+from app.services.cv_pdf_generator import CVPDFGenerator
+from app.services.render_jobs import obtener_gestor
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    WTF_CSRF_ENABLED = False
+    CV_JOBS_WORKERS = 0
+
+
+class PerfilVersionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dir_cache = tempfile.mkdtemp()
+        TestConfig.CV_CACHE_DIR = self.dir_cache
+        self.app = create_app(TestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        user = User(email='docente@example.com', role='docente')
+        user.set_password('password123')
+        self.docente = Docente(user=user, nombre_completo='Docente de Prueba')
+        db.session.add(self.docente)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        shutil.rmtree(self.dir_cache, ignore_errors=True)
+
+    def test_escrituras_a_tablas_hijas_incrementan_la_version(self):
+        inicial = version_perfil(self.docente.id)
+
+        articulo = Articulo(docente_id=self.docente.id, titulo='Nuevo')
+        db.session.add(articulo)
+        db.session.commit()
+        tras_insertar = version_perfil(self.docente.id)
+
+        articulo.titulo = 'Editado'
+        db.session.commit()
+        tras_editar = version_perfil(self.docente.id)
+
+        db.session.delete(articulo)
+        db.session.commit()
+        tras_borrar = version_perfil(self.docente.id)
+
+        self.assertLess(inicial, tras_insertar)
+        self.assertLess(tras_insertar, tras_editar)
+        self.assertLess(tras_editar, tras_borrar)
+
+    def test_editar_el_docente_incrementa_la_version(self):
+        inicial = version_perfil(self.docente.id)
+        self.docente.orcid = '0000-0001-2345-6789'
+        db.session.commit()
+
+        self.assertEqual(version_perfil(self.docente.id), inicial + 1)
+
+    def test_cambiar_el_correo_del_usuario_incrementa_la_version(self):
+        inicial = version_perfil(self.docente.id)
+        self.docente.user.email = 'nuevo@example.com'
+        db.session.commit()
+        tras_correo = version_perfil(self.docente.id)
+
+        self.docente.user.set_password('otra-clave')
+        db.session.commit()
+
+        self.assertEqual(tras_correo, inicial + 1)
+        # La contraseña no está en la instantánea del perfil
+        self.assertEqual(version_perfil(self.docente.id), tras_correo)
+
+    def test_borrar_el_docente_no_falla(self):
+        db.session.add(Articulo(docente_id=self.docente.id, titulo='Art'))
+        db.session.commit()
+
+        db.session.delete(self.docente.user)
+        db.session.commit()
+
+        self.assertEqual(Docente.query.count(), 0)
+
+
+class CVRenderCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.cache = CVRenderCache(self.directorio, max_bytes=1000)
+
+    def tearDown(self):
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def test_misma_llave_no_regenera(self):
+        generar = mock.Mock(return_value=b'%PDF-1')
+
+        primero = self.cache.obtener_o_generar(1, 3, 'pdf', {'sections': ['a']}, generar)
+        segundo = self.cache.obtener_o_generar(1, 3, 'pdf', {'sections': ['a']}, generar)
+
+        self.assertEqual(primero, segundo)
+        self.assertEqual(generar.call_count, 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_version_nueva_purga_la_anterior(self):
+        self.cache.obtener_o_generar(1, 1, 'pdf', {}, lambda: b'v1')
+        self.cache.obtener_o_generar(1, 2, 'pdf', {}, lambda: b'v2')
+
+        archivos = os.listdir(os.path.join(self.directorio, '1'))
+        self.assertEqual(len(archivos), 1)
+        self.assertTrue(archivos[0].startswith('v2_'))
+
+    def test_limite_de_tamano_desaloja_lo_menos_usado(self):
+        self.cache.obtener_o_generar(1, 1, 'pdf', {}, lambda: b'x' * 400)
+        self.cache.obtener_o_generar(2, 1, 'pdf', {}, lambda: b'x' * 400)
+        ruta_1 = os.path.join(self.directorio, '1', os.listdir(os.path.join(self.directorio, '1'))[0])
+        ruta_2 = os.path.join(self.directorio, '2', os.listdir(os.path.join(self.directorio, '2'))[0])
+        os.utime(ruta_1, (1, 1))
+        os.utime(ruta_2, (2, 2))
+
+        self.cache.obtener_o_generar(3, 1, 'pdf', {}, lambda: b'x' * 400)
+
+        self.assertFalse(os.path.exists(ruta_1))
+        self.assertTrue(os.path.exists(ruta_2))
+        self.assertLessEqual(self.cache.tamano_total(), 1000)
+
+
+class CVCacheRutaTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dir_cache = tempfile.mkdtemp()
+        TestConfig.CV_CACHE_DIR = self.dir_cache
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            user = User(email='docente@example.com', role='docente')
+            user.set_password('password123')
+            docente = Docente(user=user, nombre_completo='Docente de Prueba')
+            db.session.add(docente)
+            db.session.commit()
+            self.docente_id = docente.id
+
+        self.client.post('/auth/login', data={'email': 'docente@example.com', 'password': 'password123'})
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+        shutil.rmtree(self.dir_cache, ignore_errors=True)
+
+    def _descargar(self):
+        trabajo = self.client.post('/cv/generar', data={'formato': 'pdf', 'sections': ['datos_generales', 'articulos']},
+                                   headers={'Accept': 'application/json'}).get_json()
+        return self.client.get(trabajo['url_descarga'])
+
+    def test_descarga_repetida_sale_de_la_cache_hasta_que_cambia_el_perfil(self):
+        with mock.patch.object(CVGeneratorService, 'generar_pdf', autospec=True,
+                               side_effect=CVGeneratorService.generar_pdf) as generar_pdf:
+            primera = self._descargar()
+            segunda = self._descargar()
+            self.assertEqual(generar_pdf.call_count, 1)
+            self.assertEqual(primera.data, segunda.data)
+
+            with self.app.app_context():
+                db.session.add(Articulo(docente_id=self.docente_id, titulo='Artículo nuevo'))
+                db.session.commit()
+
+            tercera = self._descargar()
+            self.assertEqual(generar_pdf.call_count, 2)
+            self.assertEqual(tercera.status_code, 200)
+            self.assertTrue(tercera.data.startswith(b'%PDF'))
+
+    def test_plantillas_del_chatbot_comparten_la_cache(self):
+        secciones = {'datos_generales': True}
+        with self.app.app_context(), mock.patch.object(
+                CVPDFGenerator, 'generar_pdf_bytes', autospec=True,
+                side_effect=CVPDFGenerator.generar_pdf_bytes) as generar_pdf_bytes:
+            docente = db.session.get(Docente, self.docente_id)
+            gestor = obtener_gestor()
+            primero = gestor.enviar_cv_plantilla(docente.user_id, docente, secciones, 'profesional')
+            segundo = gestor.enviar_cv_plantilla(docente.user_id, docente, secciones, 'profesional')
+
+        self.assertEqual(generar_pdf_bytes.call_count, 1)
+        self.assertEqual(primero.ruta, segundo.ruta)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+from datetime import date
+from app import create_app, db
+from app.config import Config
+from app.models.user import User
+from app.models.docente import Docente
+from app.models.articulo import Articulo
+from app.models.empleo import Empleo
+from app.services.cv_pdf_generator import ContextoCV, CVPDFGenerator
+from app.utils.query_stats import contar_consultas
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    CV_JOBS_WORKERS = 0
+
+
+SECCIONES = {
+    'datos_generales': True, 'experiencia_laboral': True, 'formacion_academica': True,
+    'articulos_cientificos': True, 'libros_capitulos': True, 'congresos_ponencias': True,
+    'proyectos_investigacion': True, 'cursos_impartidos': True, 'tesis_dirigidas': True,
+    'desarrollos_tecnologicos': True,
+}
+
+
+class ContextoCVTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        user = User(email='docente@example.com', role='docente')
+        user.set_password('password123')
+        self.docente = Docente(user=user, nombre_completo='Docente de Prueba')
+        db.session.add(self.docente)
+        db.session.flush()
+        db.session.add_all([
+            Empleo(docente_id=self.docente.id, puesto='Sin fecha', institucion='A'),
+            Empleo(docente_id=self.docente.id, puesto='Antiguo', institucion='B', fecha_inicio=date(2010, 1, 1)),
+            Empleo(docente_id=self.docente.id, puesto='Actual', institucion='C', fecha_inicio=date(2020, 1, 1)),
+            Articulo(docente_id=self.docente.id, titulo='Sin año'),
+            Articulo(docente_id=self.docente.id, titulo='2019', anio=2019),
+            Articulo(docente_id=self.docente.id, titulo='2023', anio=2023),
+        ])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_orden_descendente_con_nulos_al_final_como_sqlite(self):
+        contexto = ContextoCV.cargar(self.docente.id)
+
+        esperado = Empleo.query.filter_by(docente_id=self.docente.id).order_by(Empleo.fecha_inicio.desc()).all()
+        self.assertEqual([e.puesto for e in contexto.empleos], [e.puesto for e in esperado])
+        self.assertEqual(contexto.empleo_actual.puesto, 'Actual')
+        self.assertEqual([a.titulo for a in contexto.articulos], ['2023', '2019', 'Sin año'])
+
+    def test_render_sin_consultas_a_la_bd(self):
+        contexto = ContextoCV.cargar(self.docente.id)
+        generador = CVPDFGenerator()
+
+        for plantilla in ('conacyt', 'profesional', 'academico'):
+            with self.subTest(plantilla=plantilla), contar_consultas() as estadisticas:
+                pdf = generador.generar_pdf_bytes(contexto, SECCIONES, plantilla)
+            self.assertTrue(pdf.startswith(b'%PDF'))
+            self.assertEqual(estadisticas.total, 0)
+
+    def test_carga_en_un_numero_fijo_de_consultas(self):
+        docente_id = self.docente.id
+        with contar_consultas() as estadisticas:
+            ContextoCV.cargar(docente_id)
+
+        self.assertEqual(estadisticas.total, 1 + len(ContextoCV.COLECCIONES))
+
+
+if __name__ == '__main__':
+    unittest.main()
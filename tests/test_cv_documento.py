@@ -0,0 +1,117 @@
+import io
+import unittest
+import zipfile
+from datetime import date
+from flask import render_template
+from app import create_app, db
+from app.config import Config
+from app.models.user import User
+from app.models.docente import Docente
+from app.models.articulo import Articulo
+from app.models.empleo import Empleo
+from app.services.cv_documento import construir_documento
+from app.services.cv_generator_service import CVGeneratorService
+from app.services.cv_pdf_generator import CVPDFGenerator
+from app.services.profile_loader import ProfileLoader
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    WTF_CSRF_ENABLED = False
+    CV_JOBS_WORKERS = 0
+    CV_CACHE_ENABLED = False
+
+
+class DocumentoCVTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            user = User(email='docente@example.com', role='docente')
+            user.set_password('password123')
+            docente = Docente(user=user, nombre_completo='Ana & Asociados', orcid='0000-0001-2345-6789')
+            db.session.add(docente)
+            db.session.flush()
+            db.session.add_all([
+                Articulo(docente_id=docente.id, titulo='Redes <profundas>', revista='Revista X', anio=2023,
+                         volumen='12', numero='3', paginas='1-10', doi='10.1/abc', autores='Pérez, A.'),
+                Empleo(docente_id=docente.id, puesto='Profesora', institucion='UTTEC',
+                       fecha_inicio=date(2020, 1, 1), actual=True),
+            ])
+            db.session.commit()
+            self.docente_id = docente.id
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _documento(self, secciones=None):
+        with self.app.app_context():
+            return construir_documento(ProfileLoader().cargar(self.docente_id), secciones)
+
+    def test_secciones_en_orden_con_citas_y_periodos(self):
+        documento = self._documento()
+
+        self.assertEqual([s.clave for s in documento.secciones], ['experiencia_laboral', 'articulos'])
+        articulo = documento.seccion('articulos').entradas[0]
+        self.assertEqual(
+            articulo.cita,
+            'Pérez, A. (2023). Redes <profundas>. Revista X, 12(3), 1-10. https://doi.org/10.1/abc'
+        )
+        self.assertEqual(documento.seccion('experiencia_laboral').entradas[0].periodo, '2020-01-01 - Actualidad')
+
+    def test_secciones_no_pedidas_se_omiten(self):
+        documento = self._documento(['articulos'])
+
+        self.assertEqual(documento.datos_generales, ())
+        self.assertEqual([s.clave for s in documento.secciones], ['articulos'])
+
+    def test_un_documento_alimenta_pdf_word_y_html(self):
+        documento = self._documento()
+        servicio = CVGeneratorService()
+
+        pdf = servicio.renderizar_documento(documento, 'pdf')
+        docx = servicio.renderizar_documento(documento, 'word')
+        with self.app.test_request_context():
+            html = render_template('components/cv_documento.html', documento=documento)
+
+        self.assertTrue(pdf.startswith(b'%PDF'))
+        with zipfile.ZipFile(io.BytesIO(docx)) as archivo:
+            self.assertIn('Redes &lt;profundas&gt;', archivo.read('word/document.xml').decode('utf-8'))
+        self.assertIn('Redes &lt;profundas&gt;', html)
+        self.assertIn('https://doi.org/10.1/abc', html)
+
+    def test_plantillas_pdf_maquetan_el_documento(self):
+        documento = self._documento()
+        generador = CVPDFGenerator()
+        plantillas = {
+            'conacyt': generador._generar_plantilla_conacyt,
+            'profesional': generador._generar_plantilla_profesional,
+            'academico': generador._generar_plantilla_academica,
+        }
+
+        for plantilla, generar_story in plantillas.items():
+            with self.subTest(plantilla=plantilla):
+                textos = ' '.join(f.text for f in generar_story(documento) if hasattr(f, 'text'))
+                # Mismos periodos y citas que el Word y la vista previa, con el texto escapado
+                self.assertIn('2020-01-01 - Actualidad', textos)
+                self.assertIn('Redes &lt;profundas&gt;', textos)
+                self.assertNotRegex(textos, '(?i)presente')
+        academico = ' '.join(f.text for f in plantillas['academico'](documento) if hasattr(f, 'text'))
+        self.assertIn('https://doi.org/10.1/abc', academico)
+
+    def test_vista_previa_usa_el_documento(self):
+        self.client.post('/auth/login', data={'email': 'docente@example.com', 'password': 'password123'})
+
+        respuesta = self.client.get('/cv/vista-previa')
+
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertIn('Artículos Científicos', respuesta.get_data(as_text=True))
+        self.assertIn('Pérez, A. (2023)', respuesta.get_data(as_text=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
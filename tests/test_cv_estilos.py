@@ -0,0 +1,77 @@
+import unittest
+from reportlab.lib.styles import ParagraphStyle
+from app import create_app, db
+from app.config import Config
+from app.models.user import User
+from app.models.docente import Docente
+from app.models.articulo import Articulo
+from app.services.cv_estilos import hoja_estilos
+from app.services.cv_pdf_generator import ContextoCV, CVPDFGenerator
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    CV_JOBS_WORKERS = 0
+
+
+class HojaEstilosTestCase(unittest.TestCase):
+    def test_generadores_comparten_la_hoja(self):
+        self.assertIs(CVPDFGenerator().styles, CVPDFGenerator().styles)
+        self.assertIs(CVPDFGenerator().styles, hoja_estilos())
+
+    def test_hoja_compartida_no_acepta_estilos_nuevos(self):
+        with self.assertRaises(TypeError):
+            hoja_estilos().add(ParagraphStyle(name='Nuevo'))
+
+    def test_contiene_los_estilos_de_todas_las_plantillas(self):
+        hoja = hoja_estilos()
+        for nombre in ('Normal', 'ConacytSection', 'ProfTitle', 'AcadHighlight', 'CustomHeading'):
+            self.assertIn(nombre, hoja)
+
+
+class PlantillasTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        user = User(email='docente@example.com', role='docente')
+        user.set_password('password123')
+        self.docente = Docente(user=user, nombre_completo='Docente de Prueba', orcid='0000-0001-2345-6789')
+        db.session.add(self.docente)
+        db.session.flush()
+        db.session.add(Articulo(docente_id=self.docente.id, titulo='Artículo', anio=2024))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_las_tres_plantillas_se_generan_con_la_hoja_compartida(self):
+        secciones = {'datos_generales': True, 'articulos_cientificos': True}
+        generador = CVPDFGenerator()
+        contexto = ContextoCV.cargar(self.docente.id)
+        for plantilla in ('conacyt', 'profesional', 'academico'):
+            with self.subTest(plantilla=plantilla):
+                pdf = generador.generar_pdf_bytes(contexto, secciones, plantilla)
+                self.assertTrue(pdf.startswith(b'%PDF'))
+
+    def test_decoracion_de_pagina_se_dibuja_una_vez_por_documento(self):
+        for i in range(150):
+            db.session.add(Articulo(docente_id=self.docente.id, titulo=f'Artículo {i}', anio=2000 + i % 20))
+        db.session.commit()
+        secciones = {'articulos_cientificos': True}
+        generador = CVPDFGenerator()
+        contexto = ContextoCV.cargar(self.docente.id)
+        for plantilla in ('conacyt', 'academico'):
+            with self.subTest(plantilla=plantilla):
+                pdf = generador.generar_pdf_bytes(contexto, secciones, plantilla)
+                paginas = pdf.count(b'/Type /Page\n')
+                self.assertGreater(paginas, 1)
+                self.assertEqual(pdf.count(b'/Subtype /Form'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
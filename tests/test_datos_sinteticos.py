@@ -0,0 +1,64 @@
+import unittest
+from app import create_app, db
+from app.config import Config
+from app.models.docente import Docente
+from app.models.articulo import Articulo
+from app.services.datos_sinteticos import GeneradorDatosSinteticos
+from app.services.profile_loader import ProfileLoader
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    WTF_CSRF_ENABLED = False
+
+
+class DatosSinteticosTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_genera_docentes_con_colecciones(self):
+        conteos = GeneradorDatosSinteticos(semilla=1, tamano_lote=50).generar(20)
+
+        self.assertEqual(conteos['users'], 20)
+        self.assertEqual(conteos['docentes'], 20)
+        self.assertEqual(Articulo.query.count(), conteos['articulos'])
+        docente = Docente.query.first()
+        self.assertTrue(docente.user.check_password('docente123'))
+        perfil = ProfileLoader().cargar(docente.id)
+        self.assertEqual(perfil.docente.user.email, docente.user.email)
+
+    def test_misma_semilla_mismos_datos(self):
+        primera = GeneradorDatosSinteticos(semilla=7).generar(5)
+        nombres = [d.nombre_completo for d in Docente.query.order_by(Docente.id)]
+        db.drop_all()
+        db.create_all()
+        segunda = GeneradorDatosSinteticos(semilla=7).generar(5)
+
+        self.assertEqual(primera, segunda)
+        self.assertEqual(nombres, [d.nombre_completo for d in Docente.query.order_by(Docente.id)])
+
+    def test_ejecuciones_sucesivas_no_colisionan(self):
+        GeneradorDatosSinteticos(semilla=1).generar(3, {'articulos': 5})
+        GeneradorDatosSinteticos(semilla=1).generar(3, {'articulos': 5})
+
+        self.assertEqual(Docente.query.count(), 6)
+
+    def test_comando_cli(self):
+        resultado = self.app.test_cli_runner().invoke(args=['generar-datos', '--docentes', '4', '--articulos', '2'])
+
+        self.assertEqual(resultado.exit_code, 0, resultado.output)
+        self.assertIn('filas en', resultado.output)
+        self.assertEqual(Docente.query.count(), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from app import create_app, db
+from app.config import Config
+from app.models.user import User
+from app.models.docente import Docente
+from app.services.chatbot_service import ChatbotService
+from app.services.documentos import AlmacenDocumentos
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    WTF_CSRF_ENABLED = False
+    CV_JOBS_WORKERS = 0
+    GROQ_API_KEY = 'clave-de-prueba'
+
+
+def _id(n):
+    return f'{n:032x}'
+
+
+class AlmacenDocumentosTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def _guardar(self, almacen, docente_id, n, datos=b'%PDF', antiguedad=0):
+        ruta = almacen.guardar(docente_id, _id(n), 'pdf', datos)
+        marca = time.time() - antiguedad
+        os.utime(ruta, (marca, marca))
+        return ruta
+
+    def test_cuota_por_docente_borra_los_mas_antiguos(self):
+        almacen = AlmacenDocumentos(self.directorio, max_por_docente=2)
+        self._guardar(almacen, 1, 1, antiguedad=30)
+        self._guardar(almacen, 1, 2, antiguedad=20)
+        self._guardar(almacen, 2, 3, antiguedad=10)
+        self._guardar(almacen, 1, 4)
+
+        self.assertIsNone(almacen.buscar(1, _id(1)))
+        self.assertIsNotNone(almacen.buscar(1, _id(2)))
+        self.assertIsNotNone(almacen.buscar(1, _id(4)))
+        self.assertIsNotNone(almacen.buscar(2, _id(3)))
+
+    def test_cuota_en_bytes(self):
+        almacen = AlmacenDocumentos(self.directorio, max_bytes_por_docente=250)
+        self._guardar(almacen, 1, 1, b'x' * 100, antiguedad=10)
+        self._guardar(almacen, 1, 2, b'x' * 100)
+        almacen.guardar(1, _id(3), 'pdf', b'x' * 100)
+
+        self.assertIsNone(almacen.buscar(1, _id(1)))
+        self.assertIsNotNone(almacen.buscar(1, _id(3)))
+
+    def test_recolectar_borra_caducados(self):
+        almacen = AlmacenDocumentos(self.directorio, retencion_dias=1)
+        self._guardar(almacen, 1, 1, antiguedad=2 * 86400)
+        self._guardar(almacen, 1, 2)
+
+        self.assertIsNone(almacen.buscar(1, _id(1)))
+        self.assertEqual(almacen.recolectar(), 1)
+        self.assertEqual(os.listdir(os.path.join(self.directorio, '1')), [f'{_id(2)}.pdf'])
+
+    def test_ids_invalidos_no_tocan_el_disco(self):
+        almacen = AlmacenDocumentos(self.directorio)
+
+        self.assertIsNone(almacen.buscar(1, '../../etc/passwd'))
+        with self.assertRaises(ValueError):
+            almacen.guardar(1, '../x', 'pdf', b'')
+
+
+class DescargaDocumentosTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        TestConfig.CV_CACHE_DIR = os.path.join(self.directorio, 'cache')
+        TestConfig.DOCUMENTOS_DIR = os.path.join(self.directorio, 'documentos')
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            for email in ('docente@example.com', 'otro@example.com'):
+                user = User(email=email, role='docente')
+                user.set_password('password123')
+                db.session.add(Docente(user=user, nombre_completo=f'Docente {email}'))
+            db.session.commit()
+            self.user_id = User.query.filter_by(email='docente@example.com').one().id
+
+        self._login('docente@example.com')
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def _login(self, email):
+        self.client.get('/auth/logout')
+        self.client.post('/auth/login', data={'email': email, 'password': 'password123'})
+
+    def _url_chatbot(self):
+        with self.app.test_request_context():
+            docente = Docente.query.filter_by(user_id=self.user_id).one()
+            mensaje = 'GENERAR_CV_PERSONALIZADO|plantilla:conacyt|secciones:{"datos_generales": true}'
+            respuesta = ChatbotService()._procesar_cv_personalizado(mensaje, docente)
+        return respuesta.split('](')[1].split(')')[0]
+
+    def test_descarga_desde_disco_con_longitud_y_etag(self):
+        trabajo = self.client.post('/cv/trabajos', data={'formato': 'pdf'}).get_json()
+
+        descarga = self.client.get(trabajo['url_descarga'])
+        self.assertEqual(descarga.status_code, 200)
+        self.assertEqual(int(descarga.headers['Content-Length']), len(descarga.data))
+        self.assertIn('attachment', descarga.headers['Content-Disposition'])
+
+        repetida = self.client.get(trabajo['url_descarga'], headers={'If-None-Match': descarga.headers['ETag']})
+        self.assertEqual(repetida.status_code, 304)
+
+    def test_enlace_del_chatbot_sobrevive_al_trabajo(self):
+        url = self._url_chatbot()
+        # El trabajo expira del registro; queda la copia del almacén
+        shutil.rmtree(self.app.extensions['render_jobs'].registro.directorio)
+
+        descarga = self.client.get(url)
+        self.assertEqual(descarga.status_code, 200)
+        self.assertTrue(descarga.data.startswith(b'%PDF'))
+        self.assertEqual(int(descarga.headers['Content-Length']), len(descarga.data))
+        self.assertIn('ETag', descarga.headers)
+
+        self._login('otro@example.com')
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_no_se_escribe_en_static(self):
+        self._url_chatbot()
+
+        self.assertFalse(os.path.isdir(os.path.join(self.app.static_folder, 'pdfs')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import io
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from app import create_app, db
+from app.config import Config
+from app.models.user import User
+from app.models.docente import Docente
+from app.models.empleo import Empleo
+from app.services import render_jobs
+from app.services.render_jobs import GestorTrabajos
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    WTF_CSRF_ENABLED = False
+    CV_JOBS_WORKERS = 0
+    CV_EXPORT_LOTE = 2
+
+
+class ExportacionCVTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        TestConfig.CV_CACHE_DIR = os.path.join(self.directorio, 'cache')
+        TestConfig.DOCUMENTOS_DIR = os.path.join(self.directorio, 'documentos')
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            admin = User(email='admin@example.com', role='admin')
+            admin.set_password('password123')
+            db.session.add(admin)
+            for indice, area in enumerate(['Sistemas', 'Sistemas', 'Mecatrónica']):
+                user = User(email=f'docente{indice}@example.com', role='docente')
+                user.set_password('password123')
+                docente = Docente(user=user, nombre_completo=f'Docente {indice} / Pérez')
+                db.session.add(docente)
+                db.session.flush()
+                db.session.add(Empleo(docente_id=docente.id, puesto='Profesor', institucion='UTTEC',
+                                      area_adscripcion=area, actual=True))
+            db.session.commit()
+        self.client.post('/auth/login', data={'email': 'admin@example.com', 'password': 'password123'})
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def _zip(self, datos):
+        return zipfile.ZipFile(io.BytesIO(datos))
+
+    def test_ruta_aplica_filtros_y_envia_zip_por_bloques(self):
+        respuesta = self.client.get('/admin/docentes/cv.zip?plantilla=conacyt&area=Sistemas')
+
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertTrue(respuesta.is_streamed)
+        self.assertEqual(respuesta.mimetype, 'application/zip')
+        archivo = self._zip(respuesta.get_data())
+        self.assertIsNone(archivo.testzip())
+        self.assertEqual(sorted(archivo.namelist()), ['CV_Docente_0_Pérez_1.pdf', 'CV_Docente_1_Pérez_2.pdf'])
+        self.assertTrue(archivo.read('CV_Docente_0_Pérez_1.pdf').startswith(b'%PDF'))
+
+    def test_word_solo_con_plantilla_basica(self):
+        self.assertEqual(self.client.get('/admin/docentes/cv.zip?plantilla=conacyt&formato=word').status_code, 400)
+
+        respuesta = self.client.get('/admin/docentes/cv.zip?plantilla=basico&formato=word')
+
+        self.assertEqual(len(self._zip(respuesta.get_data()).namelist()), 3)
+
+    def test_un_cv_fallido_queda_en_errores_txt(self):
+        original = render_jobs.ejecutar_tarea
+
+        def fallar_uno(tarea):
+            if tarea['perfil'].docente.nombre_completo.startswith('Docente 1'):
+                raise RuntimeError('sin memoria')
+            return original(tarea)
+
+        with mock.patch('app.services.render_jobs.ejecutar_tarea', side_effect=fallar_uno):
+            archivo = self._zip(self.client.get('/admin/docentes/cv.zip').get_data())
+
+        self.assertEqual(len(archivo.namelist()), 3)
+        self.assertEqual(archivo.read('errores.txt').decode('utf-8'), 'CV_Docente_1_Pérez_2.pdf: sin memoria\n')
+
+    def test_segunda_exportacion_sale_de_la_cache(self):
+        self.client.get('/admin/docentes/cv.zip').get_data()
+
+        with mock.patch('app.services.render_jobs.ejecutar_tarea') as ejecutar:
+            archivo = self._zip(self.client.get('/admin/docentes/cv.zip').get_data())
+
+        ejecutar.assert_not_called()
+        self.assertEqual(len(archivo.namelist()), 3)
+
+    def test_comando_guarda_el_zip(self):
+        salida = os.path.join(self.directorio, 'cvs.zip')
+
+        resultado = self.app.test_cli_runner().invoke(args=['exportar-cvs', salida, '--area', 'Mecatrónica'])
+
+        self.assertEqual(resultado.exit_code, 0, resultado.output)
+        with zipfile.ZipFile(salida) as archivo:
+            self.assertEqual(archivo.namelist(), ['CV_Docente_2_Pérez_3.pdf'])
+
+
+class MapearTestCase(unittest.TestCase):
+    def test_tareas_en_vuelo_acotadas(self):
+        gestor = GestorTrabajos(cache=None, registro=None, workers=2)
+        pool = ThreadPoolExecutor(max_workers=2)
+        gestor._obtener_pool = lambda: pool
+        liberar = threading.Event()
+        enviadas = []
+
+        def ejecutar(tarea):
+            liberar.wait(5)
+            return tarea
+
+        def tareas():
+            for numero in range(10):
+                enviadas.append(numero)
+                yield numero, numero
+
+        with mock.patch('app.services.render_jobs.ejecutar_tarea', side_effect=ejecutar):
+            resultados = gestor.mapear(tareas(), en_vuelo=3)
+            hilo = threading.Timer(0.2, liberar.set)
+            hilo.start()
+            primero = next(resultados)
+            self.assertLessEqual(len(enviadas), 4)
+            resto = list(resultados)
+        pool.shutdown()
+
+        self.assertEqual(sorted(c for c, _, _ in [primero] + resto), list(range(10)))
+        self.assertTrue(all(error is None for _, _, error in [primero] + resto))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from app import create_app, db
+from app.config import Config
+from app.models.user import User
+from app.models.docente import Docente
+from app.models.articulo import Articulo
+from app.models.congreso import Congreso
+from app.services.indice_perfil import IndiceBM25, IndicePerfil, tokenizar
+from app.services.profile_loader import ProfileLoader
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    CV_JOBS_WORKERS = 0
+
+
+class IndiceBM25TestCase(unittest.TestCase):
+    def test_tokenizar(self):
+        self.assertEqual(tokenizar('¿Cuáles son mis Artículos en Universidades?'), ['articulo', 'universidad'])
+
+    def test_agregar_y_quitar(self):
+        indice = IndiceBM25()
+        indice.agregar('a', tokenizar('redes neuronales para imágenes'))
+        indice.agregar('b', tokenizar('bases de datos distribuidas'))
+        indice.agregar('c', tokenizar('redes de sensores'))
+
+        puntuaciones = indice.puntuar(tokenizar('redes neuronales'))
+        self.assertEqual(max(puntuaciones, key=puntuaciones.get), 'a')
+        self.assertNotIn('b', puntuaciones)
+
+        indice.quitar('a')
+        self.assertEqual(set(indice.puntuar(tokenizar('redes neuronales'))), {'c'})
+        self.assertEqual(len(indice), 2)
+
+
+class IndicePerfilTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.contexto = self.app.app_context()
+        self.contexto.push()
+        db.create_all()
+        user = User(email='docente@example.com', role='docente')
+        user.set_password('password123')
+        docente = Docente(user=user, nombre_completo='Ana Ruiz')
+        db.session.add(docente)
+        db.session.flush()
+        db.session.add_all(
+            [Articulo(docente_id=docente.id, titulo=f'Estudio número {n} de suelos', anio=2000 + n) for n in range(15)]
+            + [Articulo(docente_id=docente.id, titulo='Redes neuronales para diagnóstico de cultivos', anio=1998),
+               Congreso(docente_id=docente.id, nombre_congreso='Congreso Nacional de Agronomía')]
+        )
+        db.session.commit()
+        self.docente_id = docente.id
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.contexto.pop()
+
+    def perfil(self):
+        return ProfileLoader().cargar(self.docente_id)
+
+    def test_recupera_registros_viejos_relevantes(self):
+        indice = IndicePerfil(self.docente_id)
+        indice.actualizar(self.perfil())
+
+        lineas = indice.buscar('¿Tengo algo sobre redes neuronales?', limite=3)
+
+        self.assertEqual(lineas[0], 'Artículo: Redes neuronales para diagnóstico de cultivos (1998)')
+        self.assertEqual(indice.buscar('¿En qué congresos participé?'), ['Congreso: Congreso Nacional de Agronomía'])
+        self.assertEqual(indice.buscar('hola'), [])
+
+    def test_empates_por_recencia(self):
+        indice = IndicePerfil(self.docente_id)
+        indice.actualizar(self.perfil())
+
+        lineas = indice.buscar('mis artículos', limite=2)
+
+        self.assertEqual(lineas, ['Artículo: Estudio número 14 de suelos (2014)', 'Artículo: Estudio número 13 de suelos (2013)'])
+
+    def test_actualizacion_incremental(self):
+        indice = IndicePerfil(self.docente_id)
+        self.assertEqual(indice.actualizar(self.perfil()), (17, 0))
+
+        articulo = Articulo.query.filter_by(anio=1998).one()
+        articulo.titulo = 'Aprendizaje profundo en cultivos'
+        db.session.delete(Congreso.query.one())
+        db.session.commit()
+
+        self.assertEqual(indice.actualizar(self.perfil()), (1, 1))
+        self.assertEqual(len(indice), 16)
+        self.assertEqual(indice.buscar('redes neuronales'), [])
+        self.assertEqual(indice.buscar('aprendizaje profundo'), ['Artículo: Aprendizaje profundo en cultivos (1998)'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+from unittest import mock
+from app import create_app, db
+from app.config import Config
+from app.models.user import User
+from app.models.docente import Docente
+from app.services.intenciones import interpretar_actualizacion, validar_valor
+from app.services.llm_cliente import ProveedorLLM
+from tests.test_conversaciones import respuesta_llm
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    WTF_CSRF_ENABLED = False
+    CV_JOBS_WORKERS = 0
+    GROQ_API_KEY = 'clave-de-prueba'
+
+
+class InterpretarActualizacionTestCase(unittest.TestCase):
+    def test_frases_habituales(self):
+        casos = {
+            'mi orcid es 0000-0002-1825-0097': ('orcid', '0000-0002-1825-0097'),
+            'Actualiza mi correo a ana@uni.mx.': ('correo_principal', 'ana@uni.mx'),
+            'por favor cambia mi nombre completo por Ana Ruiz': ('nombre_completo', 'Ana Ruiz'),
+            'pon mi cvu: 123456': ('cvu', '123456'),
+            'Mi país de nacimiento es México': ('pais_nacimiento', 'México'),
+            'actualiza mi nombre a Juan por favor': ('nombre_completo', 'Juan'),
+            'pon mi nacionalidad como mexicana por favor': ('nacionalidad', 'mexicana'),
+            'mi estado civil es Unión Libre': ('estado_civil', 'Unión Libre'),
+            'mi domicilio es: Av. Juárez 12, Col. Centro': ('domicilio', 'Av. Juárez 12, Col. Centro'),
+            'cambia mi domicilio a "Calle Hidalgo y Morelos 5"': ('domicilio', 'Calle Hidalgo y Morelos 5'),
+        }
+        for mensaje, (campo, valor) in casos.items():
+            self.assertEqual(interpretar_actualizacion(mensaje), {'campo': campo, 'valor': valor}, mensaje)
+
+    def test_normaliza_el_valor(self):
+        self.assertEqual(validar_valor('curp', 'pelj800101hdflpr09'), 'PELJ800101HDFLPR09')
+        self.assertEqual(validar_valor('orcid', 'https://orcid.org/0000-0001-5109-370x'), '0000-0001-5109-370X')
+        self.assertEqual(validar_valor('sexo', 'mujer'), 'Femenino')
+        self.assertEqual(validar_valor('correo_principal', '"ana@uni.mx"'), 'ana@uni.mx')
+
+    def test_valores_invalidos(self):
+        self.assertIsNone(validar_valor('orcid', '1234'))
+        self.assertIsNone(validar_valor('correo_principal', 'ana arroba uni'))
+        self.assertIsNone(validar_valor('nombre_completo', 'Ana 2'))
+        self.assertIsNone(validar_valor('rfc', 'X' * 20))
+        self.assertIsNone(validar_valor('nombre_completo', 'Uno Dos Tres Cuatro Cinco Seis Siete'))
+        self.assertIsNone(validar_valor('nacionalidad', 'marciana'))
+        self.assertIsNone(validar_valor('estado_civil', 'complicado'))
+        self.assertIsNone(validar_valor('domicilio', 'Av. Juárez 12'))
+        self.assertEqual(validar_valor('domicilio', 'Av. Juárez 12', delimitado=True), 'Av. Juárez 12')
+
+    def test_ambiguos_quedan_para_el_modelo(self):
+        for mensaje in (
+            '¿cuál es mi orcid?',
+            'no cambies mi correo a ana@uni.mx',
+            'cambia mi correo a a@b.com y mi orcid a 0000-0002-1825-0097',
+            'cambia mi correo de a@b.com a c@d.com',
+            'cámbialo a ana@uni.mx',
+            'mi orcid es 1234',
+            'Hola, mi nombre es Ana y necesito ayuda con mi CV',
+            'mi domicilio es un desastre',
+            'mi nombre es el que aparece en mi título',
+        ):
+            self.assertIsNone(interpretar_actualizacion(mensaje), mensaje)
+
+
+class ChatbotActualizacionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            user = User(email='docente@example.com', role='docente')
+            user.set_password('password123')
+            db.session.add(Docente(user=user, nombre_completo='Ana Ruiz'))
+            db.session.commit()
+        self.llm = mock.Mock()
+        parche = mock.patch.object(ProveedorLLM, 'cliente', return_value=self.llm)
+        parche.start()
+        self.addCleanup(parche.stop)
+        self.client.post('/auth/login', data={'email': 'docente@example.com', 'password': 'password123'})
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_frase_habitual_se_actualiza_sin_llamar_al_modelo(self):
+        respuesta = self.client.post('/chatbot/mensaje', json={'mensaje': 'mi orcid es 0000-0002-1825-0097'})
+
+        self.assertIn('Perfil actualizado', respuesta.get_json()['respuesta'])
+        self.llm.chat.completions.create.assert_not_called()
+        with self.app.app_context():
+            self.assertEqual(Docente.query.one().orcid, '0000-0002-1825-0097')
+
+    def test_frase_ambigua_recurre_al_modelo(self):
+        self.llm.chat.completions.create.return_value = respuesta_llm(
+            '{"actualizaciones": [{"campo": "cvu", "valor": "123"}, {"campo": "orcid", "valor": "0000-0002-1825-0097"}]}'
+        )
+
+        self.client.post('/chatbot/mensaje', json={'mensaje': 'actualiza mi cvu a 123 y mi orcid a 0000-0002-1825-0097'})
+
+        self.llm.chat.completions.create.assert_called_once()
+        with self.app.app_context():
+            docente = Docente.query.one()
+            self.assertEqual((docente.cvu, docente.orcid), ('123', '0000-0002-1825-0097'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from unittest import mock
+from app import create_app
+from app.config import Config
+from app.services.chatbot_service import ChatbotService
+from app.services.llm_cliente import ProveedorLLM, obtener_proveedor_llm
+from app.services.planificador_llm import obtener_planificador
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    CV_JOBS_WORKERS = 0
+    GROQ_API_KEY = 'clave-de-prueba'
+    LLM_POOL_MAX_CONEXIONES = 7
+    LLM_POOL_MAX_KEEPALIVE = 3
+    LLM_TIMEOUT_LECTURA = 12
+    LLM_MAX_REINTENTOS = 4
+
+
+class ProveedorLLMTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+
+    def test_un_cliente_por_proceso_entre_peticiones(self):
+        with self.app.test_request_context():
+            primero = ChatbotService()
+        with self.app.test_request_context():
+            segundo = ChatbotService()
+
+        self.assertIs(primero.client, segundo.client)
+        self.assertEqual(primero.model, TestConfig.GROQ_MODEL)
+
+    def test_aplica_limites_timeouts_y_reintentos(self):
+        with self.app.app_context():
+            cliente = obtener_proveedor_llm().cliente()
+            planificador = obtener_planificador()
+
+        # Los reintentos los hace el planificador, no el SDK
+        self.assertEqual((cliente.max_retries, planificador.max_reintentos), (0, 4))
+        self.assertEqual(cliente.timeout.read, 12)
+        pool = cliente._client._transport._pool
+        self.assertEqual(pool._max_connections, 7)
+        self.assertEqual(pool._max_keepalive_connections, 3)
+
+    def test_tras_un_fork_crea_otro_cliente(self):
+        proveedor = ProveedorLLM('clave')
+        padre = proveedor.cliente()
+
+        with mock.patch('app.services.llm_cliente.os.getpid', return_value=-1):
+            hijo = proveedor.cliente()
+
+        self.assertIsNot(hijo, padre)
+
+    def test_sin_api_key(self):
+        with self.assertRaises(ValueError):
+            ProveedorLLM('').cliente()
+
+
+if __name__ == '__main__':
+    unittest.main()
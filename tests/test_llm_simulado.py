@@ -0,0 +1,126 @@
+import asyncio
+import random
+import unittest
+import groq
+from starlette.testclient import TestClient
+from app import create_app, db
+from app.config import Config
+from app.models.user import User
+from app.models.docente import Docente
+from app.services.llm_cliente import ProveedorLLM
+from app.services.llm_simulado import (
+    ClienteSimulado, ClienteSimuladoAsync, ModeloSimulado, crear_servidor, distribucion_latencia
+)
+
+MENSAJES = [{'role': 'user', 'content': 'Hola'}]
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    WTF_CSRF_ENABLED = False
+    CV_JOBS_WORKERS = 0
+    GROQ_API_KEY = None
+    LLM_BACKEND = 'simulado'
+    LLM_SIMULADO_LATENCIA = 'fija:0'
+    LLM_SIMULADO_TOKENS_SEG = 0
+
+
+def modelo(**opciones):
+    return ModeloSimulado(**{'tokens_por_segundo': 0, 'latencia': 'fija:0', 'semilla': 1, **opciones})
+
+
+class ModeloSimuladoTestCase(unittest.TestCase):
+    def test_distribuciones_de_latencia(self):
+        rng = random.Random(1)
+
+        self.assertEqual(distribucion_latencia('fija:0.25')(rng), 0.25)
+        self.assertTrue(0.1 <= distribucion_latencia('uniforme:0.1:0.2')(rng) <= 0.2)
+        self.assertGreater(distribucion_latencia('lognormal:0.4:0.5')(rng), 0)
+        for especificacion in ('normal:1:2', 'fija', 'uniforme:a:b'):
+            with self.assertRaises(ValueError):
+                distribucion_latencia(especificacion)
+
+    def test_respuesta_y_stream_con_los_tipos_del_sdk(self):
+        cliente = ClienteSimulado(modelo(tokens_respuesta=6))
+
+        completa = cliente.chat.completions.create(messages=MENSAJES, model='m')
+        fragmentos = list(cliente.chat.completions.create(messages=MENSAJES, model='m', stream=True, max_tokens=2))
+
+        self.assertTrue(completa.choices[0].message.content)
+        self.assertEqual(len(fragmentos), 2)
+        self.assertEqual(fragmentos[-1].choices[0].finish_reason, 'stop')
+
+    def test_prompt_que_pide_json(self):
+        cliente = ClienteSimulado(modelo())
+        mensajes = [{'role': 'system', 'content': 'Solo respondes en JSON válido.'}, *MENSAJES]
+
+        completa = cliente.chat.completions.create(messages=mensajes, model='m')
+
+        self.assertEqual(completa.choices[0].message.content, '{"error": "no_identificado"}')
+
+    def test_errores_inyectados_como_los_del_sdk(self):
+        simulado = modelo(tasa_429=1.0, retry_after=2)
+        with self.assertRaises(groq.RateLimitError) as contexto:
+            ClienteSimulado(simulado).chat.completions.create(messages=MENSAJES, model='m')
+        self.assertEqual(contexto.exception.response.headers['retry-after'], '2')
+
+        simulado.tasa_429, simulado.tasa_error = 0.0, 1.0
+        with self.assertRaises(groq.InternalServerError):
+            ClienteSimulado(simulado).chat.completions.create(messages=MENSAJES, model='m')
+        self.assertEqual(simulado.estadisticas(), {'llamadas': 2, 'errores_429': 1, 'errores_500': 1})
+
+    def test_cliente_async(self):
+        async def leer():
+            stream = await ClienteSimuladoAsync(modelo(tokens_respuesta=4)).chat.completions.create(
+                messages=MENSAJES, model='m', stream=True
+            )
+            return [fragmento.choices[0].delta.content async for fragmento in stream]
+
+        self.assertTrue(asyncio.run(leer()))
+
+    def test_servidor_compatible_con_el_sdk_de_groq(self):
+        simulado = modelo(tokens_respuesta=4)
+        sdk = groq.Groq(api_key='x', base_url='http://testserver', max_retries=0,
+                        http_client=TestClient(crear_servidor(simulado)))
+
+        completa = sdk.chat.completions.create(messages=MENSAJES, model='m')
+        fragmentos = list(sdk.chat.completions.create(messages=MENSAJES, model='m', stream=True))
+
+        self.assertEqual(''.join(f.choices[0].delta.content for f in fragmentos).split()[0],
+                         completa.choices[0].message.content.split()[0])
+        simulado.tasa_429 = 1.0
+        with self.assertRaises(groq.RateLimitError):
+            sdk.chat.completions.create(messages=MENSAJES, model='m')
+
+
+class BackendSimuladoTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            user = User(email='docente@example.com', role='docente')
+            user.set_password('password123')
+            db.session.add(Docente(user=user, nombre_completo='Ana Ruiz'))
+            db.session.commit()
+        self.client.post('/auth/login', data={'email': 'docente@example.com', 'password': 'password123'})
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_chatbot_responde_sin_api_key(self):
+        respuesta = self.client.post('/chatbot/mensaje', json={'mensaje': 'Resume mi trayectoria'})
+
+        self.assertTrue(respuesta.get_json()['respuesta'].startswith('Según tu CV'))
+        self.assertEqual(self.app.extensions['llm'].simulado.estadisticas()['llamadas'], 1)
+
+    def test_backend_desconocido(self):
+        with self.assertRaises(ValueError):
+            ProveedorLLM('clave', backend='otro')
+
+
+if __name__ == '__main__':
+    unittest.main()
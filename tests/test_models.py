@@ -1,12 +1,16 @@
 import unittest
 from app import create_app, db
-from app.models.usuario import Usuario
+from app.config import Config
+from app.models.user import User
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
 
 class ModelTestCase(unittest.TestCase):
     def setUp(self):
-        self.app = create_app()
-        self.app.config['TESTING'] = True
-        self.app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///:memory:'
+        self.app = create_app(TestConfig)
         self.app_context = self.app.app_context()
         self.app_context.push()
         db.create_all()
@@ -17,11 +21,9 @@ class ModelTestCase(unittest.TestCase):
         self.app_context.pop()
     
     def test_usuario_creation(self):
-        usuario = Usuario(
+        usuario = User(
             email='test@example.com',
-            nombre='Test',
-            apellidos='User',
-            rol='profesor'
+            role='docente'
         )
         usuario.set_password('password123')
         db.session.add(usuario)
@@ -30,6 +32,7 @@ class ModelTestCase(unittest.TestCase):
         self.assertEqual(usuario.email, 'test@example.com')
         self.assertTrue(usuario.check_password('password123'))
         self.assertFalse(usuario.check_password('wrongpassword'))
+        self.assertFalse(usuario.es_admin())
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,221 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+import groq
+import httpx
+from app import create_app, db
+from app.config import Config
+from app.models.user import User
+from app.models.docente import Docente
+from app.services.llm_cliente import ProveedorLLM
+from app.services.planificador_llm import ColaLLMLlena, PlanificadorLLM, segundos_retry_after
+from tests.test_conversaciones import respuesta_llm
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    WTF_CSRF_ENABLED = False
+    CV_JOBS_WORKERS = 0
+    GROQ_API_KEY = 'clave-de-prueba'
+
+
+def error_429(retry_after='0.05'):
+    respuesta = httpx.Response(429, headers={'retry-after': retry_after}, request=httpx.Request('POST', 'http://llm'))
+    return groq.RateLimitError('rate limit', response=respuesta, body=None)
+
+
+def esperar_cola(planificador, en_cola):
+    limite = time.monotonic() + 2
+    while planificador.estadisticas()['en_cola'] < en_cola:
+        if time.monotonic() > limite:
+            raise AssertionError('la cola no llegó al tamaño esperado')
+        time.sleep(0.001)
+
+
+class PlanificadorLLMTestCase(unittest.TestCase):
+    def test_respeta_el_tope_global(self):
+        planificador = PlanificadorLLM(max_concurrentes=2, max_por_usuario=10)
+        en_curso, maximo, lock = [0], [0], threading.Lock()
+
+        def llamada():
+            with lock:
+                en_curso[0] += 1
+                maximo[0] = max(maximo[0], en_curso[0])
+            time.sleep(0.02)
+            with lock:
+                en_curso[0] -= 1
+
+        hilos = [threading.Thread(target=planificador.llamar, args=(i % 3, llamada)) for i in range(8)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(maximo[0], 2)
+        estadisticas = planificador.estadisticas()
+        self.assertEqual((estadisticas['llamadas'], estadisticas['en_curso'], estadisticas['en_cola']), (8, 0, 0))
+
+    def test_turnos_por_rotacion_entre_usuarios(self):
+        planificador = PlanificadorLLM(max_concurrentes=1, max_por_usuario=10)
+        orden = []
+
+        def pedir(usuario):
+            planificador.llamar(usuario, lambda: orden.append(usuario))
+
+        hilos = []
+        with planificador.turno('insistente'):
+            # El mismo usuario manda tres consultas antes de que llegue otro
+            for usuario in ('insistente', 'insistente', 'insistente', 'otro'):
+                hilos.append(threading.Thread(target=pedir, args=(usuario,)))
+                hilos[-1].start()
+                esperar_cola(planificador, len(hilos))
+        for hilo in hilos:
+            hilo.join()
+
+        self.assertEqual(orden, ['insistente', 'otro', 'insistente', 'insistente'])
+
+    def test_limite_de_consultas_por_usuario(self):
+        planificador = PlanificadorLLM(max_concurrentes=4, max_por_usuario=1)
+
+        with planificador.turno(1):
+            with self.assertRaises(ColaLLMLlena):
+                with planificador.turno(1):
+                    pass
+            with planificador.turno(2):
+                pass
+
+        with planificador.turno(1):
+            pass
+        self.assertEqual(planificador.estadisticas()['rechazadas'], 1)
+
+    def test_espera_maxima_en_cola(self):
+        planificador = PlanificadorLLM(max_concurrentes=1, espera_maxima=0.02)
+
+        with planificador.turno(1):
+            with self.assertRaises(ColaLLMLlena):
+                with planificador.turno(2):
+                    pass
+
+        self.assertEqual(planificador.estadisticas()['en_cola'], 0)
+        with planificador.turno(2) as turno:
+            self.assertLess(turno.cola_s, 0.02)
+
+    def test_429_pausa_reduce_el_limite_y_reintenta(self):
+        planificador = PlanificadorLLM(max_concurrentes=8, max_reintentos=2)
+        llamada = mock.Mock(side_effect=[error_429('0.05'), 'respuesta'])
+
+        resultado, turno = planificador.llamar(1, llamada)
+
+        self.assertEqual(resultado, 'respuesta')
+        self.assertEqual(turno.reintentos, 1)
+        # La pausa del Retry-After cuenta como cola, no como tiempo del modelo
+        self.assertGreaterEqual(turno.cola_s, 0.05)
+        self.assertLess(turno.modelo_s, 0.05)
+        estadisticas = planificador.estadisticas()
+        self.assertEqual((estadisticas['limite'], estadisticas['respuestas_429']), (4, 1))
+
+    def test_durante_la_pausa_no_se_conceden_turnos(self):
+        planificador = PlanificadorLLM(max_concurrentes=4)
+        planificador.registrar_429(0.05)
+
+        with planificador.turno(1) as turno:
+            pass
+
+        self.assertGreaterEqual(turno.cola_s, 0.04)
+
+    def test_el_limite_se_recupera_con_exitos(self):
+        planificador = PlanificadorLLM(max_concurrentes=4)
+        planificador.registrar_429(0)
+        self.assertEqual(planificador.limite, 2)
+
+        for _ in range(2):
+            planificador.llamar(1, lambda: None)
+
+        self.assertEqual(planificador.limite, 3)
+
+    def test_errores_no_reintentables_y_reintentos_agotados(self):
+        planificador = PlanificadorLLM(max_reintentos=1)
+
+        with self.assertRaises(ValueError):
+            planificador.llamar(1, mock.Mock(side_effect=ValueError('prompt inválido')))
+        with self.assertRaises(groq.RateLimitError):
+            planificador.llamar(1, mock.Mock(side_effect=[error_429('0'), error_429('0')]))
+        self.assertEqual(planificador.estadisticas()['en_curso'], 0)
+
+    def test_retry_after_en_milisegundos(self):
+        respuesta = httpx.Response(429, headers={'retry-after-ms': '250'}, request=httpx.Request('POST', 'http://llm'))
+
+        self.assertEqual(segundos_retry_after(groq.RateLimitError('', response=respuesta, body=None)), 0.25)
+        self.assertIsNone(segundos_retry_after(ValueError()))
+
+    def test_turno_async_cancelado_en_cola(self):
+        planificador = PlanificadorLLM(max_concurrentes=1)
+
+        async def esperar_y_cancelar():
+            async def pedir():
+                async with planificador.turno_async(2):
+                    pass
+
+            tarea = asyncio.create_task(pedir())
+            await asyncio.sleep(0.01)
+            tarea.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await tarea
+
+        with planificador.turno(1):
+            asyncio.run(esperar_y_cancelar())
+            self.assertEqual(planificador.estadisticas()['en_cola'], 0)
+
+        async def pedir_y_medir():
+            async with planificador.turno_async(2) as turno:
+                return await turno.llamar_async(lambda: asyncio.sleep(0, 'ok'))
+
+        self.assertEqual(asyncio.run(pedir_y_medir()), 'ok')
+
+
+class ChatbotPlanificadoTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            user = User(email='docente@example.com', role='docente')
+            user.set_password('password123')
+            db.session.add(Docente(user=user, nombre_completo='Ana Ruiz'))
+            db.session.commit()
+        self.llm = mock.Mock()
+        parche = mock.patch.object(ProveedorLLM, 'cliente', return_value=self.llm)
+        parche.start()
+        self.addCleanup(parche.stop)
+        self.client.post('/auth/login', data={'email': 'docente@example.com', 'password': 'password123'})
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_metadata_separa_cola_y_modelo(self):
+        self.llm.chat.completions.create.side_effect = [error_429('0'), respuesta_llm('Hola, Ana.')]
+
+        datos = self.client.post('/chatbot/mensaje', json={'mensaje': 'Hola'}).get_json()
+
+        self.assertEqual(datos['respuesta'], 'Hola, Ana.')
+        self.assertEqual(set(datos['metadata']['llm']), {'cola_ms', 'modelo_ms', 'reintentos'})
+        self.assertEqual(datos['metadata']['llm']['reintentos'], 1)
+
+    def test_usuario_con_demasiadas_consultas(self):
+        planificador = self.app.extensions['planificador_llm']
+        planificador.max_por_usuario = 1
+
+        with planificador.turno(1):
+            datos = self.client.post('/chatbot/mensaje', json={'mensaje': 'Hola'}).get_json()
+
+        self.assertTrue(datos['respuesta'].startswith('⏳'))
+        self.llm.chat.completions.create.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
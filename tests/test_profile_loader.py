@@ -0,0 +1,89 @@
+import pickle
+import unittest
+from app import create_app, db
+from app.config import Config
+from app.models.user import User
+from app.models.docente import Docente
+from app.models.articulo import Articulo
+from app.models.congreso import Congreso
+from app.services.profile_loader import ProfileLoader
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    WTF_CSRF_ENABLED = False
+
+
+class ProfileLoaderTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.docentes = []
+        for i in range(3):
+            user = User(email=f'docente{i}@example.com', role='docente')
+            user.set_password('password123')
+            docente = Docente(user=user, nombre_completo=f'Docente {i}')
+            db.session.add(docente)
+            self.docentes.append(docente)
+        db.session.commit()
+
+        for docente in self.docentes:
+            for anio in (2019, 2023, 2021):
+                db.session.add(Articulo(docente_id=docente.id, titulo=f'Art {docente.id}-{anio}', anio=anio))
+            db.session.add(Congreso(docente_id=docente.id, nombre_congreso='Congreso'))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _contar_consultas(self, funcion):
+        from sqlalchemy import event
+        consultas = []
+
+        def registrar(conn, cursor, statement, parameters, context, executemany):
+            consultas.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', registrar)
+        try:
+            resultado = funcion()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', registrar)
+        return resultado, consultas
+
+    def test_cargar_incluye_colecciones_y_usuario(self):
+        perfil = ProfileLoader().cargar(self.docentes[0].id)
+
+        self.assertEqual(perfil.docente.nombre_completo, 'Docente 0')
+        self.assertEqual(perfil.docente.user.email, 'docente0@example.com')
+        self.assertEqual([a.anio for a in perfil.articulos], [2023, 2021, 2019])
+        self.assertEqual(len(perfil.congresos), 1)
+        self.assertEqual(perfil.libros, ())
+
+    def test_instantanea_inmutable_y_serializable(self):
+        perfil = ProfileLoader().cargar(self.docentes[0].id)
+
+        with self.assertRaises(AttributeError):
+            perfil.articulos[0].titulo = 'Otro'
+        self.assertEqual(pickle.loads(pickle.dumps(perfil)), perfil)
+
+    def test_numero_de_consultas_no_depende_de_los_docentes(self):
+        ids = [d.id for d in self.docentes]
+        _, consultas_uno = self._contar_consultas(lambda: ProfileLoader().cargar(ids[0]))
+        perfiles, consultas_varios = self._contar_consultas(lambda: ProfileLoader().cargar_varios(ids))
+
+        self.assertEqual(len(perfiles), 3)
+        self.assertEqual(len(consultas_uno), 1 + len(ProfileLoader.COLECCIONES))
+        self.assertEqual(len(consultas_varios), len(consultas_uno))
+
+    def test_docente_inexistente(self):
+        self.assertIsNone(ProfileLoader().cargar(9999))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+from app import create_app, db
+from app.config import Config
+from app.models.user import User
+from app.models.docente import Docente
+from app.models.articulo import Articulo
+from app.utils.query_stats import (
+    PresupuestoConsultasExcedido, contar_consultas, huella_sql, presupuesto_consultas
+)
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    WTF_CSRF_ENABLED = False
+    QUERY_STATS_HEADERS = True
+
+
+class HuellaSqlTestCase(unittest.TestCase):
+    def test_colapsa_literales_y_listas_in(self):
+        self.assertEqual(
+            huella_sql("SELECT * FROM t WHERE id IN (?, ?, ?) AND x = 'a'  LIMIT 10"),
+            huella_sql("SELECT * FROM t WHERE id IN (?) AND x = 'b' LIMIT 5")
+        )
+
+
+class QueryStatsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            user = User(email='docente@example.com', role='docente')
+            user.set_password('password123')
+            docente = Docente(user=user, nombre_completo='Docente de Prueba')
+            db.session.add(docente)
+            db.session.commit()
+            for i in range(5):
+                db.session.add(Articulo(docente_id=docente.id, titulo=f'Artículo {i}', anio=2020 + i))
+            db.session.commit()
+
+        self.client.post('/auth/login', data={
+            'email': 'docente@example.com',
+            'password': 'password123'
+        })
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_cabeceras_de_consultas(self):
+        response = self.client.get('/docente/perfil')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(int(response.headers['X-Query-Count']), 0)
+        self.assertIn('X-Query-Time-Ms', response.headers)
+        self.assertIn('X-Query-Max-Repeats', response.headers)
+
+    def test_modo_estricto_falla_al_exceder_presupuesto(self):
+        self.app.config.update(QUERY_STATS_STRICT=True, QUERY_BUDGETS={'docente.perfil': 3})
+
+        with self.assertRaises(PresupuestoConsultasExcedido):
+            self.client.get('/docente/perfil')
+
+    def test_presupuesto_detecta_consultas_repetidas(self):
+        with self.app.app_context():
+            with self.assertRaises(PresupuestoConsultasExcedido):
+                with presupuesto_consultas(max_repeticiones=2):
+                    for i in range(1, 6):
+                        db.session.get(Articulo, i)
+
+            with contar_consultas() as estadisticas:
+                Articulo.query.filter(Articulo.id.in_([1, 2, 3, 4, 5])).all()
+            self.assertEqual(estadisticas.total, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import Future
+from app import create_app, db
+from app.config import Config
+from app.models.user import User
+from app.models.docente import Docente
+from app.models.articulo import Articulo
+from app.services.chatbot_service import ChatbotService
+from app.services import render_jobs
+from app.services.cv_cache import CVRenderCache
+from app.services.profile_loader import ProfileLoader
+from app.services.render_jobs import GestorTrabajos, RegistroTrabajos, Trabajo
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    WTF_CSRF_ENABLED = False
+    CV_JOBS_WORKERS = 0
+    CV_JOBS_MAX_POR_USUARIO = 1
+    GROQ_API_KEY = 'clave-de-prueba'
+
+
+class TrabajosRutaTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dir_cache = tempfile.mkdtemp()
+        TestConfig.CV_CACHE_DIR = self.dir_cache
+        TestConfig.DOCUMENTOS_DIR = self.dir_cache + '/documentos'
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            for email in ('docente@example.com', 'otro@example.com'):
+                user = User(email=email, role='docente')
+                user.set_password('password123')
+                docente = Docente(user=user, nombre_completo=f'Docente {email}')
+                db.session.add(docente)
+                db.session.flush()
+                db.session.add(Articulo(docente_id=docente.id, titulo='Artículo de prueba', anio=2023))
+            db.session.commit()
+            self.user_id = User.query.filter_by(email='docente@example.com').one().id
+
+        self._login('docente@example.com')
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+        shutil.rmtree(self.dir_cache, ignore_errors=True)
+
+    def _login(self, email):
+        self.client.get('/auth/logout')
+        self.client.post('/auth/login', data={'email': email, 'password': 'password123'})
+
+    def test_crear_consultar_y_descargar(self):
+        respuesta = self.client.post('/cv/trabajos', data={'formato': 'pdf'})
+
+        self.assertEqual(respuesta.status_code, 202)
+        trabajo = respuesta.get_json()
+        self.assertEqual(trabajo['estado'], 'terminado')
+
+        estado = self.client.get(trabajo['url_estado'])
+        self.assertEqual(estado.get_json()['id'], trabajo['id'])
+
+        descarga = self.client.get(trabajo['url_descarga'])
+        self.assertEqual(descarga.status_code, 200)
+        self.assertEqual(descarga.mimetype, 'application/pdf')
+        self.assertTrue(descarga.data.startswith(b'%PDF'))
+
+    def test_formulario_encola_sin_esperar_el_render(self):
+        datos = {'formato': 'pdf', 'sections': ['datos_generales']}
+
+        normal = self.client.post('/cv/generar', data=datos)
+        con_fetch = self.client.post('/cv/generar', data=datos, headers={'Accept': 'application/json'})
+
+        self.assertEqual(normal.status_code, 302)
+        self.assertIn('/cv/generar?trabajo=', normal.headers['Location'])
+        pagina = self.client.get(normal.headers['Location'])
+        self.assertIn(b'data-url-estado="/cv/trabajos/', pagina.data)
+        self.assertEqual(con_fetch.status_code, 202)
+        self.assertIn('url_estado', con_fetch.get_json())
+
+    def test_descarga_de_un_trabajo_en_curso_no_bloquea(self):
+        gestor = self.app.extensions['render_jobs']
+        en_curso = Trabajo('en-curso', self.user_id, 1, 'pdf', 'CV.pdf', future=Future())
+        gestor._trabajos[en_curso.id] = en_curso
+
+        respuesta = self.client.get('/cv/trabajos/en-curso/descarga')
+        con_espera = self.client.get('/cv/trabajos/en-curso/descarga?esperar=0.01')
+
+        self.assertEqual(respuesta.status_code, 202)
+        self.assertIn('Retry-After', respuesta.headers)
+        self.assertEqual(respuesta.get_json()['estado'], 'pendiente')
+        self.assertEqual(con_espera.status_code, 202)
+
+    def test_otro_worker_responde_estado_y_descarga(self):
+        trabajo = self.client.post('/cv/trabajos', data={'formato': 'pdf'}).get_json()
+
+        # Un gestor nuevo, como el de otro worker: no comparte memoria con el primero
+        render_jobs.init_app(self.app)
+
+        self.assertEqual(self.client.get(trabajo['url_estado']).get_json()['estado'], 'terminado')
+        descarga = self.client.get(trabajo['url_descarga'])
+        self.assertEqual(descarga.status_code, 200)
+        self.assertTrue(descarga.data.startswith(b'%PDF'))
+
+    def test_trabajos_de_otro_usuario_no_son_visibles(self):
+        trabajo = self.client.post('/cv/trabajos', data={'formato': 'word'}).get_json()
+
+        self._login('otro@example.com')
+
+        self.assertEqual(self.client.get(trabajo['url_estado']).status_code, 404)
+        self.assertEqual(self.client.get(trabajo['url_descarga']).status_code, 404)
+
+    def test_limite_por_usuario_responde_429(self):
+        gestor = self.app.extensions['render_jobs']
+        en_curso = Trabajo('en-curso', self.user_id, 1, 'pdf', 'CV.pdf', future=Future())
+        gestor._trabajos[en_curso.id] = en_curso
+
+        respuesta = self.client.post('/cv/trabajos', data={'formato': 'pdf'})
+
+        self.assertEqual(respuesta.status_code, 429)
+        self.assertIn('Retry-After', respuesta.headers)
+
+    def test_chatbot_enlaza_la_descarga_del_trabajo(self):
+        with self.app.test_request_context():
+            docente = Docente.query.filter_by(user_id=self.user_id).one()
+            mensaje = 'GENERAR_CV_PERSONALIZADO|plantilla:academico|secciones:{"datos_generales": true}'
+            respuesta = ChatbotService()._procesar_cv_personalizado(mensaje, docente)
+
+        self.assertIn('/cv/trabajos/', respuesta)
+        url = respuesta.split('](')[1].split(')')[0]
+        descarga = self.client.get(url)
+        self.assertEqual(descarga.status_code, 200)
+        self.assertTrue(descarga.data.startswith(b'%PDF'))
+
+
+class PoolProcesosTestCase(unittest.TestCase):
+    def setUp(self):
+        self.dir_cache = tempfile.mkdtemp()
+        TestConfig.CV_CACHE_DIR = self.dir_cache
+        self.app = create_app(TestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        user = User(email='docente@example.com', role='docente')
+        user.set_password('password123')
+        docente = Docente(user=user, nombre_completo='Docente de Prueba')
+        db.session.add(docente)
+        db.session.commit()
+        self.perfil = ProfileLoader().cargar(docente.id)
+
+        self.cache = CVRenderCache(self.dir_cache)
+        self.gestor = GestorTrabajos(self.cache, RegistroTrabajos(self.dir_cache + '/trabajos'), workers=1)
+
+    def tearDown(self):
+        self.gestor.cerrar()
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        shutil.rmtree(self.dir_cache, ignore_errors=True)
+
+    def test_render_en_proceso_separado_y_luego_desde_cache(self):
+        trabajo = self.gestor.enviar_cv(1, self.perfil, 'pdf')
+        self.gestor.esperar(trabajo, timeout=60)
+
+        self.assertEqual(trabajo.estado, 'terminado', trabajo.error)
+        with open(trabajo.ruta, 'rb') as f:
+            self.assertTrue(f.read().startswith(b'%PDF'))
+
+        repetido = self.gestor.enviar_cv(1, self.perfil, 'pdf')
+        self.assertIsNone(repetido.future)
+        self.assertEqual(repetido.ruta, trabajo.ruta)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from app import create_app, db
+from app.config import Config
+from app.models.user import User
+from app.models.docente import Docente
+from app.models.articulo import Articulo
+from app.services.llm_cliente import ProveedorLLM
+from app.services.respuestas_chat import CacheRespuestas, es_autonoma, normalizar_pregunta, responder_conteo
+from tests.test_conversaciones import respuesta_llm
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    WTF_CSRF_ENABLED = False
+    CV_JOBS_WORKERS = 0
+    GROQ_API_KEY = 'clave-de-prueba'
+
+
+class RespuestasSinModeloTestCase(unittest.TestCase):
+    def test_normalizar_pregunta(self):
+        self.assertEqual(normalizar_pregunta('Hola, ¿Qué ARTÍCULOS   tengo? Gracias'), 'que articulos tengo')
+
+    def test_seguimientos_no_son_autonomos(self):
+        self.assertTrue(es_autonoma(normalizar_pregunta('¿Qué congresos tengo?')))
+        for pregunta in ('¿Y el más reciente?', '¿De qué trata ese?', 'Gracias', '¿Y cuántos libros?'):
+            self.assertFalse(es_autonoma(normalizar_pregunta(pregunta)), pregunta)
+
+    def test_conteo_con_los_totales_del_contexto(self):
+        contexto = SimpleNamespace(totales={'articulos': 12, 'libros': 3, 'congresos': 0})
+
+        self.assertIn('**Artículos científicos:** 12', responder_conteo('¿Cuántos artículos tengo?', contexto))
+        publicaciones = responder_conteo('¿cuantas publicaciones tengo registradas?', contexto)
+        self.assertIn('**Artículos científicos:** 12', publicaciones)
+        self.assertIn('**Libros y capítulos:** 3', publicaciones)
+        # Un filtro que los totales no resuelven va al modelo
+        self.assertIsNone(responder_conteo('¿Cuántos artículos tengo en 2020?', contexto))
+        self.assertIsNone(responder_conteo('¿Qué artículos tengo?', contexto))
+
+    def test_cache_exacta_normalizada_y_por_version(self):
+        cache = CacheRespuestas()
+        cache.guardar(1, 4, 'conversacion', '¿Qué congresos tengo?', 'Tienes dos.')
+
+        self.assertEqual(cache.buscar(1, 4, 'conversacion', '¿Qué congresos tengo?')[1]['tipo'], 'exacta')
+        self.assertEqual(cache.buscar(1, 4, 'conversacion', 'que congresos tengo')[1]['tipo'], 'normalizada')
+        self.assertIsNone(cache.buscar(1, 5, 'conversacion', '¿Qué congresos tengo?'))
+        self.assertIsNone(cache.buscar(2, 4, 'conversacion', '¿Qué congresos tengo?'))
+        # El prompt del streaming es otro: no comparte respuestas con el chat normal
+        self.assertIsNone(cache.buscar(1, 4, 'streaming', '¿Qué congresos tengo?'))
+
+        cache.guardar(1, 4, 'conversacion', '¿Y el más reciente?', 'El de 2024.')
+        self.assertEqual(cache.estadisticas()['entradas'], 1)
+
+
+class ChatbotRespuestasTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            user = User(email='docente@example.com', role='docente')
+            user.set_password('password123')
+            docente = Docente(user=user, nombre_completo='Ana Ruiz')
+            db.session.add(docente)
+            db.session.flush()
+            db.session.add(Articulo(docente_id=docente.id, titulo='Suelos', anio=2020))
+            db.session.commit()
+            self.docente_id = docente.id
+        self.llm = mock.Mock()
+        self.llm.chat.completions.create.return_value = respuesta_llm('Tienes un artículo sobre suelos.')
+        parche = mock.patch.object(ProveedorLLM, 'cliente', return_value=self.llm)
+        parche.start()
+        self.addCleanup(parche.stop)
+        self.client.post('/auth/login', data={'email': 'docente@example.com', 'password': 'password123'})
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def preguntar(self, mensaje):
+        return self.client.post('/chatbot/mensaje', json={'mensaje': mensaje}).get_json()
+
+    def test_conteo_sin_llamar_al_modelo(self):
+        datos = self.preguntar('¿Cuántos artículos tengo?')
+
+        self.assertIn('**Artículos científicos:** 1', datos['respuesta'])
+        self.assertEqual(datos['metadata']['cache'], {'tipo': 'calculada'})
+        self.llm.chat.completions.create.assert_not_called()
+
+    def test_pregunta_repetida_sale_de_la_cache_hasta_que_cambia_el_perfil(self):
+        primera = self.preguntar('¿Qué artículos tengo?')
+        exacta = self.preguntar('¿Qué artículos tengo?')
+        normalizada = self.preguntar('que articulos tengo')
+
+        self.assertIsNone(primera['metadata']['cache'])
+        self.assertEqual(exacta['metadata']['cache']['tipo'], 'exacta')
+        self.assertEqual(exacta['metadata'].keys(), primera['metadata'].keys())
+        self.assertIsNone(exacta['metadata']['llm'])
+        self.assertEqual(normalizada['metadata']['cache']['tipo'], 'normalizada')
+        self.assertEqual(normalizada['respuesta'], 'Tienes un artículo sobre suelos.')
+        self.assertEqual(self.llm.chat.completions.create.call_count, 1)
+
+        with self.app.app_context():
+            db.session.add(Articulo(docente_id=self.docente_id, titulo='Agua', anio=2024))
+            db.session.commit()
+        self.assertIsNone(self.preguntar('¿Qué artículos tengo?')['metadata']['cache'])
+        self.assertEqual(self.llm.chat.completions.create.call_count, 2)
+
+    def test_respuestas_con_historial_no_se_guardan(self):
+        self.preguntar('¿Qué libros tengo?')
+        # Segundo turno: el prompt ya lleva la conversación anterior
+        self.preguntar('¿Qué artículos tengo?')
+        repetida = self.preguntar('¿Qué artículos tengo?')
+
+        self.assertIsNone(repetida['metadata']['cache'])
+        self.assertEqual(self.llm.chat.completions.create.call_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
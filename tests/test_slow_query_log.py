@@ -0,0 +1,46 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from app import create_app, db
+from app.config import Config
+from app.models.articulo import Articulo
+
+
+class SlowQueryLogTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.log_path = os.path.join(self.tmpdir, 'slow.jsonl')
+
+        class TestConfig(Config):
+            TESTING = True
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+            SLOW_QUERY_THRESHOLD_MS = 0
+            SLOW_QUERY_LOG_PATH = self.log_path
+
+        self.app = create_app(TestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        self.app.extensions['slow_query_log'].handler.close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_registra_plan_de_consulta(self):
+        Articulo.query.filter_by(revista='Nature').all()
+
+        with open(self.log_path, encoding='utf-8') as f:
+            entradas = [json.loads(linea) for linea in f]
+        entrada = next(e for e in entradas if 'FROM articulos' in e['statement'])
+
+        self.assertEqual(entrada['parameters'], ['str'])
+        self.assertIn('SCAN articulos', ' '.join(p['detail'] for p in entrada['query_plan']))
+
+
+if __name__ == '__main__':
+    unittest.main()
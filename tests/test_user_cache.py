@@ -0,0 +1,96 @@
+import unittest
+from sqlalchemy import event
+from app import create_app, db
+from app.config import Config
+from app.models.user import User
+from app.models.docente import Docente
+from app.utils.cache import TTLCache
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    WTF_CSRF_ENABLED = False
+
+
+class TTLCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.ahora = 0.0
+        self.cache = TTLCache(maxsize=2, ttl=10, timer=lambda: self.ahora)
+
+    def test_expira_por_tiempo(self):
+        self.cache.set('a', 1)
+        self.ahora = 9.9
+        self.assertEqual(self.cache.get('a'), 1)
+        self.ahora = 10.0
+        self.assertIsNone(self.cache.get('a'))
+
+    def test_desaloja_el_menos_usado(self):
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+        self.cache.set('c', 3)
+        self.assertEqual(self.cache.get('a'), 1)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(self.cache.get('c'), 3)
+
+
+class UserCacheTestCase(unittest.TestCase):
+    """Las peticiones se hacen sin un app context externo para que flask-login
+    no reutilice el usuario guardado en ``g`` entre peticiones."""
+
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            user = User(email='docente@example.com', role='docente')
+            user.set_password('password123')
+            db.session.add(Docente(user=user, nombre_completo='Docente de Prueba'))
+            db.session.commit()
+            self.user_id = user.id
+            self.engine = db.engine
+
+        self.client.post('/auth/login', data={
+            'email': 'docente@example.com',
+            'password': 'password123'
+        })
+
+        self.consultas = []
+        event.listen(self.engine, 'before_cursor_execute', self._registrar)
+
+    def tearDown(self):
+        event.remove(self.engine, 'before_cursor_execute', self._registrar)
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _registrar(self, conn, cursor, statement, parameters, context, executemany):
+        self.consultas.append(' '.join(statement.split()))
+
+    def _consultas_a_users(self):
+        return [sql for sql in self.consultas if 'FROM users' in sql]
+
+    def test_peticiones_repetidas_no_consultan_users(self):
+        self.client.get('/chatbot/')
+        self.consultas.clear()
+
+        response = self.client.get('/chatbot/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._consultas_a_users(), [])
+
+    def test_modificar_usuario_invalida_la_cache(self):
+        self.client.get('/chatbot/')
+        with self.app.app_context():
+            db.session.get(User, self.user_id).email = 'nuevo@example.com'
+            db.session.commit()
+        self.consultas.clear()
+
+        self.client.get('/chatbot/')
+
+        self.assertEqual(len(self._consultas_a_users()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()